@@ -3,6 +3,8 @@ from .item import router as item_router
 from .menu import router as menu_router
 from .restaurant import router as restaurant_router
 from .category import router as category_router
+from .metrics import router as metrics_router
+from .mystery_bag import router as mystery_bag_router
 
 api_router = APIRouter(prefix='/api/v1')
 
@@ -10,3 +12,5 @@ api_router.include_router(item_router)
 api_router.include_router(category_router)
 api_router.include_router(menu_router)
 api_router.include_router(restaurant_router)
+api_router.include_router(mystery_bag_router)
+api_router.include_router(metrics_router)
@@ -0,0 +1,28 @@
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from decorators import handle_app_errors
+from dependencies import get_uow, get_mystery_bag_service
+from discovery import get_dietary_flag
+from schemas.mystery_bag import MysteryBagDietaryFlagIn, MysteryBagRetrieveOut
+from services import MysteryBagService
+from uow import SqlAlchemyUnitOfWork
+
+router = APIRouter(
+    prefix='/mystery-bags'
+)
+
+
+@router.get('/', response_model=List[MysteryBagRetrieveOut])
+@handle_app_errors
+async def search_mystery_bags(include: List[MysteryBagDietaryFlagIn] = Query(default=[]),
+                              exclude: List[MysteryBagDietaryFlagIn] = Query(default=[]),
+                              restaurant_id: Optional[List[int]] = Query(default=None),
+                              at: Optional[datetime] = None,
+                              limit: int = Query(default=50, gt=0, le=500),
+                              mystery_bag_service: MysteryBagService = Depends(get_mystery_bag_service),
+                              uow: SqlAlchemyUnitOfWork = Depends(get_uow)):
+    return await mystery_bag_service.search(uow, include=get_dietary_flag(include), exclude=get_dietary_flag(exclude),
+                                            restaurant_ids=restaurant_id, at=at, limit=limit)
@@ -0,0 +1,81 @@
+"""
+Throughput benchmark of KafkaReceiver against an in-process fake broker.
+
+Every message's action sleeps for the given time, standing in for a database transaction. A single worker
+processes messages one by one, like the receiver used to; more workers process partitions concurrently.
+
+Usage (from `src` directory, with the same environment variables as the tests):
+    CONFIGURATION=Test python -m benchmarks.consumer --messages 2000 --workers 1 4 16
+"""
+
+import argparse
+import asyncio
+import time
+from typing import List
+
+from loguru import logger
+
+from consumer import ConsumerEvent, KafkaReceiver
+from consumer.schemas import RestaurantUpdatedSchema
+from benchmarks.kafka import FakeKafkaConsumer
+
+
+class BenchmarkEvent(ConsumerEvent[RestaurantUpdatedSchema]):
+    """
+    Event whose action takes a fixed time without using the database.
+    """
+
+    schema_class = RestaurantUpdatedSchema
+    latency = 0.002
+
+    async def action(self, uow):
+        await asyncio.sleep(self.latency)
+
+
+def run(messages_count: int, partitions_count: int, aggregates_count: int, workers_count: int) -> float:
+    """
+    Consumes all messages and returns the number of messages processed per second.
+    """
+
+    consumer = FakeKafkaConsumer('restaurant_menu', partitions_count)
+
+    for number in range(messages_count):
+        consumer.produce(BenchmarkEvent.get_event_name(), str(number % aggregates_count),
+                         {'id': number, 'is_active': True})
+
+    receiver = KafkaReceiver(consumer, [BenchmarkEvent], workers_count=workers_count)
+
+    started_at = time.perf_counter()
+    receiver.start_receiving()
+
+    while not consumer.is_consumed():
+        time.sleep(0.001)
+
+    elapsed = time.perf_counter() - started_at
+    receiver.stop()
+
+    return messages_count / elapsed
+
+
+def main(args: List[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--messages', type=int, default=2000)
+    parser.add_argument('--partitions', type=int, default=12)
+    parser.add_argument('--aggregates', type=int, default=100)
+    parser.add_argument('--latency-ms', type=float, default=2)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 16])
+    options = parser.parse_args(args)
+
+    logger.remove()
+    BenchmarkEvent.latency = options.latency_ms / 1000
+
+    print(f"{options.messages} messages, {options.partitions} partitions, "
+          f"{options.aggregates} aggregates, {options.latency_ms} ms per action")
+
+    for workers_count in options.workers:
+        throughput = run(options.messages, options.partitions, options.aggregates, workers_count)
+        print(f"workers={workers_count:<4} {throughput:10.0f} messages/s")
+
+
+if __name__ == '__main__':
+    main()
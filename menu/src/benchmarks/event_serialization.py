@@ -0,0 +1,98 @@
+"""
+Benchmark of serialization of producer events.
+
+Serializes the events of `kafka_producer_events_topics` for all their topics and decodes them back,
+the way the publisher and receivers do, and reports events per second and bytes per event:
+
+- before: a schema instance per topic and `json.dumps`, decoded by `json.loads`;
+- json and msgpack: schemas applied once per event and values encoded by codecs, decoded by `decode_value`.
+
+Usage (from `src` directory):
+    python -m benchmarks.event_serialization --events 100000
+"""
+
+import argparse
+import json
+import random
+import string
+import time
+from typing import Callable, List, Tuple
+
+from config import get_settings
+from producer import ProducerEvent, decode_value, get_codec
+from setup.kafka.producer import init_producer_events
+from utils import import_string
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Producer events serialization benchmark")
+    parser.add_argument("--events", type=int, default=100_000, help="Number of serialized events")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    return parser.parse_args()
+
+
+def generate_events(count: int, event_classes: List[type]) -> List[ProducerEvent]:
+    return [random.choice(event_classes)(id=id, name=''.join(random.choices(string.ascii_letters, k=20)),
+                                         image_url=f'https://storage.example.com/menu/{id}.png',
+                                         price=random.randint(100, 100_000),
+                                         restaurant_id=random.randint(1, 5000))
+            for id in range(1, count + 1)]
+
+
+def serialize_before(event: ProducerEvent) -> List[bytes]:
+    return [json.dumps(event._topics_schemas[topic](**event._data).model_dump()).encode('ascii')
+            for topic in event.get_topics()]
+
+
+def make_serialize(codec_name: str) -> Callable[[ProducerEvent], List[bytes]]:
+    codec = get_codec(codec_name)
+
+    def serialize(event: ProducerEvent) -> List[bytes]:
+        return [codec.encode(event.get_data(topic)) for topic in event.get_topics()]
+
+    return serialize
+
+
+def measure(events: List[ProducerEvent], serialize: Callable[[ProducerEvent], List[bytes]],
+            deserialize: Callable[[bytes], dict]) -> Tuple[float, float, float]:
+    start = time.perf_counter()
+    values = [value for event in events for value in serialize(event)]
+    serialize_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+
+    for value in values:
+        deserialize(value)
+
+    deserialize_time = time.perf_counter() - start
+
+    return (len(events) / serialize_time, len(events) / deserialize_time,
+            sum(len(value) for value in values) / len(events))
+
+
+def run(args: argparse.Namespace):
+    random.seed(args.seed)
+
+    settings = get_settings()
+    init_producer_events(settings)
+    event_classes = [import_string(str_event) for str_event in settings.kafka_producer_events_topics]
+
+    cases = [
+        ("before", serialize_before, lambda value: json.loads(value.decode('ascii'))),
+        ("json", make_serialize('json'), decode_value),
+        ("msgpack", make_serialize('msgpack'), decode_value),
+    ]
+
+    print(f"{'codec':>8} | {'serialized events/s':>20} | {'decoded events/s':>17} | {'bytes/event':>11}")
+
+    for name, serialize, deserialize in cases:
+        # Events cache their serialized data, so every case gets fresh ones
+        random.seed(args.seed)
+        events = generate_events(args.events, event_classes)
+        serialized, decoded, size = measure(events, serialize, deserialize)
+
+        print(f"{name:>8} | {serialized:>20,.0f} | {decoded:>17,.0f} | {size:>11.1f}")
+
+
+if __name__ == "__main__":
+    run(parse_args())
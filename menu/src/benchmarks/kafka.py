@@ -0,0 +1,178 @@
+"""
+In-process fakes of the Kafka consumer and publisher shared by benchmarks and tests.
+"""
+
+import math
+import time
+import zlib
+from threading import Lock
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+from kafka import ConsumerRebalanceListener
+from kafka.consumer.fetcher import ConsumerRecord
+from kafka.structs import OffsetAndMetadata, TopicPartition
+
+from producer import AbstractPublisher, JsonCodec
+
+
+class FakeKafkaConsumer:
+    """
+    In-process stand-in for KafkaConsumer which serves messages of a topic from memory.
+
+    Messages are assigned to partitions by their keys and served as raw bytes, like KafkaConsumer without
+    deserializers does. Revoking partitions calls the rebalance listener during the next poll and rewinds
+    the partitions to their committed offsets, like a real rebalance does.
+    """
+
+    def __init__(self, topic: str, partitions_count: int):
+        self._topic = topic
+        self._lock = Lock()
+        self._messages: Dict[TopicPartition, List[ConsumerRecord]] = {
+            TopicPartition(topic, partition): list() for partition in range(partitions_count)
+        }
+        self._positions: Dict[TopicPartition, int] = {partition: 0 for partition in self._messages}
+        self._paused: Set[TopicPartition] = set()
+        self._revoked: Set[TopicPartition] = set()
+        self._listener: Optional[ConsumerRebalanceListener] = None
+
+        self.committed: Dict[TopicPartition, int] = dict()
+        self.paused_partitions: Set[TopicPartition] = set()
+        self.closed = False
+
+    def produce(self, event_name: str, key: str, value: Union[dict, bytes],
+                headers: Optional[List[Tuple[str, bytes]]] = None) -> ConsumerRecord:
+        partition = TopicPartition(self._topic, zlib.crc32(key.encode()) % len(self._messages))
+        value = value if isinstance(value, bytes) else JsonCodec().encode(value)
+
+        with self._lock:
+            messages = self._messages[partition]
+            message = ConsumerRecord(topic=self._topic, partition=partition.partition, offset=len(messages),
+                                     timestamp=0, timestamp_type=0, key=key.encode(), value=value,
+                                     headers=[('event_name', event_name.encode())] + (headers or []), checksum=None,
+                                     serialized_key_size=-1, serialized_value_size=-1,
+                                     serialized_header_size=-1)
+            messages.append(message)
+
+        return message
+
+    def revoke(self, *partitions: TopicPartition):
+        with self._lock:
+            self._revoked.update(partitions)
+
+    def is_consumed(self) -> bool:
+        with self._lock:
+            return all(self.committed.get(partition, 0) == len(messages)
+                       for partition, messages in self._messages.items())
+
+    def subscription(self) -> Set[str]:
+        return {self._topic}
+
+    def subscribe(self, topics=(), pattern=None, listener: Optional[ConsumerRebalanceListener] = None):
+        self._listener = listener
+
+    def assignment(self) -> Set[TopicPartition]:
+        return set(self._messages)
+
+    def unsubscribe(self):
+        self._listener = None
+
+    def assign(self, partitions: List[TopicPartition]):
+        pass
+
+    def partitions_for_topic(self, topic: str) -> Set[int]:
+        return {partition.partition for partition in self._messages}
+
+    def committed(self, partition: TopicPartition) -> Optional[int]:
+        return self.committed.get(partition)
+
+    def seek_to_beginning(self, *partitions: TopicPartition):
+        for partition in partitions:
+            self._positions[partition] = 0
+
+    def end_offsets(self, partitions: List[TopicPartition]) -> Dict[TopicPartition, int]:
+        with self._lock:
+            return {partition: len(self._messages[partition]) for partition in partitions}
+
+    def position(self, partition: TopicPartition) -> int:
+        return self._positions[partition]
+
+    def pause(self, *partitions: TopicPartition):
+        self._paused.update(partitions)
+        self.paused_partitions.update(partitions)
+
+    def resume(self, *partitions: TopicPartition):
+        self._paused.difference_update(partitions)
+
+    def paused(self) -> Set[TopicPartition]:
+        return set(self._paused)
+
+    def commit(self, offsets: Dict[TopicPartition, OffsetAndMetadata]):
+        for partition, metadata in offsets.items():
+            self.committed[partition] = metadata.offset
+
+    def poll(self, timeout_ms: int = 0, max_records: Optional[int] = None,
+             update_offsets: bool = True) -> Dict[TopicPartition, List[ConsumerRecord]]:
+        with self._lock:
+            revoked, self._revoked = self._revoked, set()
+
+        if revoked:
+            self._listener.on_partitions_revoked(revoked)
+
+            for partition in revoked:
+                self._positions[partition] = self.committed.get(partition, 0)
+                self._paused.discard(partition)
+
+            self._listener.on_partitions_assigned(revoked)
+
+        records = dict()
+
+        with self._lock:
+            partitions = [partition for partition in self._messages if partition not in self._paused]
+            limit = math.ceil(max_records / max(len(partitions), 1)) if max_records else None
+
+            for partition in partitions:
+                position = self._positions[partition]
+                messages = self._messages[partition][position:position + limit if limit else None]
+
+                if messages:
+                    records[partition] = messages
+                    self._positions[partition] = position + len(messages)
+
+        if not records:
+            time.sleep(min(timeout_ms, 10) / 1000)
+
+        return records
+
+    def close(self, autocommit: bool = True, timeout: Optional[float] = None):
+        self.closed = True
+
+
+class FakePublisher(AbstractPublisher):
+    """
+    Publisher which keeps delivered messages.
+    """
+
+    def __init__(self, error: Optional[Exception] = None):
+        super().__init__()
+        self.error = error
+        self.delivered: List[Tuple[str, str, Optional[str], dict]] = list()
+        self.delivered_records: List[Tuple[str, Optional[str], dict, List[Tuple[str, bytes]]]] = list()
+
+    def publish(self, event):
+        raise NotImplementedError
+
+    def deliver(self, messages, timeout=None):
+        messages = list(messages)
+
+        if self.error:
+            raise self.error
+
+        self.delivered.extend(messages)
+
+    def deliver_records(self, records, timeout=None):
+        records = list(records)
+
+        if self.error:
+            raise self.error
+
+        self.delivered_records.extend(records)
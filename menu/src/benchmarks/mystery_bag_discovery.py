@@ -0,0 +1,114 @@
+"""
+Benchmark for the mystery bag discovery index.
+
+Fills the index with random mystery bags and measures latency of filter queries.
+Results are checked against a brute-force filter over `MysteryBag` properties.
+
+Usage (from `src` directory):
+    python -m benchmarks.mystery_bag_discovery --bags 100000 --queries 1000
+"""
+
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from discovery import MysteryBagDiscoveryIndex, DietaryFlag, DIETARY_FLAGS_FIELDS
+from models import MysteryBag
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Mystery bag discovery index benchmark")
+    parser.add_argument("--bags", type=int, default=100_000, help="Number of indexed mystery bags")
+    parser.add_argument("--queries", type=int, default=1000, help="Number of measured queries")
+    parser.add_argument("--restaurants", type=int, default=5000, help="Number of restaurants")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    return parser.parse_args()
+
+
+def generate_mystery_bags(count: int, restaurants: int, now: datetime):
+    for id in range(1, count + 1):
+        pickup_start_time = now + timedelta(minutes=random.randint(-240, 120))
+        flags = {field: random.random() < 0.5 for field in DIETARY_FLAGS_FIELDS.values()}
+
+        yield MysteryBag(id=id, restaurant_id=random.randint(1, restaurants), is_active=True,
+                         available_quantity=random.randint(0, 5),
+                         pickup_start_time=pickup_start_time,
+                         pickup_end_time=pickup_start_time + timedelta(minutes=random.randint(30, 240)),
+                         **flags)
+
+
+def brute_force_search(mystery_bags, include: DietaryFlag, exclude: DietaryFlag, at: datetime):
+    result = []
+
+    for mystery_bag in mystery_bags:
+        if not (mystery_bag.available_quantity > 0
+                and mystery_bag.pickup_start_time <= at <= mystery_bag.pickup_end_time):
+            continue
+
+        if all(getattr(mystery_bag, field) for flag, field in DIETARY_FLAGS_FIELDS.items() if flag & include) \
+                and not any(getattr(mystery_bag, field) for flag, field in DIETARY_FLAGS_FIELDS.items()
+                            if flag & exclude):
+            result.append(mystery_bag.id)
+
+    return result
+
+
+def random_query():
+    flags = list(DietaryFlag)
+    include = DietaryFlag(0)
+    exclude = DietaryFlag(0)
+
+    for flag in random.sample(flags, random.randint(0, 3)):
+        if random.random() < 0.5:
+            include |= flag
+        else:
+            exclude |= flag
+
+    return include, exclude
+
+
+def run(args: argparse.Namespace):
+    random.seed(args.seed)
+    now = datetime.utcnow().replace(microsecond=0)
+
+    mystery_bags = list(generate_mystery_bags(args.bags, args.restaurants, now))
+    index = MysteryBagDiscoveryIndex()
+
+    start = time.perf_counter()
+    index.rebuild(mystery_bags)
+    rebuild_elapsed = time.perf_counter() - start
+
+    # Correctness
+    for _ in range(10):
+        include, exclude = random_query()
+        expected = set(brute_force_search(mystery_bags, include, exclude, now))
+        assert set(index.search(include, exclude, at=now)) == expected, "Index result differs from brute force"
+
+    start = time.perf_counter()
+    brute_force_search(mystery_bags, DietaryFlag.VEGETARIAN | DietaryFlag.JAIN, DietaryFlag.NUTS, now)
+    brute_force_elapsed = time.perf_counter() - start
+
+    # Latency
+    latencies = []
+
+    for _ in range(args.queries):
+        include, exclude = random_query()
+
+        start = time.perf_counter()
+        index.search(include, exclude, at=now)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    latencies.sort()
+
+    print(f"indexed bags:       {len(index)}")
+    print(f"rebuild:            {rebuild_elapsed:.3f}s")
+    print(f"brute force query:  {brute_force_elapsed * 1000:.3f}ms")
+    print(f"index query p50:    {statistics.median(latencies):.3f}ms")
+    print(f"index query p99:    {latencies[int(len(latencies) * 0.99) - 1]:.3f}ms")
+    print(f"index query max:    {latencies[-1]:.3f}ms")
+
+
+if __name__ == "__main__":
+    run(parse_args())
@@ -0,0 +1,127 @@
+"""
+Contention benchmark for mystery bag reservations.
+
+Runs many concurrent reservers against the same mystery bag and checks that the bag is never oversold.
+
+Usage (from `src` directory):
+    python -m benchmarks.mystery_bag_reservations --reservers 500 --quantity 100
+    python -m benchmarks.mystery_bag_reservations --url sqlite+aiosqlite:///benchmark.sqlite3
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncEngine
+
+from exceptions import MysteryBagSoldOutError
+from models import Base, Restaurant, MysteryBag, MysteryBagReservation
+from schemas.mystery_bag import MysteryBagReservationCreateIn
+from services import MysteryBagService
+from uow import SqlAlchemyUnitOfWork
+from utils.uow import uow_transaction_with_commit
+
+BENCHMARK_RESTAURANT_ID = 2_000_000_000
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Mystery bag reservations contention benchmark")
+    parser.add_argument("--url", default=None, help="Database URL. Default is the configured one")
+    parser.add_argument("--reservers", type=int, default=500, help="Number of concurrent reservers")
+    parser.add_argument("--quantity", type=int, default=100, help="Available quantity of the mystery bag")
+    parser.add_argument("--pool-size", type=int, default=20, help="Connection pool size")
+    return parser.parse_args()
+
+
+def create_engine(url: str, pool_size: int) -> AsyncEngine:
+    if url.startswith("sqlite"):
+        # SQLite serializes writers, so reservers wait for the lock instead of failing
+        return create_async_engine(url, connect_args={"timeout": 60})
+
+    return create_async_engine(url, pool_size=pool_size, max_overflow=0, pool_timeout=60)
+
+
+async def seed(session_maker: async_sessionmaker, quantity: int) -> int:
+    async with session_maker() as session:
+        session.add(Restaurant(id=BENCHMARK_RESTAURANT_ID, is_active=True))
+        mystery_bag = MysteryBag(title="Benchmark Mystery Bag", restaurant_id=BENCHMARK_RESTAURANT_ID,
+                                 original_value=20000, selling_price=9900,
+                                 total_quantity=quantity, available_quantity=quantity,
+                                 pickup_start_time=datetime.utcnow(),
+                                 pickup_end_time=datetime.utcnow() + timedelta(hours=1))
+        session.add(mystery_bag)
+        await session.commit()
+        return mystery_bag.id
+
+
+async def cleanup(session_maker: async_sessionmaker, mystery_bag_id: int):
+    async with session_maker() as session:
+        await session.execute(delete(MysteryBagReservation)
+                              .where(MysteryBagReservation.mystery_bag_id == mystery_bag_id))
+        await session.execute(delete(MysteryBag).where(MysteryBag.id == mystery_bag_id))
+        await session.execute(delete(Restaurant).where(Restaurant.id == BENCHMARK_RESTAURANT_ID))
+        await session.commit()
+
+
+async def reserve(service: MysteryBagService, session_maker: async_sessionmaker,
+                  mystery_bag_id: int, customer_id: int) -> bool:
+    data = MysteryBagReservationCreateIn(mystery_bag_id=mystery_bag_id, customer_id=customer_id)
+
+    try:
+        async with uow_transaction_with_commit(SqlAlchemyUnitOfWork(session_maker)) as uow:
+            await service.reserve(data, uow)
+    except MysteryBagSoldOutError:
+        return False
+
+    return True
+
+
+async def run(args: argparse.Namespace):
+    if args.url is None:
+        from db.url import DATABASE_URL
+        args.url = DATABASE_URL
+
+    engine = create_engine(args.url, args.pool_size)
+
+    if args.url.startswith("sqlite"):
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+    mystery_bag_id = await seed(session_maker, args.quantity)
+    service = MysteryBagService()
+
+    try:
+        start = time.perf_counter()
+        results = await asyncio.gather(*(reserve(service, session_maker, mystery_bag_id, customer_id)
+                                         for customer_id in range(args.reservers)))
+        elapsed = time.perf_counter() - start
+
+        async with session_maker() as session:
+            mystery_bag = await session.get(MysteryBag, mystery_bag_id)
+            available_quantity = mystery_bag.available_quantity
+
+        successes = sum(results)
+        oversold = max(successes - args.quantity, 0)
+
+        print(f"reservers:          {args.reservers}")
+        print(f"initial quantity:   {args.quantity}")
+        print(f"successful:         {successes}")
+        print(f"sold out:           {args.reservers - successes}")
+        print(f"left in stock:      {available_quantity}")
+        print(f"oversold:           {oversold}")
+        print(f"elapsed:            {elapsed:.3f}s")
+        print(f"reservations/s:     {args.reservers / elapsed:.1f}")
+
+        assert oversold == 0, "Mystery bag was oversold"
+        assert available_quantity == args.quantity - successes, "Stock does not match reservations"
+        assert available_quantity >= 0, "Stock went negative"
+    finally:
+        await cleanup(session_maker, mystery_bag_id)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(run(parse_args()))
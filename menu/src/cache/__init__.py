@@ -0,0 +1,9 @@
+from config import get_settings
+from .single_flight import *
+from .menu import *
+
+settings = get_settings()
+
+# Init current menu cache
+current_menu_cache = CurrentMenuCache(maxsize=settings.current_menu_cache_maxsize,
+                                      ttl=settings.current_menu_cache_ttl_seconds)
@@ -0,0 +1,36 @@
+from typing import Optional
+
+from loguru import logger
+
+from schemas.menu import MenuRetrieveOut
+from uow import SqlAlchemyUnitOfWork
+from .single_flight import SingleFlightCache
+
+__all__ = [
+    'CurrentMenuCache',
+]
+
+
+class CurrentMenuCache(SingleFlightCache[Optional[MenuRetrieveOut]]):
+    """
+    Cache of serialized current menu trees (menu with categories and their items), keyed by restaurant ID.
+    """
+
+    def invalidate_restaurant(self, restaurant_id: int, uow: Optional[SqlAlchemyUnitOfWork] = None):
+        """
+        Invalidates a current menu of a restaurant.
+
+        The entry is dropped immediately and once again after the unit of work is committed,
+        so a concurrent reader can not cache the menu tree as it was before the commit.
+
+        Args:
+            restaurant_id (int): The ID of the restaurant.
+            uow (Optional[SqlAlchemyUnitOfWork]): The unit of work instance of the write.
+        """
+
+        self.invalidate(restaurant_id)
+
+        if uow is not None:
+            uow.add_after_commit_callback(lambda: self.invalidate(restaurant_id))
+
+        logger.debug(f"Invalidated cached current Menu of Restaurant with id={restaurant_id}")
@@ -0,0 +1,162 @@
+import asyncio
+from dataclasses import dataclass
+from threading import RLock
+from typing import TypeVar, Generic, Dict, Hashable, Callable, Awaitable, Any
+
+from cachetools import TTLCache
+
+__all__ = [
+    'CacheStats',
+    'SingleFlightCache',
+]
+
+Value = TypeVar("Value")
+
+
+@dataclass
+class CacheStats:
+    """
+    Counters of a cache.
+
+    Attributes:
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups which loaded the value.
+        coalesced (int): Number of lookups which waited for a concurrent load of the same key.
+        invalidations (int): Number of invalidated keys.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    invalidations: int = 0
+
+
+@dataclass
+class _Flight:
+    loop: asyncio.AbstractEventLoop
+    future: asyncio.Future
+
+
+class SingleFlightCache(Generic[Value]):
+    """
+    Read-through LRU cache with TTL and single-flight loading.
+
+    Concurrent lookups of the same missing key in the same event loop share one load,
+    so a popular key which expires does not cause a stampede. If a key is invalidated
+    while it is being loaded, the loaded value is returned to the waiting callers but not stored.
+
+    The cache is thread-safe, since it is shared between the web application and Kafka receivers
+    which run their own event loops in separate threads.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Initializes a new instance of the SingleFlightCache class.
+
+        Args:
+            maxsize (int): The maximum number of entries, least recently used ones are evicted first.
+            ttl (float): Time to live of entries in seconds.
+        """
+
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._in_flight: Dict[Hashable, _Flight] = dict()
+        self._lock = RLock()
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._cache)
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Value]]) -> Value:
+        """
+        Returns a cached value or loads it.
+
+        Args:
+            key (Hashable): The key.
+            loader (Callable[[], Awaitable[Value]]): Coroutine function which loads the value.
+
+        Returns:
+            Value: The value.
+        """
+
+        loop = asyncio.get_running_loop()
+
+        with self._lock:
+            try:
+                value = self._cache[key]
+                self.stats.hits += 1
+                return value
+            except KeyError:
+                pass
+
+            flight = self._in_flight.get(key)
+
+            if flight is not None and flight.loop is loop:
+                self.stats.coalesced += 1
+                leader = False
+            else:
+                self.stats.misses += 1
+                flight = _Flight(loop=loop, future=loop.create_future())
+                self._in_flight[key] = flight
+                leader = True
+
+        if not leader:
+            return await asyncio.shield(flight.future)
+
+        try:
+            value = await loader()
+        except BaseException as e:
+            self._land(key, flight)
+            flight.future.set_exception(e)
+            # Mark exception as retrieved if nobody waits for it
+            flight.future.exception()
+            raise
+
+        with self._lock:
+            # The flight has already landed if the key was invalidated during the load
+            if self._land(key, flight):
+                self._cache[key] = value
+
+        flight.future.set_result(value)
+        return value
+
+    def _land(self, key: Hashable, flight: _Flight) -> bool:
+        with self._lock:
+            if self._in_flight.get(key) is flight:
+                del self._in_flight[key]
+                return True
+
+        return False
+
+    def invalidate(self, key: Hashable):
+        """
+        Removes a key from the cache and prevents its in-flight loads from being stored.
+
+        Args:
+            key (Hashable): The key.
+        """
+
+        with self._lock:
+            self._cache.pop(key, None)
+            self._in_flight.pop(key, None)
+            self.stats.invalidations += 1
+
+    def clear(self):
+        """
+        Removes all keys from the cache.
+        """
+
+        with self._lock:
+            self._cache.clear()
+            self._in_flight.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Returns counters of the cache.
+
+        Returns:
+            Dict[str, Any]: The counters and the current size of the cache.
+        """
+
+        with self._lock:
+            return {**self.stats.__dict__, 'size': len(self._cache)}
@@ -5,6 +5,9 @@ from config import get_settings, BASE_DIRECTORY
 from .creator import *
 from .events import *
 from .receiver import *
+from .broadcast import *
+from .retry import *
+from .snapshot import *
 
 settings = get_settings()
 
@@ -0,0 +1,176 @@
+import asyncio
+from threading import Thread, Event
+from typing import List, Optional, Set, Type
+
+from kafka import KafkaConsumer
+from kafka.consumer.fetcher import ConsumerRecord
+from kafka.errors import KafkaError
+from loguru import logger
+
+from db import init_thread_engine, dispose_thread_engine
+from utils.uow import get_sqlalchemy_uow
+from .events import ConsumerEvent
+from .utils import decode_message, get_event_name, get_consumer_event_by_name
+
+
+__all__ = [
+    "KafkaBroadcastReceiver",
+]
+
+
+class KafkaBroadcastReceiver:
+    """
+    Class for receiving events which make in-memory state of every process stale.
+
+    An event is applied to the database by a single consumer of its group, so caches of other processes
+    would stay stale until they expire. The broadcast receiver runs in every process and consumes all partitions
+    of a topic with a consumer without a group, i.e. from the latest messages and without committed offsets,
+    and calls `invalidate` of received events. Messages which can't be decoded or whose events aren't broadcast
+    are skipped, they are dead lettered by the consumer of the group.
+
+    The consumer of the group may commit its transaction after the event is invalidated here, so a concurrent
+    request could cache the state before the commit once again. Every event is therefore invalidated once more
+    after a delay, which must exceed the usual lag of the consumer of the group. A longer lag is bounded
+    by TTLs and rebuilds of caches.
+
+    It runs in a separate daemon thread with its own event loop.
+    """
+
+    def __init__(self, consumer: KafkaConsumer, consumer_events: List[Type[ConsumerEvent]],
+                 repeat_delay: float = 5, max_poll_records: int = 500, poll_timeout_ms: int = 100):
+        """
+        Constructor for the KafkaBroadcastReceiver class.
+
+        Args:
+            consumer (KafkaConsumer): The KafkaConsumer instance, created without a group.
+            consumer_events (List[Type[ConsumerEvent]]): The list of broadcast consumer events.
+            repeat_delay (float): The time in seconds after which an event is invalidated once more.
+            max_poll_records (int): The maximum number of messages fetched at once.
+            poll_timeout_ms (int): The time in milliseconds to wait for messages if there are none.
+        """
+
+        self._consumer = consumer
+        self._consumer_events = consumer_events
+        self._repeat_delay = repeat_delay
+        self._max_poll_records = max_poll_records
+        self._poll_timeout_ms = poll_timeout_ms
+
+        self._repeats: Set[asyncio.Task] = set()
+
+        self._stop_requested = Event()
+        self._receiver_thread = Thread(target=self.__between_callback)
+        self._receiver_thread.daemon = True
+
+    def _decode(self, message: ConsumerRecord) -> Optional[ConsumerEvent]:
+        """
+        Decodes a fetched message into its event.
+
+        Args:
+            message (ConsumerRecord): The message with the raw key and value.
+
+        Returns:
+            Optional[ConsumerEvent]: The event or None if the message isn't a broadcast event.
+        """
+
+        try:
+            message = decode_message(message)
+            event_class = get_consumer_event_by_name(get_event_name(message), self._consumer_events)
+
+            return event_class(message.value, message.offset) if event_class else None
+        except Exception as e:
+            logger.warning(f"Skipped broadcast message {message.topic}:{message.partition}:{message.offset} "
+                           f"which can't be decoded: {e}")
+
+    async def _invalidate(self, event: ConsumerEvent):
+        """
+        Invalidates in-memory state which the event makes stale.
+
+        Args:
+            event (ConsumerEvent): The event.
+        """
+
+        try:
+            await event.invalidate(get_sqlalchemy_uow())
+        except Exception as e:
+            logger.error(f"Error invalidating {event.get_event_name()}: {e}")
+
+    async def _repeat(self, event: ConsumerEvent):
+        """
+        Invalidates in-memory state which the event makes stale once more after the delay.
+
+        Args:
+            event (ConsumerEvent): The event.
+        """
+
+        await asyncio.sleep(self._repeat_delay)
+        await self._invalidate(event)
+
+    async def _consume_messages(self):
+        """
+        Method for consuming messages from Kafka.
+        """
+
+        while not self._stop_requested.is_set():
+            try:
+                records = await asyncio.to_thread(self._consumer.poll, timeout_ms=self._poll_timeout_ms,
+                                                  max_records=self._max_poll_records)
+            except KafkaError as e:
+                logger.error(f'Failed to fetch broadcast messages: {e}')
+                await asyncio.sleep(self._poll_timeout_ms / 1000)
+                continue
+
+            for messages in records.values():
+                for message in messages:
+                    event = self._decode(message)
+
+                    if event is None:
+                        continue
+
+                    await self._invalidate(event)
+
+                    repeat = asyncio.create_task(self._repeat(event))
+                    self._repeats.add(repeat)
+                    repeat.add_done_callback(self._repeats.discard)
+
+        for repeat in list(self._repeats):
+            repeat.cancel()
+
+        await asyncio.gather(*self._repeats, return_exceptions=True)
+        await asyncio.to_thread(self._consumer.close, False)
+
+    def __between_callback(self):
+        """
+        Synchronous wrapper for method that consumes messages.
+        """
+
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        init_thread_engine()
+
+        try:
+            loop.run_until_complete(self._consume_messages())
+        except Exception as e:
+            logger.critical(f'Broadcast receiver stopped by unexpected error: {e}')
+
+        loop.run_until_complete(dispose_thread_engine())
+        loop.close()
+
+    def start_receiving(self):
+        """
+        Starts the receiver thread.
+        """
+
+        self._receiver_thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stops fetching messages, cancels pending repeated invalidations and closes the consumer.
+
+        Args:
+            timeout (Optional[float]): The maximum time to wait in seconds.
+        """
+
+        self._stop_requested.set()
+
+        if self._receiver_thread.is_alive():
+            self._receiver_thread.join(timeout)
@@ -1,22 +1,24 @@
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar, Type
+from typing import Generic, List, TypeVar, Type
 
 from pydantic import BaseModel
 
-from schemas import RestaurantUpdateIn, RestaurantCreateIn, RestaurantManagerCreateIn
-from services import RestaurantService, RestaurantManagerService
+from cache import current_menu_cache
+from grpc_files import grpc_roles_client
+from services import RestaurantService
 from uow import SqlAlchemyUnitOfWork
 from utils.uow import uow_transaction, uow_transaction_with_commit
 
 from .schemas import RestaurantManagerCreatedSchema, RestaurantCreatedSchema, RestaurantUpdatedSchema, \
-    MenuItemRatingUpdatedSchema
+    MenuItemRatingUpdatedSchema, UserUpdatedSchema
 
 __all__ = [
     "ConsumerEvent",
     "RestaurantCreatedEvent",
     "RestaurantUpdatedEvent",
     "RestaurantManagerCreatedEvent",
-    "MenuItemRatingUpdatedEvent"
+    "MenuItemRatingUpdatedEvent",
+    "UserUpdatedEvent",
 ]
 
 BaseEventSchema = TypeVar("BaseEventSchema", bound=BaseModel)
@@ -30,19 +32,25 @@ class ConsumerEvent(Generic[BaseEventSchema], ABC):
 
     Attributes:
         schema_class (Type[BaseEventSchema]): The schema class for the event's data.
+        supports_batch (bool): Whether the receiver applies consecutive events of this class
+        from a partition together with `action_batch`.
     """
 
     schema_class: Type[BaseEventSchema] = None
+    supports_batch: bool = False
 
-    def __init__(self, data: dict):
+    def __init__(self, data: dict, version: int = -1):
         """
         Constructor for the inherited classes from ConsumerEvent class.
 
         Args:
             data (dict): The received data.
+            version (int): The offset of the received message, used as the version of replicated records.
+                Default is -1.
         """
 
         self._data: BaseEventSchema = self.schema_class(**data)
+        self._version = version
 
     @abstractmethod
     async def action(self, uow: SqlAlchemyUnitOfWork):
@@ -55,6 +63,35 @@ class ConsumerEvent(Generic[BaseEventSchema], ABC):
 
         raise NotImplementedError
 
+    @classmethod
+    async def action_batch(cls, events: List["ConsumerEvent"], uow: SqlAlchemyUnitOfWork):
+        """
+        Action to be executed on consecutive events of a partition, in the order they were received.
+
+        Events which support batches override it to apply all events in a single transaction.
+        By default events are applied one by one.
+
+        Args:
+            events (List[ConsumerEvent]): The events.
+            uow (SqlAlchemyUnitOfWork): The unit of work instance.
+        """
+
+        for event in events:
+            await event.action(uow)
+
+    async def invalidate(self, uow: SqlAlchemyUnitOfWork):
+        """
+        Invalidates in-memory state of the process which the event makes stale.
+
+        An event is applied to the database by a single consumer of its group, while every process receives it
+        with a broadcast receiver and calls this method. By default nothing is invalidated.
+
+        Args:
+            uow (SqlAlchemyUnitOfWork): The unit of work instance to read the state from.
+        """
+
+        pass
+
     @classmethod
     def get_event_name(cls) -> str:
         """
@@ -73,20 +110,43 @@ class RestaurantCreatedEvent(ConsumerEvent[RestaurantCreatedSchema]):
     """
 
     schema_class = RestaurantCreatedSchema
+    supports_batch = True
 
     async def action(self, uow: SqlAlchemyUnitOfWork):
         """
-        Creates a new restaurant.
+        Creates a new restaurant and sets it to its restaurant manager.
+
+        Nothing is changed if the restaurant already has this or a newer version.
 
         Args:
             uow (SqlAlchemyUnitOfWork): The unit of work instance.
         """
 
-        restaurant_service = RestaurantService()
+        async with uow_transaction_with_commit(uow) as uow:
+            restaurant_data = self._data.model_dump(exclude={"restaurant_manager_id"})
+
+            if await uow.restaurants.upsert({**restaurant_data, "version": self._version}):
+                await uow.managers.update(self._data.restaurant_manager_id, {"restaurant_id": self._data.id})
+
+    @classmethod
+    async def action_batch(cls, events: List["RestaurantCreatedEvent"], uow: SqlAlchemyUnitOfWork):
+        """
+        Creates new restaurants and sets them to their restaurant managers in a single transaction.
+
+        The manager of a restaurant never changes, so managers are set even for restaurants
+        which already have newer versions.
+
+        Args:
+            events (List[RestaurantCreatedEvent]): The events.
+            uow (SqlAlchemyUnitOfWork): The unit of work instance.
+        """
 
         async with uow_transaction_with_commit(uow) as uow:
-            restaurant_data = RestaurantCreateIn(**self._data.model_dump())
-            await restaurant_service.create(restaurant_data, uow)
+            await uow.restaurants.upsert_many([{**event._data.model_dump(exclude={"restaurant_manager_id"}),
+                                                "version": event._version}
+                                               for event in events])
+            await uow.managers.set_restaurants({event._data.restaurant_manager_id: event._data.id
+                                                for event in events})
 
 
 class RestaurantUpdatedEvent(ConsumerEvent[RestaurantUpdatedSchema]):
@@ -95,21 +155,56 @@ class RestaurantUpdatedEvent(ConsumerEvent[RestaurantUpdatedSchema]):
     """
 
     schema_class = RestaurantUpdatedSchema
+    supports_batch = True
 
     async def action(self, uow: SqlAlchemyUnitOfWork):
         """
         Activates a restaurant.
 
+        Nothing is changed if the restaurant already has this or a newer version.
+
+        Args:
+            uow (SqlAlchemyUnitOfWork): The unit of work instance.
+        """
+
+        restaurant_service = RestaurantService()
+
+        async with uow_transaction_with_commit(uow) as uow:
+            if await uow.restaurants.upsert({**self._data.model_dump(), "version": self._version}):
+                await restaurant_service.refresh_discovery_index(self._data.id, self._data.is_active, uow)
+
+    @classmethod
+    async def action_batch(cls, events: List["RestaurantUpdatedEvent"], uow: SqlAlchemyUnitOfWork):
+        """
+        Activates restaurants in a single transaction.
+
         Args:
+            events (List[RestaurantUpdatedEvent]): The events.
             uow (SqlAlchemyUnitOfWork): The unit of work instance.
         """
 
         restaurant_service = RestaurantService()
 
         async with uow_transaction_with_commit(uow) as uow:
-            restaurant_id = self._data.id
-            restaurant_data = RestaurantUpdateIn(**self._data.model_dump())
-            await restaurant_service.update(restaurant_id, restaurant_data, uow)
+            await uow.restaurants.upsert_many([{**event._data.model_dump(), "version": event._version}
+                                               for event in events])
+
+            restaurants = {event._data.id: event._data.is_active for event in events}
+
+            for restaurant_id, is_active in restaurants.items():
+                await restaurant_service.refresh_discovery_index(restaurant_id, is_active, uow)
+
+    async def invalidate(self, uow: SqlAlchemyUnitOfWork):
+        """
+        Refreshes mystery bags of the restaurant in the discovery index of the process.
+
+        Args:
+            uow (SqlAlchemyUnitOfWork): The unit of work instance.
+        """
+
+        async with uow_transaction(uow) as uow:
+            await RestaurantService().refresh_discovery_index(self._data.id, self._data.is_active, uow,
+                                                              after_commit=False)
 
 
 class RestaurantManagerCreatedEvent(ConsumerEvent[RestaurantManagerCreatedSchema]):
@@ -118,20 +213,34 @@ class RestaurantManagerCreatedEvent(ConsumerEvent[RestaurantManagerCreatedSchema
     """
 
     schema_class = RestaurantManagerCreatedSchema
+    supports_batch = True
 
     async def action(self, uow: SqlAlchemyUnitOfWork):
         """
         Creates a new restaurant manager.
 
+        Nothing is changed if the restaurant manager already has this or a newer version.
+
         Args:
             uow (SqlAlchemyUnitOfWork): The unit of work instance.
         """
 
-        restaurant_manager_service = RestaurantManagerService()
+        async with uow_transaction_with_commit(uow) as uow:
+            await uow.managers.upsert({**self._data.model_dump(), "version": self._version})
+
+    @classmethod
+    async def action_batch(cls, events: List["RestaurantManagerCreatedEvent"], uow: SqlAlchemyUnitOfWork):
+        """
+        Creates new restaurant managers in a single transaction.
+
+        Args:
+            events (List[RestaurantManagerCreatedEvent]): The events.
+            uow (SqlAlchemyUnitOfWork): The unit of work instance.
+        """
 
         async with uow_transaction_with_commit(uow) as uow:
-            restaurant_manager_data = RestaurantManagerCreateIn(**self._data.model_dump())
-            await restaurant_manager_service.create(restaurant_manager_data, uow)
+            await uow.managers.upsert_many([{**event._data.model_dump(), "version": event._version}
+                                            for event in events])
 
 
 class MenuItemRatingUpdatedEvent(ConsumerEvent[MenuItemRatingUpdatedSchema]):
@@ -140,18 +249,82 @@ class MenuItemRatingUpdatedEvent(ConsumerEvent[MenuItemRatingUpdatedSchema]):
     """
 
     schema_class = MenuItemRatingUpdatedSchema
+    supports_batch = True
 
     async def action(self, uow: SqlAlchemyUnitOfWork):
         """
-        Updates a menu item rating.
+        Updates a menu item rating, unless a newer rating has been received.
 
         Args:
             uow (SqlAlchemyUnitOfWork): The unit of work instance.
         """
 
+        await type(self).action_batch([self], uow)
+
+    @classmethod
+    async def action_batch(cls, events: List["MenuItemRatingUpdatedEvent"], uow: SqlAlchemyUnitOfWork):
+        """
+        Updates ratings of menu items in a single transaction.
+
+        Only the newest rating of a menu item in the batch is written.
+
+        Args:
+            events (List[MenuItemRatingUpdatedEvent]): The events.
+            uow (SqlAlchemyUnitOfWork): The unit of work instance.
+        """
+
+        ratings = dict()
+
+        for event in events:
+            rating = ratings.get(event._data.id)
+
+            if rating is None or rating["version"] <= event._data.version:
+                ratings[event._data.id] = event._data.model_dump(include={"id", "rating", "reviews_count", "version"})
+
         async with uow_transaction_with_commit(uow) as uow:
-            await uow.items.update(self._data.id, {
-                "rating": self._data.rating,
-                "reviews_count": self._data.reviews_count
-            })
+            restaurant_ids = await uow.items.update_ratings(list(ratings.values()))
+
+            for restaurant_id in restaurant_ids:
+                current_menu_cache.invalidate_restaurant(restaurant_id, uow)
+
+    async def invalidate(self, uow: SqlAlchemyUnitOfWork):
+        """
+        Invalidates the cached current menu of the menu item's restaurant in the process.
+
+        Args:
+            uow (SqlAlchemyUnitOfWork): The unit of work instance.
+        """
+
+        async with uow_transaction(uow) as uow:
+            menu_item = await uow.items.retrieve(self._data.id)
+
+        if menu_item:
+            current_menu_cache.invalidate_restaurant(menu_item.restaurant_id)
+
+
+class UserUpdatedEvent(ConsumerEvent[UserUpdatedSchema]):
+    """
+    Event when User is updated.
+    """
+
+    schema_class = UserUpdatedSchema
+
+    async def action(self, uow: SqlAlchemyUnitOfWork):
+        """
+        Invalidates cached roles of a user.
+
+        Args:
+            uow (SqlAlchemyUnitOfWork): The unit of work instance.
+        """
+
+        grpc_roles_client.invalidate_user(self._data.id)
+
+    async def invalidate(self, uow: SqlAlchemyUnitOfWork):
+        """
+        Invalidates cached roles of a user in the process.
+
+        Args:
+            uow (SqlAlchemyUnitOfWork): The unit of work instance.
+        """
 
+        grpc_roles_client.invalidate_user(self._data.id)
@@ -1,20 +1,46 @@
 import asyncio
-from threading import Thread
-from typing import List, Type
+from threading import Thread, Event
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Type
 
-from kafka import KafkaConsumer
+from kafka import KafkaConsumer, ConsumerRebalanceListener
+from kafka.consumer.fetcher import ConsumerRecord
+from kafka.errors import KafkaError
+from kafka.structs import OffsetAndMetadata, TopicPartition
 from loguru import logger
 
+from db import init_thread_engine, dispose_thread_engine
 from exceptions import AppError
 from utils.uow import get_sqlalchemy_uow
 from .events import ConsumerEvent
-from .utils import get_consumer_event_by_name
+from .retry import RetryPolicy, get_message_version
+from .utils import UnknownEventError, decode_message, get_event_name, get_consumer_event_by_name
 
 
 __all__ = [
     "KafkaReceiver",
 ]
 
+# Put into the queue of a partition to stop its processing
+_RELEASED = object()
+
+# Time in seconds between attempts to reroute a failed message while Kafka is unavailable
+_REROUTE_INTERVAL = 1
+
+
+class _RebalanceListener(ConsumerRebalanceListener):
+    """
+    Finishes processing of revoked partitions before they are handed over to another consumer of the group.
+    """
+
+    def __init__(self, receiver: "KafkaReceiver"):
+        self._receiver = receiver
+
+    def on_partitions_revoked(self, revoked: Set[TopicPartition]):
+        self._receiver._on_partitions_revoked(revoked)
+
+    def on_partitions_assigned(self, assigned: Set[TopicPartition]):
+        logger.info(f"Assigned partitions: {', '.join(map(str, assigned))}")
+
 
 class KafkaReceiver:
     """
@@ -22,42 +48,464 @@ class KafkaReceiver:
 
     It uses KafkaConsumer to receive messages from Kafka, identifies the event type
     and calls the action method of the event class.
+
+    Messages are processed by an asyncio runtime in the receiver thread. Every assigned partition has its own
+    queue, whose messages are processed one by one in the order of their offsets, while partitions are processed
+    concurrently by a bounded number of workers. A partition with a full queue is paused until it is drained.
+
+    Consecutive messages of a partition whose event supports batches are applied together by the event's
+    `action_batch`. A batch is collected until it has the maximum size, the maximum wait time passes or a message
+    of another event is received.
+
+    Offsets are committed manually and only for messages whose actions have finished, i.e. whose database
+    transactions have been committed, so every message is processed at least once.
+
+    Messages are fetched as raw bytes and decoded one by one while they are processed. A message which can't be
+    decoded, has malformed headers or an unknown event is dead lettered as it was fetched, so a poison message
+    never stops its partition or the receiver.
+
+    With a retry policy, failed messages are rerouted to delay or dead letter topics instead of being skipped,
+    so a failing message never blocks its partition. Delay topics are consumed by the same receiver: a partition
+    of a delay topic waits until its next message is due, while other partitions are processed.
+
+    KafkaConsumer is not thread-safe, so it is only used by the polling step, one call at a time.
     """
 
-    def __init__(self, consumer: KafkaConsumer, consumer_events: List[Type[ConsumerEvent]]):
+    def __init__(self, consumer: KafkaConsumer, consumer_events: List[Type[ConsumerEvent]],
+                 workers_count: int = 8, partition_queue_maxsize: int = 100, max_poll_records: int = 500,
+                 poll_timeout_ms: int = 100, batch_max_size: int = 100, batch_max_wait_ms: int = 20,
+                 retry_policy: Optional[RetryPolicy] = None):
         """
         Constructor for the KafkaReceiver class.
 
         Args:
-            consumer (KafkaConsumer): The KafkaConsumer instance.
+            consumer (KafkaConsumer): The KafkaConsumer instance, created with disabled auto commit.
             consumer_events (List[Type[ConsumerEvent]]): The list of consumer events.
+            workers_count (int): The maximum number of messages processed concurrently.
+            partition_queue_maxsize (int): The number of queued messages at which a partition is paused.
+            max_poll_records (int): The maximum number of messages fetched at once.
+            poll_timeout_ms (int): The time in milliseconds to wait for messages if there are none.
+            batch_max_size (int): The maximum number of messages applied by a batch action.
+            batch_max_wait_ms (int): The maximum time in milliseconds to wait for more messages of a batch.
+            retry_policy (Optional[RetryPolicy]): The policy rerouting failed messages, if None they are skipped.
         """
 
         self._consumer = consumer
         self._consumer_events = consumer_events
+        self._workers_count = workers_count
+        self._partition_queue_maxsize = partition_queue_maxsize
+        self._max_poll_records = max_poll_records
+        self._poll_timeout_ms = poll_timeout_ms
+        self._batch_max_size = batch_max_size
+        self._batch_max_wait_ms = batch_max_wait_ms
+        self._retry_policy = retry_policy
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._workers: Optional[asyncio.Semaphore] = None
+        self._queues: Dict[TopicPartition, asyncio.Queue] = dict()
+        self._partition_tasks: Dict[TopicPartition, asyncio.Task] = dict()
+        self._paused: Set[TopicPartition] = set()
+        self._delayed: Set[TopicPartition] = set()
+        self._processed_offsets: Dict[TopicPartition, int] = dict()
+        self._committed_offsets: Dict[TopicPartition, int] = dict()
+
+        self._stop_requested = Event()
         self._receiver_thread = Thread(target=self.__between_callback)
         self._receiver_thread.daemon = True
 
-    async def _consume_messages(self):
+    def _decode(self, message: ConsumerRecord) -> Tuple[ConsumerRecord, Type[ConsumerEvent]]:
         """
-        Method for consuming messages from Kafka.
+        Decodes a fetched message and finds its event class.
+
+        Args:
+            message (ConsumerRecord): The message with the raw key and value.
+
+        Returns:
+            Tuple[ConsumerRecord, Type[ConsumerEvent]]: The decoded message and its event class.
+
+        Raises:
+            Exception: If the message can't be decoded, its headers are malformed or its event is unknown.
         """
 
-        for message in self._consumer:
-            logger.info(f'Received message: {message.key}, {message.value}')
+        message = decode_message(message)
+        event_name = get_event_name(message)
+        event_class = get_consumer_event_by_name(event_name, self._consumer_events)
 
-            event_class = get_consumer_event_by_name(message.key, self._consumer_events)
-            if not event_class:
-                logger.critical(f'Could not find event class for key: {message.key}')
-                continue
+        if event_class is None:
+            raise UnknownEventError(event_name)
+
+        # Headers of rerouted messages are read while they are processed
+        get_message_version(message)
+        RetryPolicy.get_delay(message)
+
+        return message, event_class
+
+    async def _handle_messages(self, event_class: Type[ConsumerEvent],
+                               messages: List[ConsumerRecord]) -> List[Tuple[ConsumerRecord, Exception]]:
+        """
+        Calls the action of the messages' event, or its batch action if there are several messages.
+
+        If the batch action fails, the messages are applied one by one, so a bad message doesn't fail the others.
+
+        Args:
+            event_class (Type[ConsumerEvent]): The event class of the messages.
+            messages (List[ConsumerRecord]): The decoded messages.
+
+        Returns:
+            List[Tuple[ConsumerRecord, Exception]]: The failed messages with their errors.
+        """
+
+        event_name = get_event_name(messages[0])
 
-            event = event_class(message.value)
-            uow = get_sqlalchemy_uow()
+        for message in messages:
+            logger.info(f'Received message: {event_name}, {message.key}, {message.value}')
 
+        if len(messages) > 1:
             try:
-                await event.action(uow)
+                events = [event_class(message.value, get_message_version(message)) for message in messages]
+                await event_class.action_batch(events, get_sqlalchemy_uow())
+                return list()
+            except Exception as e:
+                logger.error(f'Failed to process batch of {len(messages)} events {event_name}, '
+                             f'processing them one by one: {str(e)}')
+
+        failed = list()
+
+        for message in messages:
+            try:
+                event = event_class(message.value, get_message_version(message))
+                await event.action(get_sqlalchemy_uow())
             except AppError as e:
                 logger.critical(f'Critical error: {str(e)}')
+                failed.append((message, e))
+            except Exception as e:
+                logger.critical(f'Unexpected error while processing event {event_name}: {str(e)}')
+                failed.append((message, e))
+
+        return failed
+
+    async def _delay(self, partition: TopicPartition, delay: float):
+        """
+        Waits before processing of a partition continues.
+
+        A delayed partition is cancelled instead of awaited when it is released.
+
+        Args:
+            partition (TopicPartition): The partition.
+            delay (float): The time to wait in seconds.
+        """
+
+        self._delayed.add(partition)
+
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            self._delayed.discard(partition)
+
+    async def _reroute(self, partition: TopicPartition, message: ConsumerRecord, error: Exception):
+        """
+        Reroutes a failed message according to the retry policy, until it is delivered or the partition is released.
+
+        Args:
+            partition (TopicPartition): The partition of the message.
+            message (ConsumerRecord): The message.
+            error (Exception): The error of the message's processing.
+        """
+
+        while True:
+            try:
+                await asyncio.to_thread(self._retry_policy.reroute, message, error)
+                return
+            except Exception as e:
+                logger.error(f'Failed to reroute message {message.topic}:{message.partition}:{message.offset}: {e}')
+                await self._delay(partition, _REROUTE_INTERVAL)
+
+    async def _dead_letter(self, partition: TopicPartition, message: ConsumerRecord, error: Exception):
+        """
+        Dead letters a message which can't be decoded, until it is delivered or the partition is released.
+
+        Without a retry policy the message is skipped.
+
+        Args:
+            partition (TopicPartition): The partition of the message.
+            message (ConsumerRecord): The message with the raw key and value.
+            error (Exception): The error of the decoding.
+        """
+
+        logger.critical(f'Failed to decode message {message.topic}:{message.partition}:{message.offset}: {error}')
+
+        if not self._retry_policy:
+            return
+
+        while True:
+            try:
+                await asyncio.to_thread(self._retry_policy.dead_letter, message, error)
+                return
+            except Exception as e:
+                logger.error(f'Failed to dead letter message {message.topic}:{message.partition}:{message.offset}: '
+                             f'{e}')
+                await self._delay(partition, _REROUTE_INTERVAL)
+
+    async def _fill_batch(self, messages: List[ConsumerRecord], event_class: Type[ConsumerEvent],
+                          queue: asyncio.Queue):
+        """
+        Adds following messages of the same event from the queue to a batch.
+
+        Args:
+            messages (List[ConsumerRecord]): The decoded messages of the batch.
+            event_class (Type[ConsumerEvent]): The event class of the batch.
+            queue (asyncio.Queue): The queue of the partition's messages.
+
+        Returns:
+            The first taken item which doesn't belong to the batch or None. Messages are returned as they were
+            fetched, so the ones which can't be decoded are dead lettered by the caller.
+        """
+
+        deadline = self._loop.time() + self._batch_max_wait_ms / 1000
+
+        while len(messages) < self._batch_max_size:
+            try:
+                message = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                timeout = deadline - self._loop.time()
+
+                if timeout <= 0:
+                    return
+
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    return
+
+            if message is _RELEASED:
+                return message
+
+            try:
+                decoded_message, message_event_class = self._decode(message)
+            except Exception:
+                return message
+
+            if message_event_class is not event_class:
+                return message
+
+            messages.append(decoded_message)
+
+    async def _process_partition(self, partition: TopicPartition, queue: asyncio.Queue):
+        """
+        Processes messages of a partition in order until the partition is released.
+
+        Args:
+            partition (TopicPartition): The partition.
+            queue (asyncio.Queue): The queue of the partition's messages.
+        """
+
+        next_message = None
+
+        while True:
+            message = next_message if next_message is not None else await queue.get()
+            next_message = None
+
+            if message is _RELEASED:
+                return
+
+            try:
+                decoded_message, event_class = self._decode(message)
+            except Exception as e:
+                await self._dead_letter(partition, message, e)
+                self._processed_offsets[partition] = message.offset + 1
+                continue
+
+            messages = [decoded_message]
+
+            if event_class.supports_batch:
+                next_message = await self._fill_batch(messages, event_class, queue)
+
+            if self._retry_policy:
+                delay = self._retry_policy.get_delay(messages[-1])
+
+                if delay > 0:
+                    await self._delay(partition, delay)
+
+            async with self._workers:
+                failed = await self._handle_messages(event_class, messages)
+
+            if self._retry_policy:
+                for message, error in failed:
+                    await self._reroute(partition, message, error)
+
+            self._processed_offsets[partition] = messages[-1].offset + 1
+
+    def _enqueue(self, partition: TopicPartition, messages: Iterable[ConsumerRecord]):
+        """
+        Puts fetched messages into the queue of their partition.
+
+        Args:
+            partition (TopicPartition): The partition.
+            messages (Iterable[ConsumerRecord]): The messages.
+        """
+
+        queue = self._queues.get(partition)
+
+        if queue is None:
+            queue = self._queues[partition] = asyncio.Queue()
+            self._partition_tasks[partition] = asyncio.create_task(self._process_partition(partition, queue))
+
+        for message in messages:
+            queue.put_nowait(message)
+
+    async def _release_partitions(self, partitions: Iterable[TopicPartition]):
+        """
+        Drops queued messages of partitions and waits until their messages in progress are processed.
+
+        Dropped messages are fetched again by the next owner of the partitions from the committed offsets.
+        Delayed partitions are cancelled, their messages in progress are fetched again too.
+
+        Args:
+            partitions (Iterable[TopicPartition]): The partitions.
+        """
+
+        tasks = list()
+
+        for partition in partitions:
+            queue = self._queues.pop(partition, None)
+            task = self._partition_tasks.pop(partition, None)
+            self._paused.discard(partition)
+
+            if queue is None:
+                continue
+
+            while not queue.empty():
+                queue.get_nowait()
+
+            queue.put_nowait(_RELEASED)
+            tasks.append(task)
+
+            if partition in self._delayed:
+                task.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _commit_offsets(self, partitions: Optional[Iterable[TopicPartition]] = None):
+        """
+        Commits offsets of processed messages.
+
+        Args:
+            partitions (Optional[Iterable[TopicPartition]]): The partitions to commit, all partitions if None.
+        """
+
+        partitions = set(partitions) if partitions is not None else None
+
+        offsets = {partition: OffsetAndMetadata(offset, '')
+                   for partition, offset in list(self._processed_offsets.items())
+                   if (partitions is None or partition in partitions)
+                   and self._committed_offsets.get(partition) != offset}
+
+        if not offsets:
+            return
+
+        try:
+            self._consumer.commit(offsets)
+        except KafkaError as e:
+            logger.error(f'Failed to commit offsets: {e}')
+            return
+
+        self._committed_offsets.update({partition: metadata.offset for partition, metadata in offsets.items()})
+
+    def _on_partitions_revoked(self, revoked: Set[TopicPartition]):
+        """
+        Processes messages in progress of revoked partitions and commits their offsets.
+
+        It is called by KafkaConsumer during polling in the polling thread.
+
+        Args:
+            revoked (Set[TopicPartition]): The revoked partitions.
+        """
+
+        asyncio.run_coroutine_threadsafe(self._release_partitions(revoked), self._loop).result()
+
+        self._commit_offsets(revoked)
+
+        for partition in revoked:
+            self._processed_offsets.pop(partition, None)
+            self._committed_offsets.pop(partition, None)
+
+        logger.info(f"Revoked partitions: {', '.join(map(str, revoked))}")
+
+    def _poll(self, pause: List[TopicPartition],
+              resume: List[TopicPartition]) -> Dict[TopicPartition, List[ConsumerRecord]]:
+        """
+        Commits processed offsets, applies backpressure and fetches new messages.
+
+        Args:
+            pause (List[TopicPartition]): The partitions to pause.
+            resume (List[TopicPartition]): The partitions to resume.
+
+        Returns:
+            Dict[TopicPartition, List[ConsumerRecord]]: The fetched messages by partitions.
+        """
+
+        self._commit_offsets()
+
+        if pause:
+            self._consumer.pause(*pause)
+
+        if resume:
+            self._consumer.resume(*resume)
+
+        return self._consumer.poll(timeout_ms=self._poll_timeout_ms, max_records=self._max_poll_records)
+
+    def _get_backpressure(self) -> Tuple[List[TopicPartition], List[TopicPartition]]:
+        """
+        Returns partitions which must be paused because of full queues and partitions which can be resumed.
+
+        Returns:
+            Tuple[List[TopicPartition], List[TopicPartition]]: The partitions to pause and to resume.
+        """
+
+        pause = [partition for partition, queue in self._queues.items()
+                 if partition not in self._paused and queue.qsize() >= self._partition_queue_maxsize]
+
+        resume = [partition for partition in self._paused
+                  if partition not in self._queues
+                  or self._queues[partition].qsize() <= self._partition_queue_maxsize // 2]
+
+        self._paused.update(pause)
+        self._paused.difference_update(resume)
+
+        return pause, resume
+
+    async def _consume_messages(self):
+        """
+        Method for consuming messages from Kafka.
+        """
+
+        self._loop = asyncio.get_running_loop()
+        self._workers = asyncio.Semaphore(self._workers_count)
+
+        topics = self._consumer.subscription()
+
+        if topics:
+            if self._retry_policy:
+                topics = set(topics) | set(self._retry_policy.get_retry_topics(topics))
+
+            self._consumer.subscribe(topics=list(topics), listener=_RebalanceListener(self))
+
+        while not self._stop_requested.is_set():
+            pause, resume = self._get_backpressure()
+
+            try:
+                records = await asyncio.to_thread(self._poll, pause, resume)
+            except KafkaError as e:
+                logger.error(f'Failed to fetch messages: {e}')
+                await asyncio.sleep(self._poll_timeout_ms / 1000)
+                continue
+
+            for partition, messages in records.items():
+                self._enqueue(partition, messages)
+
+        await self._release_partitions(list(self._queues))
+        await asyncio.to_thread(self._commit_offsets)
+        await asyncio.to_thread(self._consumer.close, False)
 
     def __between_callback(self):
         """
@@ -66,8 +514,14 @@ class KafkaReceiver:
 
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
+        init_thread_engine()
 
-        loop.run_until_complete(self._consume_messages())
+        try:
+            loop.run_until_complete(self._consume_messages())
+        except Exception as e:
+            logger.critical(f'Receiver stopped by unexpected error: {e}')
+
+        loop.run_until_complete(dispose_thread_engine())
         loop.close()
 
     def start_receiving(self):
@@ -76,3 +530,16 @@ class KafkaReceiver:
         """
 
         self._receiver_thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stops fetching messages, waits for messages in progress, commits their offsets and closes the consumer.
+
+        Args:
+            timeout (Optional[float]): The maximum time to wait in seconds.
+        """
+
+        self._stop_requested.set()
+
+        if self._receiver_thread.is_alive():
+            self._receiver_thread.join(timeout)
@@ -36,3 +36,16 @@ class MenuItemRatingUpdatedSchema(BaseModel):
     id: int = Field(ge=0)
     rating: float
     reviews_count: int
+    # 0 for ratings published before they were versioned
+    version: int = Field(default=0, ge=0)
+
+
+class UserUpdatedSchema(BaseModel):
+    """
+    Schema class for output representation of an updated user.
+    """
+
+    id: int = Field(ge=0)
+    role: str
+    is_active: bool
+    is_email_verified: bool
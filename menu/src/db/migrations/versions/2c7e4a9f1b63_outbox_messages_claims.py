@@ -0,0 +1,29 @@
+"""outbox messages claims
+
+Revision ID: 2c7e4a9f1b63
+Revises: 8b5e2f7a9c31
+Create Date: 2026-10-18 10:12:37.604518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c7e4a9f1b63'
+down_revision: Union[str, None] = '8b5e2f7a9c31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('outbox_messages', sa.Column('claimed_until', sa.DateTime(), nullable=True))
+    op.create_index('ix_outbox_messages_topic_aggregate_id_id', 'outbox_messages',
+                    ['topic', 'aggregate_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_outbox_messages_topic_aggregate_id_id', table_name='outbox_messages')
+    op.drop_column('outbox_messages', 'claimed_until')
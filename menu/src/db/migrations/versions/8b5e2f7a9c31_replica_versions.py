@@ -0,0 +1,28 @@
+"""replica versions
+
+Revision ID: 8b5e2f7a9c31
+Revises: e3b6a0c94d17
+Create Date: 2026-10-17 18:04:27.513906
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b5e2f7a9c31'
+down_revision: Union[str, None] = 'e3b6a0c94d17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('restaurants', sa.Column('version', sa.BigInteger(), server_default='-1', nullable=False))
+    op.add_column('restaurant_managers', sa.Column('version', sa.BigInteger(), server_default='-1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('restaurant_managers', 'version')
+    op.drop_column('restaurants', 'version')
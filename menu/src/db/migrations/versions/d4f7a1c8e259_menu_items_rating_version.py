@@ -0,0 +1,26 @@
+"""menu items rating version
+
+Revision ID: d4f7a1c8e259
+Revises: 2c7e4a9f1b63
+Create Date: 2026-10-18 11:21:15.604921
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f7a1c8e259'
+down_revision: Union[str, None] = '2c7e4a9f1b63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('menu_items', sa.Column('rating_version', sa.BigInteger(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('menu_items', 'rating_version')
@@ -0,0 +1,28 @@
+"""outbox messages event name
+
+Revision ID: e3b6a0c94d17
+Revises: 5d1e8b7c3f20
+Create Date: 2026-10-17 16:12:40.318264
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b6a0c94d17'
+down_revision: Union[str, None] = '5d1e8b7c3f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column('outbox_messages', 'key', new_column_name='event_name',
+                    existing_type=sa.String(length=255), existing_nullable=False)
+
+
+def downgrade() -> None:
+    op.alter_column('outbox_messages', 'event_name', new_column_name='key',
+                    existing_type=sa.String(length=255), existing_nullable=False)
@@ -3,7 +3,7 @@ from typing import Optional
 from fastapi import Depends, Cookie
 
 from models import RestaurantManager
-from services import MenuItemService, MenuCategoryService, MenuService, RestaurantService
+from services import MenuItemService, MenuCategoryService, MenuService, RestaurantService, MysteryBagService
 from authentication import authenticate
 from uow import SqlAlchemyUnitOfWork
 from .uow import get_uow
@@ -12,7 +12,8 @@ __all__ = [
     'get_menu_item_service',
     'get_menu_category_service',
     'get_menu_service',
-    'get_restaurant_service'
+    'get_restaurant_service',
+    'get_mystery_bag_service',
 ]
 
 
@@ -90,3 +91,14 @@ async def get_restaurant_service(access_token: Optional[str] = Cookie(default=No
     if isinstance(user, RestaurantManager):
         return RestaurantService(restaurant_manager=user)
     return RestaurantService()
+
+
+async def get_mystery_bag_service() -> MysteryBagService:
+    """
+    Dependency for retrieving the mystery bag service.
+
+    Returns:
+        MysteryBagService: An instance of the MysteryBagService class.
+    """
+
+    return MysteryBagService()
@@ -0,0 +1,8 @@
+from config import get_settings
+from .flags import *
+from .index import *
+
+settings = get_settings()
+
+# Init discovery index
+mystery_bag_discovery_index = MysteryBagDiscoveryIndex(bucket_seconds=settings.mystery_bag_discovery_bucket_seconds)
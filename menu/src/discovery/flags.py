@@ -0,0 +1,80 @@
+from enum import IntFlag
+from typing import Iterable
+
+from models import MysteryBag
+
+__all__ = [
+    'DietaryFlag',
+    'DIETARY_FLAGS_FIELDS',
+    'get_dietary_mask',
+    'get_dietary_flag',
+]
+
+
+class DietaryFlag(IntFlag):
+    """
+    Bit flags of mystery bag dietary information.
+
+    Every flag corresponds to one boolean column of the `MysteryBag` model,
+    so the whole dietary summary of a mystery bag fits into a single byte.
+    """
+
+    VEGETARIAN = 1 << 0
+    JAIN = 1 << 1
+    VEGAN = 1 << 2
+    HALAL = 1 << 3
+    DAIRY = 1 << 4
+    NUTS = 1 << 5
+    GLUTEN = 1 << 6
+    ALCOHOL = 1 << 7
+
+
+DIETARY_FLAGS_FIELDS = {
+    DietaryFlag.VEGETARIAN: 'is_vegetarian',
+    DietaryFlag.JAIN: 'is_jain',
+    DietaryFlag.VEGAN: 'is_vegan',
+    DietaryFlag.HALAL: 'is_halal',
+    DietaryFlag.DAIRY: 'contains_dairy',
+    DietaryFlag.NUTS: 'contains_nuts',
+    DietaryFlag.GLUTEN: 'contains_gluten',
+    DietaryFlag.ALCOHOL: 'contains_alcohol',
+}
+
+
+def get_dietary_mask(mystery_bag: MysteryBag) -> int:
+    """
+    Packs dietary booleans of a mystery bag into a bitmask.
+
+    Args:
+        mystery_bag (MysteryBag): The mystery bag.
+
+    Returns:
+        int: The bitmask of `DietaryFlag` values.
+    """
+
+    mask = 0
+
+    for flag, field in DIETARY_FLAGS_FIELDS.items():
+        if getattr(mystery_bag, field):
+            mask |= flag
+
+    return mask
+
+
+def get_dietary_flag(names: Iterable[str]) -> DietaryFlag:
+    """
+    Combines dietary flags by their case-insensitive names, e.g. `["vegetarian", "jain"]`.
+
+    Args:
+        names (Iterable[str]): The names of flags.
+
+    Returns:
+        DietaryFlag: The combined flags.
+    """
+
+    flag = DietaryFlag(0)
+
+    for name in names:
+        flag |= DietaryFlag[name.upper()]
+
+    return flag
@@ -0,0 +1,320 @@
+from collections import defaultdict
+from datetime import datetime
+from threading import RLock
+from typing import Dict, Set, List, Iterable, Optional
+
+import numpy as np
+from loguru import logger
+
+from models import MysteryBag
+from .flags import DietaryFlag, get_dietary_mask
+
+__all__ = [
+    'MysteryBagDiscoveryIndex',
+]
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def to_timestamp(value: datetime) -> int:
+    """
+    Converts naive UTC datetime to the number of seconds since epoch.
+
+    Args:
+        value (datetime): The datetime.
+
+    Returns:
+        int: The timestamp.
+    """
+
+    return int((value - EPOCH).total_seconds())
+
+
+class MysteryBagDiscoveryIndex:
+    """
+    Process-local index of currently available mystery bags.
+
+    Mystery bags are stored column-wise in NumPy arrays, their dietary booleans are packed
+    into a single byte, so filter queries are answered with vectorized bitwise operations
+    instead of evaluating model properties row by row.
+
+    Mystery bags are bucketed by the end of their pickup window, so bags whose window has closed
+    are evicted by dropping whole buckets.
+
+    All methods are thread-safe, since the index is shared between the web application,
+    Kafka receivers and background jobs which run in separate threads.
+    """
+
+    def __init__(self, bucket_seconds: int = 3600, capacity: int = 1024):
+        """
+        Initializes a new instance of the MysteryBagDiscoveryIndex class.
+
+        Args:
+            bucket_seconds (int): The width of pickup window buckets in seconds.
+            capacity (int): The initial capacity of arrays.
+        """
+
+        self._bucket_seconds = bucket_seconds
+        self._lock = RLock()
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int):
+        """
+        Resets the index and allocates empty arrays.
+
+        Args:
+            capacity (int): The capacity of arrays.
+        """
+
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._restaurant_ids = np.zeros(capacity, dtype=np.int64)
+        self._masks = np.zeros(capacity, dtype=np.uint8)
+        self._pickup_starts = np.zeros(capacity, dtype=np.int64)
+        self._pickup_ends = np.zeros(capacity, dtype=np.int64)
+        self._available_quantities = np.zeros(capacity, dtype=np.int32)
+        self._alive = np.zeros(capacity, dtype=np.bool_)
+
+        self._slots: Dict[int, int] = dict()
+        self._free_slots: List[int] = list()
+        self._size = 0
+        self._buckets: Dict[int, Set[int]] = defaultdict(set)
+
+    def _grow(self):
+        """
+        Doubles the capacity of arrays.
+        """
+
+        capacity = max(len(self._ids) * 2, 1)
+
+        for name in ('_ids', '_restaurant_ids', '_masks', '_pickup_starts', '_pickup_ends',
+                     '_available_quantities', '_alive'):
+            array = getattr(self, name)
+            grown = np.zeros(capacity, dtype=array.dtype)
+            grown[:len(array)] = array
+            setattr(self, name, grown)
+
+    def _get_bucket(self, pickup_end: int) -> int:
+        return pickup_end // self._bucket_seconds
+
+    def _take_slot(self) -> int:
+        if self._free_slots:
+            return self._free_slots.pop()
+
+        if self._size == len(self._ids):
+            self._grow()
+
+        self._size += 1
+        return self._size - 1
+
+    def _remove(self, id: int) -> bool:
+        slot = self._slots.pop(id, None)
+
+        if slot is None:
+            return False
+
+        bucket = self._get_bucket(int(self._pickup_ends[slot]))
+        self._buckets[bucket].discard(id)
+        if not self._buckets[bucket]:
+            del self._buckets[bucket]
+
+        self._alive[slot] = False
+        self._free_slots.append(slot)
+        return True
+
+    def _upsert(self, mystery_bag: MysteryBag):
+        self._remove(mystery_bag.id)
+
+        if not mystery_bag.is_active:
+            return
+
+        slot = self._take_slot()
+        pickup_end = to_timestamp(mystery_bag.pickup_end_time)
+
+        self._ids[slot] = mystery_bag.id
+        self._restaurant_ids[slot] = mystery_bag.restaurant_id
+        self._masks[slot] = get_dietary_mask(mystery_bag)
+        self._pickup_starts[slot] = to_timestamp(mystery_bag.pickup_start_time)
+        self._pickup_ends[slot] = pickup_end
+        self._available_quantities[slot] = mystery_bag.available_quantity
+        self._alive[slot] = True
+
+        self._slots[mystery_bag.id] = slot
+        self._buckets[self._get_bucket(pickup_end)].add(mystery_bag.id)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, id: int) -> bool:
+        return id in self._slots
+
+    def rebuild(self, mystery_bags: Iterable[MysteryBag]):
+        """
+        Replaces the whole content of the index.
+
+        Args:
+            mystery_bags (Iterable[MysteryBag]): The mystery bags to index.
+        """
+
+        mystery_bags = list(mystery_bags)
+
+        with self._lock:
+            self._allocate(max(len(mystery_bags), 1024))
+
+            for mystery_bag in mystery_bags:
+                self._upsert(mystery_bag)
+
+        logger.info(f"Rebuilt discovery index with {len(mystery_bags)} MysteryBag(s)")
+
+    def upsert(self, mystery_bag: MysteryBag):
+        """
+        Adds or replaces a mystery bag in the index. Inactive mystery bags are removed.
+
+        Args:
+            mystery_bag (MysteryBag): The mystery bag.
+        """
+
+        with self._lock:
+            self._upsert(mystery_bag)
+
+    def upsert_many(self, mystery_bags: Iterable[MysteryBag]):
+        """
+        Adds or replaces many mystery bags in the index.
+
+        Args:
+            mystery_bags (Iterable[MysteryBag]): The mystery bags.
+        """
+
+        with self._lock:
+            for mystery_bag in mystery_bags:
+                self._upsert(mystery_bag)
+
+    def remove(self, id: int):
+        """
+        Removes a mystery bag from the index.
+
+        Args:
+            id (int): The ID of the mystery bag.
+        """
+
+        with self._lock:
+            self._remove(id)
+
+    def remove_restaurant(self, restaurant_id: int):
+        """
+        Removes all mystery bags of a restaurant from the index.
+
+        Args:
+            restaurant_id (int): The ID of the restaurant.
+        """
+
+        with self._lock:
+            matches = self._alive[:self._size] & (self._restaurant_ids[:self._size] == restaurant_id)
+
+            for id in self._ids[:self._size][matches].tolist():
+                self._remove(id)
+
+    def set_available_quantity(self, id: int, available_quantity: int):
+        """
+        Sets available quantity of an indexed mystery bag.
+
+        Args:
+            id (int): The ID of the mystery bag.
+            available_quantity (int): The available quantity.
+        """
+
+        with self._lock:
+            slot = self._slots.get(id)
+
+            if slot is not None:
+                self._available_quantities[slot] = available_quantity
+
+    def restock(self, quantities: Dict[int, int]):
+        """
+        Returns stock to indexed mystery bags or takes reserved stock from them.
+
+        Args:
+            quantities (Dict[int, int]): Mapping of mystery bag IDs to quantities to return,
+                negative for reserved quantities.
+        """
+
+        with self._lock:
+            for id, quantity in quantities.items():
+                slot = self._slots.get(id)
+
+                if slot is not None:
+                    self._available_quantities[slot] += quantity
+
+    def evict_expired(self, now: Optional[datetime] = None) -> int:
+        """
+        Removes mystery bags whose pickup window has closed.
+
+        Args:
+            now (Optional[datetime]): The current time. Default is current UTC time.
+
+        Returns:
+            int: The number of evicted mystery bags.
+        """
+
+        now = to_timestamp(now or datetime.utcnow())
+        current_bucket = self._get_bucket(now)
+        evicted = 0
+
+        with self._lock:
+            for bucket in [bucket for bucket in self._buckets if bucket <= current_bucket]:
+                for id in list(self._buckets.get(bucket, ())):
+                    if self._pickup_ends[self._slots[id]] < now:
+                        self._remove(id)
+                        evicted += 1
+
+        if evicted:
+            logger.debug(f"Evicted {evicted} expired MysteryBag(s) from discovery index")
+
+        return evicted
+
+    def search(self, include: DietaryFlag = DietaryFlag(0), exclude: DietaryFlag = DietaryFlag(0),
+               at: Optional[datetime] = None, restaurant_ids: Optional[Iterable[int]] = None,
+               limit: Optional[int] = None) -> np.ndarray:
+        """
+        Finds mystery bags available for pickup at the given moment.
+
+        Args:
+            include (DietaryFlag): Flags which mystery bags must have, e.g. `VEGETARIAN | JAIN`.
+            exclude (DietaryFlag): Flags which mystery bags must not have, e.g. `NUTS`.
+            at (Optional[datetime]): The pickup moment. Default is current UTC time.
+            restaurant_ids (Optional[Iterable[int]]): IDs of restaurants to search in. Default is all restaurants.
+            limit (Optional[int]): The maximum number of results. If given, results are ordered
+                by the end of their pickup window, otherwise the order is arbitrary.
+
+        Returns:
+            np.ndarray: IDs of found mystery bags.
+        """
+
+        at = to_timestamp(at or datetime.utcnow())
+        include, exclude = int(include), int(exclude)
+
+        with self._lock:
+            size = self._size
+
+            matches = self._available_quantities[:size] > 0
+            matches &= self._alive[:size]
+            matches &= self._pickup_starts[:size] <= at
+            matches &= self._pickup_ends[:size] >= at
+
+            # Required flags must be set and excluded flags must be unset in one comparison
+            if include or exclude:
+                matches &= (self._masks[:size] & (include | exclude)) == include
+
+            if restaurant_ids is not None:
+                matches &= np.isin(self._restaurant_ids[:size], np.fromiter(restaurant_ids, dtype=np.int64))
+
+            slots = np.flatnonzero(matches)
+
+            if limit is not None and limit < len(slots):
+                # Partial sort, only the soonest closing pickup windows are ordered
+                pickup_ends = self._pickup_ends[slots]
+                nearest = np.argpartition(pickup_ends, limit)[:limit]
+                slots = slots[nearest[np.argsort(pickup_ends[nearest], kind='stable')]]
+            elif limit is not None:
+                slots = slots[np.argsort(self._pickup_ends[slots], kind='stable')]
+
+            return self._ids[slots]
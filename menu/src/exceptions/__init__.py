@@ -5,3 +5,4 @@ from .menu import *
 from .restaurant import *
 from .manager import *
 from .permissions import *
+from .mystery_bag import *
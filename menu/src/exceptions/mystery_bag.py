@@ -0,0 +1,67 @@
+from models import MysteryBag, MysteryBagReservation
+from .base import AppError, DatabaseInstanceNotFoundError
+
+__all__ = [
+    'MysteryBagNotFoundWithIdError',
+    'MysteryBagSoldOutError',
+    'MysteryBagReservationNotFoundWithIdError',
+]
+
+
+class MysteryBagNotFoundWithIdError(DatabaseInstanceNotFoundError):
+    """
+    Exception class for mystery bag that was not found in the database by id.
+    """
+
+    def __init__(self, id: int):
+        """
+        Initialize the MysteryBagNotFoundWithIdError exception.
+
+        Args:
+            id (int): The ID of the mystery bag.
+        """
+
+        super().__init__('id', id, MysteryBag)
+
+
+class MysteryBagSoldOutError(AppError):
+    """
+    Exception class for mystery bag which has not enough stock or is not available for pickup.
+    """
+
+    def __init__(self, id: int, quantity: int):
+        """
+        Initialize the MysteryBagSoldOutError exception.
+
+        Args:
+            id (int): The ID of the mystery bag.
+            quantity (int): The requested quantity.
+        """
+
+        self._id = id
+        self._quantity = quantity
+        super().__init__()
+
+    @property
+    def status_code(self) -> int:
+        return 409
+
+    @property
+    def message(self) -> str:
+        return f"MysteryBag with id={self._id} has not got {self._quantity} item(s) available"
+
+
+class MysteryBagReservationNotFoundWithIdError(DatabaseInstanceNotFoundError):
+    """
+    Exception class for active mystery bag reservation that was not found in the database by id.
+    """
+
+    def __init__(self, id: int):
+        """
+        Initialize the MysteryBagReservationNotFoundWithIdError exception.
+
+        Args:
+            id (int): The ID of the mystery bag reservation.
+        """
+
+        super().__init__('id', id, MysteryBagReservation)
@@ -1,7 +1,21 @@
 from config import get_settings
-from .roles_client import RolesClient
+from .roles_client import *
+from .roles_cache import *
+from .roles_verifier import *
 
 settings = get_settings()
 
-grpc_roles_client = RolesClient(host=settings.roles_grpc_server_host,
-                                port=settings.roles_grpc_server_port)
+grpc_roles_client = CachedRolesClient(RolesClient(host=settings.roles_grpc_server_host,
+                                                  port=settings.roles_grpc_server_port,
+                                                  timeout=settings.roles_grpc_timeout_seconds),
+                                      maxsize=settings.roles_cache_maxsize,
+                                      ttl=settings.roles_cache_ttl_seconds,
+                                      negative_ttl=settings.roles_cache_negative_ttl_seconds)
+
+if settings.jwt_local_verification:
+    grpc_roles_client = LocalRolesClient(grpc_roles_client,
+                                         algorithm=settings.jwt_algorithm,
+                                         verifying_key=settings.jwt_verifying_key,
+                                         jwks_file=settings.jwt_jwks_file,
+                                         leeway=settings.jwt_leeway_seconds,
+                                         max_token_lifetime=settings.jwt_access_token_lifetime_seconds)
@@ -1,7 +1,8 @@
+from google.protobuf.internal import containers as _containers
 from google.protobuf.internal import enum_type_wrapper as _enum_type_wrapper
 from google.protobuf import descriptor as _descriptor
 from google.protobuf import message as _message
-from typing import ClassVar as _ClassVar, Optional as _Optional, Union as _Union
+from typing import ClassVar as _ClassVar, Iterable as _Iterable, Mapping as _Mapping, Optional as _Optional, Union as _Union
 
 DESCRIPTOR: _descriptor.FileDescriptor
 
@@ -31,3 +32,27 @@ class GetUserRoleResponse(_message.Message):
     user_id: str
     role: UserRole
     def __init__(self, user_id: _Optional[str] = ..., role: _Optional[_Union[UserRole, str]] = ...) -> None: ...
+
+class GetUserRolesRequest(_message.Message):
+    __slots__ = ["access_tokens"]
+    ACCESS_TOKENS_FIELD_NUMBER: _ClassVar[int]
+    access_tokens: _containers.RepeatedScalarFieldContainer[str]
+    def __init__(self, access_tokens: _Optional[_Iterable[str]] = ...) -> None: ...
+
+class UserRoleResult(_message.Message):
+    __slots__ = ["user_id", "role", "status_code", "details"]
+    USER_ID_FIELD_NUMBER: _ClassVar[int]
+    ROLE_FIELD_NUMBER: _ClassVar[int]
+    STATUS_CODE_FIELD_NUMBER: _ClassVar[int]
+    DETAILS_FIELD_NUMBER: _ClassVar[int]
+    user_id: str
+    role: UserRole
+    status_code: int
+    details: str
+    def __init__(self, user_id: _Optional[str] = ..., role: _Optional[_Union[UserRole, str]] = ..., status_code: _Optional[int] = ..., details: _Optional[str] = ...) -> None: ...
+
+class GetUserRolesResponse(_message.Message):
+    __slots__ = ["results"]
+    RESULTS_FIELD_NUMBER: _ClassVar[int]
+    results: _containers.RepeatedCompositeFieldContainer[UserRoleResult]
+    def __init__(self, results: _Optional[_Iterable[_Union[UserRoleResult, _Mapping]]] = ...) -> None: ...
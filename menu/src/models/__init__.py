@@ -6,10 +6,12 @@ from .category import MenuCategory
 from .item import MenuItem
 from .restaurant import Restaurant
 from .manager import RestaurantManager
-from .mystery_bag import MysteryBag, MysteryBagReview, MysteryBagTemplate
+from .mystery_bag import MysteryBag, MysteryBagReservation, MysteryBagReview, MysteryBagTemplate
+from .outbox import OutboxMessage
 
 __all__ = [
     'Base', 'CustomBase', 'Menu', 'MenuCategory', 'MenuItem', 
     'Restaurant', 'RestaurantManager',
-    'MysteryBag', 'MysteryBagReview', 'MysteryBagTemplate'
+    'MysteryBag', 'MysteryBagReservation', 'MysteryBagReview', 'MysteryBagTemplate',
+    'OutboxMessage'
 ]
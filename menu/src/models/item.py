@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Float, Boolean, Text, JSON
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey, Float, Boolean, Text, JSON
 from sqlalchemy.orm import relationship
 
 from .base import CustomBase
@@ -14,6 +14,8 @@ class MenuItem(CustomBase):
 
     rating = Column(Float(decimal_return_scale=2), nullable=True)
     reviews_count = Column(Integer, nullable=False, default=0)
+    # Version of the rating aggregates in the review service, older ratings are dropped
+    rating_version = Column(BigInteger, nullable=False, default=0, server_default='0')
 
     restaurant_id = Column(Integer, ForeignKey('restaurants.id', name='fk_restaurant_id'), nullable=False)
     
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy import Column, BigInteger, Integer, ForeignKey
 from sqlalchemy.orm import relationship
 
 from .base import CustomBase
@@ -11,4 +11,7 @@ class RestaurantManager(CustomBase):
 
     restaurant_id = Column(Integer, ForeignKey('restaurants.id', name='fk_restaurant_id'), unique=True)
 
+    # Offset of the Kafka message which has last written the replica
+    version = Column(BigInteger, nullable=False, default=-1, server_default='-1')
+
     restaurant = relationship("Restaurant", uselist=False)
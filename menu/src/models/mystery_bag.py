@@ -144,6 +144,38 @@ class MysteryBag(CustomBase):
         return f"{self.title} - ₹{self.selling_price_inr} (Save ₹{self.savings_inr})"
 
 
+class MysteryBagReservation(CustomBase):
+    """
+    Temporary hold on mystery bag stock placed by a customer.
+
+    Stock is taken from `MysteryBag.available_quantity` when the reservation is created.
+    Unconfirmed reservations expire after `expires_at` and their quantity is returned to the bag
+    by the periodic release job.
+    """
+    __tablename__ = 'mystery_bag_reservations'
+
+    mystery_bag_id = Column(Integer, ForeignKey('mystery_bags.id', name='fk_mystery_bag_id',
+                                                ondelete="CASCADE"), nullable=False, index=True)
+    customer_id = Column(Integer, nullable=False)  # Reference to customer from user-management service
+
+    quantity = Column(Integer, nullable=False, default=1)
+
+    expires_at = Column(DateTime, nullable=False, index=True)  # Hold is released after this moment
+    is_confirmed = Column(Boolean, nullable=False, default=False)  # Confirmed holds never expire
+    created_at = Column(DateTime, default=func.now())
+
+    # Relationships
+    mystery_bag = relationship("MysteryBag", uselist=False)
+
+    @property
+    def is_expired(self):
+        """Check if reservation hold has expired"""
+        return not self.is_confirmed and self.expires_at < datetime.utcnow()
+
+    def __str__(self):
+        return f"Reservation of {self.quantity} for MysteryBag {self.mystery_bag_id}"
+
+
 class MysteryBagReview(CustomBase):
     """
     Reviews and ratings for mystery bags to help customers make informed decisions.
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Boolean, ForeignKey
+from sqlalchemy import Column, BigInteger, Integer, Boolean, ForeignKey
 
 from .base import CustomBase
 
@@ -11,5 +11,8 @@ class Restaurant(CustomBase):
 
     current_menu_id = Column(Integer, ForeignKey('menus.id', name='fk_current_menu_id', use_alter=True), unique=True)
 
+    # Offset of the Kafka message which has last written the replica
+    version = Column(BigInteger, nullable=False, default=-1, server_default='-1')
+
     def __str__(self):
         return str(self.id)
@@ -0,0 +1,4 @@
+from .notifier import *
+
+# Init outbox notifier
+outbox_notifier = OutboxNotifier()
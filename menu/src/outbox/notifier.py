@@ -0,0 +1,58 @@
+import asyncio
+from threading import Lock
+from typing import Optional
+
+__all__ = [
+    "OutboxNotifier",
+]
+
+
+class OutboxNotifier(object):
+    """
+    Wakes up the outbox relay when new messages are committed.
+
+    The relay waits in its own thread's event loop, while messages are committed from the web application
+    and other threads, so `notify` can be called from any thread.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._event: Optional[asyncio.Event] = None
+
+    def notify(self):
+        """
+        Wakes up the waiting relay.
+        """
+
+        with self._lock:
+            loop, event = self._loop, self._event
+
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(event.set)
+
+    async def wait(self, timeout: float) -> bool:
+        """
+        Waits until new messages are committed or the timeout expires.
+
+        Args:
+            timeout (float): The maximum time to wait in seconds.
+
+        Returns:
+            bool: True if the relay was notified.
+        """
+
+        with self._lock:
+            if self._loop is not asyncio.get_running_loop():
+                self._loop = asyncio.get_running_loop()
+                self._event = asyncio.Event()
+
+            event = self._event
+
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            event.clear()
@@ -0,0 +1,195 @@
+import json
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Union
+
+from kafka.serializer import Deserializer, Serializer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+__all__ = [
+    "Codec",
+    "JsonCodec",
+    "MsgpackCodec",
+    "get_codec",
+    "decode_value",
+    "TopicCodecSerializer",
+    "CodecDeserializer",
+]
+
+# First bytes of MessagePack maps: fixmap, map 16 and map 32
+_MSGPACK_MAP_PREFIXES = frozenset(range(0x80, 0x90)) | {0xde, 0xdf}
+
+
+class Codec(ABC):
+    """
+    Base class for encoding values of Kafka messages.
+
+    Attributes:
+        name (str): The name of the codec used in settings.
+    """
+
+    name: str
+
+    @abstractmethod
+    def encode(self, value: dict) -> bytes:
+        """
+        Encodes the value of a message.
+
+        Args:
+            value (dict): The value.
+
+        Returns:
+            bytes: The encoded value.
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def decode(self, data: bytes) -> dict:
+        """
+        Decodes the value of a message.
+
+        Args:
+            data (bytes): The encoded value.
+
+        Returns:
+            dict: The value.
+        """
+
+        raise NotImplementedError
+
+
+class JsonCodec(Codec):
+    """
+    JSON codec, understood by all services. It uses orjson if it is installed.
+    """
+
+    name = 'json'
+
+    def encode(self, value: dict) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(value)
+
+        return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+    def decode(self, data: bytes) -> dict:
+        if orjson is not None:
+            return orjson.loads(data)
+
+        return json.loads(data)
+
+
+class MsgpackCodec(Codec):
+    """
+    MessagePack codec, which produces smaller values than JSON.
+
+    It must only be used for topics whose consumers decode values with `decode_value`.
+    """
+
+    name = 'msgpack'
+
+    def __init__(self):
+        if msgpack is None:
+            raise ImportError("msgpack is required for the msgpack codec")
+
+    def encode(self, value: dict) -> bytes:
+        return msgpack.packb(value)
+
+    def decode(self, data: bytes) -> dict:
+        return msgpack.unpackb(data)
+
+
+_codecs: Dict[str, Codec] = dict()
+
+
+def get_codec(name: str) -> Codec:
+    """
+    Returns the codec by name.
+
+    Args:
+        name (str): The name of the codec: json or msgpack.
+
+    Returns:
+        Codec: The codec.
+
+    Raises:
+        ValueError: If there is no codec with the name.
+    """
+
+    if name not in _codecs:
+        codec_class = next((codec_class for codec_class in (JsonCodec, MsgpackCodec) if codec_class.name == name),
+                           None)
+
+        if codec_class is None:
+            raise ValueError(f"Unknown codec: {name}")
+
+        _codecs[name] = codec_class()
+
+    return _codecs[name]
+
+
+def decode_value(data: Optional[bytes]) -> Optional[dict]:
+    """
+    Decodes the value of a message encoded by any codec.
+
+    Values are objects, so the codec is recognized by the first byte: JSON objects start with a brace
+    or whitespace and MessagePack maps start with their own prefixes. Thus messages of services,
+    which only produce JSON, don't need any header.
+
+    Args:
+        data (Optional[bytes]): The encoded value.
+
+    Returns:
+        Optional[dict]: The value or None for tombstones.
+    """
+
+    if data is None:
+        return None
+
+    if data and data[0] in _MSGPACK_MAP_PREFIXES:
+        return get_codec(MsgpackCodec.name).decode(data)
+
+    return get_codec(JsonCodec.name).decode(data)
+
+
+class TopicCodecSerializer(Serializer):
+    """
+    Serializer of message values for KafkaProducer, which encodes them with the codec of their topic.
+
+    Values which are already encoded, like republished messages fetched as raw bytes, are sent as they are.
+    """
+
+    def __init__(self, topics_codecs: Optional[Dict[str, str]] = None, default_codec: str = JsonCodec.name):
+        """
+        Constructor for the TopicCodecSerializer class.
+
+        Args:
+            topics_codecs (Optional[Dict[str, str]]): The names of codecs by topics.
+            default_codec (str): The name of the codec of other topics.
+        """
+
+        self._topics_codecs = {topic: get_codec(name) for topic, name in (topics_codecs or {}).items()}
+        self._default_codec = get_codec(default_codec)
+
+    def serialize(self, topic: str, value: Optional[Union[dict, bytes]]) -> Optional[bytes]:
+        if value is None or isinstance(value, bytes):
+            return value
+
+        return self._topics_codecs.get(topic, self._default_codec).encode(value)
+
+
+class CodecDeserializer(Deserializer):
+    """
+    Deserializer of message values for KafkaConsumer, which decodes values encoded by any codec.
+    """
+
+    def deserialize(self, topic: str, bytes_: Optional[bytes]) -> Optional[dict]:
+        return decode_value(bytes_)
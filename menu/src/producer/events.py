@@ -1,5 +1,8 @@
+import json
+import zlib
 from abc import ABC
-from typing import List, Set, TypeVar, Type, Iterable, Dict
+from functools import lru_cache
+from typing import List, Set, Tuple, TypeVar, Type, Iterable, Dict, Optional
 
 from pydantic import BaseModel
 
@@ -7,10 +10,50 @@ from pydantic import BaseModel
 __all__ = [
     "ProducerEvent",
     "MenuItemCreatedEvent",
+    "get_schema_id",
+    "get_event_schema_id",
 ]
 
 BaseEventSchema = TypeVar("BaseEventSchema", bound=BaseModel)
 
+# IDs of schemas of events' data by event names and topics, filled when schemas are registered
+_events_schemas_ids: Dict[Tuple[str, str], str] = dict()
+
+
+@lru_cache
+def get_schema_id(schema: Type[BaseModel]) -> str:
+    """
+    Returns the compact ID of a schema: eight hex digits of the CRC32 of its JSON schema.
+
+    The ID changes whenever a field, its type or constraints change, so consumers can tell
+    which version of a schema a message was produced with.
+
+    Args:
+        schema (Type[BaseModel]): The schema.
+
+    Returns:
+        str: The ID of the schema.
+    """
+
+    json_schema = json.dumps(schema.model_json_schema(), sort_keys=True, separators=(',', ':'))
+
+    return f"{zlib.crc32(json_schema.encode('utf-8')):08x}"
+
+
+def get_event_schema_id(event_name: str, topic: str) -> Optional[str]:
+    """
+    Returns the ID of the schema of an event's data published to a topic.
+
+    Args:
+        event_name (str): The name of the event.
+        topic (str): The topic.
+
+    Returns:
+        Optional[str]: The ID of the schema or None if the schema isn't registered.
+    """
+
+    return _events_schemas_ids.get((event_name, topic))
+
 
 class ProducerEvent(ABC):
     """
@@ -21,9 +64,11 @@ class ProducerEvent(ABC):
     Attributes:
         _topics_schemas (Dict[str, Type[BaseEventSchema]]): Dictionary of topics to which the event's data
         will be published and associated schemas with them.
+        _aggregate_id_field (str): Name of the data field with ID of the entity the event is about.
     """
 
     _topics_schemas: Dict[str, Type[BaseEventSchema]]
+    _aggregate_id_field: str = 'id'
 
     def __init__(self, **data):
         """
@@ -34,12 +79,14 @@ class ProducerEvent(ABC):
         """
 
         self._data = data
+        self._serialized_data: Dict[Type[BaseEventSchema], dict] = dict()
 
     def get_data(self, topic: str) -> dict:
         """
         Data to be published.
 
-        Data is serialized according to the topic's schema.
+        Data is serialized according to the topic's schema. Every schema is applied once,
+        so topics sharing a schema get the same dictionary, which must not be modified.
 
         Args:
             topic (str): The topic to which the data will be published.
@@ -48,18 +95,44 @@ class ProducerEvent(ABC):
             dict: Data to be published.
         """
 
-        return self._topics_schemas.get(topic)(**self._data).model_dump()
+        schema = self._topics_schemas.get(topic)
+        data = self._serialized_data.get(schema)
+
+        if data is None:
+            data = self._serialized_data[schema] = schema.model_validate(self._data).model_dump()
+
+        return data
+
+    def get_aggregate_id(self) -> Optional[str]:
+        """
+        ID of the entity the event is about.
+
+        Events of the same entity are published in the order they were created.
+
+        Returns:
+            Optional[str]: The ID or None if the data has no such field.
+        """
+
+        aggregate_id = self._data.get(self._aggregate_id_field)
+
+        return str(aggregate_id) if aggregate_id is not None else None
 
     @classmethod
     def extend_topics_schemas(cls, topics_schemas: Dict[str, Type[BaseEventSchema]]):
         """
         Extends the set of topics to which the event's data will be published.
 
+        Schemas are built and their IDs are computed here, so publishing doesn't pay for it.
+
         Args:
             topics_schemas (Dict[str, Type[BaseEventSchema]]): Dictionary of topics to which the event's data
             will be published and associated schemas with them.
         """
 
+        for topic, schema in topics_schemas.items():
+            schema.model_rebuild()
+            _events_schemas_ids[(cls.get_event_name(), topic)] = get_schema_id(schema)
+
         cls._topics_schemas.update(topics_schemas)
 
     @classmethod
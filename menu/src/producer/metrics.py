@@ -0,0 +1,75 @@
+import time
+from threading import Lock
+from typing import Any, Dict
+
+__all__ = [
+    'PublisherMetrics',
+]
+
+
+class PublisherMetrics(object):
+    """
+    Delivery metrics of a publisher.
+
+    Counters are updated from the request handlers, the sender thread and the Kafka producer's I/O thread.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._enqueued = 0
+        self._dropped = 0
+        self._sent = 0
+        self._delivered = 0
+        self._failed = 0
+        self._delivery_time_total = 0.0
+        self._delivery_time_max = 0.0
+
+    def record_enqueued(self):
+        with self._lock:
+            self._enqueued += 1
+
+    def record_dropped(self):
+        with self._lock:
+            self._dropped += 1
+
+    def record_sent(self):
+        with self._lock:
+            self._sent += 1
+
+    def record_delivered(self, sent_at: float):
+        """
+        Records a message acknowledged by Kafka.
+
+        Args:
+            sent_at (float): The `time.monotonic()` value when the message was handed to the producer.
+        """
+
+        delivery_time = time.monotonic() - sent_at
+
+        with self._lock:
+            self._delivered += 1
+            self._delivery_time_total += delivery_time
+            self._delivery_time_max = max(self._delivery_time_max, delivery_time)
+
+    def record_failed(self):
+        with self._lock:
+            self._failed += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns current values of the metrics.
+
+        Returns:
+            Dict[str, Any]: The metrics by their names.
+        """
+
+        with self._lock:
+            return {
+                "enqueued": self._enqueued,
+                "dropped": self._dropped,
+                "sent": self._sent,
+                "delivered": self._delivered,
+                "failed": self._failed,
+                "delivery_time_avg_seconds": self._delivery_time_total / self._delivered if self._delivered else 0.0,
+                "delivery_time_max_seconds": self._delivery_time_max,
+            }
@@ -4,3 +4,5 @@ from .category import *
 from .menu import *
 from .restaurant import *
 from .manager import *
+from .mystery_bag import *
+from .outbox import *
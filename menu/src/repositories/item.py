@@ -1,6 +1,6 @@
 from typing import List
 
-from sqlalchemy import Select, select
+from sqlalchemy import Select, Update, select, update, bindparam
 from loguru import logger
 
 from models import MenuItem
@@ -60,3 +60,69 @@ class MenuItemRepository(SQLAlchemyRepository[MenuItem]):
         logger.debug(f"Retrieved list of MenuItem for restaurant with id={restaurant_id}")
 
         return result
+
+    def _get_update_ratings_stmt(self, **kwargs) -> Update:
+        """
+        Create an UPDATE statement for ratings of menu items, executed once per menu item.
+
+        A rating is only written if its version isn't older than the stored one, because ratings of a menu item
+        published by different processes of the review service may be received out of order.
+
+        Args:
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Update: The UPDATE statement.
+        """
+
+        table = MenuItem.__table__
+
+        return update(table) \
+            .where(table.c.id == bindparam('item_id'), table.c.rating_version <= bindparam('item_version')) \
+            .values(rating=bindparam('item_rating'), reviews_count=bindparam('item_reviews_count'),
+                    rating_version=bindparam('item_version'))
+
+    def _get_list_items_restaurant_ids_stmt(self, ids: List[int], **kwargs) -> Select:
+        """
+        Create a SELECT statement to retrieve IDs of restaurants which menu items belong to.
+
+        Args:
+            ids (List[int]): The IDs of the menu items.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Select: The SELECT statement.
+        """
+
+        return select(MenuItem.restaurant_id).where(MenuItem.id.in_(ids)).distinct()
+
+    async def update_ratings(self, ratings: List[dict], **kwargs) -> List[int]:
+        """
+        Update ratings of menu items in a single executemany statement.
+
+        Menu items which don't exist and ratings older than the stored ones are skipped.
+
+        Args:
+            ratings (List[dict]): The ID, rating, reviews count and version of every menu item.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            List[int]: The IDs of restaurants which updated menu items belong to.
+        """
+
+        if not ratings:
+            return []
+
+        stmt = self._get_update_ratings_stmt(**kwargs)
+        await self._session.execute(stmt, [{'item_id': rating['id'],
+                                            'item_rating': rating['rating'],
+                                            'item_reviews_count': rating['reviews_count'],
+                                            'item_version': rating['version']}
+                                           for rating in ratings])
+
+        stmt = self._get_list_items_restaurant_ids_stmt([rating['id'] for rating in ratings], **kwargs)
+        result = await self._session.execute(stmt)
+
+        logger.debug(f"Updated ratings of {len(ratings)} MenuItem(s)")
+
+        return list(result.scalars().all())
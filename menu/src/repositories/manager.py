@@ -1,15 +1,58 @@
+from typing import Dict
+
+from loguru import logger
+from sqlalchemy import Update, update, bindparam
+
 from models import RestaurantManager
 
-from .generic import SQLAlchemyRepository
+from .generic import SQLAlchemyReplicaRepository
 
 __all__ = [
     'RestaurantManagerRepository',
 ]
 
 
-class RestaurantManagerRepository(SQLAlchemyRepository[RestaurantManager]):
+class RestaurantManagerRepository(SQLAlchemyReplicaRepository[RestaurantManager]):
     """
     Repository for RestaurantManager model operations.
     """
 
     model = RestaurantManager
+
+    def _get_set_restaurant_stmt(self, **kwargs) -> Update:
+        """
+        Create an UPDATE statement which sets a restaurant to a restaurant manager.
+
+        The statement is parametrized with `b_id` and `b_restaurant_id` bind parameters,
+        so it can be executed for many restaurant managers at once.
+
+        Args:
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Update: The UPDATE statement.
+        """
+
+        table = RestaurantManager.__table__
+
+        return update(table) \
+            .where(table.c.id == bindparam('b_id')) \
+            .values(restaurant_id=bindparam('b_restaurant_id'))
+
+    async def set_restaurants(self, restaurants: Dict[int, int], **kwargs):
+        """
+        Set restaurants to restaurant managers in bulk.
+
+        Args:
+            restaurants (Dict[int, int]): Mapping of restaurant manager IDs to restaurant IDs.
+            **kwargs: Additional keyword arguments.
+        """
+
+        if not restaurants:
+            return
+
+        stmt = self._get_set_restaurant_stmt(**kwargs)
+        await self._session.execute(stmt, [{'b_id': id, 'b_restaurant_id': restaurant_id}
+                                           for id, restaurant_id in restaurants.items()])
+
+        logger.debug(f"Set restaurants to {len(restaurants)} RestaurantManager(s)")
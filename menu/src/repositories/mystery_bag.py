@@ -0,0 +1,317 @@
+from datetime import datetime
+from typing import Optional, List, Dict, Tuple
+
+from sqlalchemy import Select, Update, Delete, select, update, delete, bindparam
+from loguru import logger
+
+from models import MysteryBag, MysteryBagReservation, Restaurant
+from .generic import SQLAlchemyRepository
+
+__all__ = [
+    'MysteryBagRepository',
+    'MysteryBagReservationRepository',
+]
+
+
+class MysteryBagRepository(SQLAlchemyRepository[MysteryBag]):
+    """
+    Repository for MysteryBag model operations.
+    """
+
+    model = MysteryBag
+
+    def _get_reserve_stmt(self, id: int, quantity: int, now: datetime, **kwargs) -> Update:
+        """
+        Create a conditional UPDATE statement which takes stock from a mystery bag.
+
+        The statement only matches the row if the mystery bag is active, its pickup window has not
+        closed yet and it has enough stock, so the check and the decrement happen atomically
+        inside the database.
+
+        Args:
+            id (int): The ID of the mystery bag.
+            quantity (int): The quantity to take.
+            now (datetime): The current time.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Update: The UPDATE statement returning the remaining available quantity.
+        """
+
+        return update(MysteryBag) \
+            .where(MysteryBag.id == id,
+                   MysteryBag.is_active,
+                   MysteryBag.pickup_end_time > now,
+                   MysteryBag.available_quantity >= quantity) \
+            .values(available_quantity=MysteryBag.available_quantity - quantity) \
+            .returning(MysteryBag.available_quantity)
+
+    def _get_restock_stmt(self, **kwargs) -> Update:
+        """
+        Create an UPDATE statement which returns stock to a mystery bag.
+
+        The statement is parametrized with `b_id` and `b_quantity` bind parameters,
+        so it can be executed for many mystery bags at once.
+
+        Args:
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Update: The UPDATE statement.
+        """
+
+        return update(MysteryBag.__table__) \
+            .where(MysteryBag.__table__.c.id == bindparam('b_id')) \
+            .values(available_quantity=MysteryBag.__table__.c.available_quantity + bindparam('b_quantity'))
+
+    def _get_list_available_stmt(self, now: datetime, restaurant_id: Optional[int] = None, **kwargs) -> Select:
+        """
+        Create a SELECT statement to retrieve active mystery bags of active restaurants
+        whose pickup window has not closed yet.
+
+        Args:
+            now (datetime): The current time.
+            restaurant_id (Optional[int]): The ID of the restaurant to filter by. Default is all restaurants.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Select: The SELECT statement.
+        """
+
+        stmt = select(MysteryBag) \
+            .join(Restaurant, Restaurant.id == MysteryBag.restaurant_id) \
+            .where(MysteryBag.is_active,
+                   Restaurant.is_active,
+                   MysteryBag.pickup_end_time > now)
+
+        if restaurant_id is not None:
+            stmt = stmt.where(MysteryBag.restaurant_id == restaurant_id)
+
+        return stmt
+
+    async def list_by_ids(self, ids: List[int], **kwargs) -> List[MysteryBag]:
+        """
+        Retrieve mystery bags by their IDs.
+
+        Args:
+            ids (List[int]): The IDs of mystery bags.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            List[MysteryBag]: List of found mystery bags in arbitrary order.
+        """
+
+        if not ids:
+            return []
+
+        stmt = select(MysteryBag).where(MysteryBag.id.in_(ids))
+
+        result = await self._session.execute(stmt)
+        result = [r[0] for r in result.fetchall()]
+
+        logger.debug(f"Retrieved list of {len(result)} MysteryBag(s) by ids")
+
+        return result
+
+    async def list_available(self, now: Optional[datetime] = None, restaurant_id: Optional[int] = None,
+                             **kwargs) -> List[MysteryBag]:
+        """
+        Retrieve active mystery bags of active restaurants whose pickup window has not closed yet.
+
+        Args:
+            now (Optional[datetime]): The current time. Default is current UTC time.
+            restaurant_id (Optional[int]): The ID of the restaurant to filter by. Default is all restaurants.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            List[MysteryBag]: List of mystery bags.
+        """
+
+        now = now or datetime.utcnow()
+        stmt = self._get_list_available_stmt(now=now, restaurant_id=restaurant_id, **kwargs)
+
+        result = await self._session.execute(stmt)
+        result = [r[0] for r in result.fetchall()]
+
+        logger.debug(f"Retrieved list of {len(result)} available MysteryBag(s)")
+
+        return result
+
+    async def reserve(self, id: int, quantity: int, now: Optional[datetime] = None, **kwargs) -> Optional[int]:
+        """
+        Take stock from a mystery bag with a single conditional decrement.
+
+        Args:
+            id (int): The ID of the mystery bag.
+            quantity (int): The quantity to take.
+            now (Optional[datetime]): The current time. Default is current UTC time.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Optional[int]: The remaining available quantity or None if the mystery bag
+                is not found, not available or has not enough stock.
+        """
+
+        now = now or datetime.utcnow()
+        stmt = self._get_reserve_stmt(id=id, quantity=quantity, now=now, **kwargs)
+
+        result = await self._session.execute(stmt)
+        result = result.scalar_one_or_none()
+
+        if result is not None:
+            logger.debug(f"Reserved {quantity} of MysteryBag with id={id}, {result} left")
+            return result
+
+        logger.warning(f"Requested to reserve {quantity} of MysteryBag with id={id} but it is not available")
+
+    async def restock(self, quantities: Dict[int, int], **kwargs):
+        """
+        Return stock to mystery bags in bulk.
+
+        Args:
+            quantities (Dict[int, int]): Mapping of mystery bag IDs to quantities to return.
+            **kwargs: Additional keyword arguments.
+        """
+
+        if not quantities:
+            return
+
+        stmt = self._get_restock_stmt(**kwargs)
+        await self._session.execute(stmt, [{'b_id': id, 'b_quantity': quantity}
+                                           for id, quantity in quantities.items()])
+
+        logger.debug(f"Restocked {len(quantities)} MysteryBag(s)")
+
+
+class MysteryBagReservationRepository(SQLAlchemyRepository[MysteryBagReservation]):
+    """
+    Repository for MysteryBagReservation model operations.
+    """
+
+    model = MysteryBagReservation
+
+    def _get_confirm_stmt(self, id: int, now: datetime, **kwargs) -> Update:
+        """
+        Create an UPDATE statement to confirm a reservation which has not expired yet.
+
+        Args:
+            id (int): The ID of the reservation.
+            now (datetime): The current time.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Update: The UPDATE statement.
+        """
+
+        return update(MysteryBagReservation) \
+            .where(MysteryBagReservation.id == id,
+                   ~MysteryBagReservation.is_confirmed,
+                   MysteryBagReservation.expires_at > now) \
+            .values(is_confirmed=True) \
+            .returning(MysteryBagReservation)
+
+    def _get_delete_unconfirmed_stmt(self, id: int, **kwargs) -> Delete:
+        """
+        Create a DELETE statement to remove an unconfirmed reservation by its ID.
+
+        Args:
+            id (int): The ID of the reservation.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Delete: The DELETE statement returning the mystery bag ID and held quantity.
+        """
+
+        return delete(MysteryBagReservation) \
+            .where(MysteryBagReservation.id == id,
+                   ~MysteryBagReservation.is_confirmed) \
+            .returning(MysteryBagReservation.mystery_bag_id, MysteryBagReservation.quantity)
+
+    def _get_delete_expired_stmt(self, now: datetime, **kwargs) -> Delete:
+        """
+        Create a DELETE statement to remove all expired unconfirmed reservations.
+
+        Args:
+            now (datetime): The current time.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Delete: The DELETE statement returning the mystery bag ID and held quantity of each reservation.
+        """
+
+        return delete(MysteryBagReservation) \
+            .where(~MysteryBagReservation.is_confirmed,
+                   MysteryBagReservation.expires_at <= now) \
+            .returning(MysteryBagReservation.mystery_bag_id, MysteryBagReservation.quantity)
+
+    async def confirm(self, id: int, now: Optional[datetime] = None, **kwargs) -> Optional[MysteryBagReservation]:
+        """
+        Confirm a reservation which has not expired yet.
+
+        Args:
+            id (int): The ID of the reservation.
+            now (Optional[datetime]): The current time. Default is current UTC time.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Optional[MysteryBagReservation]: The confirmed reservation or None if it is not found,
+                already confirmed or expired.
+        """
+
+        now = now or datetime.utcnow()
+        stmt = self._get_confirm_stmt(id=id, now=now, **kwargs)
+
+        result = await self._session.execute(stmt)
+        result = result.scalar_one_or_none()
+
+        if result:
+            logger.debug(f"Confirmed MysteryBagReservation with id={id}")
+            return result
+
+        logger.warning(f"Requested to confirm MysteryBagReservation with id={id} but it is not active")
+
+    async def delete_unconfirmed(self, id: int, **kwargs) -> Optional[Tuple[int, int]]:
+        """
+        Delete an unconfirmed reservation by its ID.
+
+        Args:
+            id (int): The ID of the reservation.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Optional[Tuple[int, int]]: The mystery bag ID and held quantity of the deleted reservation
+                or None if it is not found or already confirmed.
+        """
+
+        stmt = self._get_delete_unconfirmed_stmt(id=id, **kwargs)
+
+        result = await self._session.execute(stmt)
+        result = result.one_or_none()
+
+        if result:
+            logger.debug(f"Deleted unconfirmed MysteryBagReservation with id={id}")
+            return tuple(result)
+
+        logger.warning(f"Requested to delete MysteryBagReservation with id={id} but it is not active")
+
+    async def delete_expired(self, now: Optional[datetime] = None, **kwargs) -> List[Tuple[int, int]]:
+        """
+        Delete all expired unconfirmed reservations with a single statement.
+
+        Args:
+            now (Optional[datetime]): The current time. Default is current UTC time.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            List[Tuple[int, int]]: The mystery bag ID and held quantity of each deleted reservation.
+        """
+
+        now = now or datetime.utcnow()
+        stmt = self._get_delete_expired_stmt(now=now, **kwargs)
+
+        result = await self._session.execute(stmt)
+        result = [tuple(r) for r in result.fetchall()]
+
+        logger.debug(f"Deleted {len(result)} expired MysteryBagReservation(s)")
+
+        return result
@@ -4,14 +4,14 @@ from sqlalchemy import Select, select
 from loguru import logger
 
 from models import Restaurant, MenuCategory, Menu
-from .generic import SQLAlchemyRepository
+from .generic import SQLAlchemyReplicaRepository
 
 __all__ = [
     'RestaurantRepository',
 ]
 
 
-class RestaurantRepository(SQLAlchemyRepository[Restaurant]):
+class RestaurantRepository(SQLAlchemyReplicaRepository[Restaurant]):
     """
     Repository for Restaurant model operations.
     """
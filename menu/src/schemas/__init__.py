@@ -3,3 +3,5 @@ from .item import *
 from .menu import *
 from .restaurant import *
 from .manager import *
+from .mystery_bag import *
+from .metrics import *
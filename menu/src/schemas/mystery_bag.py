@@ -0,0 +1,119 @@
+from abc import ABC
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+__all__ = [
+    "MysteryBagDietaryFlagIn",
+    "MysteryBagRetrieveOut",
+    "MysteryBagReservationBase",
+    "MysteryBagReservationBaseOut",
+    "MysteryBagReservationRetrieveOut",
+    "MysteryBagReservationCreateIn",
+    "MysteryBagReservationCreateOut",
+]
+
+
+# Mystery bag
+
+class MysteryBagDietaryFlagIn(str, Enum):
+    """
+    Names of dietary flags which mystery bags are searched by.
+    """
+
+    vegetarian = "vegetarian"
+    jain = "jain"
+    vegan = "vegan"
+    halal = "halal"
+    dairy = "dairy"
+    nuts = "nuts"
+    gluten = "gluten"
+    alcohol = "alcohol"
+
+
+class MysteryBagRetrieveOut(BaseModel):
+    """
+    Schema class for output representation of a retrieved mystery bag.
+    """
+
+    id: int = Field(ge=0)
+    title: str
+    description: Optional[str]
+    image_url: Optional[str]
+    restaurant_id: int = Field(ge=0)
+    original_value: int
+    selling_price: int
+    available_quantity: int
+    pickup_start_time: datetime
+    pickup_end_time: datetime
+    is_vegetarian: bool
+    is_jain: bool
+    is_vegan: bool
+    is_halal: bool
+    contains_dairy: bool
+    contains_nuts: bool
+    contains_gluten: bool
+    contains_alcohol: bool
+    spice_level: Optional[str]
+    meal_category: Optional[str]
+    cuisine_type: Optional[str]
+
+    model_config = {
+        "from_attributes": True
+    }
+
+
+# Base
+
+class MysteryBagReservationBase(BaseModel, ABC):
+    """
+    Base schema class for a mystery bag reservation, containing common attributes.
+    """
+
+    mystery_bag_id: int = Field(ge=0)
+    customer_id: int = Field(ge=0)
+    quantity: int = Field(default=1, gt=0)
+
+
+class MysteryBagReservationBaseOut(MysteryBagReservationBase, ABC):
+    """
+    Base schema class for output representation of a mystery bag reservation.
+    """
+
+    id: int = Field(ge=0)
+    expires_at: datetime
+    is_confirmed: bool
+
+    model_config = {
+        "from_attributes": True
+    }
+
+
+# Retrieve
+
+class MysteryBagReservationRetrieveOut(MysteryBagReservationBaseOut):
+    """
+    Schema class for output representation of a retrieved mystery bag reservation.
+    """
+
+    pass
+
+
+# Create
+
+class MysteryBagReservationCreateIn(MysteryBagReservationBase):
+    """
+    Schema class for input data when reserving a mystery bag.
+    """
+
+    pass
+
+
+class MysteryBagReservationCreateOut(MysteryBagReservationBaseOut):
+    """
+    Schema class for output representation after reserving a mystery bag.
+    """
+
+    pass
@@ -3,3 +3,5 @@ from .item import *
 from .manager import *
 from .menu import *
 from .restaurant import *
+from .mystery_bag import *
+from .outbox import *
@@ -3,6 +3,7 @@ from typing import Optional
 from fastapi import UploadFile
 from loguru import logger
 
+from cache import current_menu_cache
 from config import get_settings
 from exceptions.menu import MenuNotFoundWithIdError
 from exceptions.category import MenuCategoryNotFoundWithIdError
@@ -85,6 +86,7 @@ class MenuCategoryService(CreateMixin[MenuCategory, MenuCategoryCreateIn, MenuCa
         settings = get_settings()
         data['image_url'] = settings.default_menu_category_image_url
         menu_category = await uow.categories.create(data, **kwargs)
+        current_menu_cache.invalidate_restaurant(restaurant.id, uow)
 
         logger.info(f"Created MenuCategory with id={menu_category.id}")
 
@@ -128,6 +130,7 @@ class MenuCategoryService(CreateMixin[MenuCategory, MenuCategoryCreateIn, MenuCa
         # Update
         data = item.model_dump()
         menu_category = await uow.categories.update(id, data, **kwargs)
+        current_menu_cache.invalidate_restaurant(restaurant.id, uow)
 
         logger.info(f"Updated MenuCategory with id={menu_category.id}")
 
@@ -164,6 +167,7 @@ class MenuCategoryService(CreateMixin[MenuCategory, MenuCategoryCreateIn, MenuCa
 
         # Delete
         await uow.categories.delete(id, **kwargs)
+        current_menu_cache.invalidate_restaurant(restaurant.id, uow)
         logger.info(f"Deleted MenuCategory with id={id}")
 
     async def add_menu_item(self, category_id: int, item_id: int,
@@ -219,6 +223,7 @@ class MenuCategoryService(CreateMixin[MenuCategory, MenuCategoryCreateIn, MenuCa
 
         # Append
         menu_category.items.add(menu_item)
+        current_menu_cache.invalidate_restaurant(restaurant.id, uow)
 
         logger.info(f"Added MenuItem with id={item_id} to MenuCategory with id={category_id}")
 
@@ -275,6 +280,7 @@ class MenuCategoryService(CreateMixin[MenuCategory, MenuCategoryCreateIn, MenuCa
 
         # Remove
         menu_category.items.remove(item)
+        current_menu_cache.invalidate_restaurant(restaurant.id, uow)
 
         logger.info(f"Removed MenuItem with id={item_id} from MenuCategory with id={category_id}")
 
@@ -305,6 +311,7 @@ class MenuCategoryService(CreateMixin[MenuCategory, MenuCategoryCreateIn, MenuCa
         updated_menu_category = await uow.categories.update(id, {
             'image_url': image_url
         })
+        current_menu_cache.invalidate_restaurant(restaurant.id, uow)
 
         logger.info(f"Uploaded image for MenuCategory with id={id}")
 
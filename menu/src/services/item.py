@@ -3,12 +3,12 @@ from typing import Optional, List
 from fastapi import UploadFile
 from loguru import logger
 
+from cache import current_menu_cache
 from config import get_settings
 from models import RestaurantManager, MenuItem
 from exceptions.item import MenuItemNotFoundWithIdError
 from exceptions.restaurant import RestaurantNotFoundWithIdError
 from exceptions.permissions import PermissionDeniedError
-from producer import publisher
 from producer.events import MenuItemCreatedEvent, MenuItemDeletedEvent, MenuItemUpdatedEvent
 from user_roles import RestaurantManagerRole
 from schemas.item import MenuItemRetrieveOut, MenuItemCreateIn, MenuItemCreateOut, MenuItemUpdateIn, MenuItemUpdateOut
@@ -113,7 +113,7 @@ class MenuItemService(RetrieveMixin[MenuItem, MenuItemRetrieveOut],
 
         logger.info(f"Created MenuItem with id={created_item.id}")
 
-        publisher.publish(MenuItemCreatedEvent(
+        await uow.add_event(MenuItemCreatedEvent(
             id=created_item.id,
             name=created_item.name,
             image_url=created_item.image_url,
@@ -158,10 +158,11 @@ class MenuItemService(RetrieveMixin[MenuItem, MenuItemRetrieveOut],
         # Update
         data = item.model_dump()
         updated_item = await uow.items.update(id, data, **kwargs)
+        current_menu_cache.invalidate_restaurant(updated_item.restaurant_id, uow)
 
         logger.info(f"Updated MenuItem with id={updated_item.id}")
 
-        publisher.publish(MenuItemUpdatedEvent(
+        await uow.add_event(MenuItemUpdatedEvent(
             id=updated_item.id,
             name=updated_item.name,
             image_url=updated_item.image_url,
@@ -200,10 +201,11 @@ class MenuItemService(RetrieveMixin[MenuItem, MenuItemRetrieveOut],
 
         # Delete
         await uow.items.delete(id, **kwargs)
+        current_menu_cache.invalidate_restaurant(menu_item.restaurant_id, uow)
 
         logger.info(f"Deleted MenuItem with id={id}")
 
-        publisher.publish(
+        await uow.add_event(
             MenuItemDeletedEvent(id=id)
         )
 
@@ -283,6 +285,7 @@ class MenuItemService(RetrieveMixin[MenuItem, MenuItemRetrieveOut],
         updated_menu_item = await uow.items.update(id, {
             'image_url': image_url
         })
+        current_menu_cache.invalidate_restaurant(menu_item.restaurant_id, uow)
 
         logger.info(f"Uploaded image for MenuItem with id={id}")
 
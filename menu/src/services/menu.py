@@ -1,6 +1,7 @@
 from typing import Optional, List
 from loguru import logger
 
+from cache import current_menu_cache
 from models import RestaurantManager, Menu
 from exceptions.menu import MenuNotFoundWithIdError
 from exceptions.restaurant import RestaurantNotFoundWithIdError, RestaurantNotActiveError, \
@@ -116,6 +117,7 @@ class MenuService(CreateMixin[Menu, MenuCreateIn, MenuCreateOut],
         # Update
         data = item.model_dump()
         menu = await uow.menus.update(id, data, **kwargs)
+        current_menu_cache.invalidate_restaurant(menu.restaurant_id, uow)
 
         logger.info(f"Updated Menu with id={menu.id}")
 
@@ -151,25 +153,21 @@ class MenuService(CreateMixin[Menu, MenuCreateIn, MenuCreateOut],
 
         # Delete
         await uow.menus.delete(id, **kwargs)
+        current_menu_cache.invalidate_restaurant(menu.restaurant_id, uow)
 
         logger.info(f"Deleted Menu with id={id}")
 
-    async def retrieve_current_restaurant_menu_instance(self, restaurant_id: int, uow: SqlAlchemyUnitOfWork,
-                                                        **kwargs) -> Optional[Menu]:
+    async def _check_restaurant_visibility(self, restaurant_id: int, uow: SqlAlchemyUnitOfWork):
         """
-        Retrieve a current menu instance of a restaurant by its ID from the repository.
+        Check if a restaurant exists and its menu can be shown to the user.
 
         Args:
             restaurant_id (int): The ID of the restaurant.
             uow (SqlAlchemyUnitOfWork): The unit of work instance.
 
-        Returns:
-            Menu: The retrieved current menu instance.
-
         Raises:
             RestaurantNotFoundWithIdError: If the restaurant is not found.
             RestaurantNotActiveError: If the restaurant is not active.
-            CurrentMenuMissingError: If there is no current menu
         """
 
         # Get restaurant
@@ -187,6 +185,26 @@ class MenuService(CreateMixin[Menu, MenuCreateIn, MenuCreateOut],
                 logger.warning(f"Restaurant with id={restaurant_id} is not active")
                 raise RestaurantNotActiveError(restaurant_id)
 
+    async def retrieve_current_restaurant_menu_instance(self, restaurant_id: int, uow: SqlAlchemyUnitOfWork,
+                                                        **kwargs) -> Optional[Menu]:
+        """
+        Retrieve a current menu instance of a restaurant by its ID from the repository.
+
+        Args:
+            restaurant_id (int): The ID of the restaurant.
+            uow (SqlAlchemyUnitOfWork): The unit of work instance.
+
+        Returns:
+            Menu: The retrieved current menu instance.
+
+        Raises:
+            RestaurantNotFoundWithIdError: If the restaurant is not found.
+            RestaurantNotActiveError: If the restaurant is not active.
+            CurrentMenuMissingError: If there is no current menu
+        """
+
+        await self._check_restaurant_visibility(restaurant_id, uow)
+
         # Get current menu
         current_menu = await uow.menus.retrieve_current_restaurant_menu(restaurant_id,
                                                                         fetch_categories=True,
@@ -243,6 +261,9 @@ class MenuService(CreateMixin[Menu, MenuCreateIn, MenuCreateOut],
         """
         Retrieve a current menu schema restaurant's ID with associated categories.
 
+        The serialized menu tree is read through the current menu cache, while restaurant
+        checks are performed on every call.
+
         Args:
             restaurant_id (int): The ID of the restaurant.
             uow (SqlAlchemyUnitOfWork): The unit of work instance.
@@ -251,9 +272,18 @@ class MenuService(CreateMixin[Menu, MenuCreateIn, MenuCreateOut],
             MenuRetrieveOut: The retrieved current menu schema with associated categories.
         """
 
-        retrieved_instance = await self.retrieve_current_restaurant_menu_instance(restaurant_id, uow, **kwargs)
-        if retrieved_instance:
-            return MenuRetrieveOut.model_validate(retrieved_instance)
+        await self._check_restaurant_visibility(restaurant_id, uow)
+
+        async def load_current_menu() -> Optional[MenuRetrieveOut]:
+            current_menu = await uow.menus.retrieve_current_restaurant_menu(restaurant_id,
+                                                                            fetch_categories=True,
+                                                                            **kwargs)
+            logger.info(f"Retrieved Current Menu for Restaurant with id={restaurant_id}")
+
+            if current_menu:
+                return MenuRetrieveOut.model_validate(current_menu)
+
+        return await current_menu_cache.get_or_load(restaurant_id, load_current_menu)
 
     async def list_restaurant_menus(self, restaurant_id: int,
                                     uow: SqlAlchemyUnitOfWork, **kwargs) -> List[MenuRetrieveOut]:
@@ -0,0 +1,205 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+from config import get_settings
+from discovery import mystery_bag_discovery_index, DietaryFlag
+from exceptions.mystery_bag import MysteryBagNotFoundWithIdError, MysteryBagSoldOutError, \
+    MysteryBagReservationNotFoundWithIdError
+from models import MysteryBagReservation
+from schemas.mystery_bag import MysteryBagReservationCreateIn, MysteryBagReservationCreateOut, \
+    MysteryBagReservationRetrieveOut, MysteryBagRetrieveOut
+from uow import SqlAlchemyUnitOfWork
+from .mixins import CreateMixin
+
+__all__ = [
+    'MysteryBagService',
+]
+
+
+class MysteryBagService(CreateMixin[MysteryBagReservation, MysteryBagReservationCreateIn,
+                                    MysteryBagReservationCreateOut]):
+    """
+    Service class for managing mystery bag inventory.
+
+    This class provides methods for searching available mystery bags, reserving mystery bags, confirming and cancelling reservations
+    and releasing expired reservations back to the stock. Stock changes are mirrored to the discovery index
+    after the transaction is committed, so a rolled back reservation never hides or restocks a mystery bag.
+
+    Stock is taken with a single conditional UPDATE, so concurrent reservations of the same mystery bag
+    never oversell it and never need to read the row first.
+
+    Attributes:
+        schema_create_out (MysteryBagReservationCreateOut): The schema for output representation of
+            created reservations.
+    """
+
+    schema_create_out = MysteryBagReservationCreateOut
+
+    async def search(self, uow: SqlAlchemyUnitOfWork, include: DietaryFlag = DietaryFlag(0),
+                     exclude: DietaryFlag = DietaryFlag(0), restaurant_ids: Optional[List[int]] = None,
+                     at: Optional[datetime] = None, limit: int = 50) -> List[MysteryBagRetrieveOut]:
+        """
+        Search mystery bags available for pickup with the discovery index and retrieve them by their IDs.
+
+        Args:
+            uow (SqlAlchemyUnitOfWork): The unit of work instance.
+            include (DietaryFlag): Flags which mystery bags must have.
+            exclude (DietaryFlag): Flags which mystery bags must not have.
+            restaurant_ids (Optional[List[int]]): IDs of restaurants to search in. Default is all restaurants.
+            at (Optional[datetime]): The pickup moment. Default is current UTC time.
+            limit (int): The maximum number of mystery bags.
+
+        Returns:
+            List[MysteryBagRetrieveOut]: Found mystery bags ordered by the end of their pickup window.
+        """
+
+        ids = mystery_bag_discovery_index.search(include, exclude, at=at, restaurant_ids=restaurant_ids,
+                                                 limit=limit).tolist()
+
+        # Mystery bags deleted since the index was refreshed are skipped
+        mystery_bags = {mystery_bag.id: mystery_bag for mystery_bag in await uow.mystery_bags.list_by_ids(ids)}
+
+        logger.info(f"Found {len(mystery_bags)} available MysteryBag(s)")
+
+        return [MysteryBagRetrieveOut.model_validate(mystery_bags[id]) for id in ids if id in mystery_bags]
+
+    async def create_instance(self, item: MysteryBagReservationCreateIn,
+                              uow: SqlAlchemyUnitOfWork, **kwargs) -> MysteryBagReservation:
+        """
+        Reserve a mystery bag and create a reservation instance in the repository.
+
+        Args:
+            item (MysteryBagReservationCreateIn): The data to create the reservation.
+            uow (SqlAlchemyUnitOfWork): The unit of work instance.
+
+        Returns:
+            MysteryBagReservation: The created reservation instance.
+
+        Raises:
+            MysteryBagNotFoundWithIdError: If the mystery bag is not found.
+            MysteryBagSoldOutError: If the mystery bag has not enough stock or is not available.
+        """
+
+        now = datetime.utcnow()
+
+        # Take stock
+        available_quantity = await uow.mystery_bags.reserve(item.mystery_bag_id, item.quantity, now=now)
+
+        if available_quantity is None:
+            # Find out the reason only on the failure path
+            if not await uow.mystery_bags.exists(item.mystery_bag_id):
+                logger.warning(f"MysteryBag with id={item.mystery_bag_id} not found")
+                raise MysteryBagNotFoundWithIdError(item.mystery_bag_id)
+
+            logger.warning(f"MysteryBag with id={item.mystery_bag_id} is sold out")
+            raise MysteryBagSoldOutError(item.mystery_bag_id, item.quantity)
+
+        # Reservations may commit out of order, so the index takes the reserved quantity instead of the stock left
+        uow.add_after_commit_callback(
+            lambda: mystery_bag_discovery_index.restock({item.mystery_bag_id: -item.quantity}))
+
+        # Hold
+        settings = get_settings()
+        data = item.model_dump()
+        data['expires_at'] = now + timedelta(seconds=settings.mystery_bag_reservation_ttl_seconds)
+        data['is_confirmed'] = False
+        reservation = await uow.reservations.create(data, **kwargs)
+
+        logger.info(f"Created MysteryBagReservation with id={reservation.id} "
+                    f"for MysteryBag with id={item.mystery_bag_id}")
+
+        return reservation
+
+    async def reserve(self, item: MysteryBagReservationCreateIn,
+                      uow: SqlAlchemyUnitOfWork, **kwargs) -> MysteryBagReservationCreateOut:
+        """
+        Reserve a mystery bag and return created serialized reservation.
+
+        Args:
+            item (MysteryBagReservationCreateIn): The data to create the reservation.
+            uow (SqlAlchemyUnitOfWork): The unit of work instance.
+
+        Returns:
+            MysteryBagReservationCreateOut: The created reservation.
+        """
+
+        return await self.create(item, uow, **kwargs)
+
+    async def confirm_reservation(self, id: int, uow: SqlAlchemyUnitOfWork,
+                                  **kwargs) -> MysteryBagReservationRetrieveOut:
+        """
+        Confirm a reservation, so its stock is never released.
+
+        Args:
+            id (int): The ID of the reservation.
+            uow (SqlAlchemyUnitOfWork): The unit of work instance.
+
+        Returns:
+            MysteryBagReservationRetrieveOut: The confirmed reservation.
+
+        Raises:
+            MysteryBagReservationNotFoundWithIdError: If the reservation is not found, already confirmed or expired.
+        """
+
+        reservation = await uow.reservations.confirm(id, **kwargs)
+
+        if not reservation:
+            logger.warning(f"Active MysteryBagReservation with id={id} not found")
+            raise MysteryBagReservationNotFoundWithIdError(id)
+
+        logger.info(f"Confirmed MysteryBagReservation with id={id}")
+
+        return MysteryBagReservationRetrieveOut.model_validate(reservation)
+
+    async def cancel_reservation(self, id: int, uow: SqlAlchemyUnitOfWork, **kwargs):
+        """
+        Cancel an unconfirmed reservation and return its stock to the mystery bag.
+
+        Args:
+            id (int): The ID of the reservation.
+            uow (SqlAlchemyUnitOfWork): The unit of work instance.
+
+        Raises:
+            MysteryBagReservationNotFoundWithIdError: If the reservation is not found or already confirmed.
+        """
+
+        deleted = await uow.reservations.delete_unconfirmed(id, **kwargs)
+
+        if not deleted:
+            logger.warning(f"Active MysteryBagReservation with id={id} not found")
+            raise MysteryBagReservationNotFoundWithIdError(id)
+
+        mystery_bag_id, quantity = deleted
+        await uow.mystery_bags.restock({mystery_bag_id: quantity})
+        uow.add_after_commit_callback(lambda: mystery_bag_discovery_index.restock({mystery_bag_id: quantity}))
+
+        logger.info(f"Cancelled MysteryBagReservation with id={id}")
+
+    async def release_expired_reservations(self, uow: SqlAlchemyUnitOfWork, **kwargs) -> int:
+        """
+        Release all expired reservations and return their stock to the mystery bags in bulk.
+
+        Args:
+            uow (SqlAlchemyUnitOfWork): The unit of work instance.
+
+        Returns:
+            int: The number of released reservations.
+        """
+
+        released = await uow.reservations.delete_expired(**kwargs)
+
+        quantities: Dict[int, int] = defaultdict(int)
+        for mystery_bag_id, quantity in released:
+            quantities[mystery_bag_id] += quantity
+
+        await uow.mystery_bags.restock(quantities)
+        uow.add_after_commit_callback(lambda: mystery_bag_discovery_index.restock(quantities))
+
+        if released:
+            logger.info(f"Released {len(released)} expired MysteryBagReservation(s) "
+                        f"of {len(quantities)} MysteryBag(s)")
+
+        return len(released)
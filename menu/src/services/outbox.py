@@ -0,0 +1,76 @@
+import asyncio
+from typing import Callable, Optional
+
+from loguru import logger
+
+from producer import AbstractPublisher
+from uow import SqlAlchemyUnitOfWork
+from utils import uow_transaction_with_commit
+
+__all__ = [
+    "OutboxService",
+]
+
+
+class OutboxService:
+    """
+    Service class for relaying outbox messages to Kafka.
+
+    Messages are claimed in a short transaction, published outside of it and deleted only after Kafka
+    acknowledges all of them, so every message is published at least once and no lock is held while Kafka
+    delivers them. A failed batch is released and published again as a whole, keeping the order of messages.
+    """
+
+    def __init__(self, publisher: AbstractPublisher, delivery_timeout: Optional[float] = None,
+                 claim_timeout: float = 60):
+        """
+        Initialize the OutboxService.
+
+        Args:
+            publisher (AbstractPublisher): The publisher which delivers messages to Kafka.
+            delivery_timeout (Optional[float]): The maximum time in seconds to wait for acknowledgements of a batch.
+            claim_timeout (float): The time in seconds after which messages of a relay which stopped without
+                deleting or releasing them can be claimed by other relays.
+        """
+
+        self._publisher = publisher
+        self._delivery_timeout = delivery_timeout
+        self._claim_timeout = claim_timeout
+
+    async def relay_messages(self, get_uow: Callable[[], SqlAlchemyUnitOfWork], limit: int, **kwargs) -> int:
+        """
+        Publish the oldest unclaimed outbox messages and delete them.
+
+        Args:
+            get_uow (Callable[[], SqlAlchemyUnitOfWork]): The function to get a unit of work for every transaction.
+            limit (int): The maximum number of messages to publish.
+
+        Returns:
+            int: The number of published messages.
+        """
+
+        async with uow_transaction_with_commit(get_uow()) as uow:
+            messages = await uow.outbox.claim_pending(limit, self._claim_timeout, **kwargs)
+
+        if not messages:
+            return 0
+
+        ids = [message.id for message in messages]
+
+        try:
+            await asyncio.to_thread(self._publisher.deliver,
+                                    [(message.topic, message.event_name, message.aggregate_id, message.payload)
+                                     for message in messages],
+                                    self._delivery_timeout)
+        except Exception:
+            async with uow_transaction_with_commit(get_uow()) as uow:
+                await uow.outbox.release(ids)
+
+            raise
+
+        async with uow_transaction_with_commit(get_uow()) as uow:
+            await uow.outbox.delete_many(ids)
+
+        logger.info(f"Relayed {len(messages)} OutboxMessage(s)")
+
+        return len(messages)
@@ -1,6 +1,8 @@
 from typing import Optional
 from loguru import logger
 
+from cache import current_menu_cache
+from discovery import mystery_bag_discovery_index
 from exceptions.restaurant import RestaurantNotFoundWithIdError, RestaurantAlreadyExistsWithIdError, \
     RestaurantMissingCurrentMenuError
 from exceptions.manager import RestaurantManagerNotFoundWithIdError
@@ -115,8 +117,36 @@ class RestaurantService(CreateMixin[Restaurant, RestaurantCreateIn, RestaurantCr
 
         logger.info(f"Updated Restaurant with id={id}")
 
+        await self.refresh_discovery_index(id, restaurant.is_active, uow)
+
         return restaurant
 
+    async def refresh_discovery_index(self, restaurant_id: int, is_active: bool, uow: SqlAlchemyUnitOfWork,
+                                      after_commit: bool = True):
+        """
+        Refreshes mystery bags of a restaurant in the discovery index after the restaurant is updated.
+
+        Args:
+            restaurant_id (int): ID of the restaurant.
+            is_active (bool): Whether the restaurant is active.
+            uow (SqlAlchemyUnitOfWork): The unit of work instance.
+            after_commit (bool): Whether to refresh the index only after the transaction of the update
+                is committed. Default is True, read-only transactions must refresh it immediately.
+        """
+
+        mystery_bags = await uow.mystery_bags.list_available(restaurant_id=restaurant_id) if is_active else None
+
+        def refresh():
+            if is_active:
+                mystery_bag_discovery_index.upsert_many(mystery_bags)
+            else:
+                mystery_bag_discovery_index.remove_restaurant(restaurant_id)
+
+        if after_commit:
+            uow.add_after_commit_callback(refresh)
+        else:
+            refresh()
+
     async def delete_instance(self, id: int, uow: SqlAlchemyUnitOfWork, **kwargs):
         """
         Delete a restaurant instance by its ID from the repository.
@@ -136,6 +166,8 @@ class RestaurantService(CreateMixin[Restaurant, RestaurantCreateIn, RestaurantCr
 
         # Delete
         await uow.restaurants.delete(id, **kwargs)
+        uow.add_after_commit_callback(lambda: mystery_bag_discovery_index.remove_restaurant(id))
+        current_menu_cache.invalidate_restaurant(id, uow)
 
         logger.info(f"Deleted Restaurant with id={id}")
 
@@ -180,6 +212,7 @@ class RestaurantService(CreateMixin[Restaurant, RestaurantCreateIn, RestaurantCr
 
         # Set current menu
         restaurant.current_menu_id = menu_id
+        current_menu_cache.invalidate_restaurant(restaurant_id, uow)
 
         logger.info(f"Set current menu of Restaurant with id={restaurant_id} to Menu with id={menu_id}")
 
@@ -217,6 +250,7 @@ class RestaurantService(CreateMixin[Restaurant, RestaurantCreateIn, RestaurantCr
             raise RestaurantMissingCurrentMenuError(restaurant_id)
 
         restaurant.current_menu_id = None
+        current_menu_cache.invalidate_restaurant(restaurant_id, uow)
 
     # async def activate(self, id: int, uow: SqlAlchemyUnitOfWork, **kwargs):
     #     """
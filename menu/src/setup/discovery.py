@@ -0,0 +1,91 @@
+import asyncio
+import time
+from threading import Thread
+
+from loguru import logger
+
+from config.settings import Settings
+from db import init_thread_engine, dispose_thread_engine
+from discovery import MysteryBagDiscoveryIndex, mystery_bag_discovery_index
+from utils.uow import get_sqlalchemy_uow, uow_transaction
+
+
+class MysteryBagDiscoveryIndexRefresher:
+    """
+    Class for keeping the mystery bag discovery index fresh.
+
+    It runs in a separate daemon thread with its own event loop. Mystery bags whose pickup window
+    has closed are evicted every `evict_interval` seconds and the whole index is rebuilt from
+    the database every `rebuild_interval` seconds to pick up mystery bags created outside this service.
+    """
+
+    def __init__(self, index: MysteryBagDiscoveryIndex, evict_interval: int, rebuild_interval: int):
+        """
+        Constructor for the MysteryBagDiscoveryIndexRefresher class.
+
+        Args:
+            index (MysteryBagDiscoveryIndex): The discovery index.
+            evict_interval (int): The interval between evictions in seconds.
+            rebuild_interval (int): The interval between full rebuilds in seconds.
+        """
+
+        self._index = index
+        self._evict_interval = evict_interval
+        self._rebuild_interval = rebuild_interval
+        self._refresher_thread = Thread(target=self.__between_callback)
+        self._refresher_thread.daemon = True
+
+    async def _rebuild(self):
+        """
+        Rebuilds the index from the database.
+        """
+
+        async with uow_transaction(get_sqlalchemy_uow()) as uow:
+            mystery_bags = await uow.mystery_bags.list_available()
+
+        self._index.rebuild(mystery_bags)
+
+    async def _refresh(self):
+        """
+        Method for refreshing the index in a loop.
+        """
+
+        rebuilt_at = None
+
+        while True:
+            try:
+                if rebuilt_at is None or time.monotonic() - rebuilt_at >= self._rebuild_interval:
+                    await self._rebuild()
+                    rebuilt_at = time.monotonic()
+                else:
+                    self._index.evict_expired()
+            except Exception as e:
+                logger.error(f"Error refreshing mystery bag discovery index: {e}")
+
+            await asyncio.sleep(self._evict_interval)
+
+    def __between_callback(self):
+        """
+        Synchronous wrapper for method that refreshes the index.
+        """
+
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        init_thread_engine()
+
+        loop.run_until_complete(self._refresh())
+        loop.run_until_complete(dispose_thread_engine())
+        loop.close()
+
+    def start_refreshing(self):
+        """
+        Starts the refresher thread.
+        """
+
+        self._refresher_thread.start()
+
+
+def init_discovery_index_refresher(settings: Settings) -> MysteryBagDiscoveryIndexRefresher:
+    return MysteryBagDiscoveryIndexRefresher(mystery_bag_discovery_index,
+                                             settings.mystery_bag_discovery_evict_interval_seconds,
+                                             settings.mystery_bag_discovery_rebuild_interval_seconds)
@@ -1,12 +1,16 @@
 from typing import List
 
 from config.settings import Settings
-from consumer import KafkaReceiver, KafkaConsumerBaseCreator
+from consumer import KafkaReceiver, KafkaBroadcastReceiver, KafkaConsumerBaseCreator, RetryPolicy
+from producer import publisher
 from utils import import_string
 
 
 def init_kafka_receivers(consumer_creator: KafkaConsumerBaseCreator, settings: Settings) -> List[KafkaReceiver]:
     kafka_receivers = list()
+    retry_policy = RetryPolicy(publisher, max_attempts=settings.kafka_consumer_retry_max_attempts,
+                               backoff_ms=settings.kafka_consumer_retry_backoff_ms,
+                               delivery_timeout=settings.kafka_consumer_retry_delivery_timeout_seconds)
 
     for topic, consumer_str_events in settings.kafka_consumer_topic_events.items():
         group_id = f"{topic}_group"
@@ -18,6 +22,34 @@ def init_kafka_receivers(consumer_creator: KafkaConsumerBaseCreator, settings: S
         topic_consumer_events = [import_string(str_event) for str_event in consumer_str_events]
 
         # Add group of consumers to kafka receivers
-        kafka_receivers.extend((KafkaReceiver(consumer, topic_consumer_events) for consumer in consumers))
+        kafka_receivers.extend((KafkaReceiver(consumer, topic_consumer_events,
+                                              workers_count=settings.kafka_consumer_workers_count,
+                                              partition_queue_maxsize=settings.kafka_consumer_partition_queue_maxsize,
+                                              max_poll_records=settings.kafka_consumer_max_poll_records,
+                                              poll_timeout_ms=settings.kafka_consumer_poll_timeout_ms,
+                                              batch_max_size=settings.kafka_consumer_batch_max_size,
+                                              batch_max_wait_ms=settings.kafka_consumer_batch_max_wait_ms,
+                                              retry_policy=retry_policy)
+                                for consumer in consumers))
 
     return kafka_receivers
+
+
+def init_kafka_broadcast_receivers(consumer_creator: KafkaConsumerBaseCreator,
+                                   settings: Settings) -> List[KafkaBroadcastReceiver]:
+    kafka_broadcast_receivers = list()
+
+    for topic, consumer_str_events in settings.kafka_broadcast_topic_events.items():
+        # Every process consumes all partitions without a group and committed offsets
+        consumer = consumer_creator.create(topic, None)
+
+        topic_consumer_events = [import_string(str_event) for str_event in consumer_str_events]
+
+        kafka_broadcast_receivers.append(
+            KafkaBroadcastReceiver(consumer, topic_consumer_events,
+                                   repeat_delay=settings.kafka_broadcast_repeat_delay_seconds,
+                                   max_poll_records=settings.kafka_consumer_max_poll_records,
+                                   poll_timeout_ms=settings.kafka_consumer_poll_timeout_ms)
+        )
+
+    return kafka_broadcast_receivers
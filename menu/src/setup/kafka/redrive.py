@@ -0,0 +1,66 @@
+"""
+Re-drive of dead lettered messages.
+
+Publishes messages of the dead letter topic of a topic back to it in chunks and commits the offsets
+following every delivered chunk for the dead letter topic's group, so every message is re-driven once.
+Only messages which are in the dead letter topic when the re-drive starts are re-driven.
+
+Usage (from `src` directory):
+    python -m setup.kafka.redrive restaurant_menu [--limit 1000] [--chunk-size 500]
+"""
+
+import argparse
+from typing import List
+
+from kafka.consumer.fetcher import ConsumerRecord
+from kafka.structs import OffsetAndMetadata
+from loguru import logger
+
+from config import get_settings
+from consumer import consumer_creator, get_dead_letter_topic, read_topic_snapshot, redrive_dead_letters
+from producer import publisher
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Re-drive of dead lettered messages")
+    parser.add_argument("topic", help="Original topic of the messages")
+    parser.add_argument("--limit", type=int, default=None, help="Maximum number of re-driven messages")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Number of messages delivered at once")
+    return parser.parse_args()
+
+
+def run(args: argparse.Namespace):
+    settings = get_settings()
+    dead_letter_topic = get_dead_letter_topic(args.topic)
+    consumer = consumer_creator.create(dead_letter_topic, f"{dead_letter_topic}_group")
+    count = 0
+
+    def redrive(messages: List[ConsumerRecord]):
+        offsets = redrive_dead_letters(messages, publisher, settings.kafka_consumer_retry_delivery_timeout_seconds)
+        consumer.commit({partition: OffsetAndMetadata(offset, '') for partition, offset in offsets.items()})
+
+    try:
+        chunk = list()
+
+        for message in read_topic_snapshot(consumer, dead_letter_topic, from_beginning=False):
+            if args.limit is not None and count >= args.limit:
+                break
+
+            chunk.append(message)
+            count += 1
+
+            if len(chunk) >= args.chunk_size:
+                redrive(chunk)
+                chunk = list()
+
+        if chunk:
+            redrive(chunk)
+    finally:
+        consumer.close(autocommit=False)
+        publisher.close(settings.kafka_consumer_retry_delivery_timeout_seconds)
+
+    logger.info(f"Re-drove {count} messages from {dead_letter_topic} to {args.topic}")
+
+
+if __name__ == "__main__":
+    run(parse_args())
@@ -0,0 +1,69 @@
+import asyncio
+from threading import Thread
+
+from loguru import logger
+
+from config.settings import Settings
+from db import init_thread_engine, dispose_thread_engine
+from services import MysteryBagService
+from utils.uow import get_sqlalchemy_uow, uow_transaction_with_commit
+
+
+class MysteryBagReservationsReleaser:
+    """
+    Class for periodically releasing expired mystery bag reservations.
+
+    It runs in a separate daemon thread with its own event loop and returns stock
+    of expired holds to the mystery bags every `interval` seconds.
+    """
+
+    def __init__(self, interval: int):
+        """
+        Constructor for the MysteryBagReservationsReleaser class.
+
+        Args:
+            interval (int): The interval between releases in seconds.
+        """
+
+        self._interval = interval
+        self._service = MysteryBagService()
+        self._releaser_thread = Thread(target=self.__between_callback)
+        self._releaser_thread.daemon = True
+
+    async def _release(self):
+        """
+        Method for releasing expired reservations in a loop.
+        """
+
+        while True:
+            try:
+                async with uow_transaction_with_commit(get_sqlalchemy_uow()) as uow:
+                    await self._service.release_expired_reservations(uow)
+            except Exception as e:
+                logger.error(f"Error releasing expired mystery bag reservations: {e}")
+
+            await asyncio.sleep(self._interval)
+
+    def __between_callback(self):
+        """
+        Synchronous wrapper for method that releases reservations.
+        """
+
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        init_thread_engine()
+
+        loop.run_until_complete(self._release())
+        loop.run_until_complete(dispose_thread_engine())
+        loop.close()
+
+    def start_releasing(self):
+        """
+        Starts the releaser thread.
+        """
+
+        self._releaser_thread.start()
+
+
+def init_reservations_releaser(settings: Settings) -> MysteryBagReservationsReleaser:
+    return MysteryBagReservationsReleaser(settings.mystery_bag_reservations_release_interval_seconds)
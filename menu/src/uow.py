@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import Callable
+from typing import Callable, List
 
+from outbox import outbox_notifier
+from producer.events import ProducerEvent
 from repositories import MenuItemRepository, MenuCategoryRepository, MenuRepository, \
-    RestaurantRepository, RestaurantManagerRepository
+    RestaurantRepository, RestaurantManagerRepository, MysteryBagRepository, MysteryBagReservationRepository, \
+    OutboxMessageRepository
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -61,6 +64,9 @@ class SqlAlchemyUnitOfWork(GenericUnitOfWork):
         menus (MenuRepository): Repository for menus.
         restaurants (RestaurantRepository): Repository for restaurants.
         managers (RestaurantManagerRepository): Repository for restaurant managers.
+        mystery_bags (MysteryBagRepository): Repository for mystery bags.
+        reservations (MysteryBagReservationRepository): Repository for mystery bag reservations.
+        outbox (OutboxMessageRepository): Repository for outbox messages.
 
     Example:
         async with uow_transaction_with_commit(SqlAlchemyUnitOfWork(session_factory)) as uow:
@@ -72,9 +78,13 @@ class SqlAlchemyUnitOfWork(GenericUnitOfWork):
     menus: MenuRepository
     restaurants: RestaurantRepository
     managers: RestaurantManagerRepository
+    mystery_bags: MysteryBagRepository
+    reservations: MysteryBagReservationRepository
+    outbox: OutboxMessageRepository
 
     def __init__(self, session_factory: Callable[[], AsyncSession]):
         self._session_factory = session_factory
+        self._after_commit_callbacks: List[Callable[[], None]] = list()
         super().__init__()
 
     def _init_repositories(self, session: AsyncSession):
@@ -83,9 +93,13 @@ class SqlAlchemyUnitOfWork(GenericUnitOfWork):
         self.menus = MenuRepository(session)
         self.restaurants = RestaurantRepository(session)
         self.managers = RestaurantManagerRepository(session)
+        self.mystery_bags = MysteryBagRepository(session)
+        self.reservations = MysteryBagReservationRepository(session)
+        self.outbox = OutboxMessageRepository(session)
 
     async def __aenter__(self):
         self._session = self._session_factory()
+        self._after_commit_callbacks = list()
         self._init_repositories(self._session)
         return await super().__aenter__()
 
@@ -93,16 +107,44 @@ class SqlAlchemyUnitOfWork(GenericUnitOfWork):
         await super().__aexit__(*args)
         await self._session.close()
 
+    def add_after_commit_callback(self, callback: Callable[[], None]):
+        """
+        Register a callback to be called after the transaction is committed.
+
+        Args:
+            callback (Callable[[], None]): The callback.
+        """
+
+        self._after_commit_callbacks.append(callback)
+
+    async def add_event(self, event: ProducerEvent):
+        """
+        Add an event to the outbox, so it is published only if the transaction is committed.
+
+        Args:
+            event (ProducerEvent): The event to publish.
+        """
+
+        await self.outbox.add_event(event)
+
+        if outbox_notifier.notify not in self._after_commit_callbacks:
+            self.add_after_commit_callback(outbox_notifier.notify)
+
     async def commit(self):
         """
-        Commit the transaction.
+        Commit the transaction and call registered after-commit callbacks.
         """
 
         await self._session.commit()
 
+        callbacks, self._after_commit_callbacks = self._after_commit_callbacks, list()
+        for callback in callbacks:
+            callback()
+
     async def rollback(self):
         """
-        Rollback the transaction.
+        Rollback the transaction and discard registered after-commit callbacks.
         """
 
         await self._session.rollback()
+        self._after_commit_callbacks = list()
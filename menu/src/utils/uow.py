@@ -1,6 +1,6 @@
 from contextlib import asynccontextmanager
 
-from db import async_session_maker
+from db import get_async_session_maker
 from uow import GenericUnitOfWork, SqlAlchemyUnitOfWork
 
 __all__ = [
@@ -18,7 +18,7 @@ def get_sqlalchemy_uow():
         SqlAlchemyOfWork: The instance.
     """
 
-    return SqlAlchemyUnitOfWork(async_session_maker)
+    return SqlAlchemyUnitOfWork(get_async_session_maker())
 
 
 @asynccontextmanager
@@ -9,7 +9,9 @@ from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from fastapi.testclient import TestClient
 
+from cache import current_menu_cache
 from db.session import get_async_session
+from grpc_files import grpc_roles_client
 from setup import app
 from models import Base
 from config import get_settings
@@ -72,6 +74,12 @@ async def clear_database():
             await session.commit()
 
 
+@pytest.fixture(scope='function', autouse=True)
+def clear_caches():
+    current_menu_cache.clear()
+    grpc_roles_client.clear()
+
+
 # Override session with test session #
 
 async def get_test_async_session() -> AsyncGenerator[AsyncSession, None]:
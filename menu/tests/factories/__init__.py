@@ -3,3 +3,4 @@ from .category import MenuCategoryFactory
 from .menu import MenuFactory
 from .restaurant import RestaurantFactory
 from .manager import RestaurantManagerFactory
+from .mystery_bag import MysteryBagFactory
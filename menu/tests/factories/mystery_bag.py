@@ -0,0 +1,22 @@
+from datetime import datetime, timedelta
+
+from async_factory_boy.factory.sqlalchemy import AsyncSQLAlchemyFactory
+from factory import Faker, SubFactory, LazyFunction
+
+from models import MysteryBag
+
+
+class MysteryBagFactory(AsyncSQLAlchemyFactory):
+    title = Faker('word')
+    original_value = Faker('pyint', min_value=200, max_value=1000)
+    selling_price = Faker('pyint', min_value=1, max_value=199)
+    total_quantity = 5
+    available_quantity = 5
+    pickup_start_time = LazyFunction(datetime.utcnow)
+    pickup_end_time = LazyFunction(lambda: datetime.utcnow() + timedelta(hours=2))
+    is_active = True
+
+    restaurant = SubFactory('tests.factories.RestaurantFactory')
+
+    class Meta:
+        model = MysteryBag
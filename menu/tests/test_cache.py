@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+from cache import SingleFlightCache
+
+
+class TestSingleFlightCache:
+
+    @pytest.fixture(scope='function')
+    def cache(self) -> SingleFlightCache:
+        return SingleFlightCache(maxsize=2, ttl=60)
+
+    async def test_get_or_load(self, cache: SingleFlightCache):
+        loads = 0
+
+        async def loader():
+            nonlocal loads
+            loads += 1
+            return 'value'
+
+        assert await cache.get_or_load(1, loader) == 'value'
+        assert await cache.get_or_load(1, loader) == 'value'
+
+        assert loads == 1
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+
+    async def test_get_or_load_none(self, cache: SingleFlightCache):
+        loads = 0
+
+        async def loader():
+            nonlocal loads
+            loads += 1
+
+        assert await cache.get_or_load(1, loader) is None
+        assert await cache.get_or_load(1, loader) is None
+        assert loads == 1
+
+    async def test_single_flight(self, cache: SingleFlightCache):
+        loads = 0
+        release = asyncio.Event()
+
+        async def loader():
+            nonlocal loads
+            loads += 1
+            await release.wait()
+            return 'value'
+
+        tasks = [asyncio.create_task(cache.get_or_load(1, loader)) for _ in range(50)]
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(*tasks) == ['value'] * 50
+        assert loads == 1
+        assert cache.stats.coalesced == 49
+
+    async def test_invalidate_during_load(self, cache: SingleFlightCache):
+        release = asyncio.Event()
+
+        async def stale_loader():
+            await release.wait()
+            return 'stale'
+
+        async def fresh_loader():
+            return 'fresh'
+
+        task = asyncio.create_task(cache.get_or_load(1, stale_loader))
+        await asyncio.sleep(0)
+
+        cache.invalidate(1)
+        release.set()
+
+        assert await task == 'stale'
+        assert await cache.get_or_load(1, fresh_loader) == 'fresh'
+
+    async def test_loader_error(self, cache: SingleFlightCache):
+        async def failing_loader():
+            raise ValueError
+
+        async def loader():
+            return 'value'
+
+        with pytest.raises(ValueError):
+            await cache.get_or_load(1, failing_loader)
+
+        assert await cache.get_or_load(1, loader) == 'value'
+
+    async def test_lru_eviction(self, cache: SingleFlightCache):
+        for key in range(3):
+            async def loader():
+                return key
+
+            await cache.get_or_load(key, loader)
+
+        assert len(cache) == 2
+        assert cache.get_stats()['size'] == 2
+
+    async def test_ttl(self):
+        cache = SingleFlightCache(maxsize=2, ttl=0.01)
+
+        async def loader():
+            return 'value'
+
+        await cache.get_or_load(1, loader)
+        await asyncio.sleep(0.02)
+        await cache.get_or_load(1, loader)
+
+        assert cache.stats.misses == 2
@@ -0,0 +1,50 @@
+import json
+
+import msgpack
+import pytest
+
+from producer import CodecDeserializer, JsonCodec, MsgpackCodec, TopicCodecSerializer, decode_value, get_codec
+
+VALUE = {'id': 1, 'name': 'Pizza Margherita', 'image_url': 'https://example.com/1.png', 'price': 1000}
+
+
+class TestCodecs:
+
+    @pytest.mark.parametrize('codec', [JsonCodec(), MsgpackCodec()])
+    def test_round_trip(self, codec):
+        assert codec.decode(codec.encode(VALUE)) == VALUE
+
+    def test_get_codec(self):
+        assert isinstance(get_codec('json'), JsonCodec)
+        assert isinstance(get_codec('msgpack'), MsgpackCodec)
+        assert get_codec('json') is get_codec('json')
+
+        with pytest.raises(ValueError):
+            get_codec('xml')
+
+    @pytest.mark.parametrize('data', [
+        json.dumps(VALUE).encode('ascii'),
+        json.dumps(VALUE, indent=2).encode('ascii'),
+        msgpack.packb(VALUE),
+        msgpack.packb({str(key): key for key in range(20)}),
+    ])
+    def test_decode_value(self, data):
+        assert decode_value(data) in (VALUE, {str(key): key for key in range(20)})
+
+    def test_decode_tombstone(self):
+        assert decode_value(None) is None
+
+    def test_topic_codec_serializer(self):
+        serializer = TopicCodecSerializer({'menu_review': 'msgpack'})
+        deserializer = CodecDeserializer()
+
+        assert json.loads(serializer.serialize('menu_order', VALUE)) == VALUE
+        assert msgpack.unpackb(serializer.serialize('menu_review', VALUE)) == VALUE
+        assert deserializer.deserialize('menu_review', serializer.serialize('menu_review', VALUE)) == VALUE
+        assert serializer.serialize('menu_order', None) is None
+
+    def test_topic_codec_serializer_raw_value(self):
+        serializer = TopicCodecSerializer({'menu_review': 'msgpack'})
+
+        # Republished messages are sent as they were fetched
+        assert serializer.serialize('menu_review', b'{"id": 1}') == b'{"id": 1}'
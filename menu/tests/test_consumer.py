@@ -0,0 +1,563 @@
+import asyncio
+import time
+from threading import Event, Lock
+from typing import Callable, List, Optional, Tuple
+
+import pytest
+from kafka.consumer.fetcher import ConsumerRecord
+from kafka.structs import TopicPartition
+
+from consumer import ConsumerEvent, KafkaBroadcastReceiver, KafkaReceiver, RestaurantCreatedEvent, RestaurantManagerCreatedEvent, \
+    RestaurantUpdatedEvent, RetryPolicy, LEGACY_VERSION, get_message_version, redrive_dead_letters
+from consumer.schemas import RestaurantUpdatedSchema
+from consumer.utils import get_event_name
+from tests.conftest import async_session_maker
+from benchmarks.kafka import FakeKafkaConsumer, FakePublisher
+from uow import SqlAlchemyUnitOfWork
+
+
+def make_message(key: Optional[str], headers: List[Tuple[str, bytes]]) -> ConsumerRecord:
+    return ConsumerRecord(topic='restaurant_menu', partition=0, offset=0, timestamp=0, timestamp_type=0,
+                          key=key, value={'id': 1}, headers=headers, checksum=None,
+                          serialized_key_size=-1, serialized_value_size=-1, serialized_header_size=-1)
+
+
+def wait_until(predicate: Callable[[], bool], timeout: float = 5):
+    deadline = time.monotonic() + timeout
+
+    while not predicate():
+        assert time.monotonic() < deadline, "Timed out"
+        time.sleep(0.005)
+
+
+class RecordedEvent(ConsumerEvent[RestaurantUpdatedSchema]):
+    """
+    Event which records processed messages and how many of them are processed at once.
+    """
+
+    schema_class = RestaurantUpdatedSchema
+
+    lock = Lock()
+    processed: List[int] = list()
+    in_progress = 0
+    max_in_progress = 0
+    delay = 0.0
+    gate: Optional[Event] = None
+
+    @classmethod
+    def reset(cls, delay: float = 0.0, gate: Optional[Event] = None):
+        cls.processed = list()
+        cls.in_progress = 0
+        cls.max_in_progress = 0
+        cls.delay = delay
+        cls.gate = gate
+
+    async def action(self, uow):
+        cls = type(self)
+
+        with cls.lock:
+            cls.in_progress += 1
+            cls.max_in_progress = max(cls.max_in_progress, cls.in_progress)
+
+        await asyncio.sleep(cls.delay)
+
+        if cls.gate is not None and not self._data.is_active:
+            await asyncio.to_thread(cls.gate.wait)
+
+        with cls.lock:
+            cls.in_progress -= 1
+            cls.processed.append(self._data.id)
+
+
+class RecordedBatchEvent(RecordedEvent):
+    """
+    Event which records the sizes of applied batches and fails batches containing an inactive restaurant.
+    """
+
+    supports_batch = True
+
+    batch_sizes: List[int] = list()
+
+    @classmethod
+    def reset(cls, delay: float = 0.0, gate: Optional[Event] = None):
+        super().reset(delay, gate)
+        cls.batch_sizes = list()
+
+    @classmethod
+    async def action_batch(cls, events: List["RecordedBatchEvent"], uow):
+        if any(not event._data.is_active for event in events):
+            raise ValueError("Inactive restaurant")
+
+        await asyncio.sleep(cls.delay)
+
+        with cls.lock:
+            cls.batch_sizes.append(len(events))
+            cls.processed.extend(event._data.id for event in events)
+
+
+class FailingEvent(RecordedEvent):
+    """
+    Event which fails messages of inactive restaurants with the given error.
+    """
+
+    error: Exception = ConnectionError("Database is unavailable")
+
+    async def action(self, uow):
+        if not self._data.is_active:
+            raise type(self).error
+
+        await super().action(uow)
+
+
+class InvalidatedEvent(RecordedEvent):
+    """
+    Event which records invalidated messages.
+    """
+
+    invalidated: List[int] = list()
+
+    @classmethod
+    def reset(cls, delay: float = 0.0, gate: Optional[Event] = None):
+        super().reset(delay, gate)
+        cls.invalidated = list()
+
+    async def invalidate(self, uow):
+        with type(self).lock:
+            type(self).invalidated.append(self._data.id)
+
+
+def get_headers(headers: List[Tuple[str, bytes]]) -> dict:
+    return {header: value.decode() for header, value in headers}
+
+
+class TestGetEventName:
+
+    @pytest.mark.parametrize(
+        "key, headers, expected_event_name",
+        [
+            ('1', [('event_name', b'RestaurantUpdatedEvent')], 'RestaurantUpdatedEvent'),
+            (None, [('trace_id', b'abc'), ('event_name', b'RestaurantUpdatedEvent')], 'RestaurantUpdatedEvent'),
+            # Messages published before the event name was moved to the header
+            ('RestaurantUpdatedEvent', [], 'RestaurantUpdatedEvent'),
+            (None, [], None),
+        ]
+    )
+    def test_get_event_name(self, key: Optional[str], headers: List[Tuple[str, bytes]],
+                            expected_event_name: Optional[str]):
+        assert get_event_name(make_message(key, headers)) == expected_event_name
+
+
+class TestReplicaEvents:
+
+    @staticmethod
+    def get_uow() -> SqlAlchemyUnitOfWork:
+        return SqlAlchemyUnitOfWork(async_session_maker)
+
+    async def retrieve_restaurant(self) -> Tuple[bool, int, Optional[int]]:
+        async with self.get_uow() as uow:
+            restaurant = await uow.restaurants.retrieve(1)
+            manager = await uow.managers.retrieve(2)
+
+            return restaurant.is_active, restaurant.version, manager.restaurant_id
+
+    async def test_redelivery(self):
+        await RestaurantManagerCreatedEvent({'id': 2}, version=0).action(self.get_uow())
+
+        for _ in range(2):
+            await RestaurantManagerCreatedEvent({'id': 2}, version=0).action(self.get_uow())
+            await RestaurantCreatedEvent({'id': 1, 'restaurant_manager_id': 2, 'is_active': False},
+                                         version=1).action(self.get_uow())
+
+        assert await self.retrieve_restaurant() == (False, 1, 1)
+
+    async def test_stale_event(self):
+        await RestaurantManagerCreatedEvent({'id': 2}, version=0).action(self.get_uow())
+        await RestaurantCreatedEvent({'id': 1, 'restaurant_manager_id': 2, 'is_active': False},
+                                     version=1).action(self.get_uow())
+        await RestaurantUpdatedEvent({'id': 1, 'is_active': True}, version=3).action(self.get_uow())
+        await RestaurantUpdatedEvent({'id': 1, 'is_active': False}, version=2).action(self.get_uow())
+
+        assert await self.retrieve_restaurant() == (True, 3, 1)
+
+
+class TestKafkaReceiver:
+
+    @pytest.fixture(scope='function')
+    def consumer(self) -> FakeKafkaConsumer:
+        return FakeKafkaConsumer('restaurant_menu', partitions_count=4)
+
+    def produce(self, consumer: FakeKafkaConsumer, aggregates_count: int, messages_count: int):
+        # IDs of an aggregate's messages grow, so the order of processing can be checked
+        for number in range(messages_count):
+            for aggregate in range(aggregates_count):
+                consumer.produce(RecordedEvent.get_event_name(), str(aggregate),
+                                 {'id': number * aggregates_count + aggregate, 'is_active': True})
+
+    def start(self, consumer: FakeKafkaConsumer, events: List[type] = (RecordedEvent, ),
+              **kwargs) -> KafkaReceiver:
+        receiver = KafkaReceiver(consumer, list(events), **kwargs)
+        receiver.start_receiving()
+        return receiver
+
+    def test_receive(self, consumer: FakeKafkaConsumer):
+        RecordedEvent.reset(delay=0.005)
+        self.produce(consumer, aggregates_count=8, messages_count=10)
+
+        receiver = self.start(consumer, workers_count=4)
+        wait_until(consumer.is_consumed)
+        receiver.stop(timeout=5)
+
+        assert sorted(RecordedEvent.processed) == list(range(80))
+        assert 1 < RecordedEvent.max_in_progress <= 4
+        assert consumer.closed
+
+        for aggregate in range(8):
+            ids = [id for id in RecordedEvent.processed if id % 8 == aggregate]
+            assert ids == sorted(ids)
+
+    def test_commit_after_processing(self, consumer: FakeKafkaConsumer):
+        gate = Event()
+        RecordedEvent.reset(gate=gate)
+
+        blocked = consumer.produce(RecordedEvent.get_event_name(), '1', {'id': 0, 'is_active': False})
+        consumer.produce(RecordedEvent.get_event_name(), '1', {'id': 1, 'is_active': True})
+        partition = TopicPartition(blocked.topic, blocked.partition)
+
+        receiver = self.start(consumer)
+
+        try:
+            wait_until(lambda: RecordedEvent.in_progress == 1)
+            time.sleep(0.05)
+
+            assert consumer.committed.get(partition, 0) == 0
+        finally:
+            gate.set()
+
+        wait_until(lambda: consumer.committed.get(partition) == 2)
+        receiver.stop(timeout=5)
+
+        assert RecordedEvent.processed == [0, 1]
+
+    def test_backpressure(self, consumer: FakeKafkaConsumer):
+        RecordedEvent.reset(delay=0.001)
+        self.produce(consumer, aggregates_count=4, messages_count=50)
+
+        receiver = self.start(consumer, workers_count=1, partition_queue_maxsize=5, max_poll_records=40)
+        wait_until(consumer.is_consumed)
+        receiver.stop(timeout=5)
+
+        assert consumer.paused_partitions
+        assert consumer.paused() == set()
+        assert sorted(RecordedEvent.processed) == list(range(200))
+
+    def test_revoke(self, consumer: FakeKafkaConsumer):
+        RecordedEvent.reset(delay=0.002)
+        self.produce(consumer, aggregates_count=4, messages_count=25)
+
+        receiver = self.start(consumer, workers_count=2)
+        wait_until(lambda: len(RecordedEvent.processed) >= 10)
+        consumer.revoke(*consumer.assignment())
+        wait_until(consumer.is_consumed)
+        receiver.stop(timeout=5)
+
+        # Queued messages of revoked partitions are fetched again, so every message is processed at least once
+        assert set(RecordedEvent.processed) == set(range(100))
+
+    def test_stop(self, consumer: FakeKafkaConsumer):
+        RecordedEvent.reset(delay=0.01)
+        self.produce(consumer, aggregates_count=4, messages_count=25)
+
+        receiver = self.start(consumer, workers_count=2)
+        wait_until(lambda: len(RecordedEvent.processed) >= 4)
+        receiver.stop(timeout=5)
+
+        processed = len(RecordedEvent.processed)
+
+        assert consumer.closed
+        assert processed < 100
+        assert sum(consumer.committed.values()) == processed
+
+    def test_batch(self, consumer: FakeKafkaConsumer):
+        RecordedBatchEvent.reset(delay=0.005)
+
+        for number in range(40):
+            consumer.produce(RecordedBatchEvent.get_event_name(), '1', {'id': number, 'is_active': True})
+
+        receiver = self.start(consumer, [RecordedBatchEvent], workers_count=1, batch_max_size=8)
+        wait_until(consumer.is_consumed)
+        receiver.stop(timeout=5)
+
+        assert RecordedBatchEvent.processed == list(range(40))
+        assert max(RecordedBatchEvent.batch_sizes) == 8
+        assert len(RecordedBatchEvent.batch_sizes) < 40
+
+    def test_batch_split_by_event(self, consumer: FakeKafkaConsumer):
+        RecordedEvent.reset()
+        RecordedBatchEvent.reset()
+
+        for number in range(6):
+            event_class = RecordedEvent if number == 3 else RecordedBatchEvent
+            consumer.produce(event_class.get_event_name(), '1', {'id': number, 'is_active': True})
+
+        receiver = self.start(consumer, [RecordedEvent, RecordedBatchEvent], batch_max_wait_ms=100)
+        wait_until(consumer.is_consumed)
+        receiver.stop(timeout=5)
+
+        assert RecordedBatchEvent.processed == [0, 1, 2, 4, 5]
+        assert RecordedEvent.processed == [3]
+        assert RecordedBatchEvent.batch_sizes == [3, 2]
+
+    def test_batch_failure(self, consumer: FakeKafkaConsumer):
+        RecordedBatchEvent.reset()
+
+        for number in range(5):
+            consumer.produce(RecordedBatchEvent.get_event_name(), '1', {'id': number, 'is_active': number != 2})
+
+        receiver = self.start(consumer, [RecordedBatchEvent], batch_max_wait_ms=100)
+        wait_until(consumer.is_consumed)
+        receiver.stop(timeout=5)
+
+        # The failed batch is applied one by one
+        assert RecordedBatchEvent.processed == list(range(5))
+        assert RecordedBatchEvent.batch_sizes == []
+
+
+class TestRetryPolicy:
+
+    @pytest.fixture(scope='function')
+    def publisher(self) -> FakePublisher:
+        return FakePublisher()
+
+    @pytest.mark.parametrize(
+        "headers, error, expected_topic, expected_attempt",
+        [
+            ([], ConnectionError(), 'restaurant_menu.retry.1', '1'),
+            ([('original_topic', b'restaurant_menu'), ('original_partition', b'0'), ('original_offset', b'0'),
+              ('retry_attempt', b'1')], ConnectionError(), 'restaurant_menu.retry.2', '2'),
+            ([('original_topic', b'restaurant_menu'), ('original_partition', b'0'), ('original_offset', b'0'),
+              ('retry_attempt', b'2')], ConnectionError(), 'restaurant_menu.dlq', '2'),
+            ([], ValueError(), 'restaurant_menu.dlq', '0'),
+        ]
+    )
+    def test_reroute(self, publisher: FakePublisher, headers: List[Tuple[str, bytes]], error: Exception,
+                     expected_topic: str, expected_attempt: str):
+        message = make_message('1', [('event_name', b'RecordedEvent')] + headers)
+
+        RetryPolicy(publisher, max_attempts=2).reroute(message, error)
+
+        [(topic, key, value, rerouted_headers)] = publisher.delivered_records
+        rerouted_headers = get_headers(rerouted_headers)
+
+        assert (topic, key, value) == (expected_topic, '1', message.value)
+        assert rerouted_headers['event_name'] == 'RecordedEvent'
+        assert rerouted_headers['original_topic'] == 'restaurant_menu'
+        assert rerouted_headers['original_offset'] == '0'
+        assert rerouted_headers['retry_attempt'] == expected_attempt
+        assert rerouted_headers['error_type'] == type(error).__name__
+        assert ('retry_at' in rerouted_headers) == (expected_topic != 'restaurant_menu.dlq')
+
+    def test_get_message_version(self):
+        assert get_message_version(make_message('1', [('event_name', b'RecordedEvent')])) == 0
+        assert get_message_version(make_message('1', [('event_name', b'RecordedEvent'),
+                                                      ('original_offset', b'42')])) == 42
+
+        # Messages keyed by event names, original and rerouted, are legacy
+        assert get_message_version(make_message('RecordedEvent', [])) == LEGACY_VERSION
+        assert get_message_version(make_message('RecordedEvent', [('event_name', b'RecordedEvent'),
+                                                                  ('original_offset', b'42')])) == LEGACY_VERSION
+
+    def test_redrive_dead_letters(self, publisher: FakePublisher):
+        consumer = FakeKafkaConsumer('restaurant_menu.dlq', partitions_count=1)
+        consumer.produce('RecordedEvent', '1', {'id': 1},
+                         [('original_topic', b'restaurant_menu'), ('original_partition', b'3'),
+                          ('original_offset', b'42'), ('retry_attempt', b'0'), ('error_type', b'ValueError')])
+
+        offsets = redrive_dead_letters(consumer.poll()[TopicPartition('restaurant_menu.dlq', 0)], publisher)
+
+        [(topic, key, value, headers)] = publisher.delivered_records
+
+        # Messages are republished as they were fetched
+        assert (topic, key, value) == ('restaurant_menu', b'1', b'{"id":1}')
+        assert get_headers(headers) == {'event_name': 'RecordedEvent', 'original_topic': 'restaurant_menu',
+                                        'original_partition': '3', 'original_offset': '42'}
+        assert offsets == {TopicPartition('restaurant_menu.dlq', 0): 1}
+
+
+class TestKafkaReceiverRetry:
+
+    @pytest.fixture(scope='function')
+    def consumer(self) -> FakeKafkaConsumer:
+        return FakeKafkaConsumer('restaurant_menu', partitions_count=4)
+
+    @pytest.fixture(scope='function')
+    def publisher(self) -> FakePublisher:
+        return FakePublisher()
+
+    def start(self, consumer: FakeKafkaConsumer, publisher: FakePublisher) -> KafkaReceiver:
+        receiver = KafkaReceiver(consumer, [FailingEvent], retry_policy=RetryPolicy(publisher))
+        receiver.start_receiving()
+        return receiver
+
+    @pytest.mark.parametrize(
+        "error, expected_topic",
+        [
+            (ConnectionError("Database is unavailable"), 'restaurant_menu.retry.1'),
+            (ValueError("Invalid restaurant"), 'restaurant_menu.dlq'),
+        ]
+    )
+    def test_failed_message_doesnt_block_partition(self, consumer: FakeKafkaConsumer, publisher: FakePublisher,
+                                                   error: Exception, expected_topic: str):
+        FailingEvent.reset()
+        FailingEvent.error = error
+
+        consumer.produce(FailingEvent.get_event_name(), '1', {'id': 0, 'is_active': False})
+        consumer.produce(FailingEvent.get_event_name(), '1', {'id': 1, 'is_active': True})
+
+        receiver = self.start(consumer, publisher)
+        wait_until(consumer.is_consumed)
+        receiver.stop(timeout=5)
+
+        assert FailingEvent.processed == [1]
+        assert [record[0] for record in publisher.delivered_records] == [expected_topic]
+
+    @pytest.mark.parametrize(
+        "event_name, value, headers, expected_error_type",
+        [
+            ('FailingEvent', b'{"id": 0, "is_active"', [], 'JSONDecodeError'),
+            ('UnknownEvent', b'{"id": 0, "is_active": true}', [], 'UnknownEventError'),
+            ('FailingEvent', b'{"id": 0, "is_active": true}', [('retry_at', b'soon')], 'ValueError'),
+            ('FailingEvent', b'{"id": 0, "is_active": true}', [('original_offset', b'\xff')], 'UnicodeDecodeError'),
+        ]
+    )
+    def test_undecodable_message_is_dead_lettered(self, consumer: FakeKafkaConsumer, publisher: FakePublisher,
+                                                  event_name: str, value: bytes, headers: List[Tuple[str, bytes]],
+                                                  expected_error_type: str):
+        FailingEvent.reset()
+
+        message = consumer.produce(event_name, '1', value, headers)
+        consumer.produce(FailingEvent.get_event_name(), '1', {'id': 1, 'is_active': True})
+
+        receiver = self.start(consumer, publisher)
+        wait_until(consumer.is_consumed)
+        receiver.stop(timeout=5)
+
+        [(topic, key, dead_letter_value, dead_letter_headers)] = publisher.delivered_records
+        dead_letter_headers = dict(dead_letter_headers)
+
+        assert FailingEvent.processed == [1]
+        assert (topic, key, dead_letter_value) == ('restaurant_menu.dlq', b'1', value)
+        assert dead_letter_headers['event_name'] == event_name.encode()
+        assert dead_letter_headers['original_partition'] == str(message.partition).encode()
+        assert dead_letter_headers['error_type'] == expected_error_type.encode()
+
+    def test_undecodable_message_in_batch(self, consumer: FakeKafkaConsumer, publisher: FakePublisher):
+        RecordedBatchEvent.reset()
+
+        consumer.produce(RecordedBatchEvent.get_event_name(), '1', {'id': 0, 'is_active': True})
+        consumer.produce(RecordedBatchEvent.get_event_name(), '1', b'\xc1')
+        consumer.produce(RecordedBatchEvent.get_event_name(), '1', {'id': 1, 'is_active': True})
+
+        receiver = KafkaReceiver(consumer, [RecordedBatchEvent], retry_policy=RetryPolicy(publisher))
+        receiver.start_receiving()
+        wait_until(consumer.is_consumed)
+        receiver.stop(timeout=5)
+
+        assert RecordedBatchEvent.processed == [0, 1]
+        assert [record[2] for record in publisher.delivered_records] == [b'\xc1']
+
+    def test_reroute_failure_blocks_partition(self, consumer: FakeKafkaConsumer):
+        FailingEvent.reset()
+        FailingEvent.error = ValueError("Invalid restaurant")
+
+        message = consumer.produce(FailingEvent.get_event_name(), '1', {'id': 0, 'is_active': False})
+        partition = TopicPartition(message.topic, message.partition)
+
+        receiver = self.start(consumer, FakePublisher(error=ConnectionError("Kafka is unavailable")))
+        time.sleep(0.2)
+        started_at = time.monotonic()
+        receiver.stop(timeout=5)
+
+        # The message is fetched again by the next owner of the partition
+        assert time.monotonic() - started_at < 1
+        assert consumer.committed.get(partition, 0) == 0
+
+    def test_delay(self, consumer: FakeKafkaConsumer, publisher: FakePublisher):
+        FailingEvent.reset()
+        retry_at = int(time.time() * 1000) + 300
+
+        delayed = consumer.produce(FailingEvent.get_event_name(), '1', {'id': 0, 'is_active': True},
+                                   [('retry_at', str(retry_at).encode()), ('retry_attempt', b'1')])
+        not_delayed_ids = list()
+
+        for id in range(1, 9):
+            message = consumer.produce(FailingEvent.get_event_name(), str(id + 1), {'id': id, 'is_active': True})
+
+            if message.partition != delayed.partition:
+                not_delayed_ids.append(id)
+
+        receiver = self.start(consumer, publisher)
+        wait_until(consumer.is_consumed)
+        receiver.stop(timeout=5)
+
+        # Messages of other partitions are not delayed
+        assert time.time() * 1000 >= retry_at
+        assert set(not_delayed_ids) <= set(FailingEvent.processed[:FailingEvent.processed.index(0)])
+        assert sorted(FailingEvent.processed) == list(range(9))
+
+    def test_stop_delayed(self, consumer: FakeKafkaConsumer, publisher: FakePublisher):
+        FailingEvent.reset()
+
+        message = consumer.produce(FailingEvent.get_event_name(), '1', {'id': 0, 'is_active': True},
+                                   [('retry_at', str(int(time.time() * 1000) + 60000).encode())])
+        partition = TopicPartition(message.topic, message.partition)
+
+        receiver = self.start(consumer, publisher)
+        time.sleep(0.1)
+        started_at = time.monotonic()
+        receiver.stop(timeout=5)
+
+        assert time.monotonic() - started_at < 1
+        assert consumer.closed
+        assert FailingEvent.processed == []
+        assert consumer.committed.get(partition, 0) == 0
+
+
+class TestKafkaBroadcastReceiver:
+
+    @pytest.fixture(scope='function')
+    def consumer(self) -> FakeKafkaConsumer:
+        return FakeKafkaConsumer('restaurant_menu', partitions_count=4)
+
+    def test_invalidate(self, consumer: FakeKafkaConsumer):
+        InvalidatedEvent.reset()
+
+        for id in range(4):
+            consumer.produce(InvalidatedEvent.get_event_name(), str(id), {'id': id, 'is_active': True})
+
+        consumer.produce(InvalidatedEvent.get_event_name(), '4', b'{')
+        consumer.produce(RecordedEvent.get_event_name(), '5', {'id': 5, 'is_active': True})
+
+        receiver = KafkaBroadcastReceiver(consumer, [InvalidatedEvent], repeat_delay=0.05)
+        receiver.start_receiving()
+        wait_until(lambda: len(InvalidatedEvent.invalidated) == 8)
+        receiver.stop(timeout=5)
+
+        # Every event is invalidated once it is received and once again after the delay
+        assert sorted(InvalidatedEvent.invalidated) == [0, 0, 1, 1, 2, 2, 3, 3]
+        assert InvalidatedEvent.processed == []
+        assert consumer.committed == {}
+        assert consumer.closed
+
+    def test_stop_cancels_repeats(self, consumer: FakeKafkaConsumer):
+        InvalidatedEvent.reset()
+        consumer.produce(InvalidatedEvent.get_event_name(), '1', {'id': 1, 'is_active': True})
+
+        receiver = KafkaBroadcastReceiver(consumer, [InvalidatedEvent], repeat_delay=60)
+        receiver.start_receiving()
+        wait_until(lambda: InvalidatedEvent.invalidated == [1])
+        started_at = time.monotonic()
+        receiver.stop(timeout=5)
+
+        assert time.monotonic() - started_at < 1
+        assert InvalidatedEvent.invalidated == [1]
+        assert consumer.closed
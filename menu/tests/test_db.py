@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine
+
+from config import get_settings
+from db.pool import InstrumentedAsyncAdaptedQueuePool, get_engine_options, pool_metrics
+
+
+class TestPoolMetrics:
+
+    @pytest.fixture(scope='function')
+    async def pool_engine(self, tmp_path) -> AsyncEngine:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'pool.sqlite3'}",
+                                     poolclass=InstrumentedAsyncAdaptedQueuePool,
+                                     pool_size=1, max_overflow=0, pool_timeout=0.1)
+        pool_metrics.reset()
+
+        yield engine
+
+        await engine.dispose()
+
+    async def test_checkouts(self, pool_engine: AsyncEngine):
+        async with pool_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            metrics = pool_metrics.snapshot()
+
+            assert metrics["checked_out"] == 1
+            assert metrics["checkouts"] == 1
+
+        async with pool_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+        metrics = pool_metrics.snapshot()
+
+        assert metrics["checked_out"] == 0
+        assert metrics["idle"] == 1
+        assert metrics["checkouts"] == 2
+        assert metrics["waiters"] == 0
+
+    async def test_is_exhausted(self, pool_engine: AsyncEngine):
+        assert not pool_engine.pool.is_exhausted()
+
+        # The only connection is checked out and the pool has no overflow, so other checkouts wait
+        async with pool_engine.connect():
+            assert pool_engine.pool.is_exhausted()
+
+        assert not pool_engine.pool.is_exhausted()
+        assert pool_metrics.snapshot()["waiters"] == 0
+
+    async def test_waiters_and_timeouts(self, pool_engine: AsyncEngine):
+        async with pool_engine.connect():
+            waiting = asyncio.create_task(pool_engine.connect().start())
+            await asyncio.sleep(0.05)
+
+            assert pool_metrics.snapshot()["waiters"] == 1
+
+            with pytest.raises(exc.TimeoutError):
+                await waiting
+
+        metrics = pool_metrics.snapshot()
+
+        assert metrics["waiters"] == 0
+        assert metrics["timeouts"] == 1
+        assert metrics["wait_time_max_seconds"] > 0
+
+
+class TestEngineOptions:
+
+    def test_pool_disabled(self, monkeypatch):
+        monkeypatch.setattr(get_settings(), "db_pool_enabled", False)
+
+        options = get_engine_options()
+
+        assert options["poolclass"].__name__ == "NullPool"
+        assert "pool_size" not in options
+
+    def test_pgbouncer_mode(self, monkeypatch):
+        monkeypatch.setattr(get_settings(), "db_pgbouncer_mode", True)
+
+        options = get_engine_options()
+        connect_args = options["connect_args"]
+
+        assert options["poolclass"] is InstrumentedAsyncAdaptedQueuePool
+        assert connect_args["statement_cache_size"] == 0
+        assert connect_args["prepared_statement_cache_size"] == 0
+        assert connect_args["prepared_statement_name_func"]() != connect_args["prepared_statement_name_func"]()
@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from discovery import MysteryBagDiscoveryIndex, DietaryFlag, get_dietary_mask, get_dietary_flag
+from models import MysteryBag
+
+
+def build_mystery_bag(id: int, restaurant_id: int = 1, available_quantity: int = 1,
+                      starts_in: int = -60, ends_in: int = 60, is_active: bool = True, **flags) -> MysteryBag:
+    now = datetime.utcnow()
+    dietary = dict(is_vegetarian=False, is_jain=False, is_vegan=False, is_halal=False,
+                   contains_dairy=False, contains_nuts=False, contains_gluten=False, contains_alcohol=False)
+    dietary.update(flags)
+
+    return MysteryBag(id=id, restaurant_id=restaurant_id, is_active=is_active,
+                      available_quantity=available_quantity,
+                      pickup_start_time=now + timedelta(minutes=starts_in),
+                      pickup_end_time=now + timedelta(minutes=ends_in),
+                      **dietary)
+
+
+class TestMysteryBagDiscoveryIndex:
+
+    @pytest.fixture(scope='function')
+    def index(self) -> MysteryBagDiscoveryIndex:
+        return MysteryBagDiscoveryIndex(capacity=2)
+
+    def test_get_dietary_mask(self):
+        mystery_bag = build_mystery_bag(1, is_vegetarian=True, is_jain=True, contains_nuts=True)
+        assert get_dietary_mask(mystery_bag) == DietaryFlag.VEGETARIAN | DietaryFlag.JAIN | DietaryFlag.NUTS
+
+    def test_get_dietary_flag(self):
+        assert get_dietary_flag(['vegetarian', 'JAIN']) == DietaryFlag.VEGETARIAN | DietaryFlag.JAIN
+        assert get_dietary_flag([]) == DietaryFlag(0)
+
+    def test_search_dietary(self, index: MysteryBagDiscoveryIndex):
+        index.rebuild([
+            build_mystery_bag(1, is_vegetarian=True, is_jain=True),
+            build_mystery_bag(2, is_vegetarian=True, is_jain=True, contains_nuts=True),
+            build_mystery_bag(3, is_vegetarian=True),
+            build_mystery_bag(4, is_halal=True),
+        ])
+
+        result = index.search(include=DietaryFlag.VEGETARIAN | DietaryFlag.JAIN, exclude=DietaryFlag.NUTS)
+        assert result.tolist() == [1]
+
+        result = index.search(include=DietaryFlag.VEGETARIAN)
+        assert sorted(result.tolist()) == [1, 2, 3]
+
+        result = index.search()
+        assert sorted(result.tolist()) == [1, 2, 3, 4]
+
+    def test_search_pickup_window(self, index: MysteryBagDiscoveryIndex):
+        index.rebuild([
+            build_mystery_bag(1),
+            build_mystery_bag(2, starts_in=30, ends_in=90),
+            build_mystery_bag(3, starts_in=-90, ends_in=-30),
+        ])
+
+        assert index.search().tolist() == [1]
+        assert sorted(index.search(at=datetime.utcnow() + timedelta(minutes=45)).tolist()) == [1, 2]
+
+    def test_search_restaurants_and_limit(self, index: MysteryBagDiscoveryIndex):
+        index.rebuild([
+            build_mystery_bag(1, restaurant_id=1, ends_in=30),
+            build_mystery_bag(2, restaurant_id=2, ends_in=10),
+            build_mystery_bag(3, restaurant_id=2, ends_in=20),
+        ])
+
+        assert sorted(index.search(restaurant_ids=[2]).tolist()) == [2, 3]
+        assert index.search(limit=2).tolist() == [2, 3]
+
+    def test_available_quantity(self, index: MysteryBagDiscoveryIndex):
+        index.rebuild([build_mystery_bag(1, available_quantity=1)])
+
+        index.set_available_quantity(1, 0)
+        assert index.search().tolist() == []
+
+        index.restock({1: 2})
+        assert index.search().tolist() == [1]
+
+        index.restock({1: -2})
+        assert index.search().tolist() == []
+
+    def test_upsert_and_remove(self, index: MysteryBagDiscoveryIndex):
+        index.upsert_many([build_mystery_bag(id) for id in range(1, 6)])
+        assert len(index) == 5
+
+        index.upsert(build_mystery_bag(3, is_vegan=True))
+        assert index.search(include=DietaryFlag.VEGAN).tolist() == [3]
+        assert len(index) == 5
+
+        index.upsert(build_mystery_bag(4, is_active=False))
+        assert 4 not in index
+
+        index.remove(5)
+        assert sorted(index.search().tolist()) == [1, 2, 3]
+
+    def test_remove_restaurant(self, index: MysteryBagDiscoveryIndex):
+        index.rebuild([
+            build_mystery_bag(1, restaurant_id=1),
+            build_mystery_bag(2, restaurant_id=2),
+            build_mystery_bag(3, restaurant_id=2),
+        ])
+
+        index.remove_restaurant(2)
+        assert index.search().tolist() == [1]
+
+    def test_evict_expired(self, index: MysteryBagDiscoveryIndex):
+        index.rebuild([
+            build_mystery_bag(1),
+            build_mystery_bag(2, starts_in=-180, ends_in=-120),
+            build_mystery_bag(3, starts_in=-60000, ends_in=-50000),
+        ])
+
+        assert index.evict_expired() == 2
+        assert len(index) == 1
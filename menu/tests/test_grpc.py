@@ -0,0 +1,193 @@
+import json
+import time
+
+import grpc
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+import grpc_files.generated.roles.roles_pb2 as pb2
+from grpc_files import CachedRolesClient, LocalRolesClient
+
+
+class FakeRolesClient:
+
+    def __init__(self):
+        self.calls = 0
+        self.error = None
+
+    async def get_user_role(self, access_token: str) -> pb2.GetUserRoleResponse:
+        self.calls += 1
+
+        if self.error:
+            raise grpc.aio.AioRpcError(self.error, grpc.aio.Metadata(), grpc.aio.Metadata(), "Invalid token")
+
+        user_id = jwt.decode(access_token, options={"verify_signature": False})["user_id"]
+        return pb2.GetUserRoleResponse(user_id=str(user_id), role=pb2.USER_ROLE_RESTAURANT_MANAGER)
+
+    async def close(self):
+        pass
+
+
+def generate_access_token(user_id: int, expires_in: float = 3600, issued_in: float = 0, **claims) -> str:
+    payload = {
+        "token_type": "access",
+        "user_id": user_id,
+        "iat": int(time.time() + issued_in),
+        "exp": int(time.time() + expires_in),
+        **claims
+    }
+    return jwt.encode(payload, "secret")
+
+
+def generate_claims_access_token(user_id: int, **claims) -> str:
+    claims = {"role": "RM", "is_active": True, "is_email_verified": True, **claims}
+    return generate_access_token(user_id, **claims)
+
+
+class TestCachedRolesClient:
+
+    @pytest.fixture(scope='function')
+    def client(self) -> FakeRolesClient:
+        return FakeRolesClient()
+
+    @pytest.fixture(scope='function')
+    def cached_client(self, client: FakeRolesClient) -> CachedRolesClient:
+        return CachedRolesClient(client, maxsize=16, ttl=60, negative_ttl=60)
+
+    async def test_get_user_role(self, client: FakeRolesClient, cached_client: CachedRolesClient):
+        access_token = generate_access_token(1)
+
+        first_response = await cached_client.get_user_role(access_token)
+        second_response = await cached_client.get_user_role(access_token)
+
+        assert first_response.user_id == second_response.user_id == "1"
+        assert client.calls == 1
+
+    async def test_get_user_role_expired_token(self, client: FakeRolesClient, cached_client: CachedRolesClient):
+        access_token = generate_access_token(1, expires_in=-1)
+
+        await cached_client.get_user_role(access_token)
+        await cached_client.get_user_role(access_token)
+
+        assert client.calls == 2
+
+    @pytest.mark.parametrize(
+        "status_code", [
+            grpc.StatusCode.UNAUTHENTICATED,
+            grpc.StatusCode.INVALID_ARGUMENT,
+        ]
+    )
+    async def test_get_user_role_rejected_token(self, client: FakeRolesClient, cached_client: CachedRolesClient,
+                                                status_code: grpc.StatusCode):
+        client.error = status_code
+
+        for _ in range(2):
+            with pytest.raises(grpc.RpcError) as e:
+                await cached_client.get_user_role("invalid")
+
+            assert e.value.code() == status_code
+
+        assert client.calls == 1
+
+    async def test_get_user_role_unavailable(self, client: FakeRolesClient, cached_client: CachedRolesClient):
+        client.error = grpc.StatusCode.UNAVAILABLE
+
+        for _ in range(2):
+            with pytest.raises(grpc.RpcError):
+                await cached_client.get_user_role(generate_access_token(1))
+
+        assert client.calls == 2
+
+    async def test_invalidate_user(self, client: FakeRolesClient, cached_client: CachedRolesClient):
+        first_access_token = generate_access_token(1)
+        second_access_token = generate_access_token(2)
+
+        await cached_client.get_user_role(first_access_token)
+        await cached_client.get_user_role(second_access_token)
+
+        cached_client.invalidate_user(1)
+
+        await cached_client.get_user_role(first_access_token)
+        await cached_client.get_user_role(second_access_token)
+
+        assert client.calls == 3
+
+
+class TestLocalRolesClient:
+
+    @pytest.fixture(scope='function')
+    def client(self) -> FakeRolesClient:
+        return FakeRolesClient()
+
+    @pytest.fixture(scope='function')
+    def local_client(self, client: FakeRolesClient, monkeypatch) -> LocalRolesClient:
+        cached_client = CachedRolesClient(client, maxsize=16, ttl=60, negative_ttl=60)
+
+        # Pretend that the client has been running for a while, so just issued tokens are trusted
+        started_at = time.time() - 60
+        monkeypatch.setattr(time, "time", lambda: started_at)
+        local_client = LocalRolesClient(cached_client, algorithm="HS256", verifying_key="secret")
+        monkeypatch.undo()
+
+        return local_client
+
+    async def test_get_user_role(self, client: FakeRolesClient, local_client: LocalRolesClient):
+        response = await local_client.get_user_role(generate_claims_access_token(1))
+
+        assert response.user_id == "1"
+        assert response.role == pb2.USER_ROLE_RESTAURANT_MANAGER
+        assert client.calls == 0
+
+    @pytest.mark.parametrize(
+        "access_token", [
+            generate_access_token(1),
+            generate_claims_access_token(1, is_email_verified=False),
+            generate_claims_access_token(1, is_active=False),
+            generate_claims_access_token(1, token_type="refresh"),
+            generate_claims_access_token(1, issued_in=-120),
+            generate_claims_access_token(1) + "x",
+        ]
+    )
+    async def test_get_user_role_fallback(self, client: FakeRolesClient, local_client: LocalRolesClient,
+                                          access_token: str):
+        response = await local_client.get_user_role(access_token)
+
+        assert response.user_id == "1"
+        assert client.calls == 1
+
+    async def test_get_user_role_expired_token(self, client: FakeRolesClient, local_client: LocalRolesClient):
+        with pytest.raises(grpc.RpcError) as e:
+            await local_client.get_user_role(generate_claims_access_token(1, expires_in=-60))
+
+        assert e.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+        assert client.calls == 0
+
+    async def test_invalidate_user(self, client: FakeRolesClient, local_client: LocalRolesClient):
+        access_token = generate_claims_access_token(1)
+
+        await local_client.get_user_role(access_token)
+        local_client.invalidate_user(1)
+        await local_client.get_user_role(access_token)
+
+        assert client.calls == 1
+
+    async def test_get_user_role_jwks_file(self, client: FakeRolesClient, tmp_path, monkeypatch):
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+        jwks_file = tmp_path / "jwks.json"
+        jwks_file.write_text(json.dumps({"keys": [{**jwk, "kid": "1", "alg": "RS256", "use": "sig"}]}))
+
+        started_at = time.time() - 60
+        monkeypatch.setattr(time, "time", lambda: started_at)
+        local_client = LocalRolesClient(CachedRolesClient(client, maxsize=16, ttl=60, negative_ttl=60),
+                                        algorithm="RS256", jwks_file=str(jwks_file))
+        monkeypatch.undo()
+
+        payload = jwt.decode(generate_claims_access_token(1), "secret", algorithms=["HS256"])
+        access_token = jwt.encode(payload, private_key, algorithm="RS256", headers={"kid": "1"})
+
+        response = await local_client.get_user_role(access_token)
+
+        assert response.user_id == "1"
+        assert client.calls == 0
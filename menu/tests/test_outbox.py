@@ -0,0 +1,145 @@
+import asyncio
+from threading import Timer
+
+import pytest
+from kafka.errors import KafkaTimeoutError
+
+from outbox import OutboxNotifier
+from producer.events import MenuItemDeletedEvent, MenuItemUpdatedEvent
+from producer.schemas import MenuItemDeletedSchema, MenuItemUpdatedSchema
+from services import OutboxService
+from benchmarks.kafka import FakePublisher
+from tests.conftest import async_session_maker
+from uow import SqlAlchemyUnitOfWork
+from utils import uow_transaction, uow_transaction_with_commit
+
+
+def get_uow() -> SqlAlchemyUnitOfWork:
+    return SqlAlchemyUnitOfWork(async_session_maker)
+
+
+class TestOutboxService:
+
+    @pytest.fixture(scope='function', autouse=True)
+    def topics(self, monkeypatch):
+        monkeypatch.setattr(MenuItemUpdatedEvent, "_topics_schemas", {'menu_order': MenuItemUpdatedSchema})
+        monkeypatch.setattr(MenuItemDeletedEvent, "_topics_schemas", {'menu_order': MenuItemDeletedSchema,
+                                                                      'menu_review': MenuItemDeletedSchema})
+
+    async def test_add_event(self, uow: SqlAlchemyUnitOfWork):
+        await uow.add_event(MenuItemDeletedEvent(id=1))
+
+        messages = await uow.outbox.claim_pending(limit=10, claim_seconds=60)
+
+        assert [(message.topic, message.event_name, message.aggregate_id, message.payload)
+                for message in messages] == [
+            ('menu_order', 'MenuItemDeletedEvent', '1', {'id': 1}),
+            ('menu_review', 'MenuItemDeletedEvent', '1', {'id': 1}),
+        ]
+
+    async def test_add_event_rollback(self, uow: SqlAlchemyUnitOfWork):
+        await uow.add_event(MenuItemDeletedEvent(id=1))
+        await uow.rollback()
+
+        assert await uow.outbox.claim_pending(limit=10, claim_seconds=60) == []
+
+    async def test_claim_pending_skips_claimed(self):
+        async with uow_transaction_with_commit(get_uow()) as uow:
+            await uow.add_event(MenuItemUpdatedEvent(id=1, name="Old", image_url="url", price=100))
+            await uow.add_event(MenuItemUpdatedEvent(id=2, name="Old", image_url="url", price=100))
+
+        async with uow_transaction_with_commit(get_uow()) as uow:
+            claimed = await uow.outbox.claim_pending(limit=1, claim_seconds=60)
+
+        async with uow_transaction_with_commit(get_uow()) as uow:
+            other_claimed = await uow.outbox.claim_pending(limit=10, claim_seconds=60)
+
+        assert [message.aggregate_id for message in claimed] == ['1']
+        assert [message.aggregate_id for message in other_claimed] == ['2']
+
+    async def test_claim_pending_skips_aggregates_with_claimed_messages(self):
+        async with uow_transaction_with_commit(get_uow()) as uow:
+            await uow.add_event(MenuItemUpdatedEvent(id=1, name="Old", image_url="url", price=100))
+            await uow.add_event(MenuItemUpdatedEvent(id=1, name="New", image_url="url", price=100))
+            await uow.add_event(MenuItemUpdatedEvent(id=2, name="New", image_url="url", price=100))
+
+        async with uow_transaction_with_commit(get_uow()) as uow:
+            claimed = await uow.outbox.claim_pending(limit=1, claim_seconds=60)
+
+        # The newer message of the first aggregate waits until the older one is published
+        async with uow_transaction_with_commit(get_uow()) as uow:
+            other_claimed = await uow.outbox.claim_pending(limit=10, claim_seconds=60)
+
+        assert [message.payload['name'] for message in claimed] == ["Old"]
+        assert [message.aggregate_id for message in other_claimed] == ['2']
+
+        async with uow_transaction_with_commit(get_uow()) as uow:
+            await uow.outbox.delete_many([message.id for message in claimed])
+
+        async with uow_transaction_with_commit(get_uow()) as uow:
+            claimed = await uow.outbox.claim_pending(limit=10, claim_seconds=60)
+
+        assert [message.payload['name'] for message in claimed] == ["New"]
+
+    async def test_claim_pending_expired(self):
+        async with uow_transaction_with_commit(get_uow()) as uow:
+            await uow.add_event(MenuItemUpdatedEvent(id=1, name="Old", image_url="url", price=100))
+
+        async with uow_transaction_with_commit(get_uow()) as uow:
+            await uow.outbox.claim_pending(limit=10, claim_seconds=-1)
+
+        async with uow_transaction(get_uow()) as uow:
+            assert len(await uow.outbox.claim_pending(limit=10, claim_seconds=60)) == 1
+
+    async def test_relay_messages(self):
+        publisher = FakePublisher()
+        service = OutboxService(publisher)
+
+        async with uow_transaction_with_commit(get_uow()) as uow:
+            await uow.add_event(MenuItemUpdatedEvent(id=1, name="Old", image_url="url", price=100))
+            await uow.add_event(MenuItemDeletedEvent(id=2))
+            await uow.add_event(MenuItemUpdatedEvent(id=1, name="New", image_url="url", price=100))
+
+        assert await service.relay_messages(get_uow, limit=2) == 2
+        assert await service.relay_messages(get_uow, limit=10) == 2
+        assert await service.relay_messages(get_uow, limit=10) == 0
+
+        assert [(topic, event_name, key) for topic, event_name, key, _ in publisher.delivered] == [
+            ('menu_order', 'MenuItemUpdatedEvent', '1'),
+            ('menu_order', 'MenuItemDeletedEvent', '2'),
+            ('menu_review', 'MenuItemDeletedEvent', '2'),
+            ('menu_order', 'MenuItemUpdatedEvent', '1'),
+        ]
+        assert publisher.delivered[0][3]['name'] == "Old"
+        assert publisher.delivered[3][3]['name'] == "New"
+
+    async def test_relay_messages_failed(self):
+        service = OutboxService(FakePublisher(error=KafkaTimeoutError()))
+
+        async with uow_transaction_with_commit(get_uow()) as uow:
+            await uow.add_event(MenuItemDeletedEvent(id=1))
+
+        with pytest.raises(KafkaTimeoutError):
+            await service.relay_messages(get_uow, limit=10)
+
+        # Messages of the failed batch are released, so they are published again at once
+        async with uow_transaction(get_uow()) as uow:
+            assert len(await uow.outbox.claim_pending(limit=10, claim_seconds=60)) == 2
+
+
+class TestOutboxNotifier:
+
+    async def test_wait_timeout(self):
+        notifier = OutboxNotifier()
+
+        assert not await notifier.wait(0.01)
+
+    async def test_notify_from_other_thread(self):
+        notifier = OutboxNotifier()
+
+        # The first wait binds the notifier to the running loop
+        await notifier.wait(0)
+
+        Timer(0.01, notifier.notify).start()
+
+        assert await asyncio.wait_for(notifier.wait(5), 1)
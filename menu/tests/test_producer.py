@@ -0,0 +1,156 @@
+from threading import Event, Timer
+from typing import List, Optional, Tuple
+
+import pytest
+from kafka.errors import KafkaTimeoutError
+from kafka.future import Future
+
+from producer import KafkaPublisher
+from producer.events import MenuItemCreatedEvent, MenuItemDeletedEvent, get_schema_id
+from producer.schemas import MenuItemCreatedSchema, MenuItemDeletedSchema
+
+
+class FakeKafkaProducer:
+    """
+    Kafka producer which keeps sent messages and resolves their futures on flush.
+    """
+
+    def __init__(self, error: Optional[Exception] = None):
+        self.error = error
+        self.sent: List[Tuple[str, Optional[str], dict, List[Tuple[str, bytes]]]] = list()
+        self.futures: List[Future] = list()
+        self.closed = False
+        self.send_allowed = Event()
+        self.send_allowed.set()
+
+    def send(self, topic: str, key: Optional[str], value: dict, headers: List[Tuple[str, bytes]]) -> Future:
+        self.send_allowed.wait()
+        self.sent.append((topic, key, value, headers))
+        future = Future()
+        self.futures.append(future)
+        return future
+
+    def flush(self, timeout: Optional[float] = None):
+        for future in self.futures:
+            if not future.is_done:
+                future.failure(self.error) if self.error else future.success(None)
+
+    def close(self, timeout: Optional[float] = None):
+        self.closed = True
+
+
+class TestKafkaPublisher:
+
+    @pytest.fixture(scope='function', autouse=True)
+    def topics(self, monkeypatch):
+        monkeypatch.setattr(MenuItemDeletedEvent, "_topics_schemas", {'menu_order': MenuItemDeletedSchema})
+
+    def test_publish(self):
+        producer = FakeKafkaProducer()
+        publisher = KafkaPublisher(producer)
+
+        publisher.publish(MenuItemDeletedEvent(id=1))
+        publisher.flush(timeout=1)
+
+        # Events of a menu item share the key, so they land on the same partition
+        assert producer.sent == [('menu_order', '1', {'id': 1}, [('event_name', b'MenuItemDeletedEvent')])]
+
+        metrics = publisher.metrics.snapshot()
+
+        assert metrics["enqueued"] == 1
+        assert metrics["sent"] == 1
+        assert metrics["delivered"] == 1
+        assert metrics["failed"] == 0
+
+    def test_publish_failed(self):
+        producer = FakeKafkaProducer(error=KafkaTimeoutError())
+        publisher = KafkaPublisher(producer)
+
+        publisher.publish(MenuItemDeletedEvent(id=1))
+        publisher.flush(timeout=1)
+
+        metrics = publisher.metrics.snapshot()
+
+        assert metrics["delivered"] == 0
+        assert metrics["failed"] == 1
+
+    def test_publish_full_queue(self):
+        producer = FakeKafkaProducer()
+        producer.send_allowed.clear()
+        publisher = KafkaPublisher(producer, queue_maxsize=1, queue_put_timeout=0.1)
+
+        # The first event is taken by the sender thread, the second one waits in the queue, the third one is rejected
+        with pytest.raises(KafkaTimeoutError):
+            for id in range(3):
+                publisher.publish(MenuItemDeletedEvent(id=id))
+
+        producer.send_allowed.set()
+        publisher.close(timeout=1)
+
+        metrics = publisher.metrics.snapshot()
+
+        assert producer.closed
+        assert metrics["dropped"] == 1
+        assert metrics["delivered"] == metrics["enqueued"]
+
+    def test_publish_waits_for_queue(self):
+        producer = FakeKafkaProducer()
+        producer.send_allowed.clear()
+        publisher = KafkaPublisher(producer, queue_maxsize=1, queue_put_timeout=5)
+        Timer(0.1, producer.send_allowed.set).start()
+
+        # Events wait for a place in the queue instead of being dropped
+        for id in range(3):
+            publisher.publish(MenuItemDeletedEvent(id=id))
+
+        publisher.close(timeout=1)
+
+        metrics = publisher.metrics.snapshot()
+
+        assert metrics["dropped"] == 0
+        assert metrics["delivered"] == 3
+
+    def test_publish_topics_producers(self, monkeypatch):
+        monkeypatch.setattr(MenuItemDeletedEvent, "_topics_schemas", {'menu_order': MenuItemDeletedSchema,
+                                                                       'menu_review': MenuItemDeletedSchema})
+        producer = FakeKafkaProducer()
+        review_producer = FakeKafkaProducer()
+        publisher = KafkaPublisher(producer, topics_producers={'menu_review': review_producer})
+
+        publisher.publish(MenuItemDeletedEvent(id=1))
+        publisher.close(timeout=1)
+
+        assert [message[0] for message in producer.sent] == ['menu_order']
+        assert [message[0] for message in review_producer.sent] == ['menu_review']
+        assert producer.closed and review_producer.closed
+        assert publisher.metrics.snapshot()["delivered"] == 2
+
+    def test_publish_schema_id_header(self, monkeypatch):
+        monkeypatch.setattr(MenuItemDeletedEvent, "_topics_schemas", dict())
+        MenuItemDeletedEvent.extend_topics_schemas({'menu_order': MenuItemDeletedSchema})
+        producer = FakeKafkaProducer()
+        publisher = KafkaPublisher(producer, schema_id_header=True)
+
+        publisher.publish(MenuItemDeletedEvent(id=1))
+        publisher.flush(timeout=1)
+
+        assert producer.sent[0][3] == [('event_name', b'MenuItemDeletedEvent'),
+                                       ('schema_id', get_schema_id(MenuItemDeletedSchema).encode('ascii'))]
+
+
+class TestProducerEvent:
+
+    def test_get_data_applies_schema_once(self, monkeypatch):
+        monkeypatch.setattr(MenuItemDeletedEvent, "_topics_schemas", {'menu_order': MenuItemDeletedSchema,
+                                                                       'menu_review': MenuItemDeletedSchema})
+        event = MenuItemDeletedEvent(id=1, name='Pizza')
+
+        assert event.get_data('menu_order') == {'id': 1}
+        assert event.get_data('menu_review') is event.get_data('menu_order')
+
+    def test_schema_id(self):
+        schema_id = get_schema_id(MenuItemDeletedSchema)
+
+        assert len(schema_id) == 8
+        assert schema_id == get_schema_id(MenuItemDeletedSchema)
+        assert schema_id != get_schema_id(MenuItemCreatedSchema)
@@ -116,6 +116,38 @@ class TestMenuItemRepository(BaseTestRepository[MenuItem, MenuItemRepository]):
         MenuItemFactory._meta.sqlalchemy_session = session
         RestaurantFactory._meta.sqlalchemy_session = session
 
+    async def test_update_ratings(self, repository: MenuItemRepository, session: AsyncSession):
+        items = await self.factory.create_batch(size=3)
+        reviews_count = items[2].reviews_count
+        ratings = [{'id': item.id, 'rating': 4.5, 'reviews_count': number + 1, 'version': 1}
+                   for number, item in enumerate(items[:2])]
+
+        restaurant_ids = {item.restaurant_id for item in items[:2]}
+        ids = [item.id for item in items]
+
+        updated_restaurant_ids = await repository.update_ratings(
+            ratings + [{'id': 0, 'rating': 1, 'reviews_count': 1, 'version': 1}])
+        session.expire_all()
+
+        assert set(updated_restaurant_ids) == restaurant_ids
+
+        for number, id in enumerate(ids[:2]):
+            updated_item = await repository.retrieve(id=id)
+            assert updated_item.rating == 4.5
+            assert updated_item.reviews_count == number + 1
+
+        assert (await repository.retrieve(id=ids[2])).reviews_count == reviews_count
+
+    async def test_update_ratings_older_version(self, repository: MenuItemRepository, session: AsyncSession):
+        id = (await self.factory.create()).id
+
+        await repository.update_ratings([{'id': id, 'rating': 4.0, 'reviews_count': 2, 'version': 2}])
+        await repository.update_ratings([{'id': id, 'rating': 5.0, 'reviews_count': 1, 'version': 1}])
+        session.expire_all()
+
+        updated_item = await repository.retrieve(id=id)
+        assert (updated_item.rating, updated_item.reviews_count, updated_item.rating_version) == (4.0, 2, 2)
+
 
 class TestMenuCategoryRepository(BaseTestRepository[MenuCategory, MenuCategoryRepository]):
     factory = MenuCategoryFactory
@@ -264,6 +296,38 @@ class TestRestaurantRepository(BaseTestRepository[Restaurant, RestaurantReposito
     def setup(self, session: AsyncSession):
         RestaurantFactory._meta.sqlalchemy_session = session
 
+    async def test_upsert(self, repository: RestaurantRepository, session: AsyncSession):
+        assert await repository.upsert({'id': 1, 'is_active': False, 'version': 5})
+
+        # Redelivered and stale events are dropped
+        assert not await repository.upsert({'id': 1, 'is_active': True, 'version': 5})
+        assert not await repository.upsert({'id': 1, 'is_active': True, 'version': 3})
+        session.expire_all()
+
+        restaurant = await repository.retrieve(id=1)
+        assert (restaurant.is_active, restaurant.version) == (False, 5)
+
+        assert await repository.upsert({'id': 1, 'is_active': True, 'version': 8})
+        session.expire_all()
+
+        restaurant = await repository.retrieve(id=1)
+        assert (restaurant.is_active, restaurant.version) == (True, 8)
+
+    async def test_upsert_legacy(self, repository: RestaurantRepository, session: AsyncSession):
+        # Offsets of legacy messages are not comparable, so they are applied in the order of consumption
+        assert await repository.upsert({'id': 1, 'is_active': False, 'version': -1})
+        assert await repository.upsert({'id': 1, 'is_active': True, 'version': -1})
+
+        # A keyed message overwrites a legacy record, whatever its offset is
+        assert await repository.upsert({'id': 1, 'is_active': False, 'version': 0})
+
+        # A legacy message never overwrites a record written by a keyed message
+        assert not await repository.upsert({'id': 1, 'is_active': True, 'version': -1})
+        session.expire_all()
+
+        restaurant = await repository.retrieve(id=1)
+        assert (restaurant.is_active, restaurant.version) == (False, 0)
+
 
 class TestRestaurantManagerRepository(BaseTestRepository[RestaurantManager, RestaurantManagerRepository]):
     factory = RestaurantManagerFactory
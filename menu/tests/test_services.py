@@ -1,17 +1,23 @@
 from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
 from typing import TypeVar, Generic, Optional, Type
 from contextlib import nullcontext as does_not_raise
 
 import pytest
 
-from .factories import MenuItemFactory, MenuCategoryFactory, MenuFactory, RestaurantFactory, RestaurantManagerFactory
+from .factories import MenuItemFactory, MenuCategoryFactory, MenuFactory, RestaurantFactory, RestaurantManagerFactory, \
+    MysteryBagFactory
 from models import MenuItem, MenuCategory, Menu, Restaurant, RestaurantManager
-from services import MenuItemService, MenuCategoryService, MenuService, RestaurantService, RestaurantManagerService
+from services import MenuItemService, MenuCategoryService, MenuService, RestaurantService, RestaurantManagerService, \
+    MysteryBagService
+from cache import current_menu_cache
+from discovery import mystery_bag_discovery_index, DietaryFlag
 from uow import SqlAlchemyUnitOfWork
 from exceptions import MenuCategoryNotFoundWithIdError, MenuItemNotFoundWithIdError, \
     RestaurantNotFoundWithIdError, MenuItemAlreadyInCategoryError, \
     RestaurantManagerOwnershipError, RestaurantMissingCurrentMenuError, MenuItemNotInCategoryError, PermissionDeniedError, \
-    MenuNotFoundWithIdError, RestaurantNotActiveError, RestaurantManagerNotFoundWithIdError
+    MenuNotFoundWithIdError, RestaurantNotActiveError, RestaurantManagerNotFoundWithIdError, \
+    MysteryBagNotFoundWithIdError, MysteryBagSoldOutError, MysteryBagReservationNotFoundWithIdError
 from schemas.item import MenuItemRetrieveOut, MenuItemCreateIn, MenuItemCreateOut, \
     MenuItemUpdateIn, MenuItemUpdateOut
 from schemas.category import MenuCategoryRetrieveOut, MenuCategoryCreateIn, \
@@ -19,6 +25,7 @@ from schemas.category import MenuCategoryRetrieveOut, MenuCategoryCreateIn, \
 from schemas.menu import MenuRetrieveOut, MenuCreateIn, MenuCreateOut, MenuUpdateIn, MenuUpdateOut
 from schemas.restaurant import RestaurantRetrieveOut, RestaurantCreateIn, RestaurantCreateOut
 from schemas.manager import RestaurantManagerRetrieveOut, RestaurantManagerCreateIn, RestaurantManagerCreateOut
+from schemas.mystery_bag import MysteryBagReservationCreateIn
 
 from .data.item import validate_menu_item, compare_menu_items, \
     generate_menu_item_create_data, generate_menu_item_create_data_nonexistent_restaurant, \
@@ -556,6 +563,26 @@ class TestMenuService(BaseTestCreateWithRestaurant[MenuItemService],
 
         assert retrieved_schema.model_dump() == expected_schema.model_dump()
 
+    async def test_retrieve_current_restaurant_menu_cached(self, uow: SqlAlchemyUnitOfWork):
+        restaurant = await RestaurantFactory.create()
+        restaurant_manager = await RestaurantManagerFactory.create(restaurant=restaurant)
+        service = MenuService(restaurant_manager=restaurant_manager)
+
+        menu = await MenuFactory.create(restaurant=restaurant)
+        restaurant.current_menu_id = menu.id
+        await uow.commit()
+
+        hits = current_menu_cache.stats.hits
+        await service.retrieve_current_restaurant_menu(restaurant.id, uow)
+        await service.retrieve_current_restaurant_menu(restaurant.id, uow)
+        assert current_menu_cache.stats.hits == hits + 1
+
+        update_data = await generate_menu_update_data()
+        await service.update(menu.id, MenuUpdateIn(**update_data), uow)
+
+        retrieved_schema = await service.retrieve_current_restaurant_menu(restaurant.id, uow)
+        assert retrieved_schema.name == update_data['name']
+
     async def test_list_restaurant_menus(self, uow: SqlAlchemyUnitOfWork):
         restaurant = await RestaurantFactory.create()
         restaurant_manager = await RestaurantManagerFactory.create(restaurant=restaurant)
@@ -695,3 +722,116 @@ class TestRestaurantManagerService(BaseTestRetrieveMixin[RestaurantManager, Rest
     async def test_delete_instance_nonexistent(self, service: RestaurantManagerService, uow: SqlAlchemyUnitOfWork):
         with pytest.raises(RestaurantManagerNotFoundWithIdError):
             await service.delete_instance(0, uow)
+
+
+class TestMysteryBagService:
+
+    @pytest.fixture(scope='function', autouse=True)
+    def setup(self, uow):
+        RestaurantFactory._meta.sqlalchemy_session = uow._session
+        MysteryBagFactory._meta.sqlalchemy_session = uow._session
+        mystery_bag_discovery_index.rebuild([])
+
+    @pytest.fixture(scope='function')
+    def service(self) -> MysteryBagService:
+        return MysteryBagService()
+
+    async def test_search(self, service: MysteryBagService, uow: SqlAlchemyUnitOfWork):
+        vegetarian = await MysteryBagFactory.create(is_vegetarian=True, contains_nuts=False,
+                                                    pickup_end_time=datetime.utcnow() + timedelta(hours=1))
+        with_nuts = await MysteryBagFactory.create(is_vegetarian=True, contains_nuts=True)
+        not_vegetarian = await MysteryBagFactory.create(is_vegetarian=False)
+        mystery_bag_discovery_index.upsert_many([vegetarian, with_nuts, not_vegetarian])
+
+        mystery_bags = await service.search(uow, include=DietaryFlag.VEGETARIAN)
+        assert [mystery_bag.id for mystery_bag in mystery_bags] == [vegetarian.id, with_nuts.id]
+
+        mystery_bags = await service.search(uow, include=DietaryFlag.VEGETARIAN, exclude=DietaryFlag.NUTS)
+        assert [mystery_bag.id for mystery_bag in mystery_bags] == [vegetarian.id]
+
+        mystery_bags = await service.search(uow, restaurant_ids=[not_vegetarian.restaurant_id])
+        assert [mystery_bag.id for mystery_bag in mystery_bags] == [not_vegetarian.id]
+
+    async def test_reserve_updates_index_after_commit(self, service: MysteryBagService, uow: SqlAlchemyUnitOfWork):
+        mystery_bag = await MysteryBagFactory.create(available_quantity=1)
+        mystery_bag_discovery_index.upsert(mystery_bag)
+        data = MysteryBagReservationCreateIn(mystery_bag_id=mystery_bag.id, customer_id=1, quantity=1)
+
+        await service.reserve(data, uow)
+        assert len(await service.search(uow)) == 1
+
+        await uow.rollback()
+        assert len(await service.search(uow)) == 1
+
+        await service.reserve(data, uow)
+        await uow.commit()
+        assert len(await service.search(uow)) == 0
+
+    async def test_reserve_updates_index_out_of_order(self, service: MysteryBagService,
+                                                      uow: SqlAlchemyUnitOfWork):
+        mystery_bag = await MysteryBagFactory.create(available_quantity=2)
+        mystery_bag_discovery_index.upsert(mystery_bag)
+        data = MysteryBagReservationCreateIn(mystery_bag_id=mystery_bag.id, customer_id=1, quantity=1)
+
+        await service.reserve(data, uow)
+        # A concurrent reservation, which took stock later, is committed first
+        mystery_bag_discovery_index.restock({mystery_bag.id: -1})
+        await uow.commit()
+
+        assert len(await service.search(uow)) == 0
+
+    async def test_reserve(self, service: MysteryBagService, uow: SqlAlchemyUnitOfWork):
+        mystery_bag = await MysteryBagFactory.create(available_quantity=5)
+        data = MysteryBagReservationCreateIn(mystery_bag_id=mystery_bag.id, customer_id=1, quantity=2)
+
+        reservation = await service.reserve(data, uow)
+
+        assert reservation.mystery_bag_id == mystery_bag.id
+        assert not reservation.is_confirmed
+
+        retrieved_mystery_bag = await uow.mystery_bags.retrieve(mystery_bag.id)
+        await uow._session.refresh(retrieved_mystery_bag)
+        assert retrieved_mystery_bag.available_quantity == 3
+
+    async def test_reserve_sold_out(self, service: MysteryBagService, uow: SqlAlchemyUnitOfWork):
+        mystery_bag = await MysteryBagFactory.create(available_quantity=1)
+        data = MysteryBagReservationCreateIn(mystery_bag_id=mystery_bag.id, customer_id=1, quantity=2)
+
+        with pytest.raises(MysteryBagSoldOutError):
+            await service.reserve(data, uow)
+
+    async def test_reserve_nonexistent(self, service: MysteryBagService, uow: SqlAlchemyUnitOfWork):
+        data = MysteryBagReservationCreateIn(mystery_bag_id=0, customer_id=1)
+
+        with pytest.raises(MysteryBagNotFoundWithIdError):
+            await service.reserve(data, uow)
+
+    async def test_cancel_reservation(self, service: MysteryBagService, uow: SqlAlchemyUnitOfWork):
+        mystery_bag = await MysteryBagFactory.create(available_quantity=5)
+        data = MysteryBagReservationCreateIn(mystery_bag_id=mystery_bag.id, customer_id=1, quantity=2)
+        reservation = await service.reserve(data, uow)
+
+        await service.cancel_reservation(reservation.id, uow)
+
+        retrieved_mystery_bag = await uow.mystery_bags.retrieve(mystery_bag.id)
+        await uow._session.refresh(retrieved_mystery_bag)
+        assert retrieved_mystery_bag.available_quantity == 5
+
+        with pytest.raises(MysteryBagReservationNotFoundWithIdError):
+            await service.cancel_reservation(reservation.id, uow)
+
+    async def test_release_expired_reservations(self, service: MysteryBagService, uow: SqlAlchemyUnitOfWork):
+        mystery_bag = await MysteryBagFactory.create(available_quantity=5)
+        data = MysteryBagReservationCreateIn(mystery_bag_id=mystery_bag.id, customer_id=1, quantity=2)
+        reservation = await service.reserve(data, uow)
+        confirmed_reservation = await service.reserve(data, uow)
+        await service.confirm_reservation(confirmed_reservation.id, uow)
+
+        await uow.reservations.update(reservation.id, {'expires_at': datetime.utcnow() - timedelta(seconds=1)})
+
+        released_count = await service.release_expired_reservations(uow)
+        assert released_count == 1
+
+        retrieved_mystery_bag = await uow.mystery_bags.retrieve(mystery_bag.id)
+        await uow._session.refresh(retrieved_mystery_bag)
+        assert retrieved_mystery_bag.available_quantity == 3
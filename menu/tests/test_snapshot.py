@@ -0,0 +1,115 @@
+import io
+import json
+from typing import List
+
+import pytest
+from kafka.consumer.fetcher import ConsumerRecord
+from kafka.structs import TopicPartition
+
+from consumer import RetryPolicy, SnapshotLoader, RestaurantCreatedEvent, RestaurantManagerCreatedEvent, \
+    RestaurantUpdatedEvent, read_topic_snapshot, read_jsonl_snapshot, write_jsonl_snapshot, commit_snapshot_offsets
+from consumer.utils import decode_message, get_event_name
+from tests.conftest import async_session_maker
+from benchmarks.kafka import FakeKafkaConsumer, FakePublisher
+from uow import SqlAlchemyUnitOfWork
+
+
+class TestSnapshot:
+
+    @pytest.fixture(scope='function')
+    def consumer(self) -> FakeKafkaConsumer:
+        consumer = FakeKafkaConsumer('restaurant_menu', 3)
+
+        for id in range(1, 11):
+            consumer.produce(RestaurantManagerCreatedEvent.get_event_name(), str(id), {'id': id})
+
+        return consumer
+
+    @staticmethod
+    def get_uow() -> SqlAlchemyUnitOfWork:
+        return SqlAlchemyUnitOfWork(async_session_maker)
+
+    def test_read_topic_snapshot(self, consumer: FakeKafkaConsumer):
+        messages = list(read_topic_snapshot(consumer, 'restaurant_menu'))
+
+        assert sorted(decode_message(message).value['id'] for message in messages) == list(range(1, 11))
+
+    def test_jsonl_roundtrip(self, consumer: FakeKafkaConsumer):
+        messages = list(read_topic_snapshot(consumer, 'restaurant_menu'))
+        file = io.StringIO()
+
+        assert write_jsonl_snapshot(messages, file) == len(messages)
+
+        file.seek(0)
+        loaded_messages: List[ConsumerRecord] = list(read_jsonl_snapshot(file))
+
+        loaded_messages = [decode_message(message) for message in loaded_messages]
+        messages = [decode_message(message) for message in messages]
+
+        assert [(message.topic, message.partition, message.offset, message.key, message.value)
+                for message in loaded_messages] == \
+               [(message.topic, message.partition, message.offset, message.key, message.value)
+                for message in messages]
+        assert all(get_event_name(message) == RestaurantManagerCreatedEvent.get_event_name()
+                   for message in loaded_messages)
+
+    async def test_load(self, consumer: FakeKafkaConsumer):
+        consumer.produce('UnknownEvent', '1', {'id': 1})
+        consumer.produce(RestaurantManagerCreatedEvent.get_event_name(), '2', b'{"id": ')
+        messages = list(read_topic_snapshot(consumer, 'restaurant_menu'))
+
+        publisher = FakePublisher()
+        loader = SnapshotLoader([RestaurantManagerCreatedEvent, RestaurantUpdatedEvent], batch_size=4,
+                                get_uow=self.get_uow, retry_policy=RetryPolicy(publisher))
+        offsets = await loader.load(messages)
+
+        # Messages which can't be decoded or whose events are unknown are dead lettered as they were fetched
+        assert sorted((topic, key, value) for topic, key, value, headers in publisher.delivered_records) == [
+            ('restaurant_menu.dlq', b'1', b'{"id":1}'),
+            ('restaurant_menu.dlq', b'2', b'{"id": '),
+        ]
+
+        expected_offsets = consumer.end_offsets([TopicPartition('restaurant_menu', partition)
+                                                 for partition in range(3)])
+        assert offsets == {partition: offset for partition, offset in expected_offsets.items() if offset}
+
+        async with self.get_uow() as uow:
+            managers_ids = sorted(manager.id for manager in await uow.managers.list())
+
+        assert managers_ids == list(range(1, 11))
+
+        # Loading the snapshot again doesn't change anything
+        assert await loader.load(messages) == offsets
+
+        commit_snapshot_offsets(consumer, offsets)
+        assert consumer.committed == offsets
+
+    async def test_load_restaurants_export(self):
+        managers = [json.dumps({'topic': 'user_menu', 'partition': 0, 'offset': id, 'key': str(id),
+                                'event_name': RestaurantManagerCreatedEvent.get_event_name(), 'value': {'id': id}})
+                    for id in range(1, 4)]
+        # Every restaurant of a full-state export precedes the end offset of its partition
+        restaurants = [json.dumps({'topic': 'restaurant_menu', 'partition': id % 2, 'offset': 9, 'key': str(id),
+                                   'event_name': RestaurantCreatedEvent.get_event_name(),
+                                   'value': {'id': id, 'address': 'Address', 'restaurant_manager_id': id,
+                                             'is_active': True}})
+                       for id in range(1, 4)]
+
+        await SnapshotLoader([RestaurantManagerCreatedEvent], get_uow=self.get_uow) \
+            .load(read_jsonl_snapshot(io.StringIO('\n'.join(managers))))
+        offsets = await SnapshotLoader([RestaurantCreatedEvent], batch_size=2, get_uow=self.get_uow) \
+            .load(read_jsonl_snapshot(io.StringIO('\n'.join(restaurants))))
+
+        assert offsets == {TopicPartition('restaurant_menu', 0): 10, TopicPartition('restaurant_menu', 1): 10}
+
+        # Live consumption continues from the end offsets and overwrites exported restaurants
+        await RestaurantUpdatedEvent({'id': 1, 'is_active': False}, version=10).action(self.get_uow())
+        await RestaurantUpdatedEvent({'id': 2, 'is_active': False}, version=8).action(self.get_uow())
+
+        async with self.get_uow() as uow:
+            managers_restaurants = sorted((manager.id, manager.restaurant_id) for manager in await uow.managers.list())
+            restaurants_states = sorted((restaurant.id, restaurant.is_active, restaurant.version)
+                                        for restaurant in await uow.restaurants.list())
+
+        assert managers_restaurants == [(1, 1), (2, 2), (3, 3)]
+        assert restaurants_states == [(1, False, 10), (2, True, 9), (3, True, 9)]
@@ -1,6 +1,9 @@
 import { KafkaConsumerEventConstructor } from "@src/config/settings/types/settings";
 import getLogger from "@src/core/setup/logger";
-import { Consumer } from "kafkajs";
+import { Consumer, KafkaMessage } from "kafkajs";
+
+// Header with the name of the event, the key of a message is the ID of the entity the event is about
+const EVENT_NAME_HEADER = "event_name"
 
 
 
@@ -17,6 +20,11 @@ export default class KafkaReceiver {
         await this.consumer.subscribe({ topic: this.topic, fromBeginning: true })
     }
 
+    private getEventName(message: KafkaMessage): string | undefined {
+        // Messages published before the name was moved to the header have the name as their key
+        return (message.headers?.[EVENT_NAME_HEADER] ?? message.key)?.toString()
+    }
+
     private getConsumerEvent(eventName: string): KafkaConsumerEventConstructor | undefined {
         return this.consumerEventConstructors.find(constructor => constructor.getEventName() === eventName)
     }
@@ -27,7 +35,7 @@ export default class KafkaReceiver {
             eachMessage: async ({ topic, partition, message }) => {
                 const logger = getLogger(module)
 
-                const eventName = message.key?.toString()
+                const eventName = this.getEventName(message)
                 
                 if (!eventName) {
                     logger.error(`Event name is empty`)
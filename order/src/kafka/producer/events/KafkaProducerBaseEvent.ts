@@ -28,6 +28,11 @@ export default abstract class KafkaProducerBaseEvent {
         return this.name
     }
 
+    public getAggregateId(): string | undefined {
+        // Events of an entity are published to the same partition, so they are consumed in order
+        return this.data?.id?.toString()
+    }
+
     public getClass(): typeof KafkaProducerBaseEvent {
         return KafkaProducerBaseEvent
     }
@@ -5,6 +5,9 @@ import getLogger from "@src/core/setup/logger";
 
 const logger = getLogger(module)
 
+// Header with the name of the event, the key of a message is the ID of the entity the event is about
+export const EVENT_NAME_HEADER = "event_name"
+
 export default class KafkaPublisher {
 
     constructor(
@@ -17,8 +20,11 @@ export default class KafkaPublisher {
             await this.kafkaProducer.send({
                 topic,
                 messages: [{
-                    key: EventClass.getEventName(),
-                    value: JSON.stringify(event.getData(topic))
+                    key: event.getAggregateId(),
+                    value: JSON.stringify(event.getData(topic)),
+                    headers: {
+                        [EVENT_NAME_HEADER]: EventClass.getEventName()
+                    }
                 }]
             })
 
@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+
+from db import pool_metrics
+from producer import publisher
+from schemas.metrics import DatabasePoolMetricsOut, KafkaPublisherMetricsOut
+
+router = APIRouter(
+    prefix='/metrics'
+)
+
+
+@router.get('/db-pool/', response_model=DatabasePoolMetricsOut)
+async def get_db_pool_metrics():
+    return pool_metrics.snapshot()
+
+
+@router.get('/kafka-publisher/', response_model=KafkaPublisherMetricsOut)
+async def get_kafka_publisher_metrics():
+    return publisher.metrics.snapshot()
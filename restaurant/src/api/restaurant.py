@@ -1,7 +1,6 @@
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Query
-from geopy.distance import geodesic
 
 from dependencies import get_uow, get_uow_with_commit, get_restaurant_service
 from schemas.application import RestaurantApplicationCreateOut
@@ -40,22 +39,30 @@ async def get_all_restaurants(service: RestaurantService = Depends(get_restauran
                               order_by_rating: Optional[bool] = Query(default=False),
                               order_by_environmental_impact: Optional[bool] = Query(default=False, description="Order by food waste saved"),
                               limit: int = Query(100, ge=1),
-                              offset: int = Query(0, ge=0)):
+                              offset: int = Query(0, ge=0),
+                              use_cursor: bool = Query(default=False, description="Use cursor pagination, "
+                                                                                  "offset is ignored"),
+                              cursor: Optional[str] = Query(default=None, description="Cursor of the next page "
+                                                                                      "from the previous response"),
+                              include_count: Optional[bool] = Query(default=None,
+                                                                    description="Count all restaurants matching "
+                                                                                "the filters, by default only "
+                                                                                "in offset pagination")):
     return await service.list(
         uow, name=name, address=address, city=city, state=state, pincode=pincode,
         cuisine_type=cuisine_type, vegetarian_only=vegetarian_only, jain_food=jain_food,
         vegan_options=vegan_options, halal_certified=halal_certified, 
         mystery_bag_enabled=mystery_bag_enabled, verified_only=verified_only,
         order_by_rating=order_by_rating, order_by_environmental_impact=order_by_environmental_impact,
-        limit=limit, offset=offset
+        limit=limit, offset=offset, use_cursor=use_cursor, cursor=cursor, include_count=include_count
     )
 
 
 @router.get('/nearby/', response_model=List[RestaurantRetrieveOut])
 @handle_app_errors
-async def get_nearby_restaurants(lat: float = Query(..., description="Latitude"),
-                                 lng: float = Query(..., description="Longitude"),
-                                 radius_km: float = Query(5.0, description="Search radius in kilometers"),
+async def get_nearby_restaurants(lat: float = Query(..., ge=-90, le=90, description="Latitude"),
+                                 lng: float = Query(..., ge=-180, le=180, description="Longitude"),
+                                 radius_km: float = Query(5.0, gt=0, le=50, description="Search radius in kilometers"),
                                  service: RestaurantService = Depends(get_restaurant_service),
                                  uow: SqlAlchemyUnitOfWork = Depends(get_uow),
                                  # Indian market specific filters
@@ -67,7 +74,7 @@ async def get_nearby_restaurants(lat: float = Query(..., description="Latitude")
                                  mystery_bag_enabled: Optional[bool] = Query(default=True),
                                  limit: int = Query(20, ge=1, le=50)):
     """
-    Find restaurants near a given location with Indian market specific filters.
+    Find restaurants near a given location with Indian market specific filters, the nearest first.
     Essential for MealPeDeal's location-based mystery bag discovery.
     """
     return await service.get_nearby_restaurants(
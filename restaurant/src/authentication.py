@@ -28,6 +28,9 @@ async def authenticate(access_token: Optional[str],
     Authenticates a user using an access token via grpc request to User microservice
     and returns the corresponding user object.
 
+    Roles of access tokens are cached or verified locally by token claims,
+    so most requests do not reach the User microservice.
+
     Args:
         access_token (Optional[str]): The access token used for authentication.
         uow (SqlAlchemyUnitOfWork): The unit of work object for interacting with the database.
@@ -45,7 +48,7 @@ async def authenticate(access_token: Optional[str],
             logger.info("Authenticated as anonymous user")
             return
 
-        grpc_response = grpc_roles_client.get_user_role(access_token)
+        grpc_response = await grpc_roles_client.get_user_role(access_token)
         for role in microservice_roles:
             if role.grpc_role == grpc_response.role:
                 user_id = int(grpc_response.user_id)
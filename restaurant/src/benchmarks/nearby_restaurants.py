@@ -0,0 +1,155 @@
+"""
+Benchmark of the nearby restaurants search.
+
+Fills an SQLite database with random restaurants around Indian cities and measures latency
+of `RestaurantRepository.list_nearby_active_restaurants` with random filters, working hours included.
+Results are checked against distances to all restaurants matching the filters.
+
+Usage (from `src` directory):
+    python -m benchmarks.nearby_restaurants --restaurants 50000 --queries 1000
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import List, Tuple
+
+import numpy as np
+from loguru import logger
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from models import Base, Restaurant
+from repositories import RestaurantRepository
+from utils.geo import haversine_distances
+
+CITIES = [
+    (28.6139, 77.2090), (19.0760, 72.8777), (12.9716, 77.5946), (13.0827, 80.2707), (22.5726, 88.3639),
+    (17.3850, 78.4867), (18.5204, 73.8567), (23.0225, 72.5714), (26.9124, 75.7873), (26.8467, 80.9462),
+]
+CUISINE_TYPES = ["North Indian", "South Indian", "Chinese", "Street Food", "Bakery", "Mughlai"]
+FILTERS = ["vegetarian_only", "jain_food", "vegan_options", "halal_certified"]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Nearby restaurants search benchmark")
+    parser.add_argument("--restaurants", type=int, default=50_000, help="Number of restaurants")
+    parser.add_argument("--queries", type=int, default=1000, help="Number of measured queries")
+    parser.add_argument("--radius", type=float, default=5.0, help="Search radius in kilometers")
+    parser.add_argument("--limit", type=int, default=20, help="Maximum number of found restaurants")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    return parser.parse_args()
+
+
+def random_location(spread_km: float = 15) -> Tuple[float, float]:
+    latitude, longitude = random.choice(CITIES)
+    delta = math.degrees(spread_km / 6371)
+
+    return (latitude + random.gauss(0, delta),
+            longitude + random.gauss(0, delta / math.cos(math.radians(latitude))))
+
+
+def generate_restaurants(count: int) -> List[dict]:
+    restaurants = []
+
+    for id in range(1, count + 1):
+        latitude, longitude = random_location()
+        serves_non_vegetarian = random.random() < 0.6
+        restaurants.append(dict(id=id, name=f"Restaurant {id}", image_url='', address='', phone='', email='',
+                                is_active=random.random() < 0.9, latitude=latitude, longitude=longitude,
+                                cuisine_types=random.sample(CUISINE_TYPES, random.randint(1, 3)),
+                                serves_vegetarian=True, serves_non_vegetarian=serves_non_vegetarian,
+                                serves_jain=random.random() < 0.2, serves_vegan=random.random() < 0.3,
+                                halal_certified=serves_non_vegetarian and random.random() < 0.3,
+                                mystery_bag_enabled=random.random() < 0.8))
+
+    return restaurants
+
+
+def random_filters() -> dict:
+    filters = {name: True for name in random.sample(FILTERS, random.randint(0, 1))}
+
+    if random.random() < 0.3:
+        filters['cuisine_type'] = random.choice(CUISINE_TYPES)
+
+    filters['mystery_bag_enabled'] = True
+
+    return filters
+
+
+def brute_force_search(restaurants: List[dict], latitude: float, longitude: float, radius_km: float,
+                       limit: int, filters: dict) -> List[int]:
+    flags = {'jain_food': 'serves_jain', 'vegan_options': 'serves_vegan', 'halal_certified': 'halal_certified',
+             'mystery_bag_enabled': 'mystery_bag_enabled'}
+    matching = [restaurant for restaurant in restaurants
+                if restaurant['is_active']
+                and all(restaurant[field] for name, field in flags.items() if filters.get(name))
+                and (not filters.get('vegetarian_only') or not restaurant['serves_non_vegetarian'])
+                and (not filters.get('cuisine_type') or filters['cuisine_type'] in restaurant['cuisine_types'])]
+
+    distances = haversine_distances(latitude, longitude,
+                                    np.array([restaurant['latitude'] for restaurant in matching]),
+                                    np.array([restaurant['longitude'] for restaurant in matching]))
+
+    return [id for distance, id in sorted((distance, restaurant['id'])
+                                          for distance, restaurant in zip(distances.tolist(), matching)
+                                          if distance <= radius_km)][:limit]
+
+
+async def run(args: argparse.Namespace):
+    # Repositories log every query
+    logger.remove()
+    random.seed(args.seed)
+    restaurants = generate_restaurants(args.restaurants)
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(directory, 'benchmark.db')}")
+        session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+            await connection.execute(insert(Restaurant), restaurants)
+            await connection.exec_driver_sql('ANALYZE')
+
+        latencies = []
+        mismatches = 0
+        found = 0
+
+        async with session_maker() as session:
+            repository = RestaurantRepository(session)
+
+            for _ in range(args.queries):
+                latitude, longitude = random_location(spread_km=10)
+                filters = random_filters()
+
+                start = time.perf_counter()
+                nearby = await repository.list_nearby_active_restaurants(latitude, longitude, args.radius,
+                                                                         fetch_working_hours=True,
+                                                                         limit=args.limit, **filters)
+                latencies.append((time.perf_counter() - start) * 1000)
+                session.expunge_all()
+
+                found += len(nearby)
+                expected = brute_force_search(restaurants, latitude, longitude, args.radius, args.limit, filters)
+
+                if [restaurant.id for restaurant, _ in nearby] != expected:
+                    mismatches += 1
+
+        await engine.dispose()
+
+    quantiles = statistics.quantiles(latencies, n=100)
+
+    print(f"restaurants: {args.restaurants}, queries: {args.queries}, radius: {args.radius} km, "
+          f"found per query: {found / args.queries:.1f}")
+    print(f"latency ms: p50 {quantiles[49]:.2f}, p95 {quantiles[94]:.2f}, p99 {quantiles[98]:.2f}, "
+          f"max {max(latencies):.2f}")
+    print(f"mismatches with brute force: {mismatches}")
+
+
+if __name__ == "__main__":
+    asyncio.run(run(parse_args()))
@@ -18,6 +18,29 @@ class Settings(BaseSettings):
     graylog_udp_port: int
     roles_grpc_server_host: str
     roles_grpc_server_port: str
+    roles_grpc_timeout_seconds: float = 1.0
+    roles_cache_maxsize: int = 10000
+    roles_cache_ttl_seconds: int = 300
+    roles_cache_negative_ttl_seconds: int = 10
+
+    pagination_count_cache_maxsize: int = 1024
+    pagination_count_cache_ttl_seconds: int = 30
+
+    jwt_local_verification: bool = False
+    jwt_algorithm: str = 'HS256'
+    jwt_verifying_key: Optional[str] = None
+    jwt_jwks_file: Optional[str] = None
+    jwt_leeway_seconds: int = 5
+    jwt_access_token_lifetime_seconds: int = 86400
+
+    db_pool_enabled: bool = True
+    db_pool_size: int = 5
+    db_pool_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 30
+    db_pool_pre_ping: bool = True
+    db_pool_recycle_seconds: int = 1800
+    db_pgbouncer_mode: bool = False
+
     kafka_bootstrap_server_host: str
     kafka_bootstrap_server_port: int
     kafka_ssl_cafile: Optional[str] = f'{BASE_DIRECTORY}/cacert.pem'
@@ -26,16 +49,52 @@ class Settings(BaseSettings):
     kafka_broker_user: str
     kafka_broker_password: str
 
+    kafka_producer_linger_ms: int = 5
+    kafka_producer_batch_size: int = 16384
+    kafka_producer_compression_type: Optional[str] = None
+    kafka_producer_topics_compression_types: Dict[str, Optional[str]] = {}
+    kafka_producer_topics_codecs: Dict[str, str] = {}
+    kafka_producer_schema_id_header: bool = False
+    kafka_publisher_queue_maxsize: int = 10000
+    kafka_publisher_queue_put_timeout_seconds: float = 5
+    kafka_publisher_flush_timeout_seconds: float = 10
+
+    outbox_relay_batch_size: int = 500
+    outbox_relay_interval_seconds: float = 1
+    outbox_relay_delivery_timeout_seconds: float = 30
+    outbox_relay_claim_timeout_seconds: float = 60
+
+    web_app_kafka_receivers_enabled: bool = False
     kafka_group_consumers_count: int = 1
+    kafka_consumer_workers_count: int = 8
+    kafka_consumer_partition_queue_maxsize: int = 100
+    kafka_consumer_max_poll_records: int = 500
+    kafka_consumer_poll_timeout_ms: int = 100
+    kafka_consumer_batch_max_size: int = 100
+    kafka_consumer_batch_max_wait_ms: int = 20
+    kafka_consumer_shutdown_timeout_seconds: float = 10
+    kafka_consumer_retry_max_attempts: int = 4
+    kafka_consumer_retry_backoff_ms: int = 5000
+    kafka_consumer_retry_delivery_timeout_seconds: float = 10
     kafka_consumer_topic_events: Dict[str, List[str]] = {
         'user_restaurant': [
             'consumer.events.RestaurantManagerCreatedEvent',
             'consumer.events.ModeratorCreatedEvent',
         ],
+        'user_roles_restaurant': [
+            'consumer.events.UserUpdatedEvent',
+        ],
         'review_restaurant': [
             'consumer.events.RestaurantRatingUpdatedEvent'
         ]
     }
+    # Events which invalidate in-memory state, received by every web process
+    kafka_broadcast_repeat_delay_seconds: float = 5
+    kafka_broadcast_topic_events: Dict[str, List[str]] = {
+        'user_roles_restaurant': [
+            'consumer.events.UserUpdatedEvent',
+        ]
+    }
 
     kafka_producer_events_topics: Dict[str, Dict[str, str]] = {
         'producer.events.RestaurantCreatedEvent': {
@@ -3,6 +3,9 @@ from config import get_settings
 from .creator import *
 from .events import *
 from .receiver import *
+from .broadcast import *
+from .retry import *
+from .snapshot import *
 
 settings = get_settings()
 
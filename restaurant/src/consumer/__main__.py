@@ -0,0 +1,54 @@
+"""
+Entry point of the process which only consumes Kafka events.
+
+Web processes don't start Kafka receivers unless `web_app_kafka_receivers_enabled` is set, so HTTP and event
+processing are scaled independently: every consumer process runs `kafka_group_consumers_count` receivers
+of every topic, each processing up to `kafka_consumer_workers_count` messages concurrently.
+
+Usage (from `src` directory):
+    python -m consumer
+"""
+
+import signal
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+
+from setup.logger import logger
+from config import get_settings
+from consumer import consumer_creator
+from producer import publisher
+from setup.kafka.consumer import init_kafka_receivers
+from setup.kafka.producer import init_producer_events
+
+
+def main():
+    settings = get_settings()
+    stop_requested = Event()
+
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signal_number, lambda *_: stop_requested.set())
+
+    init_producer_events(settings)
+    logger.info("Kafka producer events initialized")
+
+    kafka_receivers = init_kafka_receivers(consumer_creator, settings)
+
+    for kafka_receiver in kafka_receivers:
+        kafka_receiver.start_receiving()
+
+    logger.info(f"{len(kafka_receivers)} Kafka receivers started")
+
+    stop_requested.wait()
+
+    with ThreadPoolExecutor(max_workers=max(len(kafka_receivers), 1)) as executor:
+        executor.map(lambda kafka_receiver: kafka_receiver.stop(settings.kafka_consumer_shutdown_timeout_seconds),
+                     kafka_receivers)
+
+    logger.info("Kafka receivers stopped")
+
+    publisher.close(settings.kafka_publisher_flush_timeout_seconds)
+    logger.info("Kafka publisher flushed and closed")
+
+
+if __name__ == "__main__":
+    main()
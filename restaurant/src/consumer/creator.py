@@ -1,6 +1,5 @@
-import json
 from abc import ABC, abstractmethod
-from typing import Union, List
+from typing import Union, List, Optional
 
 from kafka import KafkaConsumer
 
@@ -14,6 +13,8 @@ __all__ = [
 class KafkaConsumerBaseCreator(ABC):
     """
     Base class for creating KafkaConsumer.
+
+    Consumers fetch keys and values as raw bytes, which are decoded message by message by `decode_message`.
     """
 
     def __init__(self, bootstrap_servers: Union[str, List[str]], security_protocol: str):
@@ -27,17 +28,15 @@ class KafkaConsumerBaseCreator(ABC):
 
         self._bootstrap_servers = bootstrap_servers
         self._security_protocol = security_protocol
-        self._key_deserializer = lambda m: m.decode("ascii")
-        self._value_deserializer = lambda m: json.loads(m.decode("ascii"))
 
     @abstractmethod
-    def create(self, topic: str, group_id: str) -> KafkaConsumer:
+    def create(self, topic: str, group_id: Optional[str]) -> KafkaConsumer:
         """
         Method for creating KafkaConsumer instance.
 
         Args:
             topic (str): The topic to consume.
-            group_id (str): The group id.
+            group_id (Optional[str]): The group id or None to consume all partitions without a group.
 
         Returns:
             KafkaConsumer: The KafkaConsumer instance.
@@ -70,14 +69,13 @@ class KafkaConsumerSASLPlaintextCreator(KafkaConsumerBaseCreator):
         self._sasl_plain_password = sasl_plain_password
         super().__init__(f'{bootstrap_server_host}:{bootstrap_server_port}', "SASL_PLAINTEXT")
 
-    def create(self, topic: str, group_id: str) -> KafkaConsumer:
+    def create(self, topic: str, group_id: Optional[str]) -> KafkaConsumer:
         return KafkaConsumer(
             topic,
             bootstrap_servers=self._bootstrap_servers,
             security_protocol=self._security_protocol,
             group_id=group_id,
-            key_deserializer=self._key_deserializer,
-            value_deserializer=self._value_deserializer,
+            enable_auto_commit=False,
             sasl_mechanism=self._sasl_mechanism,
             sasl_plain_username=self._sasl_plain_username,
             sasl_plain_password=self._sasl_plain_password,
@@ -114,16 +112,16 @@ class KafkaConsumerSCRAM256Creator(KafkaConsumerBaseCreator):
         self._sasl_plain_password = sasl_plain_password
         super().__init__(f"{bootstrap_server_host}:{bootstrap_server_port}", "SASL_SSL")
 
-    def create(self, topic: str, group_id: str) -> KafkaConsumer:
+    def create(self, topic: str, group_id: Optional[str]) -> KafkaConsumer:
         return KafkaConsumer(
             topic,
             bootstrap_servers=self._bootstrap_servers,
             sasl_mechanism=self._sasl_mechanism,
             api_version=(2, 7),
-            auto_offset_reset="earliest",
+            # Consumers without a group only receive new messages
+            auto_offset_reset="earliest" if group_id else "latest",
             group_id=group_id,
-            key_deserializer=self._key_deserializer,
-            value_deserializer=self._value_deserializer,
+            enable_auto_commit=False,
             sasl_plain_password=self._sasl_plain_password,
             sasl_plain_username=self._sasl_plain_username,
             security_protocol=self._security_protocol,
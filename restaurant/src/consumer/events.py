@@ -1,19 +1,20 @@
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar, Type
+from typing import Generic, List, TypeVar, Type
 
 from pydantic import BaseModel
 
-from schemas import RestaurantManagerCreateIn, ModeratorCreateIn
-from services import RestaurantManagerService, ModeratorService
+from grpc_files import grpc_roles_client
 from uow import SqlAlchemyUnitOfWork
 from utils.uow import uow_transaction_with_commit
-from .schemas import RestaurantManagerCreatedSchema, ModeratorCreatedSchema, RestaurantRatingUpdatedSchema
+from .schemas import RestaurantManagerCreatedSchema, ModeratorCreatedSchema, RestaurantRatingUpdatedSchema, \
+    UserUpdatedSchema
 
 __all__ = [
     "ConsumerEvent",
     "RestaurantManagerCreatedEvent",
     "ModeratorCreatedEvent",
-    "RestaurantRatingUpdatedEvent"
+    "RestaurantRatingUpdatedEvent",
+    "UserUpdatedEvent",
 ]
 
 BaseEventSchema = TypeVar("BaseEventSchema", bound=BaseModel)
@@ -27,19 +28,25 @@ class ConsumerEvent(Generic[BaseEventSchema], ABC):
 
     Attributes:
         schema_class (Type[BaseEventSchema]): The schema class for the event's data.
+        supports_batch (bool): Whether the receiver applies consecutive events of this class
+        from a partition together with `action_batch`.
     """
 
     schema_class: Type[BaseEventSchema] = None
+    supports_batch: bool = False
 
-    def __init__(self, data: dict):
+    def __init__(self, data: dict, version: int = -1):
         """
         Constructor for the inherited classes from ConsumerEvent class.
 
         Args:
             data (dict): The received data.
+            version (int): The offset of the received message, used as the version of replicated records.
+                Default is -1.
         """
 
         self._data: BaseEventSchema = self.schema_class(**data)
+        self._version = version
 
     @abstractmethod
     async def action(self, uow: SqlAlchemyUnitOfWork):
@@ -52,6 +59,35 @@ class ConsumerEvent(Generic[BaseEventSchema], ABC):
 
         raise NotImplementedError
 
+    @classmethod
+    async def action_batch(cls, events: List["ConsumerEvent"], uow: SqlAlchemyUnitOfWork):
+        """
+        Action to be executed on consecutive events of a partition, in the order they were received.
+
+        Events which support batches override it to apply all events in a single transaction.
+        By default events are applied one by one.
+
+        Args:
+            events (List[ConsumerEvent]): The events.
+            uow (SqlAlchemyUnitOfWork): The unit of work instance.
+        """
+
+        for event in events:
+            await event.action(uow)
+
+    async def invalidate(self, uow: SqlAlchemyUnitOfWork):
+        """
+        Invalidates in-memory state of the process which the event makes stale.
+
+        An event is applied to the database by a single consumer of its group, while every process receives it
+        with a broadcast receiver and calls this method. By default nothing is invalidated.
+
+        Args:
+            uow (SqlAlchemyUnitOfWork): The unit of work instance to read the state from.
+        """
+
+        pass
+
     @classmethod
     def get_event_name(cls) -> str:
         """
@@ -70,20 +106,34 @@ class RestaurantManagerCreatedEvent(ConsumerEvent[RestaurantManagerCreatedSchema
     """
 
     schema_class = RestaurantManagerCreatedSchema
+    supports_batch = True
 
     async def action(self, uow: SqlAlchemyUnitOfWork):
         """
         Creates a new restaurant manager.
 
+        Nothing is changed if the restaurant manager already has this or a newer version.
+
         Args:
             uow (SqlAlchemyUnitOfWork): The unit of work instance.
         """
 
-        restaurant_manager_service = RestaurantManagerService()
+        async with uow_transaction_with_commit(uow) as uow:
+            await uow.managers.upsert({**self._data.model_dump(), "version": self._version})
+
+    @classmethod
+    async def action_batch(cls, events: List["RestaurantManagerCreatedEvent"], uow: SqlAlchemyUnitOfWork):
+        """
+        Creates new restaurant managers in a single transaction.
+
+        Args:
+            events (List[RestaurantManagerCreatedEvent]): The events.
+            uow (SqlAlchemyUnitOfWork): The unit of work instance.
+        """
 
         async with uow_transaction_with_commit(uow) as uow:
-            restaurant_manager_data = RestaurantManagerCreateIn(**self._data.model_dump())
-            await restaurant_manager_service.create(restaurant_manager_data, uow)
+            await uow.managers.upsert_many([{**event._data.model_dump(), "version": event._version}
+                                            for event in events])
 
 
 class ModeratorCreatedEvent(ConsumerEvent[ModeratorCreatedSchema]):
@@ -92,20 +142,34 @@ class ModeratorCreatedEvent(ConsumerEvent[ModeratorCreatedSchema]):
     """
 
     schema_class = ModeratorCreatedSchema
+    supports_batch = True
 
     async def action(self, uow: SqlAlchemyUnitOfWork):
         """
         Creates a new moderator.
 
+        Nothing is changed if the moderator already has this or a newer version.
+
         Args:
             uow (SqlAlchemyUnitOfWork): The unit of work instance.
         """
 
-        moderator_service = ModeratorService()
+        async with uow_transaction_with_commit(uow) as uow:
+            await uow.moderators.upsert({**self._data.model_dump(), "version": self._version})
+
+    @classmethod
+    async def action_batch(cls, events: List["ModeratorCreatedEvent"], uow: SqlAlchemyUnitOfWork):
+        """
+        Creates new moderators in a single transaction.
+
+        Args:
+            events (List[ModeratorCreatedEvent]): The events.
+            uow (SqlAlchemyUnitOfWork): The unit of work instance.
+        """
 
         async with uow_transaction_with_commit(uow) as uow:
-            moderator_data = ModeratorCreateIn(**self._data.model_dump())
-            await moderator_service.create(moderator_data, uow)
+            await uow.moderators.upsert_many([{**event._data.model_dump(), "version": event._version}
+                                              for event in events])
 
 
 class RestaurantRatingUpdatedEvent(ConsumerEvent[RestaurantRatingUpdatedSchema]):
@@ -114,18 +178,66 @@ class RestaurantRatingUpdatedEvent(ConsumerEvent[RestaurantRatingUpdatedSchema])
     """
 
     schema_class = RestaurantRatingUpdatedSchema
+    supports_batch = True
 
     async def action(self, uow: SqlAlchemyUnitOfWork):
         """
-        Updates a restaurant rating.
+        Updates a restaurant rating, unless a newer rating has been received.
 
         Args:
             uow (SqlAlchemyUnitOfWork): The unit of work instance.
         """
 
+        await type(self).action_batch([self], uow)
+
+    @classmethod
+    async def action_batch(cls, events: List["RestaurantRatingUpdatedEvent"], uow: SqlAlchemyUnitOfWork):
+        """
+        Updates ratings of restaurants in a single transaction.
+
+        Only the newest rating of a restaurant in the batch is written.
+
+        Args:
+            events (List[RestaurantRatingUpdatedEvent]): The events.
+            uow (SqlAlchemyUnitOfWork): The unit of work instance.
+        """
+
+        ratings = dict()
+
+        for event in events:
+            rating = ratings.get(event._data.id)
+
+            if rating is None or rating["version"] <= event._data.version:
+                ratings[event._data.id] = event._data.model_dump(include={"id", "rating", "reviews_count", "version"})
+
         async with uow_transaction_with_commit(uow) as uow:
-            await uow.restaurants.update(self._data.id, {
-                "rating": self._data.rating,
-                "reviews_count": self._data.reviews_count
-            })
+            await uow.restaurants.update_ratings(list(ratings.values()))
+
+
+
+class UserUpdatedEvent(ConsumerEvent[UserUpdatedSchema]):
+    """
+    Event when User is updated.
+    """
+
+    schema_class = UserUpdatedSchema
+
+    async def action(self, uow: SqlAlchemyUnitOfWork):
+        """
+        Invalidates cached roles of a user.
+
+        Args:
+            uow (SqlAlchemyUnitOfWork): The unit of work instance.
+        """
+
+        grpc_roles_client.invalidate_user(self._data.id)
+
+    async def invalidate(self, uow: SqlAlchemyUnitOfWork):
+        """
+        Invalidates cached roles of a user in the process.
+
+        Args:
+            uow (SqlAlchemyUnitOfWork): The unit of work instance.
+        """
 
+        grpc_roles_client.invalidate_user(self._data.id)
@@ -1,3 +1,5 @@
-from .engine import async_engine
-from .session import get_async_session, async_session_maker
+from .engine import async_engine, get_async_engine, init_thread_engine, dispose_thread_engine
+from .session import get_async_session, get_async_session_maker, async_session_maker
+from .pool import pool_metrics
 from .url import DATABASE_URL
+from .functions import *
@@ -1,8 +1,63 @@
-from sqlalchemy import NullPool
-from sqlalchemy.ext.asyncio import create_async_engine
+from threading import local
 
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine
+from .pool import get_engine_options
 from .url import DATABASE_URL
 
-# Async Engine #
 
-async_engine = create_async_engine(DATABASE_URL, poolclass=NullPool)
+def create_engine() -> AsyncEngine:
+    """
+    Creates an async engine with the pool configured in settings.
+
+    Returns:
+        AsyncEngine: The engine.
+    """
+
+    return create_async_engine(DATABASE_URL, **get_engine_options())
+
+
+# Async Engine of the web application's event loop #
+
+async_engine = create_engine()
+
+# Engines of threads which run their own event loops #
+
+_thread_engines = local()
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Returns the engine of the current thread.
+
+    Returns:
+        AsyncEngine: The engine created by `init_thread_engine` in this thread or the web application's engine.
+    """
+
+    return getattr(_thread_engines, "engine", async_engine)
+
+
+def init_thread_engine() -> AsyncEngine:
+    """
+    Creates an engine for the current thread.
+
+    Pooled asyncpg connections are bound to the event loop they were opened in, so every thread which
+    runs its own event loop, like Kafka receivers, must use its own engine.
+
+    Returns:
+        AsyncEngine: The engine of the current thread.
+    """
+
+    _thread_engines.engine = create_engine()
+    return _thread_engines.engine
+
+
+async def dispose_thread_engine():
+    """
+    Closes all connections of the current thread's engine.
+    """
+
+    engine = getattr(_thread_engines, "engine", None)
+
+    if engine is not None:
+        del _thread_engines.engine
+        await engine.dispose()
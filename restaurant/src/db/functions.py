@@ -0,0 +1,47 @@
+import json
+from typing import Any
+
+from sqlalchemy import Boolean, literal
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+__all__ = [
+    "json_array_contains",
+]
+
+
+class json_array_contains(FunctionElement):
+    """
+    SQL expression checking whether a JSON array column contains a value.
+
+    PostgreSQL compiles it to the `@>` operator on JSONB, which is served by a GIN index
+    on the column cast to JSONB. SQLite searches the array with `json_each`.
+
+    Args:
+        column: The JSON array column.
+        value (Any): The value of an element of the array.
+    """
+
+    name = 'json_array_contains'
+    type = Boolean()
+    inherit_cache = True
+
+    def __init__(self, column, value: Any):
+        super().__init__(column, literal(value))
+
+
+@compiles(json_array_contains)
+@compiles(json_array_contains, 'postgresql')
+def _compile_json_array_contains_postgresql(element: json_array_contains, compiler, **kwargs) -> str:
+    column, value = element.clauses
+    value = literal(json.dumps([value.value]))
+
+    return f"CAST({compiler.process(column, **kwargs)} AS JSONB) @> CAST({compiler.process(value, **kwargs)} AS JSONB)"
+
+
+@compiles(json_array_contains, 'sqlite')
+def _compile_json_array_contains_sqlite(element: json_array_contains, compiler, **kwargs) -> str:
+    column, value = element.clauses
+
+    return f"EXISTS (SELECT 1 FROM json_each({compiler.process(column, **kwargs)}) " \
+           f"WHERE json_each.value = {compiler.process(value, **kwargs)})"
@@ -0,0 +1,39 @@
+"""restaurant location index
+
+Revision ID: 6c1f4e92ab57
+Revises: b5e8d3a17f20
+Create Date: 2026-10-17 20:03:15.284617
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c1f4e92ab57'
+down_revision: Union[str, None] = 'b5e8d3a17f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Location columns, which may be missing in databases created by migrations
+location_columns = [
+    sa.Column('latitude', sa.Float(), nullable=True),
+    sa.Column('longitude', sa.Float(), nullable=True),
+]
+
+
+def upgrade() -> None:
+    existing_columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('restaurants')}
+
+    for column in location_columns:
+        if column.name not in existing_columns:
+            op.add_column('restaurants', column)
+
+    op.create_index('ix_restaurants_is_active_latitude_longitude', 'restaurants',
+                    ['is_active', 'latitude', 'longitude'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_restaurants_is_active_latitude_longitude', table_name='restaurants')
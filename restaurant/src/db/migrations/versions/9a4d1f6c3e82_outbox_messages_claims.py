@@ -0,0 +1,29 @@
+"""outbox messages claims
+
+Revision ID: 9a4d1f6c3e82
+Revises: 6c1f4e92ab57
+Create Date: 2026-10-18 10:14:05.118342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4d1f6c3e82'
+down_revision: Union[str, None] = '6c1f4e92ab57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('outbox_messages', sa.Column('claimed_until', sa.DateTime(), nullable=True))
+    op.create_index('ix_outbox_messages_topic_aggregate_id_id', 'outbox_messages',
+                    ['topic', 'aggregate_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_outbox_messages_topic_aggregate_id_id', table_name='outbox_messages')
+    op.drop_column('outbox_messages', 'claimed_until')
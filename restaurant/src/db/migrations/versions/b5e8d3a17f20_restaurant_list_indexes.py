@@ -0,0 +1,61 @@
+"""restaurant list indexes
+
+Revision ID: b5e8d3a17f20
+Revises: d2a6f93e1c48
+Create Date: 2026-10-17 19:12:41.730214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e8d3a17f20'
+down_revision: Union[str, None] = 'd2a6f93e1c48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Columns of restaurant listings filters, which may be missing in databases created by migrations
+filter_columns = [
+    sa.Column('city', sa.String(100), nullable=True),
+    sa.Column('state', sa.String(100), nullable=True),
+    sa.Column('pincode', sa.String(6), nullable=True),
+    sa.Column('cuisine_types', sa.JSON(), nullable=True),
+    sa.Column('serves_vegetarian', sa.Boolean(), nullable=True),
+    sa.Column('serves_non_vegetarian', sa.Boolean(), nullable=True),
+    sa.Column('serves_jain', sa.Boolean(), nullable=True),
+    sa.Column('serves_vegan', sa.Boolean(), nullable=True),
+    sa.Column('halal_certified', sa.Boolean(), nullable=True),
+    sa.Column('mystery_bag_enabled', sa.Boolean(), nullable=True),
+    sa.Column('is_verified', sa.Boolean(), nullable=True),
+    sa.Column('total_food_waste_saved_kg', sa.Float(), nullable=True),
+]
+
+
+def upgrade() -> None:
+    existing_columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('restaurants')}
+
+    for column in filter_columns:
+        if column.name not in existing_columns:
+            op.add_column('restaurants', column)
+
+    op.create_index('ix_restaurants_is_active_city', 'restaurants', ['is_active', 'city'])
+    op.create_index('ix_restaurants_is_active_state', 'restaurants', ['is_active', 'state'])
+    op.create_index('ix_restaurants_pincode', 'restaurants', ['pincode'])
+    op.create_index('ix_restaurants_cuisine_types', 'restaurants', [sa.text('CAST(cuisine_types AS JSONB)')],
+                    postgresql_using='gin')
+    op.create_index('ix_restaurants_is_active_rating', 'restaurants',
+                    ['is_active', sa.text('coalesce(rating, 0) DESC'), sa.text('id DESC')])
+    op.create_index('ix_restaurants_is_active_food_waste_saved', 'restaurants',
+                    ['is_active', sa.text('coalesce(total_food_waste_saved_kg, 0) DESC'), sa.text('id DESC')])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_restaurants_is_active_food_waste_saved', table_name='restaurants')
+    op.drop_index('ix_restaurants_is_active_rating', table_name='restaurants')
+    op.drop_index('ix_restaurants_cuisine_types', table_name='restaurants')
+    op.drop_index('ix_restaurants_pincode', table_name='restaurants')
+    op.drop_index('ix_restaurants_is_active_state', table_name='restaurants')
+    op.drop_index('ix_restaurants_is_active_city', table_name='restaurants')
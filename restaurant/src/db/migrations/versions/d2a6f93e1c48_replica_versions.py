@@ -0,0 +1,28 @@
+"""replica versions
+
+Revision ID: d2a6f93e1c48
+Revises: 4f81c2d6b9e0
+Create Date: 2026-10-17 18:04:27.513906
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a6f93e1c48'
+down_revision: Union[str, None] = '4f81c2d6b9e0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('restaurant_managers', sa.Column('version', sa.BigInteger(), server_default='-1', nullable=False))
+    op.add_column('moderators', sa.Column('version', sa.BigInteger(), server_default='-1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('moderators', 'version')
+    op.drop_column('restaurant_managers', 'version')
@@ -0,0 +1,26 @@
+"""restaurants rating version
+
+Revision ID: f3b9c6e2d714
+Revises: 9a4d1f6c3e82
+Create Date: 2026-10-18 11:28:40.172305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b9c6e2d714'
+down_revision: Union[str, None] = '9a4d1f6c3e82'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('restaurants', sa.Column('rating_version', sa.BigInteger(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('restaurants', 'rating_version')
@@ -0,0 +1,174 @@
+import time
+from contextlib import contextmanager
+from threading import Lock
+from typing import Any, Dict
+from uuid import uuid4
+from weakref import WeakSet
+
+from sqlalchemy import NullPool, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from config import get_settings
+
+
+class PoolMetrics(object):
+    """
+    Connection pool metrics of all database engines of the service.
+
+    Every thread which runs its own event loop has its own pool, so the metrics are summed over all pools.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._pools: WeakSet = WeakSet()
+        self._waiters = 0
+        self._checkouts = 0
+        self._timeouts = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+
+    def register_pool(self, pool: AsyncAdaptedQueuePool):
+        """
+        Adds a pool to the metrics.
+
+        Args:
+            pool (AsyncAdaptedQueuePool): The connection pool.
+        """
+
+        with self._lock:
+            self._pools.add(pool)
+
+    @contextmanager
+    def measure_checkout(self, blocks: bool):
+        """
+        Context manager which measures the time spent waiting for a connection from a pool.
+
+        Args:
+            blocks (bool): Whether the checkout waits for a connection to be returned to the pool.
+        """
+
+        start = time.perf_counter()
+
+        if blocks:
+            with self._lock:
+                self._waiters += 1
+
+        try:
+            yield
+        except exc.TimeoutError:
+            with self._lock:
+                self._timeouts += 1
+            raise
+        else:
+            wait_time = time.perf_counter() - start
+
+            with self._lock:
+                self._checkouts += 1
+                self._wait_time_total += wait_time
+                self._wait_time_max = max(self._wait_time_max, wait_time)
+        finally:
+            if blocks:
+                with self._lock:
+                    self._waiters -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns current values of the metrics.
+
+        Returns:
+            Dict[str, Any]: The metrics by their names.
+        """
+
+        with self._lock:
+            pools = list(self._pools)
+            checkouts = self._checkouts
+
+            return {
+                "pools": len(pools),
+                "size": sum(pool.size() for pool in pools),
+                "checked_out": sum(pool.checkedout() for pool in pools),
+                "idle": sum(pool.checkedin() for pool in pools),
+                "overflow": sum(max(pool.overflow(), 0) for pool in pools),
+                "waiters": self._waiters,
+                "checkouts": checkouts,
+                "timeouts": self._timeouts,
+                "wait_time_avg_seconds": self._wait_time_total / checkouts if checkouts else 0.0,
+                "wait_time_max_seconds": self._wait_time_max,
+            }
+
+    def reset(self):
+        """
+        Resets the checkout counters, keeping the registered pools.
+        """
+
+        with self._lock:
+            self._checkouts = 0
+            self._timeouts = 0
+            self._wait_time_total = 0.0
+            self._wait_time_max = 0.0
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Async queue pool which reports its checkouts to the pool metrics of the service.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        pool_metrics.register_pool(self)
+
+    def is_exhausted(self) -> bool:
+        """
+        Checks whether a checkout has to wait, that is the pool has no idle connections and can't open overflow ones.
+
+        Returns:
+            bool: True if the pool is exhausted, False otherwise.
+        """
+
+        # A negative max overflow means the pool opens overflow connections without a limit
+        return self.checkedin() == 0 and -1 < self._max_overflow <= self.overflow()
+
+    def connect(self):
+        with pool_metrics.measure_checkout(self.is_exhausted()):
+            return super().connect()
+
+
+def get_engine_options() -> Dict[str, Any]:
+    """
+    Returns keyword arguments of `create_async_engine` according to the pool settings.
+
+    Returns:
+        Dict[str, Any]: The engine options.
+    """
+
+    settings = get_settings()
+
+    options: Dict[str, Any] = dict()
+
+    if settings.db_pool_enabled:
+        options.update(
+            poolclass=InstrumentedAsyncAdaptedQueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_pool_max_overflow,
+            pool_timeout=settings.db_pool_timeout_seconds,
+            pool_pre_ping=settings.db_pool_pre_ping,
+            pool_recycle=settings.db_pool_recycle_seconds,
+        )
+    else:
+        options.update(poolclass=NullPool)
+
+    if settings.db_pgbouncer_mode:
+        # PgBouncer in transaction mode may run statements of a session on different server connections,
+        # so prepared statements must not be cached and their names must be unique
+        options.update(
+            connect_args={
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            }
+        )
+
+    return options
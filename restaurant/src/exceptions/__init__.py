@@ -4,3 +4,4 @@ from .manager import *
 from .moderator import *
 from .restaurant import *
 from .application import *
+from .pagination import *
@@ -0,0 +1,30 @@
+from .base import AppError
+
+__all__ = [
+    "InvalidCursorError",
+]
+
+
+class InvalidCursorError(AppError):
+    """
+    Exception class for errors when a pagination cursor can't be decoded.
+    """
+
+    def __init__(self, cursor: str):
+        """
+        Initialize the InvalidCursorError exception.
+
+        Args:
+            cursor (str): The cursor.
+        """
+
+        self._cursor = cursor
+        super().__init__()
+
+    @property
+    def status_code(self) -> int:
+        return 400
+
+    @property
+    def message(self) -> str:
+        return f"Invalid pagination cursor: {self._cursor}"
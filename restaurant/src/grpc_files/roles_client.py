@@ -9,25 +9,42 @@ __all__ = ["RolesClient"]
 
 class RolesClient(object):
     """
-    Client for gRPC functionality
+    Asynchronous client for gRPC functionality.
+
+    The channel is opened lazily, so it is bound to the event loop of the first request,
+    and every call is limited by a deadline.
     """
 
-    def __init__(self, host: str, port: int):
+    def __init__(self, host: str, port: int, timeout: float = 1.0):
         self.host = host
         self.server_port = port
+        self.timeout = timeout
+
+        self.channel = None
+        self.stub = None
 
-        # instantiate a channel
-        self.channel = grpc.insecure_channel(
-            '{}:{}'.format(self.host, self.server_port))
+    def _get_stub(self) -> pb2_grpc.RolesServiceStub:
+        if self.stub is None:
+            # instantiate a channel
+            self.channel = grpc.aio.insecure_channel(
+                '{}:{}'.format(self.host, self.server_port))
 
-        # bind the client
-        self.stub = pb2_grpc.RolesServiceStub(self.channel)
+            # bind the client
+            self.stub = pb2_grpc.RolesServiceStub(self.channel)
 
-    def get_user_role(self, access_token):
+        return self.stub
+
+    async def get_user_role(self, access_token: str) -> pb2.GetUserRoleResponse:
         request = pb2.GetUserRoleRequest(access_token=access_token)
-        response = self.stub.GetUserRole(request)
+        response = await self._get_stub().GetUserRole(request, timeout=self.timeout)
 
         logger.info(f"Got gRPC response for user with id={response.user_id} and role={response.role}")
 
         return response
 
+    async def close(self):
+        if self.channel is not None:
+            await self.channel.close()
+
+        self.channel = None
+        self.stub = None
@@ -6,3 +6,4 @@ from .moderator import *
 from .hours import *
 from .restaurant import *
 from .application import *
+from .outbox import *
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Boolean, Integer
+from sqlalchemy import Column, BigInteger, Boolean, Integer
 
 from .base import CustomBase
 
@@ -9,3 +9,6 @@ class Moderator(CustomBase):
     __tablename__ = 'moderators'
 
     id = Column(Integer, primary_key=True, autoincrement=False)
+
+    # Offset of the Kafka message which has last written the replica
+    version = Column(BigInteger, nullable=False, default=-1, server_default='-1')
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, String, DateTime, JSON, Index
+from sqlalchemy.sql import func
+
+from .base import CustomBase
+
+__all__ = ["OutboxMessage"]
+
+
+class OutboxMessage(CustomBase):
+    """
+    Kafka message written in the same transaction as the changes it describes.
+
+    Messages are published by the outbox relay in the order of their IDs and deleted after Kafka
+    acknowledges them. The aggregate ID is the key of a message and the event name is its header.
+    A relay claims messages until `claimed_until` before publishing them, so other relays skip them.
+    """
+
+    __tablename__ = 'outbox_messages'
+
+    topic = Column(String(255), nullable=False)
+    event_name = Column(String(255), nullable=False)
+    aggregate_id = Column(String(255), nullable=True)
+    payload = Column(JSON, nullable=False)
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+    claimed_until = Column(DateTime, nullable=True)
+
+
+Index('ix_outbox_messages_topic_aggregate_id_id', OutboxMessage.topic, OutboxMessage.aggregate_id, OutboxMessage.id)
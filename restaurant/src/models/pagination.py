@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Generic, TypeVar, List
+from typing import Generic, TypeVar, List, Optional
 
 M = TypeVar('M')
 
@@ -8,5 +8,6 @@ M = TypeVar('M')
 class PaginatedModel(Generic[M]):
     limit: int
     offset: int
-    count: int
+    count: Optional[int]
     items: List[M]
+    next_cursor: Optional[str] = None
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, String, Boolean, Float, Integer, DateTime, Text, JSON
+from sqlalchemy import Column, String, Boolean, Float, Integer, BigInteger, DateTime, Text, JSON, Index, cast
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -19,6 +20,8 @@ class Restaurant(CustomBase):
 
     rating = Column(Float(decimal_return_scale=2), nullable=True)
     reviews_count = Column(Integer, nullable=False, default=0)
+    # Version of the rating aggregates in the review service, older ratings are dropped
+    rating_version = Column(BigInteger, nullable=False, default=0, server_default='0')
 
     is_active = Column(Boolean, nullable=False, default=True)
     
@@ -118,3 +121,18 @@ class Restaurant(CustomBase):
             'pan_verified': bool(self.pan_number),
             'fully_compliant': all([self.gst_number, self.fssai_license, self.trade_license_number, self.pan_number])
         }
+
+
+# Filters of restaurant listings
+Index('ix_restaurants_is_active_city', Restaurant.is_active, Restaurant.city)
+Index('ix_restaurants_is_active_state', Restaurant.is_active, Restaurant.state)
+Index('ix_restaurants_pincode', Restaurant.pincode)
+Index('ix_restaurants_is_active_latitude_longitude', Restaurant.is_active, Restaurant.latitude, Restaurant.longitude)
+Index('ix_restaurants_cuisine_types', cast(Restaurant.cuisine_types, JSONB),
+      postgresql_using='gin').ddl_if(dialect='postgresql')
+
+# Sort keys of listings of active restaurants
+Index('ix_restaurants_is_active_rating',
+      Restaurant.is_active, func.coalesce(Restaurant.rating, 0).desc(), Restaurant.id.desc())
+Index('ix_restaurants_is_active_food_waste_saved',
+      Restaurant.is_active, func.coalesce(Restaurant.total_food_waste_saved_kg, 0).desc(), Restaurant.id.desc())
@@ -2,8 +2,11 @@ from loguru import logger
 
 from config import get_settings
 from .events import *
+from .codecs import *
 from .creator import *
+from .metrics import *
 from .publisher import *
+from .export import *
 
 settings = get_settings()
 
@@ -11,7 +14,11 @@ settings = get_settings()
 producer_creator = KafkaProducerSASLPlaintextCreator(bootstrap_server_host=settings.kafka_bootstrap_server_host,
                                                      bootstrap_server_port=settings.kafka_bootstrap_server_port,
                                                      sasl_plain_username=settings.kafka_broker_user,
-                                                     sasl_plain_password=settings.kafka_broker_password)
+                                                     sasl_plain_password=settings.kafka_broker_password,
+                                                     linger_ms=settings.kafka_producer_linger_ms,
+                                                     batch_size=settings.kafka_producer_batch_size,
+                                                     compression_type=settings.kafka_producer_compression_type,
+                                                     topics_codecs=settings.kafka_producer_topics_codecs)
 
 
 # producer_creator = KafkaProducerSCRAM256Creator(bootstrap_server_host=settings.kafka_bootstrap_server_host,
@@ -20,12 +27,25 @@ producer_creator = KafkaProducerSASLPlaintextCreator(bootstrap_server_host=setti
 #                                                 sasl_plain_password=settings.kafka_broker_password,
 #                                                 ssl_cafile=settings.kafka_ssl_cafile,
 #                                                 ssl_certfile=settings.kafka_ssl_certfile,
-#                                                 ssl_keyfile=settings.kafka_ssl_keyfile)
+#                                                 ssl_keyfile=settings.kafka_ssl_keyfile,
+#                                                 linger_ms=settings.kafka_producer_linger_ms,
+#                                                 batch_size=settings.kafka_producer_batch_size,
+#                                                 compression_type=settings.kafka_producer_compression_type,
+#                                                 topics_codecs=settings.kafka_producer_topics_codecs)
 
 # Init publisher
 try:
     producer = producer_creator.create()
-    publisher = KafkaPublisher(producer)
+    # Compression is a setting of a producer, so every other compression needs its own producer
+    compression_producers = {compression_type: producer_creator.with_compression_type(compression_type).create()
+                             for compression_type in set(settings.kafka_producer_topics_compression_types.values())
+                             if compression_type != settings.kafka_producer_compression_type}
+    topics_producers = {topic: compression_producers.get(compression_type, producer)
+                        for topic, compression_type in settings.kafka_producer_topics_compression_types.items()}
+    publisher = KafkaPublisher(producer, queue_maxsize=settings.kafka_publisher_queue_maxsize,
+                               topics_producers=topics_producers,
+                               schema_id_header=settings.kafka_producer_schema_id_header,
+                               queue_put_timeout=settings.kafka_publisher_queue_put_timeout_seconds)
 except Exception as e:
     logger.error(f"Failed to create Kafka publisher: {e}")
     publisher = DummyPublisher()
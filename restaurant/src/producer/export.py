@@ -0,0 +1,66 @@
+import json
+from typing import Dict, IO, Iterable
+
+from kafka.partitioner.default import DefaultPartitioner
+
+from .events import ProducerEvent
+
+__all__ = [
+    'get_key_partition',
+    'write_jsonl_export',
+]
+
+
+def get_key_partition(key: str, partitions_count: int) -> int:
+    """
+    Returns the partition to which producers publish messages with the key.
+
+    Args:
+        key (str): The key, i.e. the ID of the entity.
+        partitions_count (int): The number of partitions of the topic.
+
+    Returns:
+        int: The partition.
+    """
+
+    partitions = list(range(partitions_count))
+
+    return DefaultPartitioner()(key.encode('ascii'), partitions, partitions)
+
+
+def write_jsonl_export(topic: str, events: Iterable[ProducerEvent], end_offsets: Dict[int, int], file: IO[str]) -> int:
+    """
+    Exports the full state of entities as events in the JSONL format of snapshots read by consumers.
+
+    A compacted topic keeps only the last event of an entity, so fields carried only by its created event
+    are lost. The owning service exports the whole state instead. The end offsets of the topic must be taken
+    before the state is read, so the state includes every message published before them. Every event is written
+    at the offset preceding the end offset of its key's partition: consumers load it with that version and
+    continue live consumption from the end offsets, so newer messages overwrite it.
+
+    Args:
+        topic (str): The topic whose consumers load the export.
+        events (Iterable[ProducerEvent]): The events with the full state of entities.
+        end_offsets (Dict[int, int]): The end offsets of the topic by partitions.
+        file (IO[str]): The JSONL file.
+
+    Returns:
+        int: The number of exported events.
+    """
+
+    count = 0
+
+    for event in events:
+        key = event.get_aggregate_id()
+        partition = get_key_partition(key, len(end_offsets))
+        file.write(json.dumps({
+            'topic': topic,
+            'partition': partition,
+            'offset': end_offsets[partition] - 1,
+            'key': key,
+            'event_name': event.get_event_name(),
+            'value': event.get_data(topic),
+        }) + '\n')
+        count += 1
+
+    return count
@@ -3,3 +3,4 @@ from .hours import *
 from .manager import *
 from .moderator import *
 from .restaurant import *
+from .outbox import *
@@ -1,8 +1,9 @@
 from abc import abstractmethod, ABC
-from typing import TypeVar, Optional, Generic, List
+from typing import TypeVar, Optional, Generic, Iterable, List
 
 from loguru import logger
-from sqlalchemy import select, insert, update, delete, Select, Insert, Update, Delete, exists
+from sqlalchemy import select, insert, update, delete, Select, Insert, Update, Delete, exists, or_
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models import CustomBase
@@ -10,6 +11,7 @@ from models import CustomBase
 __all__ = [
     "GenericRepository",
     "SQLAlchemyRepository",
+    "SQLAlchemyReplicaRepository",
 ]
 
 from models.pagination import PaginatedModel
@@ -274,3 +276,84 @@ class SQLAlchemyRepository(GenericRepository[Model], ABC):
         logger.debug(f"Checked for existence {self.model.__name__} with id={id}")
 
         return result
+
+
+class SQLAlchemyReplicaRepository(SQLAlchemyRepository[Model], ABC):
+    """
+    An abstract base class for repositories of models replicated from other services by Kafka events.
+
+    Replicated models have a `version` column with the offset of the message which has last written the record.
+    Events of an aggregate are sent to the same partition, so a newer event has a greater offset, and a record
+    is only overwritten by a newer version. Redelivered and replayed events are dropped by the database.
+
+    Messages published before events were keyed by their entities are spread over partitions by event names,
+    so their offsets are not comparable. Records written by them, or before versions were added, have version -1
+    and are overwritten by any message, in the order of consumption as they were before. A record written
+    by a keyed message is never overwritten by such a legacy message.
+    """
+
+    def _get_upsert_stmt(self, columns: Iterable[str], **kwargs) -> Insert:
+        """
+        Create an INSERT ... ON CONFLICT DO UPDATE statement, which only overwrites an older or a legacy version
+        of a record.
+
+        Args:
+            columns (Iterable[str]): The columns of the data, including the ID and the version.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Insert: The INSERT statement, executed with the data and the version of every record.
+        """
+
+        table = self.model.__table__
+        dialect_insert = sqlite.insert if self._session.get_bind().dialect.name == 'sqlite' else postgresql.insert
+        stmt = dialect_insert(table)
+
+        return stmt.on_conflict_do_update(
+            index_elements=[table.c.id],
+            set_={column: stmt.excluded[column] for column in columns if column != 'id'},
+            where=or_(table.c.version < stmt.excluded.version, table.c.version < 0),
+        )
+
+    async def upsert(self, data: dict, **kwargs) -> bool:
+        """
+        Add a record or update it if the stored version is older.
+
+        Args:
+            data (dict): A dictionary containing the data and the version of the record.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            bool: True if the record has been written, False if the stored version is the same or newer.
+        """
+
+        stmt = self._get_upsert_stmt(columns=data.keys(), **kwargs)
+        result = await self._session.execute(stmt, data)
+
+        if result.rowcount:
+            logger.debug(f"Upserted {self.model.__name__} with id={data['id']} and version={data['version']}")
+            return True
+
+        logger.debug(f"Skipped stale {self.model.__name__} with id={data['id']} and version={data['version']}")
+        return False
+
+    async def upsert_many(self, data: List[dict], **kwargs):
+        """
+        Add records or update those whose stored versions are older in a single executemany statement.
+
+        Only the last version of a record in the list is written.
+
+        Args:
+            data (List[dict]): Dictionaries with the same keys, containing the data and the version of every record.
+            **kwargs: Additional keyword arguments.
+        """
+
+        if not data:
+            return
+
+        data = list({record['id']: record for record in data}.values())
+
+        stmt = self._get_upsert_stmt(columns=data[0].keys(), **kwargs)
+        await self._session.execute(stmt, data)
+
+        logger.debug(f"Upserted {len(data)} {self.model.__name__}(s)")
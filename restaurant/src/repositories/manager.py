@@ -1,12 +1,12 @@
 from models import RestaurantManager
-from .generic import SQLAlchemyRepository
+from .generic import SQLAlchemyReplicaRepository
 
 __all__ = [
     "RestaurantManagerRepository",
 ]
 
 
-class RestaurantManagerRepository(SQLAlchemyRepository[RestaurantManager]):
+class RestaurantManagerRepository(SQLAlchemyReplicaRepository[RestaurantManager]):
     """
     Repository for RestaurantManager model operations.
     """
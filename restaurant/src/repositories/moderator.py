@@ -1,12 +1,12 @@
 from models import Moderator
-from .generic import SQLAlchemyRepository
+from .generic import SQLAlchemyReplicaRepository
 
 __all__ = [
     "ModeratorRepository",
 ]
 
 
-class ModeratorRepository(SQLAlchemyRepository[Moderator]):
+class ModeratorRepository(SQLAlchemyReplicaRepository[Moderator]):
     """
     Repository for Moderator model operations.
     """
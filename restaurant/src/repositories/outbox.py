@@ -0,0 +1,190 @@
+from datetime import datetime, timedelta
+from typing import List, Optional, Set, Tuple
+
+from sqlalchemy import Select, Delete, Update, select, delete, insert, update, or_, tuple_
+from loguru import logger
+
+from models import OutboxMessage
+from producer.events import ProducerEvent
+from .generic import SQLAlchemyRepository
+
+__all__ = [
+    'OutboxMessageRepository',
+]
+
+
+class OutboxMessageRepository(SQLAlchemyRepository[OutboxMessage]):
+    """
+    Repository for OutboxMessage model operations.
+    """
+
+    model = OutboxMessage
+
+    def _get_list_pending_stmt(self, limit: int, now: datetime, **kwargs) -> Select:
+        """
+        Create a SELECT statement which locks the oldest unclaimed messages.
+
+        Rows locked by concurrent relays are skipped instead of waited for, so relays don't queue up
+        behind each other.
+
+        Args:
+            limit (int): The maximum number of messages.
+            now (datetime): The current time, claims which expired before it are ignored.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Select: The SELECT statement.
+        """
+
+        return select(OutboxMessage) \
+            .where(or_(OutboxMessage.claimed_until.is_(None), OutboxMessage.claimed_until < now)) \
+            .order_by(OutboxMessage.id) \
+            .limit(limit) \
+            .with_for_update(skip_locked=True)
+
+    def _get_list_preceded_keys_stmt(self, keys: Set[Tuple[str, str]], ids: List[int], **kwargs) -> Select:
+        """
+        Create a SELECT statement for topics and aggregate IDs which have older messages outside of a batch.
+
+        Args:
+            keys (Set[Tuple[str, str]]): The topics and aggregate IDs of the messages of the batch.
+            ids (List[int]): The IDs of the messages of the batch.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Select: The SELECT statement.
+        """
+
+        return select(OutboxMessage.topic, OutboxMessage.aggregate_id) \
+            .where(tuple_(OutboxMessage.topic, OutboxMessage.aggregate_id).in_(list(keys)),
+                   OutboxMessage.id < max(ids),
+                   OutboxMessage.id.not_in(ids)) \
+            .distinct()
+
+    def _get_update_claimed_until_stmt(self, ids: List[int], claimed_until: Optional[datetime],
+                                       **kwargs) -> Update:
+        """
+        Create an UPDATE statement which claims messages or releases them.
+
+        Args:
+            ids (List[int]): The IDs of the messages.
+            claimed_until (Optional[datetime]): The end of the claim or None to release the messages.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Update: The UPDATE statement.
+        """
+
+        return update(OutboxMessage).where(OutboxMessage.id.in_(ids)).values(claimed_until=claimed_until)
+
+    def _get_delete_many_stmt(self, ids: List[int], **kwargs) -> Delete:
+        """
+        Create a DELETE statement for published messages.
+
+        Args:
+            ids (List[int]): The IDs of the messages.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Delete: The DELETE statement.
+        """
+
+        return delete(OutboxMessage).where(OutboxMessage.id.in_(ids))
+
+    async def add_event(self, event: ProducerEvent, **kwargs):
+        """
+        Add a message for every topic of the event.
+
+        Args:
+            event (ProducerEvent): The event to publish.
+            **kwargs: Additional keyword arguments.
+        """
+
+        event_name = event.get_event_name()
+        aggregate_id = event.get_aggregate_id()
+
+        messages = [{'topic': topic, 'event_name': event_name, 'aggregate_id': aggregate_id,
+                     'payload': event.get_data(topic)}
+                    for topic in event.get_topics()]
+
+        if not messages:
+            return
+
+        await self._session.execute(insert(OutboxMessage), messages)
+
+        logger.debug(f"Added {len(messages)} OutboxMessage(s) of event {event_name}")
+
+    async def claim_pending(self, limit: int, claim_seconds: float, **kwargs) -> List[OutboxMessage]:
+        """
+        Claim the oldest unclaimed messages for some time.
+
+        Messages of a topic and an aggregate which has older messages claimed by another relay are left
+        unclaimed, so messages of an aggregate are never published out of order. The claims are visible
+        to other relays once the transaction is committed.
+
+        Args:
+            limit (int): The maximum number of messages.
+            claim_seconds (float): The time in seconds after which unpublished messages can be claimed again.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            List[OutboxMessage]: The claimed messages in the order they were added.
+        """
+
+        now = datetime.utcnow()
+        stmt = self._get_list_pending_stmt(limit, now, **kwargs)
+        result = await self._session.execute(stmt)
+        messages = list(result.scalars().all())
+
+        keys = {(message.topic, message.aggregate_id) for message in messages if message.aggregate_id is not None}
+
+        if keys:
+            stmt = self._get_list_preceded_keys_stmt(keys, [message.id for message in messages], **kwargs)
+            result = await self._session.execute(stmt)
+            preceded_keys = set(map(tuple, result.all()))
+            messages = [message for message in messages if (message.topic, message.aggregate_id) not in preceded_keys]
+
+        if not messages:
+            return messages
+
+        stmt = self._get_update_claimed_until_stmt([message.id for message in messages],
+                                                   now + timedelta(seconds=claim_seconds), **kwargs)
+        await self._session.execute(stmt)
+
+        logger.debug(f"Claimed {len(messages)} OutboxMessage(s)")
+
+        return messages
+
+    async def release(self, ids: List[int], **kwargs):
+        """
+        Release claimed messages, so they can be claimed again at once.
+
+        Args:
+            ids (List[int]): The IDs of the messages.
+            **kwargs: Additional keyword arguments.
+        """
+
+        if not ids:
+            return
+
+        stmt = self._get_update_claimed_until_stmt(ids, None, **kwargs)
+        await self._session.execute(stmt)
+
+        logger.debug(f"Released {len(ids)} OutboxMessage(s)")
+
+    async def delete_many(self, ids: List[int], **kwargs):
+        """
+        Delete published messages.
+
+        Args:
+            ids (List[int]): The IDs of the messages.
+            **kwargs: Additional keyword arguments.
+        """
+
+        if not ids:
+            return
+
+        stmt = self._get_delete_many_stmt(ids, **kwargs)
+        await self._session.execute(stmt)
+
+        logger.debug(f"Deleted {len(ids)} OutboxMessage(s)")
@@ -1,12 +1,15 @@
-from typing import Optional, List
+from typing import Optional, List, Tuple, AsyncIterator
 
 from loguru import logger
-from sqlalchemy import Select, select, desc
+from sqlalchemy import Select, Update, select, update, bindparam, func
 from sqlalchemy.orm import selectinload
+from sqlalchemy.sql import ColumnElement
 
-from models import Restaurant
+from db.functions import json_array_contains
+from models import Restaurant, RestaurantManager
 from models.pagination import PaginatedModel
-from utils.paginate import paginate
+from utils.geo import get_bounding_box, get_nearest
+from utils.paginate import paginate, keyset_paginate
 from .generic import SQLAlchemyRepository
 
 __all__ = [
@@ -87,16 +90,8 @@ class RestaurantRepository(SQLAlchemyRepository[Restaurant]):
         stmt = self.__get_select_stmt_with_options(stmt=stmt,
                                                    fetch_working_hours=fetch_working_hours,
                                                    **kwargs)
-        if kwargs.get('address', None):
-            stmt = stmt.filter(Restaurant.address.contains(kwargs['address']))
 
-        if kwargs.get('name', None):
-            stmt = stmt.filter(Restaurant.name.contains(kwargs['name']))
-
-        if kwargs.get('order_by_rating', None):
-            stmt = stmt.order_by(desc(kwargs['order_by_rating']))
-
-        return stmt
+        return self._filter_list_stmt(stmt, **kwargs)
 
     def _get_list_active_restaurants_stmt(self,
                                           fetch_working_hours: bool = False,
@@ -119,16 +114,166 @@ class RestaurantRepository(SQLAlchemyRepository[Restaurant]):
                                                    fetch_working_hours=fetch_working_hours,
                                                    **kwargs)
 
-        if kwargs.get('address', None):
-            stmt = stmt.filter(Restaurant.address.contains(kwargs['address']))
+        return self._filter_list_stmt(stmt, **kwargs)
+
+    def _filter_list_stmt(self, stmt: Select,
+                          name: Optional[str] = None,
+                          address: Optional[str] = None,
+                          city: Optional[str] = None,
+                          state: Optional[str] = None,
+                          pincode: Optional[str] = None,
+                          cuisine_type: Optional[str] = None,
+                          vegetarian_only: Optional[bool] = None,
+                          jain_food: Optional[bool] = None,
+                          vegan_options: Optional[bool] = None,
+                          halal_certified: Optional[bool] = None,
+                          mystery_bag_enabled: Optional[bool] = None,
+                          verified_only: Optional[bool] = None,
+                          **kwargs) -> Select:
+        """
+        Apply the filters and the order of restaurant listings to the SELECT statement.
 
-        if kwargs.get('name', None):
-            stmt = stmt.filter(Restaurant.name.contains(kwargs['name']))
+        City, state and PIN code are matched exactly, so they are served by indexes. Dietary and other
+        flags filter restaurants by their value if it is given, `vegetarian_only` and `verified_only`
+        only filter when they are True.
 
-        if kwargs.get('order_by_rating', None):
-            stmt = stmt.order_by(desc(Restaurant.rating))
+        Args:
+            stmt (Select): The SELECT statement of restaurants.
+            name (Optional[str]): Part of the name.
+            address (Optional[str]): Part of the address.
+            city (Optional[str]): The city.
+            state (Optional[str]): The state.
+            pincode (Optional[str]): The PIN code.
+            cuisine_type (Optional[str]): One of the cuisine types.
+            vegetarian_only (Optional[bool]): Whether to list only purely vegetarian restaurants.
+            jain_food (Optional[bool]): Whether restaurants serve Jain food.
+            vegan_options (Optional[bool]): Whether restaurants serve vegan food.
+            halal_certified (Optional[bool]): Whether restaurants are halal certified.
+            mystery_bag_enabled (Optional[bool]): Whether restaurants offer mystery bags.
+            verified_only (Optional[bool]): Whether to list only verified restaurants.
+            **kwargs: Additional keyword arguments, including the order of restaurants.
 
-        return stmt
+        Returns:
+            Select: The filtered and ordered SELECT statement.
+        """
+
+        if address:
+            stmt = stmt.filter(Restaurant.address.contains(address))
+
+        if name:
+            stmt = stmt.filter(Restaurant.name.contains(name))
+
+        if city:
+            stmt = stmt.filter(Restaurant.city == city)
+
+        if state:
+            stmt = stmt.filter(Restaurant.state == state)
+
+        if pincode:
+            stmt = stmt.filter(Restaurant.pincode == pincode)
+
+        if cuisine_type:
+            stmt = stmt.filter(json_array_contains(Restaurant.cuisine_types, cuisine_type))
+
+        if vegetarian_only:
+            stmt = stmt.filter(Restaurant.serves_vegetarian.is_(True), Restaurant.serves_non_vegetarian.is_not(True))
+
+        if verified_only:
+            stmt = stmt.filter(Restaurant.is_verified.is_(True))
+
+        for column, value in ((Restaurant.serves_jain, jain_food),
+                              (Restaurant.serves_vegan, vegan_options),
+                              (Restaurant.halal_certified, halal_certified),
+                              (Restaurant.mystery_bag_enabled, mystery_bag_enabled)):
+            if value is not None:
+                stmt = stmt.filter(column.is_(value))
+
+        sort_keys, descending = self._get_sort_keys(**kwargs)
+
+        return stmt.order_by(*[key.desc() if descending else key.asc() for key in sort_keys])
+
+    def _get_sort_order(self, order_by_rating: bool = False, order_by_environmental_impact: bool = False,
+                        **kwargs) -> str:
+        """
+        Get the name of the order of restaurant listings, which cursors are bound to.
+
+        Args:
+            order_by_rating (bool, optional): Whether to order restaurants by rating. Default is False.
+            order_by_environmental_impact (bool, optional): Whether to order restaurants by saved food waste.
+                Default is False.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            str: The name of the order.
+        """
+
+        if order_by_rating:
+            return 'rating'
+
+        if order_by_environmental_impact:
+            return 'environmental_impact'
+
+        return 'id'
+
+    def _get_sort_keys(self, order_by_rating: bool = False, order_by_environmental_impact: bool = False,
+                       **kwargs) -> Tuple[List[ColumnElement], bool]:
+        """
+        Get the sort keys of restaurant listings, which end with the unique ID.
+
+        Restaurants without rating go after rated ones when ordered by rating. The keys of active restaurants
+        are indexed.
+
+        Args:
+            order_by_rating (bool, optional): Whether to order restaurants by rating. Default is False.
+            order_by_environmental_impact (bool, optional): Whether to order restaurants by saved food waste.
+                Default is False.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Tuple[List[ColumnElement], bool]: The sort keys and whether they are in descending order.
+        """
+
+        if order_by_rating:
+            return [func.coalesce(Restaurant.rating, 0), Restaurant.id], True
+
+        if order_by_environmental_impact:
+            return [func.coalesce(Restaurant.total_food_waste_saved_kg, 0), Restaurant.id], True
+
+        return [Restaurant.id], False
+
+    async def _paginate(self, stmt: Select, limit: int, offset: int, use_cursor: bool = False,
+                        cursor: Optional[str] = None, include_count: Optional[bool] = None,
+                        **kwargs) -> PaginatedModel[Restaurant]:
+        """
+        Get a page of restaurants by offset or by cursor.
+
+        Args:
+            stmt (Select): The SELECT statement of restaurants.
+            limit (int): The maximum number of restaurants to retrieve.
+            offset (int): The offset to start retrieving restaurants from, ignored in cursor pagination.
+            use_cursor (bool, optional): Whether to use cursor pagination. Default is False.
+            cursor (Optional[str]): The cursor of the previous page, it turns cursor pagination on.
+            include_count (Optional[bool]): Whether to count all restaurants. By default, restaurants are counted
+                only in offset pagination, whose clients need the count to navigate.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            PaginatedModel[Restaurant]: Page of restaurants.
+        """
+
+        if use_cursor or cursor:
+            sort_keys, descending = self._get_sort_keys(**kwargs)
+            result = await keyset_paginate(stmt, self._session, limit=limit, sort_keys=sort_keys,
+                                           sort_order=self._get_sort_order(**kwargs), descending=descending,
+                                           cursor=cursor, with_count=bool(include_count))
+
+            return PaginatedModel(limit=limit, offset=0, count=result['count'], items=result['items'],
+                                  next_cursor=result['next_cursor'])
+
+        result = await paginate(stmt, self._session, limit=limit, offset=offset,
+                                with_count=include_count is not False, cached_count=True)
+
+        return PaginatedModel(limit=limit, offset=offset, count=result['count'], items=result['items'])
 
     async def retrieve(self,
                        id: int,
@@ -165,7 +310,8 @@ class RestaurantRepository(SQLAlchemyRepository[Restaurant]):
                 Default is False.
             limit (Optional[int]): The maximum number of restaurants to retrieve. Default is 100.
             offset (Optional[int]): The offset to start retrieving restaurants from. Default is 0.
-            **kwargs: Additional keyword arguments.
+            **kwargs: Additional keyword arguments, including `use_cursor`, `cursor` and `include_count`
+                of cursor pagination.
 
         Returns:
             PaginatedModel[Restaurant]: List of restaurants.
@@ -175,11 +321,11 @@ class RestaurantRepository(SQLAlchemyRepository[Restaurant]):
         """
 
         stmt = self._get_list_stmt(fetch_working_hours=fetch_working_hours, **kwargs)
-        result = await paginate(stmt, self._session, limit=limit, offset=offset)
+        result = await self._paginate(stmt, limit=limit, offset=offset, **kwargs)
 
         logger.debug(f"Retrieved list of {self.model.__name__}")
 
-        return PaginatedModel(limit=limit, offset=offset, count=result['count'], items=result['items'])
+        return result
 
     async def list_active_restaurants(self,
                                       fetch_working_hours: bool = False,
@@ -192,15 +338,169 @@ class RestaurantRepository(SQLAlchemyRepository[Restaurant]):
                 Default is False.
             limit (Optional[int]): The maximum number of restaurants to retrieve. Default is 100.
             offset (Optional[int]): The offset to start retrieving restaurants from. Default is 0.
-            **kwargs: Additional keyword arguments.
+            **kwargs: Additional keyword arguments, including `use_cursor`, `cursor` and `include_count`
+                of cursor pagination.
 
         Returns:
             PaginatedModel[Restaurant]: List of active Restaurants.
         """
 
         stmt = self._get_list_active_restaurants_stmt(fetch_working_hours=fetch_working_hours, **kwargs)
-        result = await paginate(stmt, self._session, limit=limit, offset=offset)
+        result = await self._paginate(stmt, limit=limit, offset=offset, **kwargs)
 
         logger.debug(f"Retrieved list of active restaurants")
 
-        return PaginatedModel(limit=limit, offset=offset, count=result['count'], items=result['items'])
+        return result
+
+    def _get_nearby_candidates_stmt(self, latitude: float, longitude: float, radius_km: float,
+                                    **kwargs) -> Select:
+        """
+        Create a SELECT statement of IDs and coordinates of active restaurants inside the bounding box of a circle.
+
+        The box is a range of the indexed latitude and longitude, so only restaurants close to the circle
+        are read. Filters of restaurant listings are applied in the same statement.
+
+        Args:
+            latitude (float): The latitude of the center in degrees.
+            longitude (float): The longitude of the center in degrees.
+            radius_km (float): The radius of the circle in kilometers.
+            **kwargs: Additional keyword arguments, including filters of restaurant listings.
+
+        Returns:
+            Select: The SELECT statement of candidate restaurants.
+        """
+
+        min_latitude, max_latitude, min_longitude, max_longitude = get_bounding_box(latitude, longitude, radius_km)
+
+        stmt = select(Restaurant.id, Restaurant.latitude, Restaurant.longitude) \
+            .where(Restaurant.is_active,
+                   Restaurant.latitude.between(min_latitude, max_latitude),
+                   Restaurant.longitude.between(min_longitude, max_longitude))
+
+        return self._filter_list_stmt(stmt, **kwargs).order_by(None)
+
+    async def list_nearby_active_restaurants(self,
+                                             latitude: float,
+                                             longitude: float,
+                                             radius_km: float,
+                                             fetch_working_hours: bool = False,
+                                             limit: int = 20,
+                                             **kwargs) -> List[Tuple[Restaurant, float]]:
+        """
+        Retrieve active restaurants within a radius of a location, ordered by distance.
+
+        Candidates are found in the bounding box of the circle, their exact distances are calculated at once
+        and only the nearest restaurants are loaded.
+
+        Args:
+            latitude (float): The latitude of the location in degrees.
+            longitude (float): The longitude of the location in degrees.
+            radius_km (float): The radius in kilometers.
+            fetch_working_hours (bool, optional): Whether to fetch associated working hours for restaurant.
+                Default is False.
+            limit (int): The maximum number of restaurants to retrieve. Default is 20.
+            **kwargs: Additional keyword arguments, including filters of restaurant listings.
+
+        Returns:
+            List[Tuple[Restaurant, float]]: The restaurants and their distances in kilometers.
+        """
+
+        candidates = (await self._session.execute(
+            self._get_nearby_candidates_stmt(latitude, longitude, radius_km, **kwargs)
+        )).all()
+        ids, distances = get_nearest(latitude, longitude, radius_km, limit, candidates)
+
+        if not len(ids):
+            return []
+
+        stmt = self.__get_select_stmt_with_options(select(Restaurant).where(Restaurant.id.in_(ids.tolist())),
+                                                   fetch_working_hours=fetch_working_hours,
+                                                   **kwargs)
+        restaurants = {restaurant.id: restaurant for restaurant in await self._session.scalars(stmt)}
+
+        logger.debug(f"Retrieved {len(ids)} nearby restaurants out of {len(candidates)} candidates")
+
+        return [(restaurants[id], distance) for id, distance in zip(ids.tolist(), distances.tolist())
+                if id in restaurants]
+
+    def _get_export_stmt(self, **kwargs) -> Select:
+        """
+        Create a SELECT statement for the state of all restaurants published with their events,
+        including IDs of their managers.
+
+        Args:
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Select: The SELECT statement.
+        """
+
+        return select(Restaurant.id, Restaurant.address, Restaurant.is_active,
+                      RestaurantManager.id.label('restaurant_manager_id')) \
+            .outerjoin(RestaurantManager, RestaurantManager.restaurant_id == Restaurant.id) \
+            .order_by(Restaurant.id)
+
+    async def stream_export(self, batch_size: int = 10000, **kwargs) -> AsyncIterator[List[dict]]:
+        """
+        Stream the state of all restaurants published with their events in batches, without loading
+        all of them at once.
+
+        Args:
+            batch_size (int): The number of restaurants in a batch.
+            **kwargs: Additional keyword arguments.
+
+        Yields:
+            List[dict]: The ID, address, activity and manager ID, or None, of every restaurant of a batch.
+        """
+
+        stmt = self._get_export_stmt(**kwargs).execution_options(yield_per=batch_size)
+        result = await self._session.stream(stmt)
+
+        async for rows in result.mappings().partitions():
+            logger.debug(f"Retrieved batch of {len(rows)} restaurants to export")
+            yield [dict(row) for row in rows]
+
+    def _get_update_ratings_stmt(self, **kwargs) -> Update:
+        """
+        Create an UPDATE statement for ratings of restaurants, executed once per restaurant.
+
+        A rating is only written if its version isn't older than the stored one, because ratings of a restaurant
+        published by different processes of the review service may be received out of order.
+
+        Args:
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Update: The UPDATE statement.
+        """
+
+        table = Restaurant.__table__
+
+        return update(table) \
+            .where(table.c.id == bindparam('restaurant_id'),
+                   table.c.rating_version <= bindparam('restaurant_version')) \
+            .values(rating=bindparam('restaurant_rating'), reviews_count=bindparam('restaurant_reviews_count'),
+                    rating_version=bindparam('restaurant_version'))
+
+    async def update_ratings(self, ratings: List[dict], **kwargs):
+        """
+        Update ratings of restaurants in a single executemany statement.
+
+        Restaurants which don't exist and ratings older than the stored ones are skipped.
+
+        Args:
+            ratings (List[dict]): The ID, rating, reviews count and version of every restaurant.
+            **kwargs: Additional keyword arguments.
+        """
+
+        if not ratings:
+            return
+
+        stmt = self._get_update_ratings_stmt(**kwargs)
+        await self._session.execute(stmt, [{'restaurant_id': rating['id'],
+                                            'restaurant_rating': rating['rating'],
+                                            'restaurant_reviews_count': rating['reviews_count'],
+                                            'restaurant_version': rating['version']}
+                                           for rating in ratings])
+
+        logger.debug(f"Updated ratings of {len(ratings)} {self.model.__name__}(s)")
@@ -3,3 +3,4 @@ from .manager import *
 from .moderator import *
 from .restaurant import *
 from .application import *
+from .metrics import *
@@ -0,0 +1,37 @@
+from pydantic import BaseModel, Field
+
+__all__ = [
+    "DatabasePoolMetricsOut",
+    "KafkaPublisherMetricsOut",
+]
+
+
+class DatabasePoolMetricsOut(BaseModel):
+    """
+    Schema class for output representation of database connection pool metrics.
+    """
+
+    pools: int = Field(ge=0)
+    size: int = Field(ge=0)
+    checked_out: int = Field(ge=0)
+    idle: int = Field(ge=0)
+    overflow: int = Field(ge=0)
+    waiters: int = Field(ge=0)
+    checkouts: int = Field(ge=0)
+    timeouts: int = Field(ge=0)
+    wait_time_avg_seconds: float = Field(ge=0)
+    wait_time_max_seconds: float = Field(ge=0)
+
+
+class KafkaPublisherMetricsOut(BaseModel):
+    """
+    Schema class for output representation of Kafka publisher metrics.
+    """
+
+    enqueued: int = Field(ge=0)
+    dropped: int = Field(ge=0)
+    sent: int = Field(ge=0)
+    delivered: int = Field(ge=0)
+    failed: int = Field(ge=0)
+    delivery_time_avg_seconds: float = Field(ge=0)
+    delivery_time_max_seconds: float = Field(ge=0)
@@ -1,4 +1,4 @@
-from typing import Generic, TypeVar, List
+from typing import Generic, TypeVar, List, Optional
 
 from pydantic import Field, BaseModel
 
@@ -6,7 +6,11 @@ M = TypeVar('M')
 
 
 class PaginatedResponse(BaseModel, Generic[M]):
-    count: int = Field(description='Number of items returned in the response')
+    count: Optional[int] = Field(description='Number of items matching given criteria, cached for a short time. '
+                                             'It is null if it was not requested')
     limit: int = Field(description='Maximum number of items returned in the response')
     offset: int = Field(description='Offset of items returned in the response')
     items: List[M] = Field(description='List of items returned in the response following given criteria')
+    next_cursor: Optional[str] = Field(default=None,
+                                       description='Cursor of the next page in cursor pagination, '
+                                                   'null if it is the last page or offset pagination is used')
@@ -130,19 +130,19 @@ class RestaurantCreateIn(RestaurantBase):
     longitude: Optional[float] = Field(None, ge=-180, le=180)
     city: Optional[str] = Field(None, min_length=1, max_length=100)
     state: Optional[str] = Field(None, min_length=1, max_length=100) 
-    pincode: Optional[str] = Field(None, regex=r'^\d{6}$')  # Indian PIN code validation
+    pincode: Optional[str] = Field(None, pattern=r'^\d{6}$')  # Indian PIN code validation
     
     # Compliance information (required for onboarding)
-    gst_number: Optional[str] = Field(None, regex=r'^[0-9]{2}[A-Z]{5}[0-9]{4}[A-Z]{1}[1-9A-Z]{1}Z[0-9A-Z]{1}$')
-    fssai_license: Optional[str] = Field(None, regex=r'^\d{14}$')  # 14-digit FSSAI license
-    pan_number: Optional[str] = Field(None, regex=r'^[A-Z]{5}[0-9]{4}[A-Z]{1}$')  # PAN card format
+    gst_number: Optional[str] = Field(None, pattern=r'^[0-9]{2}[A-Z]{5}[0-9]{4}[A-Z]{1}[1-9A-Z]{1}Z[0-9A-Z]{1}$')
+    fssai_license: Optional[str] = Field(None, pattern=r'^\d{14}$')  # 14-digit FSSAI license
+    pan_number: Optional[str] = Field(None, pattern=r'^[A-Z]{5}[0-9]{4}[A-Z]{1}$')  # PAN card format
     trade_license_number: Optional[str] = Field(None, min_length=1, max_length=50)
     
     # MealPeDeal configuration
     mystery_bag_enabled: bool = True
     pickup_counter_info: Optional[str] = Field(None, max_length=500)
     pickup_instructions: Optional[str] = Field(None, max_length=1000)
-    contact_phone: Optional[str] = Field(None, regex=r'^\+91[0-9]{10}$')  # Indian phone format
+    contact_phone: Optional[str] = Field(None, pattern=r'^\+91[0-9]{10}$')  # Indian phone format
     
     # Dietary options (important for Indian market)
     serves_vegetarian: bool = True
@@ -197,13 +197,13 @@ class RestaurantUpdateIn(BaseModel):
     longitude: Optional[float] = Field(None, ge=-180, le=180)
     city: Optional[str] = Field(None, min_length=1, max_length=100)
     state: Optional[str] = Field(None, min_length=1, max_length=100)
-    pincode: Optional[str] = Field(None, regex=r'^\d{6}$')
+    pincode: Optional[str] = Field(None, pattern=r'^\d{6}$')
     
     # MealPeDeal settings
     mystery_bag_enabled: Optional[bool] = None
     pickup_counter_info: Optional[str] = Field(None, max_length=500)
     pickup_instructions: Optional[str] = Field(None, max_length=1000)
-    contact_phone: Optional[str] = Field(None, regex=r'^\+91[0-9]{10}$')
+    contact_phone: Optional[str] = Field(None, pattern=r'^\+91[0-9]{10}$')
     average_pickup_time: Optional[int] = Field(None, ge=5, le=120)  # 5 to 120 minutes
     
     # Dietary options
@@ -237,9 +237,9 @@ class RestaurantComplianceIn(BaseModel):
     Schema for updating restaurant compliance information.
     """
     
-    gst_number: Optional[str] = Field(None, regex=r'^[0-9]{2}[A-Z]{5}[0-9]{4}[A-Z]{1}[1-9A-Z]{1}Z[0-9A-Z]{1}$')
-    fssai_license: Optional[str] = Field(None, regex=r'^\d{14}$')
-    pan_number: Optional[str] = Field(None, regex=r'^[A-Z]{5}[0-9]{4}[A-Z]{1}$')
+    gst_number: Optional[str] = Field(None, pattern=r'^[0-9]{2}[A-Z]{5}[0-9]{4}[A-Z]{1}[1-9A-Z]{1}Z[0-9A-Z]{1}$')
+    fssai_license: Optional[str] = Field(None, pattern=r'^\d{14}$')
+    pan_number: Optional[str] = Field(None, pattern=r'^[A-Z]{5}[0-9]{4}[A-Z]{1}$')
     trade_license_number: Optional[str] = Field(None, min_length=1, max_length=50)
 
 
@@ -253,7 +253,7 @@ class RestaurantLocationIn(BaseModel):
     address: str = Field(min_length=1, max_length=200)
     city: str = Field(min_length=1, max_length=100)
     state: str = Field(min_length=1, max_length=100)
-    pincode: str = Field(regex=r'^\d{6}$')
+    pincode: str = Field(pattern=r'^\d{6}$')
 
 
 class RestaurantMysteryBagConfigIn(BaseModel):
@@ -4,3 +4,4 @@ from .manager import *
 from .restaurant import *
 from .hours import *
 from .mixins import *
+from .outbox import *
@@ -7,7 +7,7 @@ from exceptions import PermissionDeniedError, RestaurantApplicationNotFoundWithI
     RestaurantManagerNotFoundWithIdError
 from models import RestaurantApplication, Moderator, ApplicationType, RestaurantManager
 from models.pagination import PaginatedModel
-from producer import publisher, RestaurantCreatedEvent, RestaurantUpdatedEvent
+from producer import RestaurantCreatedEvent, RestaurantUpdatedEvent
 from schemas.application import RestaurantApplicationUpdateOut, RestaurantApplicationUpdateIn
 from schemas.pagination import PaginatedResponse
 from user_roles import ModeratorRole, RestaurantManagerRole
@@ -299,7 +299,7 @@ class RestaurantApplicationService(RetrieveMixin[RestaurantApplication, Restaura
 
             restaurant_manager.restaurant_id = restaurant.id
 
-            publisher.publish(
+            await uow.add_event(
                 RestaurantCreatedEvent(id=restaurant.id,
                                        address=restaurant.address,
                                        restaurant_manager_id=restaurant_manager.id,
@@ -310,7 +310,7 @@ class RestaurantApplicationService(RetrieveMixin[RestaurantApplication, Restaura
 
             logger.info(f"Updated restaurant with id={restaurant.id}")
 
-            publisher.publish(
+            await uow.add_event(
                 RestaurantUpdatedEvent(id=restaurant.id,
                                        address=restaurant.address,
                                        is_active=restaurant.is_active)
@@ -6,7 +6,6 @@ from exceptions import WorkingHoursNotFoundWithIdError, WorkingHoursAlreadyExist
     WorkingHoursTimeConflictError, \
     PermissionDeniedError, RestaurantNotFoundWithIdError
 from models import WorkingHours, RestaurantManager
-from producer import publisher
 from producer.events import WorkingHoursCreatedEvent, WorkingHoursUpdatedEvent, WorkingHoursDeletedEvent
 from user_roles import RestaurantManagerRole
 from schemas import WorkingHoursUpdateIn, WorkingHoursCreateIn, WorkingHoursCreateOut, WorkingHoursUpdateOut
@@ -92,7 +91,7 @@ class WorkingHoursService(CreateMixin[WorkingHours, WorkingHoursCreateIn, Workin
 
         logger.info(f"Created working hours with id={working_hours_instance.id}")
 
-        publisher.publish(WorkingHoursCreatedEvent(
+        await uow.add_event(WorkingHoursCreatedEvent(
             id=working_hours_instance.id,
             day_of_week=working_hours_instance.day_of_week,
             opening_time=working_hours_instance.opening_time,
@@ -150,7 +149,7 @@ class WorkingHoursService(CreateMixin[WorkingHours, WorkingHoursCreateIn, Workin
 
         logger.info(f"Updated working hours with id={working_hours_instance.id}")
 
-        publisher.publish(WorkingHoursUpdatedEvent(
+        await uow.add_event(WorkingHoursUpdatedEvent(
             id=working_hours_instance.id,
             opening_time=working_hours_instance.opening_time,
             closing_time=working_hours_instance.closing_time,
@@ -191,6 +190,6 @@ class WorkingHoursService(CreateMixin[WorkingHours, WorkingHoursCreateIn, Workin
         await uow.working_hours.delete(id, **kwargs)
         logger.info(f"Deleted working hours with id={id}")
 
-        publisher.publish(WorkingHoursDeletedEvent(
+        await uow.add_event(WorkingHoursDeletedEvent(
             id=id
         ))
@@ -4,7 +4,7 @@ from fastapi import UploadFile
 from loguru import logger
 
 from models.pagination import PaginatedModel
-from producer import publisher, RestaurantCreatedEvent, RestaurantUpdatedEvent
+from producer import RestaurantCreatedEvent, RestaurantUpdatedEvent
 from schemas.pagination import PaginatedResponse
 from user_roles import ModeratorRole, RestaurantManagerRole
 from exceptions import PermissionDeniedError
@@ -75,7 +75,8 @@ class RestaurantService(RetrieveMixin[Restaurant, RestaurantRetrieveOut],
                                  offset=instance_list.offset,
                                  count=instance_list.count,
                                  items=[self.schema_retrieve_out.model_validate(instance)
-                                        for instance in instance_list.items])
+                                        for instance in instance_list.items],
+                                 next_cursor=instance_list.next_cursor)
 
     async def list(self, uow: SqlAlchemyUnitOfWork,
                    limit: int = 100,
@@ -279,6 +280,33 @@ class RestaurantService(RetrieveMixin[Restaurant, RestaurantRetrieveOut],
 
         return self.get_retrieve_schema(retrieved_instance)
 
+    async def get_nearby_restaurants(self, latitude: float, longitude: float, radius_km: float,
+                                     uow: SqlAlchemyUnitOfWork, limit: int = 20,
+                                     **kwargs) -> List[RestaurantRetrieveOut]:
+        """
+        Finds active restaurants within a radius of a location, the nearest first.
+
+        Args:
+            latitude (float): The latitude of the location in degrees.
+            longitude (float): The longitude of the location in degrees.
+            radius_km (float): The search radius in kilometers.
+            uow (SqlAlchemyUnitOfWork): The unit of work instance.
+            limit (int, optional): The maximum number of restaurants to return. Defaults to 20.
+            **kwargs: Filters of restaurant listings.
+
+        Returns:
+            List[RestaurantRetrieveOut]: The nearby restaurants ordered by distance.
+        """
+
+        nearby_restaurants = await uow.restaurants.list_nearby_active_restaurants(latitude, longitude, radius_km,
+                                                                                  fetch_working_hours=True,
+                                                                                  limit=limit, **kwargs)
+
+        logger.info(f"Found {len(nearby_restaurants)} restaurants within {radius_km} km "
+                    f"of ({latitude}, {longitude}).")
+
+        return [self.get_retrieve_schema(restaurant) for restaurant, _ in nearby_restaurants]
+
     async def upload_image(self, id: int, file: UploadFile, uow: SqlAlchemyUnitOfWork, **kwargs) -> RestaurantUpdateOut:
         """
         Uploads an image for the restaurant with the given ID.
@@ -389,7 +417,7 @@ class RestaurantService(RetrieveMixin[Restaurant, RestaurantRetrieveOut],
 
         logger.info(f"Activated restaurant with id={id}.")
 
-        publisher.publish(
+        await uow.add_event(
             RestaurantUpdatedEvent(
                 id=retrieved_restaurant.id,
                 address=retrieved_restaurant.address,
@@ -437,7 +465,7 @@ class RestaurantService(RetrieveMixin[Restaurant, RestaurantRetrieveOut],
 
         logger.info(f"Deactivated restaurant with id={id}.")
 
-        publisher.publish(
+        await uow.add_event(
             RestaurantUpdatedEvent(
                 id=retrieved_restaurant.id,
                 address=retrieved_restaurant.address,
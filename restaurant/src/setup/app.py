@@ -1,12 +1,19 @@
+import asyncio
+from typing import List
+
 from fastapi import FastAPI
 from loguru import logger
 from starlette.middleware.cors import CORSMiddleware
 
 from api import api_router
 from config import get_settings
-from consumer import consumer_creator
-from setup.kafka.consumer import init_kafka_receivers
+from consumer import consumer_creator, KafkaReceiver, KafkaBroadcastReceiver
+from db import async_engine
+from grpc_files import grpc_roles_client
+from producer import publisher
+from setup.kafka.consumer import init_kafka_receivers, init_kafka_broadcast_receivers
 from setup.kafka.producer import init_producer_events
+from setup.outbox import init_outbox_relay
 
 # App initialization #
 
@@ -32,6 +39,9 @@ app.add_middleware(
 
 app.include_router(api_router)
 
+kafka_receivers: List[KafkaReceiver] = list()
+kafka_broadcast_receivers: List[KafkaBroadcastReceiver] = list()
+
 
 # Startup
 
@@ -39,13 +49,24 @@ app.include_router(api_router)
 def startup_event():
     settings = get_settings()
 
+    # Kafka events are consumed by a separate process (python -m consumer) unless enabled here
+    if settings.web_app_kafka_receivers_enabled:
+        try:
+            kafka_receivers.extend(init_kafka_receivers(consumer_creator, settings))
+            for kafka_receiver in kafka_receivers:
+                kafka_receiver.start_receiving()
+            logger.info("Kafka receivers initialized")
+        except Exception as e:
+            logger.error(f"Error initializing kafka receivers: {e}")
+
+    # Every process invalidates its caches, whichever process consumes the events
     try:
-        kafka_receivers = init_kafka_receivers(consumer_creator, settings)
-        for kafka_receiver in kafka_receivers:
-            kafka_receiver.start_receiving()
-        logger.info("Kafka receivers initialized")
+        kafka_broadcast_receivers.extend(init_kafka_broadcast_receivers(consumer_creator, settings))
+        for kafka_broadcast_receiver in kafka_broadcast_receivers:
+            kafka_broadcast_receiver.start_receiving()
+        logger.info("Kafka broadcast receivers initialized")
     except Exception as e:
-        logger.error(f"Error initializing kafka receivers: {e}")
+        logger.error(f"Error initializing kafka broadcast receivers: {e}")
 
     try:
         init_producer_events(settings)
@@ -53,6 +74,13 @@ def startup_event():
     except Exception as e:
         logger.error(f"Error initializing kafka producer events: {e}")
 
+    try:
+        outbox_relay = init_outbox_relay(settings)
+        outbox_relay.start_relaying()
+        logger.info("Outbox relay initialized")
+    except Exception as e:
+        logger.error(f"Error initializing outbox relay: {e}")
+
     try:
         from setup.firebase import init_firebase
         init_firebase(settings)
@@ -60,3 +88,28 @@ def startup_event():
     except Exception as e:
         logger.error(f"Error initializing firebase: {e}")
 
+
+
+# Shutdown
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    settings = get_settings()
+
+    await asyncio.gather(*(asyncio.to_thread(kafka_receiver.stop, settings.kafka_consumer_shutdown_timeout_seconds)
+                           for kafka_receiver in kafka_receivers))
+    logger.info("Kafka receivers stopped")
+
+    await asyncio.gather(*(asyncio.to_thread(kafka_broadcast_receiver.stop,
+                                             settings.kafka_consumer_shutdown_timeout_seconds)
+                           for kafka_broadcast_receiver in kafka_broadcast_receivers))
+    logger.info("Kafka broadcast receivers stopped")
+
+    await asyncio.to_thread(publisher.close, settings.kafka_publisher_flush_timeout_seconds)
+    logger.info("Kafka publisher flushed and closed")
+
+    await grpc_roles_client.close()
+    logger.info("gRPC roles client closed")
+
+    await async_engine.dispose()
+    logger.info("Database connection pool closed")
@@ -0,0 +1,74 @@
+"""
+Export of the full state of restaurants for bootstrap of their replicas in other microservices.
+
+A compacted topic keeps only the last event of a restaurant, which loses fields carried only by
+`RestaurantCreatedEvent`, e.g. the restaurant's manager. The export writes every restaurant as
+`RestaurantCreatedEvent`, or as `RestaurantUpdatedEvent` if it has no manager, in the JSONL format of snapshots,
+which consumers load with `python -m setup.kafka.snapshot load <topic> --file <file>`. The end offsets of the topic
+are taken before restaurants are read, so consumers continue live consumption from them.
+
+Usage (from `src` directory):
+    python -m setup.kafka.export restaurant_menu --file restaurant_menu.jsonl [--batch-size 10000]
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict, IO
+
+from kafka.structs import TopicPartition
+from loguru import logger
+
+from config import get_settings
+from consumer import consumer_creator
+from producer import RestaurantCreatedEvent, RestaurantUpdatedEvent, write_jsonl_export
+from setup.kafka.producer import init_producer_events
+from utils.uow import get_sqlalchemy_uow, uow_transaction
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Export of the full state of restaurants")
+    parser.add_argument("topic", help="Topic whose consumers load the export")
+    parser.add_argument("--file", required=True, help="Output JSONL file")
+    parser.add_argument("--batch-size", type=int, default=10000, help="Number of restaurants read at once")
+    return parser.parse_args()
+
+
+async def export_restaurants(topic: str, end_offsets: Dict[int, int], file: IO[str], batch_size: int) -> int:
+    count = 0
+
+    async with uow_transaction(get_sqlalchemy_uow()) as uow:
+        async for restaurants in uow.restaurants.stream_export(batch_size=batch_size):
+            events = [RestaurantCreatedEvent(**restaurant) if restaurant['restaurant_manager_id'] is not None
+                      else RestaurantUpdatedEvent(id=restaurant['id'], address=restaurant['address'],
+                                                  is_active=restaurant['is_active'])
+                      for restaurant in restaurants]
+            count += write_jsonl_export(topic, events, end_offsets, file)
+
+    return count
+
+
+def export(args: argparse.Namespace):
+    init_producer_events(get_settings())
+
+    if args.topic not in RestaurantCreatedEvent.get_topics():
+        raise ValueError(f"Restaurants are not published to {args.topic}")
+
+    consumer = consumer_creator.create(args.topic, None)
+    start = time.perf_counter()
+
+    try:
+        partitions = [TopicPartition(args.topic, partition) for partition in consumer.partitions_for_topic(args.topic)]
+        end_offsets = {partition.partition: offset for partition, offset in consumer.end_offsets(partitions).items()}
+    finally:
+        consumer.close(autocommit=False)
+
+    with open(args.file, "w") as file:
+        count = asyncio.run(export_restaurants(args.topic, end_offsets, file, args.batch_size))
+
+    logger.info(f"Exported {count} restaurants for {args.topic} to {args.file} "
+                f"in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    export(parse_args())
@@ -0,0 +1,81 @@
+import asyncio
+from threading import Thread
+
+from loguru import logger
+
+from config.settings import Settings
+from db import init_thread_engine, dispose_thread_engine
+from outbox import outbox_notifier
+from producer import publisher
+from services import OutboxService
+from utils.uow import get_sqlalchemy_uow
+
+
+class OutboxRelay:
+    """
+    Class for relaying outbox messages to Kafka.
+
+    It runs in a separate daemon thread with its own event loop. It publishes messages in batches
+    while there are any, then waits until a transaction with new messages is committed or
+    `interval` seconds pass.
+    """
+
+    def __init__(self, batch_size: int, interval: float, delivery_timeout: float, claim_timeout: float):
+        """
+        Constructor for the OutboxRelay class.
+
+        Args:
+            batch_size (int): The maximum number of messages published at once.
+            interval (float): The maximum time in seconds between checks of the outbox.
+            delivery_timeout (float): The maximum time in seconds to wait for acknowledgements of a batch.
+            claim_timeout (float): The time in seconds after which messages claimed by a stopped relay
+                can be claimed again.
+        """
+
+        self._batch_size = batch_size
+        self._interval = interval
+        self._service = OutboxService(publisher, delivery_timeout, claim_timeout)
+        self._relay_thread = Thread(target=self.__between_callback)
+        self._relay_thread.daemon = True
+
+    async def _relay(self):
+        """
+        Method for relaying messages in a loop.
+        """
+
+        while True:
+            try:
+                relayed = await self._service.relay_messages(get_sqlalchemy_uow, self._batch_size)
+            except Exception as e:
+                logger.error(f"Error relaying outbox messages: {e}")
+                relayed = 0
+
+            if relayed < self._batch_size:
+                await outbox_notifier.wait(self._interval)
+
+    def __between_callback(self):
+        """
+        Synchronous wrapper for method that relays messages.
+        """
+
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        init_thread_engine()
+
+        loop.run_until_complete(self._relay())
+        loop.run_until_complete(dispose_thread_engine())
+        loop.close()
+
+    def start_relaying(self):
+        """
+        Starts the relay thread.
+        """
+
+        self._relay_thread.start()
+
+
+def init_outbox_relay(settings: Settings) -> OutboxRelay:
+    return OutboxRelay(batch_size=settings.outbox_relay_batch_size,
+                       interval=settings.outbox_relay_interval_seconds,
+                       delivery_timeout=settings.outbox_relay_delivery_timeout_seconds,
+                       claim_timeout=settings.outbox_relay_claim_timeout_seconds)
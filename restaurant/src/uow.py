@@ -1,7 +1,10 @@
 from abc import ABC, abstractmethod
 from typing import Callable
 
-from repositories import WorkingHoursRepository, RestaurantRepository, RestaurantManagerRepository, ModeratorRepository
+from outbox import outbox_notifier
+from producer.events import ProducerEvent
+from repositories import WorkingHoursRepository, RestaurantRepository, RestaurantManagerRepository, ModeratorRepository, \
+    OutboxMessageRepository
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -61,6 +64,7 @@ class SqlAlchemyUnitOfWork(GenericUnitOfWork):
         managers (RestaurantManagerRepository): Repository for restaurant managers.
         working_hours (WorkingHoursRepository): Repository for working hours.
         moderators (ModeratorRepository): Repository for moderators.
+        outbox (OutboxMessageRepository): Repository for outbox messages.
     """
 
     restaurants: RestaurantRepository
@@ -68,9 +72,11 @@ class SqlAlchemyUnitOfWork(GenericUnitOfWork):
     managers: RestaurantManagerRepository
     working_hours: WorkingHoursRepository
     moderators: ModeratorRepository
+    outbox: OutboxMessageRepository
 
     def __init__(self, session_factory: Callable[[], AsyncSession]):
         self._session_factory = session_factory
+        self._has_events = False
         super().__init__()
 
     def _init_repositories(self, session: AsyncSession):
@@ -79,9 +85,11 @@ class SqlAlchemyUnitOfWork(GenericUnitOfWork):
         self.managers = RestaurantManagerRepository(session)
         self.working_hours = WorkingHoursRepository(session)
         self.moderators = ModeratorRepository(session)
+        self.outbox = OutboxMessageRepository(session)
 
     async def __aenter__(self):
         self._session = self._session_factory()
+        self._has_events = False
         self._init_repositories(self._session)
         return await super().__aenter__()
 
@@ -89,16 +97,32 @@ class SqlAlchemyUnitOfWork(GenericUnitOfWork):
         await super().__aexit__(*args)
         await self._session.close()
 
+    async def add_event(self, event: ProducerEvent):
+        """
+        Add an event to the outbox, so it is published only if the transaction is committed.
+
+        Args:
+            event (ProducerEvent): The event to publish.
+        """
+
+        await self.outbox.add_event(event)
+        self._has_events = True
+
     async def commit(self):
         """
-        Commit the transaction.
+        Commit the transaction and wake up the outbox relay if events were added.
         """
 
         await self._session.commit()
 
+        if self._has_events:
+            self._has_events = False
+            outbox_notifier.notify()
+
     async def rollback(self):
         """
-        Rollback the transaction.
+        Rollback the transaction and discard added events.
         """
 
         await self._session.rollback()
+        self._has_events = False
@@ -0,0 +1,102 @@
+import math
+from typing import Sequence, Tuple
+
+import numpy as np
+
+# Mean radius of the Earth
+EARTH_RADIUS_KM = 6371.0088
+
+
+def get_bounding_box(latitude: float, longitude: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """
+    Returns the latitude and longitude ranges of a box containing a circle on the Earth's surface.
+
+    The box may contain points which are farther than the radius, but never misses closer ones. If the circle
+    reaches a pole or the antimeridian, the box spans all longitudes.
+
+    Args:
+        latitude (float): The latitude of the center in degrees.
+        longitude (float): The longitude of the center in degrees.
+        radius_km (float): The radius of the circle in kilometers.
+
+    Returns:
+        Tuple[float, float, float, float]: The minimum and maximum latitude, the minimum and maximum longitude.
+    """
+
+    delta_latitude = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_latitude, max_latitude = latitude - delta_latitude, latitude + delta_latitude
+
+    if min_latitude <= -90 or max_latitude >= 90:
+        return max(min_latitude, -90), min(max_latitude, 90), -180, 180
+
+    # The widest parallel of the box is the one closest to a pole
+    delta_longitude = math.degrees(radius_km / (EARTH_RADIUS_KM * math.cos(math.radians(max(abs(min_latitude),
+                                                                                             abs(max_latitude))))))
+    min_longitude, max_longitude = longitude - delta_longitude, longitude + delta_longitude
+
+    if min_longitude < -180 or max_longitude > 180:
+        return min_latitude, max_latitude, -180, 180
+
+    return min_latitude, max_latitude, min_longitude, max_longitude
+
+
+def haversine_distances(latitude: float, longitude: float,
+                        latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """
+    Calculates great-circle distances from a point to arrays of points at once.
+
+    Args:
+        latitude (float): The latitude of the point in degrees.
+        longitude (float): The longitude of the point in degrees.
+        latitudes (np.ndarray): The latitudes of the other points in degrees.
+        longitudes (np.ndarray): The longitudes of the other points in degrees.
+
+    Returns:
+        np.ndarray: The distances in kilometers.
+    """
+
+    latitude, longitude = math.radians(latitude), math.radians(longitude)
+    latitudes, longitudes = np.radians(latitudes), np.radians(longitudes)
+
+    a = np.sin((latitudes - latitude) / 2) ** 2 \
+        + math.cos(latitude) * np.cos(latitudes) * np.sin((longitudes - longitude) / 2) ** 2
+
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1)))
+
+
+def get_nearest(latitude: float, longitude: float, radius_km: float, limit: int,
+                candidates: Sequence[Tuple[int, float, float]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Selects the points nearest to a point within a radius.
+
+    Args:
+        latitude (float): The latitude of the point in degrees.
+        longitude (float): The longitude of the point in degrees.
+        radius_km (float): The radius in kilometers.
+        limit (int): The maximum number of selected points.
+        candidates (Sequence[Tuple[int, float, float]]): The IDs, latitudes and longitudes of candidate points,
+            e.g. the ones inside the bounding box of the circle.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The IDs and distances in kilometers of selected points,
+            ordered by distance and then by ID.
+    """
+
+    if not candidates:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+    ids, latitudes, longitudes = (np.asarray(column) for column in zip(*candidates))
+    distances = haversine_distances(latitude, longitude,
+                                    latitudes.astype(np.float64), longitudes.astype(np.float64))
+
+    inside = np.flatnonzero(distances <= radius_km)
+    ids, distances = ids[inside].astype(np.int64), distances[inside]
+
+    if len(distances) > limit:
+        # Partial selection of the nearest points is linear, only they are sorted then
+        nearest = np.argpartition(distances, limit - 1)[:limit]
+        ids, distances = ids[nearest], distances[nearest]
+
+    order = np.lexsort((ids, distances))
+
+    return ids[order], distances[order]
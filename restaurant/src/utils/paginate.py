@@ -1,9 +1,178 @@
-from sqlalchemy import Select, select, func
+import base64
+import json
+from typing import Any, List, Optional, Sequence
+
+from cachetools import TTLCache
+from sqlalchemy import Select, select, func, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import ColumnElement
+
+from config import get_settings
+from exceptions.pagination import InvalidCursorError
+
+settings = get_settings()
+
+# Counts of rows by compiled queries, which are shared by all pages of a listing
+_counts_cache: TTLCache = TTLCache(maxsize=settings.pagination_count_cache_maxsize,
+                                   ttl=settings.pagination_count_cache_ttl_seconds)
+
+
+async def count(query: Select, session: AsyncSession, cached: bool = False) -> int:
+    """
+    Counts rows of a query.
+
+    The count is a scan of all matching rows, so a cached count may be used, which is up to
+    `pagination_count_cache_ttl_seconds` old.
+
+    Args:
+        query (Select): The query.
+        session (AsyncSession): The session.
+        cached (bool): Whether a cached count may be returned.
+
+    Returns:
+        int: The number of rows.
+    """
+
+    count_query = select(func.count()).select_from(query.order_by(None).subquery())
+
+    if not cached:
+        return await session.scalar(count_query)
+
+    compiled = count_query.compile(session.get_bind())
+    key = (compiled.string, tuple(sorted((name, repr(value)) for name, value in compiled.params.items())))
+
+    if (rows_count := _counts_cache.get(key)) is None:
+        rows_count = _counts_cache[key] = await session.scalar(count_query)
 
+    return rows_count
 
-async def paginate(query: Select, session: AsyncSession, limit: int, offset: int) -> dict:
+
+async def paginate(query: Select, session: AsyncSession, limit: int, offset: int,
+                   with_count: bool = True, cached_count: bool = False) -> dict:
     return {
-        'count': await session.scalar(select(func.count()).select_from(query.subquery())),
+        'count': await count(query, session, cached=cached_count) if with_count else None,
         'items': [todo for todo in await session.scalars(query.limit(limit).offset(offset))]
     }
+
+
+def encode_cursor(values: Sequence[Any], sort_order: str) -> str:
+    """
+    Encodes values of sort keys of the last row of a page into an opaque cursor.
+
+    Args:
+        values (Sequence[Any]): The values of the sort keys, the last of which is the unique ID.
+        sort_order (str): The name of the order of the listing, so the cursor isn't used with another order.
+
+    Returns:
+        str: The cursor.
+    """
+
+    payload = {'sort_order': sort_order, 'values': list(values)}
+
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode('utf-8')) \
+        .decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, keys_count: int, sort_order: str) -> List[Any]:
+    """
+    Decodes values of sort keys from a cursor.
+
+    Orders may have sort keys of the same types, so the cursor must have been made for the same order,
+    otherwise its values would be compared with another column.
+
+    Args:
+        cursor (str): The cursor.
+        keys_count (int): The number of sort keys.
+        sort_order (str): The name of the order of the listing.
+
+    Returns:
+        List[Any]: The values of the sort keys.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or was made for another order.
+    """
+
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except ValueError:
+        raise InvalidCursorError(cursor)
+
+    if not isinstance(payload, dict) or payload.get('sort_order') != sort_order:
+        raise InvalidCursorError(cursor)
+
+    values = payload.get('values')
+
+    if not isinstance(values, list) or len(values) != keys_count:
+        raise InvalidCursorError(cursor)
+
+    return values
+
+
+def get_keyset_page_stmt(query: Select, sort_keys: Sequence[ColumnElement], sort_order: str,
+                         descending: bool = False, cursor: Optional[str] = None) -> Select:
+    """
+    Create a SELECT statement of rows following the row the cursor was made from.
+
+    The values of the sort keys are selected after the entity, so the cursor of the next page can be made.
+
+    Args:
+        query (Select): The query selecting one entity.
+        sort_keys (Sequence[ColumnElement]): The sort keys, the last of which must be unique.
+        sort_order (str): The name of the order of the listing, which the cursor must have been made for.
+        descending (bool): Whether all sort keys are in descending order.
+        cursor (Optional[str]): The cursor of the previous page or None for the first page.
+
+    Returns:
+        Select: The SELECT statement without limit.
+
+    Raises:
+        InvalidCursorError: If the cursor can't be decoded or was made for another order.
+    """
+
+    page_query = query.order_by(None) \
+        .order_by(*[key.desc() if descending else key.asc() for key in sort_keys]) \
+        .add_columns(*sort_keys)
+
+    if cursor:
+        keys, values = tuple_(*sort_keys), tuple_(*decode_cursor(cursor, len(sort_keys), sort_order))
+        page_query = page_query.where(keys < values if descending else keys > values)
+
+    return page_query
+
+
+async def keyset_paginate(query: Select, session: AsyncSession, limit: int, sort_keys: Sequence[ColumnElement],
+                          sort_order: str, descending: bool = False, cursor: Optional[str] = None,
+                          with_count: bool = False) -> dict:
+    """
+    Returns a page of a query, which follows the row the cursor was made from.
+
+    Rows are ordered by the sort keys, the last of which must be unique, and the page is found
+    by comparing them with the cursor's values, so every page costs the same as the first one
+    if the sort keys are indexed.
+
+    Args:
+        query (Select): The query selecting one entity.
+        session (AsyncSession): The session.
+        limit (int): The maximum number of rows in the page.
+        sort_keys (Sequence[ColumnElement]): The sort keys, e.g. a column and the ID.
+        sort_order (str): The name of the order of the listing, which the cursor must have been made for.
+        descending (bool): Whether all sort keys are in descending order.
+        cursor (Optional[str]): The cursor of the previous page or None for the first page.
+        with_count (bool): Whether to return the cached number of all rows of the query.
+
+    Returns:
+        dict: The count, the items and the cursor of the next page or None if it is the last page.
+
+    Raises:
+        InvalidCursorError: If the cursor can't be decoded or was made for another order.
+    """
+
+    page_query = get_keyset_page_stmt(query, sort_keys, sort_order, descending=descending, cursor=cursor)
+    rows = (await session.execute(page_query.limit(limit + 1))).all()
+    next_cursor = encode_cursor(rows[limit - 1][1:], sort_order) if len(rows) > limit else None
+
+    return {
+        'count': await count(query, session, cached=True) if with_count else None,
+        'items': [row[0] for row in rows[:limit]],
+        'next_cursor': next_cursor,
+    }
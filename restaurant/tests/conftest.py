@@ -14,7 +14,7 @@ from setup import app
 from models import Base
 from config import get_settings
 from uow import SqlAlchemyUnitOfWork
-from utils import uow_transaction
+from utils.uow import uow_transaction
 
 # Change settings to Test #
 
@@ -0,0 +1,46 @@
+import pytest
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from exceptions.pagination import InvalidCursorError
+from repositories import RestaurantRepository
+from utils.paginate import encode_cursor, decode_cursor
+
+
+class TestCursor:
+
+    def test_cursor_round_trip(self):
+        cursor = encode_cursor([4.5, 7], 'rating')
+
+        assert decode_cursor(cursor, 2, 'rating') == [4.5, 7]
+
+    @pytest.mark.parametrize('cursor', [
+        # Another order with the same number of sort keys
+        encode_cursor([12.5, 7], 'environmental_impact'),
+        # Other sort keys
+        encode_cursor([7], 'rating'),
+        # Cursor without an order
+        'WzQuNSw3XQ',
+        'not a cursor',
+    ])
+    def test_decode_invalid_cursor(self, cursor: str):
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor, 2, 'rating')
+
+
+class TestRestaurantCursorPagination:
+
+    async def test_cursor_of_another_order(self, session: AsyncSession):
+        repository = RestaurantRepository(session)
+
+        with pytest.raises(InvalidCursorError):
+            await repository.list_active_restaurants(order_by_environmental_impact=True,
+                                                     cursor=encode_cursor([4.5, 7], 'rating'))
+
+    async def test_count_only_on_request(self, session: AsyncSession):
+        repository = RestaurantRepository(session)
+
+        # Cursor pages are counted only on request, offset pages by default
+        assert (await repository.list_active_restaurants(use_cursor=True)).count is None
+        assert (await repository.list_active_restaurants(use_cursor=True, include_count=True)).count == 0
+        assert (await repository.list_active_restaurants()).count == 0
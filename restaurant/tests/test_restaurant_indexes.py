@@ -0,0 +1,53 @@
+import pytest
+
+from sqlalchemy import Select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from repositories import RestaurantRepository
+from utils.paginate import get_keyset_page_stmt
+
+
+async def explain(session: AsyncSession, stmt: Select) -> str:
+    sql = stmt.compile(session.get_bind(), compile_kwargs={'literal_binds': True})
+    plan = await session.execute(text(f'EXPLAIN QUERY PLAN {sql}'))
+
+    return '\n'.join(row[-1] for row in plan)
+
+
+class TestRestaurantListIndexes:
+
+    @pytest.mark.parametrize(
+        "filters, index",
+        [
+            ({'city': 'Pune'}, 'ix_restaurants_is_active_city'),
+            ({'state': 'Maharashtra'}, 'ix_restaurants_is_active_state'),
+            ({'pincode': '411001'}, 'ix_restaurants_pincode'),
+            ({'order_by_rating': True}, 'ix_restaurants_is_active_rating'),
+            ({'order_by_environmental_impact': True}, 'ix_restaurants_is_active_food_waste_saved'),
+        ]
+    )
+    async def test_list_active_restaurants_uses_index(self, session: AsyncSession, filters: dict, index: str):
+        repository = RestaurantRepository(session)
+        sort_keys, descending = repository._get_sort_keys(**filters)
+        stmt = get_keyset_page_stmt(repository._get_list_active_restaurants_stmt(**filters),
+                                    sort_keys, repository._get_sort_order(**filters), descending=descending)
+
+        plan = await explain(session, stmt)
+
+        assert index in plan
+        assert 'TEMP B-TREE' not in plan
+
+    @pytest.mark.parametrize(
+        "filters",
+        [
+            {},
+            {'jain_food': True, 'cuisine_type': 'Chinese'},
+        ]
+    )
+    async def test_nearby_restaurants_candidates_use_location_index(self, session: AsyncSession, filters: dict):
+        repository = RestaurantRepository(session)
+        stmt = repository._get_nearby_candidates_stmt(18.5204, 73.8567, 5, **filters)
+
+        plan = await explain(session, stmt)
+
+        assert 'ix_restaurants_is_active_latitude_longitude' in plan
@@ -4,6 +4,7 @@ from .order import router as order_router
 from .menu_item import router as menu_item_router
 from .restaurant import router as restaurant_router
 from .review import router as review_router
+from .metrics import router as metrics_router
 
 api_router = APIRouter(prefix='/api/v1')
 api_router.include_router(courier_router)
@@ -11,3 +12,4 @@ api_router.include_router(order_router)
 api_router.include_router(menu_item_router)
 api_router.include_router(restaurant_router)
 api_router.include_router(review_router)
+api_router.include_router(metrics_router)
@@ -1,12 +1,13 @@
-from typing import List
+from typing import Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
 from decorators import handle_app_errors
 from dependencies.services import get_review_service
 from dependencies.uow import get_uow
+from models.review import ReviewSortOrder
 from schemas.rating import RatingRetrieveOutSchema
-from schemas.review import ReviewRetrieveOutSchema
+from schemas.review import ReviewPageOutSchema
 from services.interfaces.review import IReviewService
 from uow.generic import GenericUnitOfWork
 
@@ -15,12 +16,17 @@ router = APIRouter(
 )
 
 
-@router.get('/{courier_id}/reviews/', response_model=List[ReviewRetrieveOutSchema])
+@router.get('/{courier_id}/reviews/', response_model=ReviewPageOutSchema)
 @handle_app_errors
 async def get_courier_reviews(courier_id: int,
                               review_service: IReviewService = Depends(get_review_service),
-                              uow: GenericUnitOfWork = Depends(get_uow)):
-    return await review_service.get_courier_reviews(courier_id, uow)
+                              uow: GenericUnitOfWork = Depends(get_uow),
+                              sort_order: ReviewSortOrder = Query(default=ReviewSortOrder.newest,
+                                                                  description="Order of reviews"),
+                              limit: int = Query(20, ge=1, le=100, description="Maximum number of reviews"),
+                              cursor: Optional[str] = Query(default=None, description="Cursor of the next page "
+                                                                                      "from the previous response")):
+    return await review_service.get_courier_reviews(courier_id, uow, sort_order, limit, cursor)
 
 
 @router.get('/{courier_id}/rating/', response_model=RatingRetrieveOutSchema)
@@ -1,11 +1,13 @@
-from typing import List, Optional
+from typing import Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
 from decorators import handle_app_errors
 from dependencies.services import get_review_service
 from dependencies.uow import get_uow, get_uow_with_commit
-from schemas.review import ReviewRetrieveOutSchema, ReviewCreateOutSchema, ReviewCreateInSchema
+from models.review import ReviewSortOrder
+from schemas.review import ReviewRetrieveOutSchema, ReviewCreateOutSchema, ReviewCreateInSchema, \
+    ReviewPageOutSchema
 from services.interfaces.review import IReviewService
 from uow.generic import GenericUnitOfWork
 
@@ -22,14 +24,17 @@ async def get_customer_menu_item_review(menu_item_id: int,
     return await review_service.get_customer_menu_item_review(menu_item_id, uow)
 
 
-@router.get('/{menu_item_id}/reviews/', response_model=List[ReviewRetrieveOutSchema])
+@router.get('/{menu_item_id}/reviews/', response_model=ReviewPageOutSchema)
 @handle_app_errors
 async def get_menu_item_reviews(menu_item_id: int,
                                 review_service: IReviewService = Depends(get_review_service),
-                                uow: GenericUnitOfWork = Depends(get_uow)):
-    chlen = await review_service.get_menu_item_reviews(menu_item_id, uow)
-    print(chlen)
-    return chlen
+                                uow: GenericUnitOfWork = Depends(get_uow),
+                                sort_order: ReviewSortOrder = Query(default=ReviewSortOrder.newest,
+                                                                    description="Order of reviews"),
+                                limit: int = Query(20, ge=1, le=100, description="Maximum number of reviews"),
+                                cursor: Optional[str] = Query(default=None, description="Cursor of the next page "
+                                                                                        "from the previous response")):
+    return await review_service.get_menu_item_reviews(menu_item_id, uow, sort_order, limit, cursor)
 
 
 @router.post('/{menu_item_id}/reviews/', response_model=ReviewCreateOutSchema)
@@ -0,0 +1,25 @@
+from fastapi import APIRouter
+
+from schemas.metrics import DatabasePoolMetricsOutSchema, KafkaPublisherMetricsOutSchema, \
+    KafkaPublisherCoalescingMetricsOutSchema
+from setup.kafka.producer.publisher import publisher
+from setup.sqlalchemy.pool import pool_metrics
+
+router = APIRouter(
+    prefix='/metrics'
+)
+
+
+@router.get('/db-pool', response_model=DatabasePoolMetricsOutSchema)
+async def get_db_pool_metrics():
+    return pool_metrics.snapshot()
+
+
+@router.get('/kafka-publisher', response_model=KafkaPublisherMetricsOutSchema)
+async def get_kafka_publisher_metrics():
+    return publisher.metrics.snapshot()
+
+
+@router.get('/kafka-publisher/coalescing', response_model=KafkaPublisherCoalescingMetricsOutSchema)
+async def get_kafka_publisher_coalescing_metrics():
+    return publisher.coalescing_metrics.snapshot()
@@ -1,11 +1,15 @@
-from typing import List, Optional
+from datetime import date
+from typing import Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
 from decorators import handle_app_errors
 from dependencies.services import get_review_service
 from dependencies.uow import get_uow, get_uow_with_commit
-from schemas.review import ReviewRetrieveOutSchema, ReviewCreateOutSchema, ReviewCreateInSchema
+from models.review import ReviewSortOrder
+from schemas.analytics import ReviewAnalyticsOutSchema
+from schemas.review import ReviewRetrieveOutSchema, ReviewCreateOutSchema, ReviewCreateInSchema, \
+    ReviewPageOutSchema
 from services.interfaces.review import IReviewService
 from uow.generic import GenericUnitOfWork
 
@@ -22,12 +26,29 @@ async def get_customer_restaurant_review(restaurant_id: int,
     return await review_service.get_customer_restaurant_review(restaurant_id, uow)
 
 
-@router.get('/{restaurant_id}/reviews', response_model=List[ReviewRetrieveOutSchema])
+@router.get('/{restaurant_id}/reviews', response_model=ReviewPageOutSchema)
 @handle_app_errors
 async def get_restaurant_reviews(restaurant_id: int,
                                  review_service: IReviewService = Depends(get_review_service),
-                                 uow: GenericUnitOfWork = Depends(get_uow)):
-    return await review_service.get_restaurant_reviews(restaurant_id, uow)
+                                 uow: GenericUnitOfWork = Depends(get_uow),
+                                 sort_order: ReviewSortOrder = Query(default=ReviewSortOrder.newest,
+                                                                     description="Order of reviews"),
+                                 limit: int = Query(20, ge=1, le=100, description="Maximum number of reviews"),
+                                 cursor: Optional[str] = Query(default=None, description="Cursor of the next page "
+                                                                                         "from the previous response")):
+    return await review_service.get_restaurant_reviews(restaurant_id, uow, sort_order, limit, cursor)
+
+
+@router.get('/{restaurant_id}/reviews/analytics/', response_model=ReviewAnalyticsOutSchema)
+@handle_app_errors
+async def get_restaurant_review_analytics(restaurant_id: int,
+                                          review_service: IReviewService = Depends(get_review_service),
+                                          uow: GenericUnitOfWork = Depends(get_uow),
+                                          date_from: Optional[date] = Query(default=None, description="First day, "
+                                                                            "the range has 30 days by default"),
+                                          date_to: Optional[date] = Query(default=None, description="Last day, "
+                                                                          "the current UTC day by default")):
+    return await review_service.get_restaurant_review_analytics(restaurant_id, uow, date_from, date_to)
 
 
 @router.post('/{restaurant_id}/reviews', response_model=ReviewCreateOutSchema)
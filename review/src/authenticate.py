@@ -5,7 +5,8 @@ from grpc import RpcError, StatusCode
 from loguru import logger
 
 from grpc_files.repository import get_repository
-from grpc_files.roles_client import RolesClient
+from grpc_files.roles_cache import CachedRolesClient
+from grpc_files.roles_verifier import LocalRolesClient
 from grpc_files.status import grpc_status_to_http
 from roles import UserRole
 from uow.generic import GenericUnitOfWork
@@ -13,16 +14,19 @@ from uow.generic import GenericUnitOfWork
 
 async def authenticate(access_token: Optional[str],
                        uow: GenericUnitOfWork,
-                       grpc_roles_client: RolesClient,
+                       grpc_roles_client: Union[CachedRolesClient, LocalRolesClient],
                        app_roles: List[Type[UserRole]]) -> Any:
     """
     Authenticates a user using an access token via grpc request to User microservice
     and returns the corresponding user object.
 
+    Roles of access tokens are cached or verified locally by token claims,
+    so most requests do not reach the User microservice.
+
     Args:
         access_token (Optional[str]): The access token used for authentication.
         uow (GenericUnitOfWork): The unit of work object for interacting with the database.
-        grpc_roles_client (RolesClient): The gRPC client for interacting with the User microservice.
+        grpc_roles_client (Union[CachedRolesClient, LocalRolesClient]): The client for resolving roles of access tokens.
         app_roles (List[Type[UserRole]]): The list of supported roles in the application.
 
     Returns:
@@ -38,7 +42,7 @@ async def authenticate(access_token: Optional[str],
             logger.info("Authenticated as anonymous user")
             return
 
-        grpc_response = grpc_roles_client.get_user_role(access_token)
+        grpc_response = await grpc_roles_client.get_user_role(access_token)
 
         repository = get_repository(grpc_response.role, uow, app_roles)
 
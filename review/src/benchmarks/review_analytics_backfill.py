@@ -0,0 +1,160 @@
+"""
+Benchmark of the backfill of daily rollups of reviews of restaurants.
+
+Fills an SQLite database with random reviews of restaurants spread over a range of days and measures
+the backfill of their rollups with one worker and with several ones, then the latency of dashboard queries
+of a restaurant served from the rollups and computed from reviews. Backfilled rollups are checked against
+rollups computed while generating the reviews.
+
+Usage (from `src` directory):
+    python -m benchmarks.review_analytics_backfill --reviews 1000000 --restaurants 2000 --days 365
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Tuple
+
+from loguru import logger
+from sqlalchemy import Date, func, insert, select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from db.sqlalchemy.models import Base, Restaurant, Review
+from setup.sqlalchemy.backfill_analytics import backfill
+from uow.sqlalchemy import SqlAlchemyUnitOfWork
+from uow.utils import uow_transaction
+
+BATCH_SIZE = 50_000
+# Ratings are skewed to positive ones like real reviews
+RATINGS_WEIGHTS = [5, 5, 10, 30, 50]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Review analytics backfill benchmark")
+    parser.add_argument("--reviews", type=int, default=1_000_000, help="Number of reviews")
+    parser.add_argument("--restaurants", type=int, default=2000, help="Number of restaurants")
+    parser.add_argument("--days", type=int, default=365, help="Number of days with reviews")
+    parser.add_argument("--chunk-days", type=int, default=7, help="Number of days in a transaction")
+    parser.add_argument("--workers", type=int, default=4, help="Number of chunks backfilled at once")
+    parser.add_argument("--queries", type=int, default=1000, help="Number of measured dashboard queries")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    return parser.parse_args()
+
+
+def random_restaurant_id(restaurants: int) -> int:
+    # Popularity of restaurants is skewed, a few of them have most of reviews
+    return max(1, int(restaurants ** random.random()))
+
+
+def generate_reviews(first_id: int, count: int, restaurants: int, date_from: date, days: int,
+                     expected: Dict[Tuple[int, date], List[int]]) -> List[dict]:
+    reviews = []
+    start = datetime.combine(date_from, datetime.min.time())
+
+    for id in range(first_id, first_id + count):
+        restaurant_id = random_restaurant_id(restaurants)
+        rating = random.choices(range(1, 6), weights=RATINGS_WEIGHTS)[0]
+        comment = "Tasty" if random.random() < 0.4 else None
+        created_at = start + timedelta(seconds=random.randrange(days * 86400))
+        reviews.append(dict(id=id, rating=rating, comment=comment, customer_id=id, restaurant_id=restaurant_id,
+                            created_at=created_at))
+
+        # Reviews count, ratings sum, comments count and the histogram of ratings
+        rollup = expected[(restaurant_id, created_at.date())]
+        rollup[0] += 1
+        rollup[1] += rating
+        rollup[2] += comment is not None
+        rollup[2 + rating] += 1
+
+    return reviews
+
+
+async def run(args: argparse.Namespace):
+    # Repositories log every query
+    logger.remove()
+    random.seed(args.seed)
+    date_from = date(2025, 1, 1)
+    date_to = date_from + timedelta(days=args.days - 1)
+    expected: Dict[Tuple[int, date], List[int]] = defaultdict(lambda: [0] * 8)
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Concurrent transactions wait for the write lock of SQLite
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(directory, 'benchmark.db')}",
+                                     connect_args={'timeout': 600})
+        session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+        start = time.perf_counter()
+
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+            await connection.execute(insert(Restaurant), [dict(id=id, is_active=True)
+                                                          for id in range(1, args.restaurants + 1)])
+
+            for first_id in range(1, args.reviews + 1, BATCH_SIZE):
+                count = min(BATCH_SIZE, args.reviews + 1 - first_id)
+                await connection.execute(insert(Review), generate_reviews(first_id, count, args.restaurants,
+                                                                          date_from, args.days, expected))
+
+            await connection.exec_driver_sql('ANALYZE')
+
+        print(f"reviews: {args.reviews}, restaurants: {args.restaurants}, days: {args.days}, "
+              f"rollups: {len(expected)}, generated in {time.perf_counter() - start:.1f}s")
+
+        get_uow = lambda: SqlAlchemyUnitOfWork(session_maker)
+
+        for workers in sorted({1, args.workers}):
+            start = time.perf_counter()
+            rollups_count = await backfill(get_uow, date_from, date_to, chunk_days=args.chunk_days,
+                                           workers=workers)
+            print(f"backfill with {workers} worker(s), {args.chunk_days} days per chunk: "
+                  f"{time.perf_counter() - start:.1f}s, {rollups_count} rollups")
+
+        async with uow_transaction(get_uow()) as uow, session_maker() as session:
+            mismatches = 0
+
+            for restaurant_id in range(1, args.restaurants + 1):
+                for rollup in await uow.review_analytics.list_daily(restaurant_id, date_from, date_to):
+                    stored = [rollup.reviews_count, rollup.ratings_sum, rollup.comments_count, *rollup.histogram]
+
+                    if expected.pop((restaurant_id, rollup.date), None) != stored:
+                        mismatches += 1
+
+            print(f"mismatches with generated reviews: {mismatches + len(expected)}")
+
+            rollups_latencies, reviews_latencies = [], []
+            day = func.date(Review.created_at, type_=Date)
+
+            for _ in range(args.queries):
+                restaurant_id = random_restaurant_id(args.restaurants)
+                window_to = date_from + timedelta(days=random.randrange(args.days))
+                window_from = window_to - timedelta(days=29)
+
+                start = time.perf_counter()
+                await uow.review_analytics.list_daily(restaurant_id, window_from, window_to)
+                rollups_latencies.append((time.perf_counter() - start) * 1000)
+
+                start = time.perf_counter()
+                await session.execute(
+                    select(day, func.count(Review.id), func.sum(Review.rating))
+                    .where(Review.restaurant_id == restaurant_id,
+                           Review.created_at >= datetime.combine(window_from, datetime.min.time()),
+                           Review.created_at < datetime.combine(window_to + timedelta(days=1), datetime.min.time()))
+                    .group_by(day)
+                )
+                reviews_latencies.append((time.perf_counter() - start) * 1000)
+
+        await engine.dispose()
+
+    for name, latencies in (("rollups", rollups_latencies), ("reviews", reviews_latencies)):
+        quantiles = statistics.quantiles(latencies, n=100)
+        print(f"30 days dashboard from {name} latency ms: p50 {quantiles[49]:.2f}, p99 {quantiles[98]:.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(run(parse_args()))
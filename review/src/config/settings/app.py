@@ -1,14 +1,15 @@
-from typing import Dict, List, Type, Callable
+from typing import Any, Awaitable, Dict, List, Type, Callable
 
 from pydantic import BaseModel
 from pydantic_settings import BaseSettings
 
 from kafka_files.consumer.events import CustomerUpdatedEvent, CustomerCreatedEvent, CourierCreatedEvent, \
     MenuItemCreatedEvent, MenuItemDeletedEvent, RestaurantCreatedEvent, OrderFinishedEvent, ConsumerEvent, \
-    RestaurantUpdatedEvent
+    RestaurantUpdatedEvent, UserUpdatedEvent
 from kafka_files.producer.events import MenuItemRatingUpdatedEvent, ProducerEvent, RestaurantRatingUpdatedEvent
 from kafka_files.producer.schemas import MenuItemRatingUpdatedSchema, RestaurantRatingUpdatedSchema
 from roles import CustomerRole, CourierRole, UserRole
+from setup.sqlalchemy.engine import init_thread_engine, dispose_thread_engine
 from setup.sqlalchemy.uow import get_sqlalchemy_uow
 from uow.generic import GenericUnitOfWork
 
@@ -19,6 +20,8 @@ class AppSettings(BaseSettings):
         CourierRole,
     ]
     get_app_uow: Callable[[], GenericUnitOfWork] = get_sqlalchemy_uow
+    init_app_thread: Callable[[], Any] = init_thread_engine
+    dispose_app_thread: Callable[[], Awaitable[None]] = dispose_thread_engine
     kafka_group_consumers_count: int = 1
     kafka_consumer_topic_events: Dict[str, List[Type[ConsumerEvent]]] = {
         'user_review': [
@@ -26,6 +29,9 @@ class AppSettings(BaseSettings):
             CustomerCreatedEvent,
             CustomerUpdatedEvent
         ],
+        'user_roles_review': [
+            UserUpdatedEvent
+        ],
         'menu_review': [
             MenuItemCreatedEvent,
             MenuItemDeletedEvent
@@ -38,6 +44,12 @@ class AppSettings(BaseSettings):
             OrderFinishedEvent
         ]
     }
+    # Events which invalidate in-memory state, received by every web process
+    kafka_broadcast_topic_events: Dict[str, List[Type[ConsumerEvent]]] = {
+        'user_roles_review': [
+            UserUpdatedEvent
+        ]
+    }
 
     kafka_producer_events_topics: Dict[Type[ProducerEvent], Dict[str, Type[BaseModel]]] = {
         MenuItemRatingUpdatedEvent: {
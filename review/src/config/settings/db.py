@@ -10,6 +10,14 @@ class PostgresSqlSettings(BaseSettings, ABC):
     pg_user: str
     pg_password: str
 
+    db_pool_enabled: bool = True
+    db_pool_size: int = 5
+    db_pool_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 30
+    db_pool_pre_ping: bool = True
+    db_pool_recycle_seconds: int = 1800
+    db_pgbouncer_mode: bool = False
+
 
 class SqliteSettings(BaseSettings, ABC):
     sqlite_db_file: str
@@ -1,5 +1,5 @@
 from abc import ABC
-from typing import Optional
+from typing import Dict, Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -15,6 +15,17 @@ class ServerSettings(BaseSettings, ABC):
     graylog_udp_port: int
     roles_grpc_server_host: str
     roles_grpc_server_port: int
+    roles_grpc_timeout_seconds: float = 1.0
+    roles_cache_maxsize: int = 10000
+    roles_cache_ttl_seconds: int = 300
+    roles_cache_negative_ttl_seconds: int = 10
+
+    jwt_local_verification: bool = False
+    jwt_algorithm: str = 'HS256'
+    jwt_verifying_key: Optional[str] = None
+    jwt_jwks_file: Optional[str] = None
+    jwt_leeway_seconds: int = 5
+    jwt_access_token_lifetime_seconds: int = 86400
     kafka_bootstrap_server_host: str
     kafka_bootstrap_server_port: int
     kafka_ssl_cafile: Optional[str] = f'{BASE_DIRECTORY}/cacert.pem'
@@ -23,6 +34,29 @@ class ServerSettings(BaseSettings, ABC):
     kafka_broker_user: str
     kafka_broker_password: str
 
+    kafka_producer_linger_ms: int = 5
+    kafka_producer_batch_size: int = 16384
+    kafka_producer_compression_type: Optional[str] = None
+    kafka_producer_topics_compression_types: Dict[str, Optional[str]] = {}
+    kafka_producer_topics_codecs: Dict[str, str] = {}
+    kafka_producer_schema_id_header: bool = False
+    kafka_publisher_queue_maxsize: int = 10000
+    kafka_publisher_queue_put_timeout_seconds: float = 5
+    kafka_publisher_flush_timeout_seconds: float = 10
+    kafka_publisher_coalescing_window_seconds: float = 1.0
+    web_app_kafka_receivers_enabled: bool = False
+    kafka_consumer_workers_count: int = 8
+    kafka_consumer_partition_queue_maxsize: int = 100
+    kafka_consumer_max_poll_records: int = 500
+    kafka_consumer_poll_timeout_ms: int = 100
+    kafka_consumer_batch_max_size: int = 100
+    kafka_consumer_batch_max_wait_ms: int = 20
+    kafka_consumer_shutdown_timeout_seconds: float = 10
+    kafka_consumer_retry_max_attempts: int = 4
+    kafka_consumer_retry_backoff_ms: int = 5000
+    kafka_consumer_retry_delivery_timeout_seconds: float = 10
+    kafka_broadcast_repeat_delay_seconds: float = 5
+
 
 class DevelopServerSettings(ServerSettings, PostgresSqlSettings):
     reload: bool = True
@@ -0,0 +1,15 @@
+"""
+Entry point of the process which only consumes Kafka events.
+
+Web processes don't start Kafka receivers unless `web_app_kafka_receivers_enabled` is set, so HTTP and event
+processing are scaled independently.
+
+Usage (from `src` directory):
+    python -m consumer
+"""
+
+from setup.utils import start_consumer
+
+
+if __name__ == "__main__":
+    start_consumer()
@@ -25,6 +25,13 @@ if config.config_file_name is not None:
 
 target_metadata = Base.metadata
 
+# Tables created by migrations for manual recovery, which are not mapped by models
+unmapped_tables = {'removed_duplicate_reviews'}
+
+
+def include_name(name, type_, parent_names) -> bool:
+    return type_ != "table" or name not in unmapped_tables
+
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
@@ -43,6 +50,7 @@ def run_migrations_offline() -> None:
         url=url,
         target_metadata=target_metadata,
         literal_binds=True,
+        include_name=include_name,
         dialect_opts={"paramstyle": "named"},
     )
 
@@ -65,7 +73,7 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata, include_name=include_name
         )
 
         with context.begin_transaction():
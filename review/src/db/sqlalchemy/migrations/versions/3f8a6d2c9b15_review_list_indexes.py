@@ -0,0 +1,37 @@
+"""review list indexes
+
+Revision ID: 3f8a6d2c9b15
+Revises: 9e2b7c5d1a84
+Create Date: 2026-10-17 21:26:43.508214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8a6d2c9b15'
+down_revision: Union[str, None] = '9e2b7c5d1a84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_reviews_restaurant_id_created_at_id', 'reviews',
+                    ['restaurant_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_reviews_restaurant_id_rating_created_at_id', 'reviews',
+                    ['restaurant_id', 'rating', 'created_at', 'id'], unique=False)
+    op.create_index('ix_reviews_menu_item_id_created_at_id', 'reviews',
+                    ['menu_item_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_reviews_menu_item_id_rating_created_at_id', 'reviews',
+                    ['menu_item_id', 'rating', 'created_at', 'id'], unique=False)
+    op.create_index(op.f('ix_orders_courier_id'), 'orders', ['courier_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_orders_courier_id'), table_name='orders')
+    op.drop_index('ix_reviews_menu_item_id_rating_created_at_id', table_name='reviews')
+    op.drop_index('ix_reviews_menu_item_id_created_at_id', table_name='reviews')
+    op.drop_index('ix_reviews_restaurant_id_rating_created_at_id', table_name='reviews')
+    op.drop_index('ix_reviews_restaurant_id_created_at_id', table_name='reviews')
@@ -0,0 +1,34 @@
+"""replica versions
+
+Revision ID: 5c7e1a9d3f62
+Revises: 0a417ed77669
+Create Date: 2026-10-17 18:04:27.513906
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c7e1a9d3f62'
+down_revision: Union[str, None] = '0a417ed77669'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('couriers', sa.Column('version', sa.BigInteger(), server_default='-1', nullable=False))
+    op.add_column('customers', sa.Column('version', sa.BigInteger(), server_default='-1', nullable=False))
+    op.add_column('menu_items', sa.Column('version', sa.BigInteger(), server_default='-1', nullable=False))
+    op.add_column('orders', sa.Column('version', sa.BigInteger(), server_default='-1', nullable=False))
+    op.add_column('restaurants', sa.Column('version', sa.BigInteger(), server_default='-1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('restaurants', 'version')
+    op.drop_column('orders', 'version')
+    op.drop_column('menu_items', 'version')
+    op.drop_column('customers', 'version')
+    op.drop_column('couriers', 'version')
@@ -0,0 +1,40 @@
+"""review analytics
+
+Revision ID: 7d4e1b8f6a23
+Revises: 3f8a6d2c9b15
+Create Date: 2026-10-17 22:12:37.904152
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d4e1b8f6a23'
+down_revision: Union[str, None] = '3f8a6d2c9b15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('review_analytics',
+    sa.Column('restaurant_id', sa.BigInteger(), autoincrement=False, nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('reviews_count', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('ratings_sum', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('comments_count', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('stars_1_count', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('stars_2_count', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('stars_3_count', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('stars_4_count', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('stars_5_count', sa.BigInteger(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('restaurant_id', 'date')
+    )
+    op.create_index('ix_reviews_created_at', 'reviews', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_reviews_created_at', table_name='reviews')
+    op.drop_table('review_analytics')
@@ -0,0 +1,54 @@
+"""rating aggregates
+
+Revision ID: 9e2b7c5d1a84
+Revises: 5c7e1a9d3f62
+Create Date: 2026-10-17 20:41:08.116592
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e2b7c5d1a84'
+down_revision: Union[str, None] = '5c7e1a9d3f62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Expressions of rated entities of reviews, with the joins they need
+entities = [
+    ('restaurant', 'reviews.restaurant_id', ''),
+    ('menu_item', 'reviews.menu_item_id', ''),
+    ('courier', 'orders.courier_id', 'JOIN orders ON orders.id = reviews.order_id'),
+]
+
+
+def upgrade() -> None:
+    op.create_table('rating_aggregates',
+    sa.Column('entity_type', sa.String(length=16), nullable=False),
+    sa.Column('entity_id', sa.BigInteger(), autoincrement=False, nullable=False),
+    sa.Column('reviews_count', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('ratings_sum', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('stars_1_count', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('stars_2_count', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('stars_3_count', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('stars_4_count', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('stars_5_count', sa.BigInteger(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('entity_type', 'entity_id')
+    )
+
+    # Aggregates of existing reviews
+    for entity_type, entity_id, join in entities:
+        op.execute(
+            f"INSERT INTO rating_aggregates (entity_type, entity_id, reviews_count, ratings_sum, "
+            f"stars_1_count, stars_2_count, stars_3_count, stars_4_count, stars_5_count) "
+            f"SELECT '{entity_type}', {entity_id}, COUNT(reviews.id), SUM(reviews.rating), "
+            + ", ".join(f"SUM(CASE WHEN reviews.rating = {stars} THEN 1 ELSE 0 END)" for stars in range(1, 6))
+            + f" FROM reviews {join} WHERE {entity_id} IS NOT NULL GROUP BY {entity_id}"
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('rating_aggregates')
@@ -0,0 +1,116 @@
+"""review unique indexes
+
+Revision ID: a6c9e3f5d712
+Revises: 7d4e1b8f6a23
+Create Date: 2026-10-17 22:54:19.371846
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6c9e3f5d712'
+down_revision: Union[str, None] = '7d4e1b8f6a23'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+# Columns of reviewed entities, which a customer reviews once
+entity_columns = ['restaurant_id', 'menu_item_id']
+
+# Duplicate reviews are moved to this table, which is kept for manual recovery and restored by downgrade
+removed_table = 'removed_duplicate_reviews'
+review_columns = 'id, rating, comment, customer_id, order_id, restaurant_id, menu_item_id, created_at'
+
+# Expressions of rated entities of reviews, with the joins they need
+entities = [
+    ('restaurant', 'reviews.restaurant_id', '', f'{removed_table}.restaurant_id', ''),
+    ('menu_item', 'reviews.menu_item_id', '', f'{removed_table}.menu_item_id', ''),
+    ('courier', 'orders.courier_id', 'JOIN orders ON orders.id = reviews.order_id',
+     'orders.courier_id', f'JOIN orders ON orders.id = {removed_table}.order_id'),
+]
+
+stars_range = range(1, 6)
+
+
+def recompute_aggregates() -> None:
+    # Rating aggregates of entities of removed reviews are computed again from the remaining reviews
+    for entity_type, entity_id, join, removed_entity_id, removed_join in entities:
+        removed_entity_ids = (f"SELECT {removed_entity_id} FROM {removed_table} {removed_join} "
+                              f"WHERE {removed_entity_id} IS NOT NULL")
+        op.execute(f"DELETE FROM rating_aggregates WHERE entity_type = '{entity_type}' "
+                   f"AND entity_id IN ({removed_entity_ids})")
+        op.execute(
+            f"INSERT INTO rating_aggregates (entity_type, entity_id, reviews_count, ratings_sum, "
+            f"stars_1_count, stars_2_count, stars_3_count, stars_4_count, stars_5_count) "
+            f"SELECT '{entity_type}', {entity_id}, COUNT(reviews.id), SUM(reviews.rating), "
+            + ", ".join(f"SUM(CASE WHEN reviews.rating = {stars} THEN 1 ELSE 0 END)" for stars in stars_range)
+            + f" FROM reviews {join} WHERE {entity_id} IN ({removed_entity_ids}) GROUP BY {entity_id}"
+        )
+
+    # So are daily rollups of days of removed reviews of restaurants
+    removed_days = (f"SELECT restaurant_id, DATE(created_at) FROM {removed_table} "
+                    f"WHERE restaurant_id IS NOT NULL")
+    op.execute(f"DELETE FROM review_analytics WHERE (restaurant_id, date) IN ({removed_days})")
+    op.execute(
+        "INSERT INTO review_analytics (restaurant_id, date, reviews_count, ratings_sum, comments_count, "
+        "stars_1_count, stars_2_count, stars_3_count, stars_4_count, stars_5_count) "
+        "SELECT restaurant_id, DATE(created_at), COUNT(id), SUM(rating), "
+        "SUM(CASE WHEN comment <> '' THEN 1 ELSE 0 END), "
+        + ", ".join(f"SUM(CASE WHEN rating = {stars} THEN 1 ELSE 0 END)" for stars in stars_range)
+        + f" FROM reviews WHERE (restaurant_id, DATE(created_at)) IN ({removed_days}) "
+        f"GROUP BY restaurant_id, DATE(created_at)"
+    )
+
+
+def upgrade() -> None:
+    op.create_table(removed_table,
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('rating', sa.SmallInteger(), nullable=False),
+    sa.Column('comment', sa.String(), nullable=True),
+    sa.Column('customer_id', sa.BigInteger(), nullable=False),
+    sa.Column('order_id', sa.BigInteger(), nullable=True),
+    sa.Column('restaurant_id', sa.BigInteger(), nullable=True),
+    sa.Column('menu_item_id', sa.BigInteger(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    for column in entity_columns:
+        # Duplicates created by concurrent requests are removed, the first review of a customer is kept
+        op.execute(
+            f"INSERT INTO {removed_table} ({review_columns}) SELECT {review_columns} FROM reviews "
+            f"WHERE {column} IS NOT NULL AND id NOT IN ("
+            f"SELECT MIN(id) FROM reviews WHERE {column} IS NOT NULL GROUP BY customer_id, {column})"
+        )
+
+    op.execute(f"DELETE FROM reviews WHERE id IN (SELECT id FROM {removed_table})")
+    recompute_aggregates()
+
+    for column in entity_columns:
+        op.create_index(f'uq_reviews_customer_id_{column}', 'reviews', ['customer_id', column], unique=True,
+                        postgresql_where=sa.text(f'{column} IS NOT NULL'),
+                        sqlite_where=sa.text(f'{column} IS NOT NULL'))
+
+    if not op.get_context().as_sql:
+        removed_count = op.get_bind().execute(sa.text(f"SELECT COUNT(*) FROM {removed_table}")).scalar()
+
+        if removed_count:
+            logger.warning(f"Removed {removed_count} duplicate reviews into {removed_table} and recomputed "
+                           f"rating aggregates and review analytics of their entities. Other services get "
+                           f"the new ratings with the next reviews of the entities")
+
+
+def downgrade() -> None:
+    for column in reversed(entity_columns):
+        op.drop_index(f'uq_reviews_customer_id_{column}', table_name='reviews')
+
+    op.execute(f"INSERT INTO reviews ({review_columns}) SELECT {review_columns} FROM {removed_table}")
+    recompute_aggregates()
+    op.drop_table(removed_table)
+
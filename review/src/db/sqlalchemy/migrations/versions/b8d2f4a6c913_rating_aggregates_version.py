@@ -0,0 +1,26 @@
+"""rating aggregates version
+
+Revision ID: b8d2f4a6c913
+Revises: a6c9e3f5d712
+Create Date: 2026-10-18 11:04:52.318940
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d2f4a6c913'
+down_revision: Union[str, None] = 'a6c9e3f5d712'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('rating_aggregates', sa.Column('version', sa.BigInteger(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('rating_aggregates', 'version')
@@ -7,3 +7,5 @@ from .menu_item import *
 from .order import *
 from .restaurant import *
 from .review import *
+from .rating import *
+from .analytics import *
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, BigInteger, Date
+
+from .base import Base
+
+__all__ = [
+    "ReviewAnalytics"
+]
+
+
+class ReviewAnalytics(Base):
+    __tablename__ = "review_analytics"
+
+    # Daily rollup of reviews of a restaurant by the UTC day the reviews were created
+    restaurant_id = Column(BigInteger, primary_key=True, autoincrement=False)
+    date = Column(Date, primary_key=True)
+
+    reviews_count = Column(BigInteger, nullable=False, default=0, server_default='0')
+    ratings_sum = Column(BigInteger, nullable=False, default=0, server_default='0')
+    comments_count = Column(BigInteger, nullable=False, default=0, server_default='0')
+
+    # Histogram of ratings from 1 to 5 stars
+    stars_1_count = Column(BigInteger, nullable=False, default=0, server_default='0')
+    stars_2_count = Column(BigInteger, nullable=False, default=0, server_default='0')
+    stars_3_count = Column(BigInteger, nullable=False, default=0, server_default='0')
+    stars_4_count = Column(BigInteger, nullable=False, default=0, server_default='0')
+    stars_5_count = Column(BigInteger, nullable=False, default=0, server_default='0')
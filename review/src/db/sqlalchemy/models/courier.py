@@ -11,3 +11,6 @@ class Courier(Base):
     __tablename__ = "couriers"
 
     id = Column(BigInteger, primary_key=True, autoincrement=False)
+
+    # Offset of the Kafka message which has last written the replica
+    version = Column(BigInteger, nullable=False, default=-1, server_default='-1')
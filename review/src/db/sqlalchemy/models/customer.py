@@ -13,3 +13,6 @@ class Customer(Base):
     id = Column(BigInteger, primary_key=True, autoincrement=False)
     full_name = Column(String, nullable=False)
     image_url = Column(String, nullable=False)
+
+    # Offset of the Kafka message which has last written the replica
+    version = Column(BigInteger, nullable=False, default=-1, server_default='-1')
@@ -8,4 +8,7 @@ class Order(Base):
 
     id = Column(BigInteger, primary_key=True, autoincrement=False)
     customer_id = Column(BigInteger, ForeignKey('customers.id', name='fk_customer_id'), nullable=False)
-    courier_id = Column(BigInteger, ForeignKey('couriers.id', name='fk_courier_id'), nullable=False)
+    courier_id = Column(BigInteger, ForeignKey('couriers.id', name='fk_courier_id'), nullable=False, index=True)
+
+    # Offset of the Kafka message which has last written the replica
+    version = Column(BigInteger, nullable=False, default=-1, server_default='-1')
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, BigInteger, String
+
+from .base import Base
+
+__all__ = [
+    "RatingAggregate"
+]
+
+
+class RatingAggregate(Base):
+    __tablename__ = "rating_aggregates"
+
+    # Type of the rated entity: restaurant, menu item or courier
+    entity_type = Column(String(16), primary_key=True)
+    entity_id = Column(BigInteger, primary_key=True, autoincrement=False)
+
+    reviews_count = Column(BigInteger, nullable=False, default=0, server_default='0')
+    ratings_sum = Column(BigInteger, nullable=False, default=0, server_default='0')
+
+    # Histogram of ratings from 1 to 5 stars
+    stars_1_count = Column(BigInteger, nullable=False, default=0, server_default='0')
+    stars_2_count = Column(BigInteger, nullable=False, default=0, server_default='0')
+    stars_3_count = Column(BigInteger, nullable=False, default=0, server_default='0')
+    stars_4_count = Column(BigInteger, nullable=False, default=0, server_default='0')
+    stars_5_count = Column(BigInteger, nullable=False, default=0, server_default='0')
+
+    # Incremented by every change, so consumers of published ratings can drop older ones
+    version = Column(BigInteger, nullable=False, default=0, server_default='0')
@@ -13,3 +13,5 @@ class Restaurant(Base):
     id = Column(BigInteger, primary_key=True, autoincrement=False)
     is_active = Column(Boolean, nullable=False, default=True)
 
+    # Offset of the Kafka message which has last written the replica
+    version = Column(BigInteger, nullable=False, default=-1, server_default='-1')
@@ -1,6 +1,6 @@
 import datetime
 
-from sqlalchemy import Column, BigInteger, SmallInteger, String, DateTime, ForeignKey
+from sqlalchemy import Column, BigInteger, SmallInteger, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from .base import Base
@@ -28,3 +28,18 @@ class Review(Base):
     order = relationship("Order", uselist=False)
     restaurant = relationship("Restaurant", uselist=False)
     menu_item = relationship("MenuItem", uselist=False)
+
+    # Listings of reviews of an entity are ordered by creation time or rating with ID as a tiebreaker
+    __table_args__ = (
+        # A customer reviews a restaurant or a menu item once, reviews of orders are unique by order_id
+        Index('uq_reviews_customer_id_restaurant_id', customer_id, restaurant_id, unique=True,
+              postgresql_where=restaurant_id.is_not(None), sqlite_where=restaurant_id.is_not(None)),
+        Index('uq_reviews_customer_id_menu_item_id', customer_id, menu_item_id, unique=True,
+              postgresql_where=menu_item_id.is_not(None), sqlite_where=menu_item_id.is_not(None)),
+        # Daily rollups of reviews are computed by ranges of creation time
+        Index('ix_reviews_created_at', created_at),
+        Index('ix_reviews_restaurant_id_created_at_id', restaurant_id, created_at, id),
+        Index('ix_reviews_restaurant_id_rating_created_at_id', restaurant_id, rating, created_at, id),
+        Index('ix_reviews_menu_item_id_created_at_id', menu_item_id, created_at, id),
+        Index('ix_reviews_menu_item_id_rating_created_at_id', menu_item_id, rating, created_at, id),
+    )
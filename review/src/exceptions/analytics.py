@@ -0,0 +1,37 @@
+from datetime import date
+
+from exceptions.base import AppError
+
+__all__ = [
+    'InvalidDateRangeError',
+]
+
+
+class InvalidDateRangeError(AppError):
+    """
+    Exception class for ranges of days, which are reversed or too long.
+    """
+
+    def __init__(self, date_from: date, date_to: date, max_days: int):
+        """
+        Initialize the InvalidDateRangeError exception.
+
+        Args:
+            date_from (date): The first day.
+            date_to (date): The last day.
+            max_days (int): The maximum number of days in a range.
+        """
+
+        self._date_from = date_from
+        self._date_to = date_to
+        self._max_days = max_days
+        super().__init__()
+
+    @property
+    def status_code(self) -> int:
+        return 400
+
+    @property
+    def message(self) -> str:
+        return f"Range of days from {self._date_from} to {self._date_to} must not be reversed " \
+               f"or longer than {self._max_days} days"
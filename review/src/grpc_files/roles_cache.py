@@ -0,0 +1,166 @@
+import time
+from threading import Lock
+from typing import Dict, NamedTuple, Set, Union
+
+import grpc
+import jwt
+from cachetools import TLRUCache
+from loguru import logger
+
+import grpc_files.generated.roles.roles_pb2 as pb2
+from .roles_client import RolesClient
+
+__all__ = ["CachedRolesClient"]
+
+# Statuses which mean that the token itself is rejected, so asking again would give the same answer
+REJECTED_TOKEN_STATUS_CODES = (grpc.StatusCode.UNAUTHENTICATED, grpc.StatusCode.INVALID_ARGUMENT)
+
+
+class _ResolvedToken(NamedTuple):
+    response: pb2.GetUserRoleResponse
+    expires_at: float
+
+
+class _RejectedToken(NamedTuple):
+    code: grpc.StatusCode
+    details: str
+    expires_at: float
+
+
+class CachedRolesClient(object):
+    """
+    Roles client which caches user roles by access token.
+
+    Resolved tokens are kept until the configured TTL or the token's `exp` claim, whichever comes first.
+    Rejected tokens are kept for a short negative TTL and the same gRPC error is raised again.
+    Tokens of a user are invalidated when user-management publishes that the user is updated.
+
+    The cache is shared between the web application's event loop and the Kafka consumer threads.
+    """
+
+    def __init__(self, client: RolesClient, maxsize: int, ttl: float, negative_ttl: float):
+        """
+        Initialize the CachedRolesClient.
+
+        Args:
+            client (RolesClient): The gRPC roles client.
+            maxsize (int): The maximum number of cached tokens.
+            ttl (float): The maximum time in seconds to keep a resolved token.
+            negative_ttl (float): The time in seconds to keep a rejected token.
+        """
+
+        self._client = client
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+
+        self._lock = Lock()
+        self._cache: TLRUCache = TLRUCache(maxsize=maxsize,
+                                           ttu=lambda _key, entry, _now: entry.expires_at,
+                                           timer=time.monotonic)
+        self._user_tokens: Dict[str, Set[str]] = dict()
+        self._generation = 0
+
+    def _get_token_ttl(self, access_token: str) -> float:
+        """
+        Returns time in seconds for which a resolved token can be cached.
+
+        The signature is not verified here, it has already been checked by the User microservice.
+
+        Args:
+            access_token (str): The access token.
+
+        Returns:
+            float: The time to live of a resolved token.
+        """
+
+        try:
+            claims = jwt.decode(access_token, options={"verify_signature": False})
+        except jwt.PyJWTError:
+            return 0
+
+        expires_at = claims.get("exp")
+
+        if expires_at is None:
+            return self._ttl
+
+        return min(self._ttl, expires_at - time.time())
+
+    async def get_user_role(self, access_token: str) -> pb2.GetUserRoleResponse:
+        """
+        Returns user id and role of an access token from the cache or from the User microservice.
+
+        Args:
+            access_token (str): The access token.
+
+        Returns:
+            pb2.GetUserRoleResponse: The response with user id and role.
+
+        Raises:
+            grpc.RpcError: If the token is rejected or the User microservice is unavailable.
+        """
+
+        with self._lock:
+            entry: Union[_ResolvedToken, _RejectedToken, None] = self._cache.get(access_token)
+            generation = self._generation
+
+        if isinstance(entry, _ResolvedToken):
+            return entry.response
+
+        if isinstance(entry, _RejectedToken):
+            raise grpc.aio.AioRpcError(entry.code, grpc.aio.Metadata(), grpc.aio.Metadata(), entry.details)
+
+        try:
+            response = await self._client.get_user_role(access_token)
+        except grpc.RpcError as e:
+            if e.code() in REJECTED_TOKEN_STATUS_CODES:
+                with self._lock:
+                    self._cache[access_token] = _RejectedToken(e.code(), e.details(),
+                                                               time.monotonic() + self._negative_ttl)
+            raise
+
+        ttl = self._get_token_ttl(access_token)
+
+        with self._lock:
+            # Do not store a response which may be outdated by an invalidation during the call
+            if ttl > 0 and generation == self._generation:
+                self._cache[access_token] = _ResolvedToken(response, time.monotonic() + ttl)
+
+                user_tokens = {token for token in self._user_tokens.get(response.user_id, ())
+                               if token in self._cache}
+                user_tokens.add(access_token)
+                self._user_tokens[response.user_id] = user_tokens
+
+        return response
+
+    def invalidate_user(self, user_id: int):
+        """
+        Removes all cached tokens of a user.
+
+        Args:
+            user_id (int): The ID of the user.
+        """
+
+        with self._lock:
+            self._generation += 1
+
+            for token in self._user_tokens.pop(str(user_id), ()):
+                self._cache.pop(token, None)
+
+        logger.info(f"Invalidated cached roles of user with id={user_id}")
+
+    def clear(self):
+        """
+        Removes all cached tokens.
+        """
+
+        with self._lock:
+            self._generation += 1
+            self._cache.clear()
+            self._user_tokens.clear()
+
+    async def close(self):
+        """
+        Closes the underlying gRPC channel.
+        """
+
+        await self._client.close()
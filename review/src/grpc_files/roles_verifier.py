@@ -0,0 +1,197 @@
+import time
+from threading import Lock
+from typing import Dict, Optional
+
+import grpc
+import jwt
+from loguru import logger
+
+import grpc_files.generated.roles.roles_pb2 as pb2
+from .roles_cache import CachedRolesClient
+
+__all__ = ["LocalRolesClient"]
+
+# Roles of users in User microservice and their gRPC counterparts
+CLAIM_ROLES: Dict[str, int] = {
+    "CU": pb2.USER_ROLE_CUSTOMER,
+    "CO": pb2.USER_ROLE_COURIER,
+    "RM": pb2.USER_ROLE_RESTAURANT_MANAGER,
+    "MO": pb2.USER_ROLE_MODERATOR,
+}
+
+
+class LocalRolesClient(object):
+    """
+    Roles client which verifies access tokens locally.
+
+    When User microservice puts role, is_active and is_email_verified claims into access tokens,
+    a token with a valid signature and claims of an active user with verified email is resolved without
+    a gRPC call. The fallback client is asked about every other token and about tokens which may be revoked,
+    i.e. issued before the last update of the user received from Kafka or before this client was created.
+    """
+
+    def __init__(self, fallback: CachedRolesClient, algorithm: str, verifying_key: Optional[str] = None,
+                 jwks_file: Optional[str] = None, leeway: float = 0, max_token_lifetime: float = 86400):
+        """
+        Initialize the LocalRolesClient.
+
+        Args:
+            fallback (CachedRolesClient): The client for tokens which can't be resolved locally.
+            algorithm (str): The signing algorithm of access tokens.
+            verifying_key (Optional[str]): The shared secret or the public key of access tokens.
+            jwks_file (Optional[str]): The path to JWKS file with public keys of access tokens,
+                used instead of the verifying key.
+            leeway (float): The allowed clock skew in seconds between this service and User microservice.
+            max_token_lifetime (float): The lifetime of access tokens in seconds.
+        """
+
+        self._fallback = fallback
+        self._algorithm = algorithm
+        self._verifying_key = verifying_key
+        self._jwks: Optional[jwt.PyJWKSet] = None
+        self._leeway = leeway
+        self._max_token_lifetime = max_token_lifetime
+
+        if jwks_file:
+            with open(jwks_file) as file:
+                self._jwks = jwt.PyJWKSet.from_json(file.read())
+
+        self._lock = Lock()
+        self._trusted_since = time.time()
+        self._user_updated_at: Dict[str, float] = dict()
+
+    def _get_key(self, access_token: str):
+        """
+        Returns the key which verifies the signature of an access token.
+
+        Args:
+            access_token (str): The access token.
+
+        Raises:
+            jwt.InvalidTokenError: If there is no key for the token in JWKS.
+        """
+
+        if self._jwks is None:
+            return self._verifying_key
+
+        key_id = jwt.get_unverified_header(access_token).get("kid")
+
+        if key_id is None and len(self._jwks.keys) == 1:
+            return self._jwks.keys[0].key
+
+        for key in self._jwks.keys:
+            if key.key_id == key_id:
+                return key.key
+
+        raise jwt.InvalidTokenError(f"Unknown key id {key_id}")
+
+    def _is_revoked(self, user_id: str, issued_at: float) -> bool:
+        """
+        Checks if claims of a token could have been changed after the token was issued.
+
+        Args:
+            user_id (str): The ID of the user.
+            issued_at (float): The "iat" claim of the token.
+
+        Returns:
+            bool: True if the token must be checked by the fallback client.
+        """
+
+        with self._lock:
+            updated_at = self._user_updated_at.get(user_id, self._trusted_since)
+
+        return issued_at <= updated_at + self._leeway
+
+    def _verify(self, access_token: str) -> Optional[pb2.GetUserRoleResponse]:
+        """
+        Resolves an access token by its claims.
+
+        Args:
+            access_token (str): The access token.
+
+        Returns:
+            Optional[pb2.GetUserRoleResponse]: The response with user id and role
+            or None if the token can't be resolved locally.
+
+        Raises:
+            grpc.RpcError: If the token is expired.
+        """
+
+        try:
+            claims = jwt.decode(access_token, self._get_key(access_token), algorithms=[self._algorithm],
+                                leeway=self._leeway)
+        except jwt.ExpiredSignatureError:
+            raise grpc.aio.AioRpcError(grpc.StatusCode.INVALID_ARGUMENT, grpc.aio.Metadata(), grpc.aio.Metadata(),
+                                       "Invalid access token")
+        except jwt.PyJWTError:
+            return
+
+        user_id = claims.get("user_id")
+        role = CLAIM_ROLES.get(claims.get("role"))
+
+        # Denials and tokens without claims are left to User microservice
+        if claims.get("token_type") != "access" or user_id is None or role is None \
+                or claims.get("is_active") is not True or claims.get("is_email_verified") is not True:
+            return
+
+        if self._is_revoked(str(user_id), claims.get("iat", 0)):
+            return
+
+        return pb2.GetUserRoleResponse(user_id=str(user_id), role=role)
+
+    async def get_user_role(self, access_token: str) -> pb2.GetUserRoleResponse:
+        """
+        Returns user id and role of an access token from its claims or from the fallback client.
+
+        Args:
+            access_token (str): The access token.
+
+        Returns:
+            pb2.GetUserRoleResponse: The response with user id and role.
+
+        Raises:
+            grpc.RpcError: If the token is rejected or the User microservice is unavailable.
+        """
+
+        response = self._verify(access_token)
+
+        if response is not None:
+            logger.info(f"Verified access token locally for user with id={response.user_id} "
+                        f"and role={response.role}")
+            return response
+
+        return await self._fallback.get_user_role(access_token)
+
+    def invalidate_user(self, user_id: int):
+        """
+        Makes tokens of a user which were issued until now to be checked by the fallback client.
+
+        Args:
+            user_id (int): The ID of the user.
+        """
+
+        now = time.time()
+
+        with self._lock:
+            self._user_updated_at[str(user_id)] = now
+
+            # Tokens issued before these updates are expired
+            expired_before = now - self._max_token_lifetime - self._leeway
+            self._user_updated_at = {key: updated_at for key, updated_at in self._user_updated_at.items()
+                                     if updated_at > expired_before}
+
+        self._fallback.invalidate_user(user_id)
+
+    def clear(self):
+        """
+        Removes all cached tokens of the fallback client.
+        """
+
+        self._fallback.clear()
+
+    async def close(self):
+        """
+        Closes the fallback client.
+        """
+
+        await self._fallback.close()
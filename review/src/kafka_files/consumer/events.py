@@ -1,11 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar
+from typing import Generic, List, TypeVar
 
 from models.courier import CourierModel, CourierCreateModel
-from models.customer import CustomerCreateModel, CustomerUpdateModel
+from models.customer import CustomerCreateModel
 from models.menu_item import MenuItemCreateModel, MenuItemModel
 from models.order import OrderCreateModel
-from models.restaurant import RestaurantCreateModel, RestaurantUpdateModel
+from models.restaurant import RestaurantCreateModel
+from setup.grpc import grpc_roles_client
 from uow.generic import GenericUnitOfWork
 from uow.utils import uow_transaction_with_commit
 
@@ -17,17 +18,26 @@ class ConsumerEvent(Generic[CreateModel], ABC):
     Base class for all consumer events.
 
     Consumer events are used for simplifying receiving messages from Kafka and processing them.
+
+    Attributes:
+        supports_batch (bool): Whether the receiver applies consecutive events of this class
+        from a partition together with `action_batch`.
     """
 
-    def __init__(self, data: dict):
+    supports_batch: bool = False
+
+    def __init__(self, data: dict, version: int = -1):
         """
         Constructor for the inherited classes from ConsumerEvent class.
 
         Args:
             data (dict): The received data.
+            version (int): The offset of the received message, used as the version of replicated records.
+                Default is -1.
         """
 
         self._data = data
+        self._version = version
 
     @abstractmethod
     def _serialize_data(self) -> CreateModel:
@@ -51,6 +61,35 @@ class ConsumerEvent(Generic[CreateModel], ABC):
 
         raise NotImplementedError
 
+    @classmethod
+    async def action_batch(cls, events: List["ConsumerEvent"], uow: GenericUnitOfWork):
+        """
+        Action to be executed on consecutive events of a partition, in the order they were received.
+
+        Events which support batches override it to apply all events in a single transaction.
+        By default events are applied one by one.
+
+        Args:
+            events (List[ConsumerEvent]): The events.
+            uow (GenericUnitOfWork): The unit of work instance.
+        """
+
+        for event in events:
+            await event.action(uow)
+
+    async def invalidate(self, uow: GenericUnitOfWork):
+        """
+        Invalidates in-memory state of the process which the event makes stale.
+
+        An event is applied to the database by a single consumer of its group, while every process receives it
+        with a broadcast receiver and calls this method. By default nothing is invalidated.
+
+        Args:
+            uow (GenericUnitOfWork): The unit of work instance to read the state from.
+        """
+
+        pass
+
     @classmethod
     def get_event_name(cls) -> str:
         """
@@ -68,12 +107,19 @@ class CourierCreatedEvent(ConsumerEvent[CourierCreateModel]):
     Event when Courier is created.
     """
 
+    supports_batch = True
+
     def _serialize_data(self) -> CourierCreateModel:
         return CourierCreateModel(**self._data)
 
     async def action(self, uow: GenericUnitOfWork):
         async with uow_transaction_with_commit(uow) as uow:
-            await uow.couriers.create(self._serialize_data())
+            await uow.couriers.upsert(self._serialize_data(), self._version)
+
+    @classmethod
+    async def action_batch(cls, events: List["CourierCreatedEvent"], uow: GenericUnitOfWork):
+        async with uow_transaction_with_commit(uow) as uow:
+            await uow.couriers.upsert_many([(event._serialize_data(), event._version) for event in events])
 
 
 class CustomerCreatedEvent(ConsumerEvent[CustomerCreateModel]):
@@ -81,26 +127,29 @@ class CustomerCreatedEvent(ConsumerEvent[CustomerCreateModel]):
     Event when Customer is created.
     """
 
+    supports_batch = True
+
     def _serialize_data(self) -> CustomerCreateModel:
         return CustomerCreateModel(**self._data)
 
     async def action(self, uow: GenericUnitOfWork):
         async with uow_transaction_with_commit(uow) as uow:
-            await uow.customers.create(self._serialize_data())
+            await uow.customers.upsert(self._serialize_data(), self._version)
+
+    @classmethod
+    async def action_batch(cls, events: List["CustomerCreatedEvent"], uow: GenericUnitOfWork):
+        async with uow_transaction_with_commit(uow) as uow:
+            await uow.customers.upsert_many([(event._serialize_data(), event._version) for event in events])
 
 
-class CustomerUpdatedEvent(ConsumerEvent[CustomerUpdateModel]):
+class CustomerUpdatedEvent(CustomerCreatedEvent):
     """
     Event when Customer is updated.
+
+    The event contains the whole replicated customer, so it is upserted like a created one.
     """
 
-    def _serialize_data(self) -> CustomerUpdateModel:
-        return CustomerUpdateModel(**self._data)
-
-    async def action(self, uow: GenericUnitOfWork):
-        customer_id = self._data.pop("id")
-        async with uow_transaction_with_commit(uow) as uow:
-            await uow.customers.update(customer_id, self._serialize_data())
+    pass
 
 
 class MenuItemCreatedEvent(ConsumerEvent[MenuItemCreateModel]):
@@ -108,12 +157,19 @@ class MenuItemCreatedEvent(ConsumerEvent[MenuItemCreateModel]):
     Event when MenuItem is created.
     """
 
+    supports_batch = True
+
     def _serialize_data(self) -> MenuItemCreateModel:
         return MenuItemCreateModel(**self._data)
 
     async def action(self, uow: GenericUnitOfWork):
         async with uow_transaction_with_commit(uow) as uow:
-            await uow.menu_items.create(self._serialize_data())
+            await uow.menu_items.upsert(self._serialize_data(), self._version)
+
+    @classmethod
+    async def action_batch(cls, events: List["MenuItemCreatedEvent"], uow: GenericUnitOfWork):
+        async with uow_transaction_with_commit(uow) as uow:
+            await uow.menu_items.upsert_many([(event._serialize_data(), event._version) for event in events])
 
 
 class MenuItemDeletedEvent(ConsumerEvent[MenuItemModel]):
@@ -135,6 +191,8 @@ class OrderFinishedEvent(ConsumerEvent[OrderCreateModel]):
     Event when Order is created.
     """
 
+    supports_batch = True
+
     def _serialize_data(self) -> OrderCreateModel:
         return OrderCreateModel(
             id=int(self._data["id"]),
@@ -144,7 +202,12 @@ class OrderFinishedEvent(ConsumerEvent[OrderCreateModel]):
 
     async def action(self, uow: GenericUnitOfWork):
         async with uow_transaction_with_commit(uow) as uow:
-            await uow.orders.create(self._serialize_data())
+            await uow.orders.upsert(self._serialize_data(), self._version)
+
+    @classmethod
+    async def action_batch(cls, events: List["OrderFinishedEvent"], uow: GenericUnitOfWork):
+        async with uow_transaction_with_commit(uow) as uow:
+            await uow.orders.upsert_many([(event._serialize_data(), event._version) for event in events])
 
 
 class RestaurantCreatedEvent(ConsumerEvent[RestaurantCreateModel]):
@@ -152,24 +215,41 @@ class RestaurantCreatedEvent(ConsumerEvent[RestaurantCreateModel]):
     Event when Restaurant is created.
     """
 
+    supports_batch = True
+
     def _serialize_data(self) -> RestaurantCreateModel:
         return RestaurantCreateModel(**self._data)
 
     async def action(self, uow: GenericUnitOfWork):
         async with uow_transaction_with_commit(uow) as uow:
-            await uow.restaurants.create(self._serialize_data())
+            await uow.restaurants.upsert(self._serialize_data(), self._version)
+
+    @classmethod
+    async def action_batch(cls, events: List["RestaurantCreatedEvent"], uow: GenericUnitOfWork):
+        async with uow_transaction_with_commit(uow) as uow:
+            await uow.restaurants.upsert_many([(event._serialize_data(), event._version) for event in events])
 
 
-class RestaurantUpdatedEvent(ConsumerEvent[RestaurantUpdateModel]):
+class RestaurantUpdatedEvent(RestaurantCreatedEvent):
     """
-    Event when Restaurant is created.
+    Event when Restaurant is updated.
+
+    The event contains the whole replicated restaurant, so it is upserted like a created one.
     """
 
-    def _serialize_data(self) -> RestaurantUpdateModel:
-        return RestaurantUpdateModel(**self._data)
+    pass
+
+
+class UserUpdatedEvent(ConsumerEvent[int]):
+    """
+    Event when User is updated.
+    """
+
+    def _serialize_data(self) -> int:
+        return int(self._data["id"])
 
     async def action(self, uow: GenericUnitOfWork):
-        restaurant_id = self._data.pop("id")
+        grpc_roles_client.invalidate_user(self._serialize_data())
 
-        async with uow_transaction_with_commit(uow) as uow:
-            await uow.restaurants.update(restaurant_id, self._serialize_data())
+    async def invalidate(self, uow: GenericUnitOfWork):
+        grpc_roles_client.invalidate_user(self._serialize_data())
@@ -0,0 +1,298 @@
+import asyncio
+import time
+from typing import Dict, Iterable, List
+
+import grpc
+from kafka.consumer.fetcher import ConsumerRecord
+from kafka.errors import KafkaError
+from kafka.structs import TopicPartition
+from loguru import logger
+from sqlalchemy.exc import InterfaceError, OperationalError, TimeoutError as PoolTimeoutError
+
+from kafka_files.producer.publisher import EVENT_NAME_HEADER, AbstractPublisher
+from .utils import get_event_name
+
+__all__ = [
+    "RetryPolicy",
+    "is_retryable_error",
+    "LEGACY_VERSION",
+    "get_message_version",
+    "get_retry_topic",
+    "get_dead_letter_topic",
+    "redrive_dead_letters",
+]
+
+# Headers of rerouted messages, the event name header is kept
+RETRY_ATTEMPT_HEADER = 'retry_attempt'
+RETRY_AT_HEADER = 'retry_at'
+ORIGINAL_TOPIC_HEADER = 'original_topic'
+ORIGINAL_PARTITION_HEADER = 'original_partition'
+ORIGINAL_OFFSET_HEADER = 'original_offset'
+ERROR_TYPE_HEADER = 'error_type'
+ERROR_MESSAGE_HEADER = 'error_message'
+
+# Version of replicas written by messages published before events were keyed by their entities
+LEGACY_VERSION = -1
+
+# Errors caused by unavailable or overloaded dependencies, which may succeed later
+RETRYABLE_ERRORS = (
+    OperationalError,
+    InterfaceError,
+    PoolTimeoutError,
+    ConnectionError,
+    TimeoutError,
+    asyncio.TimeoutError,
+    KafkaError,
+    grpc.RpcError,
+)
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """
+    Checks whether processing of a message, which failed with the error, may succeed later.
+
+    Application errors, invalid data and bugs fail the same way every time, so they are not retryable.
+
+    Args:
+        error (Exception): The error.
+
+    Returns:
+        bool: True if the error is retryable, False otherwise.
+    """
+
+    return isinstance(error, RETRYABLE_ERRORS)
+
+
+def _get_headers(message: ConsumerRecord, errors: str = 'strict') -> Dict[str, str]:
+    return {header: value.decode('utf-8', errors) for header, value in message.headers or ()}
+
+
+def get_message_version(message: ConsumerRecord) -> int:
+    """
+    Returns the version of replicas written by a message, i.e. the offset of the message in its original topic.
+
+    Messages published before events were keyed by their entities have the event name as their key, rerouted ones
+    keep it, so events of an entity are spread over partitions and their offsets can't be compared. They are
+    versioned with `LEGACY_VERSION`, their replicas are overwritten by any message and they never overwrite
+    replicas written by keyed messages.
+
+    Args:
+        message (ConsumerRecord): The decoded message, original or rerouted.
+
+    Returns:
+        int: The version.
+    """
+
+    if message.key == get_event_name(message):
+        return LEGACY_VERSION
+
+    offset = _get_headers(message).get(ORIGINAL_OFFSET_HEADER)
+
+    return int(offset) if offset is not None else message.offset
+
+
+def get_retry_topic(topic: str, attempt: int) -> str:
+    """
+    Returns the delay topic of a retry attempt of a topic's messages.
+
+    Every attempt has its own topic, so all messages of a delay topic wait for the same time.
+
+    Args:
+        topic (str): The original topic.
+        attempt (int): The retry attempt, starting from 1.
+
+    Returns:
+        str: The delay topic.
+    """
+
+    return f"{topic}.retry.{attempt}"
+
+
+def get_dead_letter_topic(topic: str) -> str:
+    """
+    Returns the dead letter topic of a topic's messages.
+
+    Args:
+        topic (str): The original topic.
+
+    Returns:
+        str: The dead letter topic.
+    """
+
+    return f"{topic}.dlq"
+
+
+class RetryPolicy:
+    """
+    Class for rerouting messages whose processing has failed.
+
+    Messages failed with retryable errors are published to delay topics with exponential backoff:
+    the n-th retry waits `backoff_ms * 2 ** (n - 1)` milliseconds. Messages failed with other errors
+    or too many times are published to the dead letter topic with the error.
+
+    Rerouted messages keep their key, value and event name, and carry the original topic, partition and offset,
+    so replicas are versioned by the original offset wherever the message is processed.
+    """
+
+    def __init__(self, publisher: AbstractPublisher, max_attempts: int = 4, backoff_ms: int = 5000,
+                 delivery_timeout: float = 10):
+        """
+        Constructor for the RetryPolicy class.
+
+        Args:
+            publisher (AbstractPublisher): The publisher of rerouted messages.
+            max_attempts (int): The maximum number of retries before a message is dead lettered.
+            backoff_ms (int): The delay of the first retry in milliseconds.
+            delivery_timeout (float): The maximum time in seconds to wait for acknowledgement of a message.
+        """
+
+        self._publisher = publisher
+        self._max_attempts = max_attempts
+        self._backoff_ms = backoff_ms
+        self._delivery_timeout = delivery_timeout
+
+    def get_retry_topics(self, topics: Iterable[str]) -> List[str]:
+        """
+        Returns the delay topics of topics, which must be consumed along with them.
+
+        Args:
+            topics (Iterable[str]): The original topics.
+
+        Returns:
+            List[str]: The delay topics.
+        """
+
+        return [get_retry_topic(topic, attempt) for topic in topics for attempt in range(1, self._max_attempts + 1)]
+
+    @staticmethod
+    def get_delay(message: ConsumerRecord) -> float:
+        """
+        Returns the time in seconds left until a message may be processed.
+
+        Args:
+            message (ConsumerRecord): The message.
+
+        Returns:
+            float: The time, zero or negative if the message may be processed now.
+        """
+
+        retry_at = _get_headers(message).get(RETRY_AT_HEADER)
+
+        return int(retry_at) / 1000 - time.time() if retry_at is not None else 0
+
+    def reroute(self, message: ConsumerRecord, error: Exception):
+        """
+        Publishes a failed message to the next delay topic or to the dead letter topic.
+
+        Args:
+            message (ConsumerRecord): The failed message.
+            error (Exception): The error of the processing.
+
+        Raises:
+            KafkaError: If the message is not delivered.
+        """
+
+        headers = _get_headers(message)
+        original_topic = headers.get(ORIGINAL_TOPIC_HEADER, message.topic)
+        attempt = int(headers.get(RETRY_ATTEMPT_HEADER, 0)) + 1
+
+        rerouted_headers = {
+            EVENT_NAME_HEADER: get_event_name(message),
+            ORIGINAL_TOPIC_HEADER: original_topic,
+            ORIGINAL_PARTITION_HEADER: headers.get(ORIGINAL_PARTITION_HEADER, str(message.partition)),
+            ORIGINAL_OFFSET_HEADER: headers.get(ORIGINAL_OFFSET_HEADER, str(message.offset)),
+            ERROR_TYPE_HEADER: type(error).__name__,
+            ERROR_MESSAGE_HEADER: str(error)[:1000],
+        }
+
+        if is_retryable_error(error) and attempt <= self._max_attempts:
+            topic = get_retry_topic(original_topic, attempt)
+            rerouted_headers[RETRY_ATTEMPT_HEADER] = str(attempt)
+            rerouted_headers[RETRY_AT_HEADER] = str(int(time.time() * 1000) + self._backoff_ms * 2 ** (attempt - 1))
+        else:
+            topic = get_dead_letter_topic(original_topic)
+            rerouted_headers[RETRY_ATTEMPT_HEADER] = str(attempt - 1)
+
+        self._publisher.deliver_records([(topic, message.key, message.value,
+                                          [(header, value.encode('utf-8'))
+                                           for header, value in rerouted_headers.items()])],
+                                        self._delivery_timeout)
+
+        logger.warning(f'Rerouted message {rerouted_headers[EVENT_NAME_HEADER]}, {message.key} '
+                       f'from {message.topic} to {topic}: {type(error).__name__}: {error}')
+
+    def dead_letter(self, message: ConsumerRecord, error: Exception):
+        """
+        Publishes a message, which can't be decoded, to the dead letter topic as it was fetched.
+
+        The raw key, value and headers are kept and nothing of them is decoded strictly, so the message can be
+        inspected and re-driven after the producer or the consumer is fixed.
+
+        Args:
+            message (ConsumerRecord): The fetched message with the raw key and value.
+            error (Exception): The error of the decoding.
+
+        Raises:
+            KafkaError: If the message is not delivered.
+        """
+
+        headers = _get_headers(message, errors='replace')
+        original_topic = headers.get(ORIGINAL_TOPIC_HEADER, message.topic)
+
+        added_headers = {
+            ORIGINAL_TOPIC_HEADER: original_topic,
+            ORIGINAL_PARTITION_HEADER: headers.get(ORIGINAL_PARTITION_HEADER, str(message.partition)),
+            ORIGINAL_OFFSET_HEADER: headers.get(ORIGINAL_OFFSET_HEADER, str(message.offset)),
+            ERROR_TYPE_HEADER: type(error).__name__,
+            ERROR_MESSAGE_HEADER: str(error)[:1000],
+        }
+
+        dead_letter_headers = [(header, value) for header, value in message.headers or ()
+                               if header not in added_headers]
+        dead_letter_headers.extend((header, value.encode('utf-8')) for header, value in added_headers.items())
+        topic = get_dead_letter_topic(original_topic)
+
+        self._publisher.deliver_records([(topic, message.key, message.value, dead_letter_headers)],
+                                        self._delivery_timeout)
+
+        logger.warning(f'Dead lettered undecodable message from {message.topic}:{message.partition}:'
+                       f'{message.offset} to {topic}: {type(error).__name__}: {error}')
+
+
+def redrive_dead_letters(messages: Iterable[ConsumerRecord], publisher: AbstractPublisher,
+                         delivery_timeout: float = 10) -> Dict[TopicPartition, int]:
+    """
+    Publishes dead lettered messages back to their original topics.
+
+    Messages are republished as they were fetched, with their raw keys, values and headers except the ones
+    of the retries and the error. Re-driven messages are processed from scratch, but keep their original
+    offsets as versions of replicas.
+
+    Args:
+        messages (Iterable[ConsumerRecord]): The messages of a dead letter topic with raw keys and values.
+        publisher (AbstractPublisher): The publisher.
+        delivery_timeout (float): The maximum time in seconds to wait for acknowledgement of the messages.
+
+    Returns:
+        Dict[TopicPartition, int]: The offsets following the re-driven messages by partitions of the dead letter topic.
+
+    Raises:
+        KafkaError: If any message is not delivered.
+    """
+
+    records = list()
+    offsets: Dict[TopicPartition, int] = dict()
+    dropped_headers = {RETRY_ATTEMPT_HEADER, RETRY_AT_HEADER, ERROR_TYPE_HEADER, ERROR_MESSAGE_HEADER}
+
+    for message in messages:
+        headers = _get_headers(message, errors='replace')
+        redriven_headers = [(header, value) for header, value in message.headers or ()
+                            if header not in dropped_headers]
+
+        records.append((headers[ORIGINAL_TOPIC_HEADER], message.key, message.value, redriven_headers))
+        offsets[TopicPartition(message.topic, message.partition)] = message.offset + 1
+
+    if records:
+        publisher.deliver_records(records, delivery_timeout)
+
+    return offsets
@@ -0,0 +1,251 @@
+import asyncio
+import json
+from typing import Callable, Dict, IO, Iterable, Iterator, List, Optional, Type
+
+from kafka import KafkaConsumer
+from kafka.consumer.fetcher import ConsumerRecord
+from kafka.structs import OffsetAndMetadata, TopicPartition
+from loguru import logger
+
+from uow.generic import GenericUnitOfWork
+from .events import ConsumerEvent
+from .retry import RetryPolicy, get_message_version
+from kafka_files.codecs import JsonCodec
+from kafka_files.producer.publisher import EVENT_NAME_HEADER
+from .utils import UnknownEventError, decode_message, get_event_name, get_consumer_event_by_name
+
+__all__ = [
+    "SnapshotLoader",
+    "read_topic_snapshot",
+    "read_jsonl_snapshot",
+    "write_jsonl_snapshot",
+    "commit_snapshot_offsets",
+]
+
+
+class SnapshotLoader:
+    """
+    Class for loading replicas from a snapshot of a topic instead of replaying its events one by one.
+
+    A snapshot is a compacted topic or its JSONL export, which keeps the last message of every aggregate.
+    Messages are grouped by their events and applied by `action_batch` in chunks, so supported events
+    are written by bulk upserts. Replicas are versioned by offsets, so the order of different events doesn't matter.
+    """
+
+    def __init__(self, consumer_events: List[Type[ConsumerEvent]], get_uow: Callable[[], GenericUnitOfWork],
+                 batch_size: int = 1000, retry_policy: Optional[RetryPolicy] = None):
+        """
+        Constructor for the SnapshotLoader class.
+
+        Args:
+            consumer_events (List[Type[ConsumerEvent]]): The list of consumer events.
+            get_uow (Callable[[], GenericUnitOfWork]): The function to get the UOW.
+            batch_size (int): The maximum number of messages applied in a transaction.
+            retry_policy (Optional[RetryPolicy]): The policy dead lettering undecodable messages, if None they
+                are skipped.
+        """
+
+        self._consumer_events = consumer_events
+        self._get_uow = get_uow
+        self._batch_size = batch_size
+        self._retry_policy = retry_policy
+
+    async def _apply(self, event_class: Type[ConsumerEvent], messages: List[ConsumerRecord]):
+        """
+        Applies messages of an event in a transaction.
+
+        Args:
+            event_class (Type[ConsumerEvent]): The event class of the messages.
+            messages (List[ConsumerRecord]): The messages.
+        """
+
+        events = [event_class(message.value, get_message_version(message)) for message in messages]
+        await event_class.action_batch(events, self._get_uow())
+
+        logger.info(f"Loaded {len(events)} events {event_class.get_event_name()}")
+
+    async def _dead_letter(self, message: ConsumerRecord, error: Exception):
+        """
+        Dead letters a message which can't be decoded or whose event is unknown.
+
+        Without a retry policy the message is skipped.
+
+        Args:
+            message (ConsumerRecord): The message with the raw key and value.
+            error (Exception): The error of the decoding.
+        """
+
+        logger.critical(f'Failed to decode message {message.topic}:{message.partition}:{message.offset}: {error}')
+
+        if self._retry_policy:
+            await asyncio.to_thread(self._retry_policy.dead_letter, message, error)
+
+    async def load(self, messages: Iterable[ConsumerRecord]) -> Dict[TopicPartition, int]:
+        """
+        Applies messages of a snapshot.
+
+        Messages which can't be decoded or whose events are unknown are dead lettered, as receivers do,
+        since the returned offsets include them.
+
+        Args:
+            messages (Iterable[ConsumerRecord]): The messages of the snapshot with raw keys and values.
+
+        Returns:
+            Dict[TopicPartition, int]: The offsets following the snapshot by partitions.
+
+        Raises:
+            KafkaError: If a message is not dead lettered.
+        """
+
+        batches: Dict[Type[ConsumerEvent], List[ConsumerRecord]] = dict()
+        offsets: Dict[TopicPartition, int] = dict()
+
+        for message in messages:
+            partition = TopicPartition(message.topic, message.partition)
+            offsets[partition] = max(offsets.get(partition, 0), message.offset + 1)
+
+            try:
+                decoded_message = decode_message(message)
+                event_name = get_event_name(decoded_message)
+                event_class = get_consumer_event_by_name(event_name, self._consumer_events)
+
+                if event_class is None:
+                    raise UnknownEventError(event_name)
+            except ValueError as e:
+                await self._dead_letter(message, e)
+                continue
+
+            batch = batches.setdefault(event_class, list())
+            batch.append(decoded_message)
+
+            if len(batch) >= self._batch_size:
+                await self._apply(event_class, batch)
+                batches[event_class] = list()
+
+        for event_class, batch in batches.items():
+            if batch:
+                await self._apply(event_class, batch)
+
+        return offsets
+
+
+def read_topic_snapshot(consumer: KafkaConsumer, topic: str, poll_timeout_ms: int = 1000,
+                        max_poll_records: int = 5000, from_beginning: bool = True) -> Iterator[ConsumerRecord]:
+    """
+    Reads messages of all partitions of a topic, which exist when the reading starts.
+
+    Args:
+        consumer (KafkaConsumer): The KafkaConsumer instance, which isn't used for anything else.
+        topic (str): The topic.
+        poll_timeout_ms (int): The time in milliseconds to wait for messages if there are none.
+        max_poll_records (int): The maximum number of messages fetched at once.
+        from_beginning (bool): Whether to read from the beginning or from the committed offsets of the consumer's
+            group. Partitions without committed offsets are always read from the beginning.
+
+    Yields:
+        ConsumerRecord: The messages with raw keys and values.
+    """
+
+    consumer.unsubscribe()
+
+    partitions = [TopicPartition(topic, partition) for partition in consumer.partitions_for_topic(topic)]
+    consumer.assign(partitions)
+
+    uncommitted = partitions if from_beginning else [partition for partition in partitions
+                                                     if consumer.committed(partition) is None]
+
+    if uncommitted:
+        consumer.seek_to_beginning(*uncommitted)
+
+    end_offsets = consumer.end_offsets(partitions)
+    remaining = {partition for partition in partitions if consumer.position(partition) < end_offsets[partition]}
+
+    while remaining:
+        records = consumer.poll(timeout_ms=poll_timeout_ms, max_records=max_poll_records)
+
+        for partition, messages in records.items():
+            for message in messages:
+                if message.offset < end_offsets[partition]:
+                    yield message
+
+            if partition in remaining and consumer.position(partition) >= end_offsets[partition]:
+                remaining.discard(partition)
+                consumer.pause(partition)
+
+
+def read_jsonl_snapshot(file: IO[str]) -> Iterator[ConsumerRecord]:
+    """
+    Reads messages of a snapshot exported by `write_jsonl_snapshot`.
+
+    Args:
+        file (IO[str]): The JSONL file.
+
+    Yields:
+        ConsumerRecord: The messages with raw keys and values, like the ones fetched from the topic.
+    """
+
+    codec = JsonCodec()
+
+    for line in file:
+        if not line.strip():
+            continue
+
+        data = json.loads(line)
+
+        yield ConsumerRecord(topic=data['topic'], partition=data['partition'], offset=data['offset'],
+                             timestamp=-1, timestamp_type=0,
+                             key=data['key'].encode('ascii') if data['key'] is not None else None,
+                             value=codec.encode(data['value']) if data['value'] is not None else None,
+                             headers=[(EVENT_NAME_HEADER, data['event_name'].encode('ascii'))], checksum=None,
+                             serialized_key_size=-1, serialized_value_size=-1, serialized_header_size=-1)
+
+
+def write_jsonl_snapshot(messages: Iterable[ConsumerRecord], file: IO[str]) -> int:
+    """
+    Exports messages of a snapshot as JSON lines.
+
+    Args:
+        messages (Iterable[ConsumerRecord]): The messages with raw keys and values.
+        file (IO[str]): The JSONL file.
+
+    Returns:
+        int: The number of exported messages.
+
+    Raises:
+        ValueError: If a message can't be decoded.
+    """
+
+    count = 0
+
+    for message in messages:
+        message = decode_message(message)
+        file.write(json.dumps({
+            'topic': message.topic,
+            'partition': message.partition,
+            'offset': message.offset,
+            'key': message.key,
+            'event_name': get_event_name(message),
+            'value': message.value,
+        }) + '\n')
+        count += 1
+
+    return count
+
+
+def commit_snapshot_offsets(consumer: KafkaConsumer, offsets: Dict[TopicPartition, int]):
+    """
+    Commits the offsets following a snapshot for the consumer group, so its receivers continue from them.
+
+    It must be called while no receiver of the group is running, because the partitions are assigned manually.
+
+    Args:
+        consumer (KafkaConsumer): The KafkaConsumer instance of the group, which isn't used for anything else.
+        offsets (Dict[TopicPartition, int]): The offsets by partitions.
+    """
+
+    if offsets:
+        consumer.unsubscribe()
+        consumer.assign(list(offsets))
+        consumer.commit({partition: OffsetAndMetadata(offset, '') for partition, offset in offsets.items()})
+
+    logger.info(f"Committed snapshot offsets: {', '.join(f'{p}={o}' for p, o in offsets.items())}")
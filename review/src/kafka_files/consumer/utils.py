@@ -1,12 +1,69 @@
 from typing import Iterable, Optional, Type
 
+from kafka.consumer.fetcher import ConsumerRecord
+
+from kafka_files.codecs import decode_value
 from kafka_files.consumer.events import ConsumerEvent
+from kafka_files.producer.publisher import EVENT_NAME_HEADER
 
 __all__ = [
+    'UnknownEventError',
+    'decode_message',
+    'get_event_name',
     'get_consumer_event_by_name'
 ]
 
 
+class UnknownEventError(ValueError):
+    """
+    Exception class for messages of events which have no consumer event class.
+    """
+
+    def __init__(self, event_name: Optional[str]):
+        super().__init__(f"Could not find event class for event: {event_name}")
+
+
+def decode_message(message: ConsumerRecord) -> ConsumerRecord:
+    """
+    Decodes the key and the value of a message fetched as raw bytes.
+
+    Consumers don't deserialize messages themselves, because KafkaConsumer deserializes them while polling,
+    where a single malformed message would stop the consumption of all partitions.
+
+    Args:
+        message (ConsumerRecord): The fetched message.
+
+    Returns:
+        ConsumerRecord: The message with the decoded key and value.
+
+    Raises:
+        ValueError: If the key or the value can't be decoded.
+    """
+
+    return message._replace(key=message.key.decode('ascii') if message.key is not None else None,
+                            value=decode_value(message.value))
+
+
+def get_event_name(message: ConsumerRecord) -> Optional[str]:
+    """
+    Returns the name of the event from the message's header.
+
+    Messages published before the name was moved to the header have the name as their key.
+
+    Args:
+        message (ConsumerRecord): The message.
+
+    Returns:
+        Optional[str]: The name of the event or None if the message has neither the header nor a key.
+    """
+
+    for header, value in message.headers or ():
+        if header == EVENT_NAME_HEADER:
+            return value.decode('ascii')
+
+    return message.key
+
+
 def get_consumer_event_by_name(event_name: str,
                                consumer_events: Iterable[Type[ConsumerEvent]]) -> Optional[Type[ConsumerEvent]]:
     """
@@ -0,0 +1,170 @@
+from threading import Event, Lock, Thread
+from typing import Dict, Iterable, List, Optional, Tuple, Type
+
+from loguru import logger
+
+from .events import ProducerEvent
+from .metrics import CoalescingMetrics
+from .publisher import AbstractPublisher
+
+__all__ = [
+    'CoalescingPublisher',
+]
+
+
+class CoalescingPublisher(AbstractPublisher):
+    """
+    Publisher, which coalesces events carrying the whole state of an entity.
+
+    Only the latest pending event of every entity is kept and the pending events are handed over to the wrapped
+    publisher once per window, so an entity gets at most one event per window and intermediate states, which
+    are overwritten by the next event anyway, are not published. The latest event of an entity is always published:
+    by the next flush, by `flush` or by `close`. Other events are published immediately.
+
+    Versioned events of an entity may be published out of order by concurrent requests, so a pending event is only
+    replaced by an event with the same or a newer version. Consumers drop events older than the state they have,
+    because processes publish their windows independently.
+    """
+
+    def __init__(self, publisher: AbstractPublisher, coalesced_events: Iterable[Type[ProducerEvent]],
+                 window_seconds: float = 1.0):
+        """
+        Initializes a new instance of the CoalescingPublisher class.
+
+        Args:
+            publisher (AbstractPublisher): The wrapped publisher.
+            coalesced_events (Iterable[Type[ProducerEvent]]): The classes of events, which are coalesced.
+                Their data must be the whole state of the entity.
+            window_seconds (float): The time between flushes of pending events, 0 to publish them immediately.
+        """
+
+        super().__init__()
+        self.metrics = publisher.metrics
+        self.coalescing_metrics = CoalescingMetrics()
+        self._publisher = publisher
+        self._coalesced_events = frozenset(coalesced_events)
+        self._window_seconds = window_seconds
+        self._pending: Dict[Tuple[str, Optional[str]], ProducerEvent] = dict()
+        self._pending_lock = Lock()
+        # Flushes are serialized, so an older event of an entity is never published after a newer one
+        self._flush_lock = Lock()
+        self._closed = Event()
+        self._flusher_thread = None
+
+        if window_seconds > 0:
+            self._flusher_thread = Thread(target=self._flush_periodically)
+            self._flusher_thread.daemon = True
+            self._flusher_thread.start()
+
+    def publish(self, event: ProducerEvent):
+        """
+        Publishes event, coalesced events are published by the next flush.
+
+        Args:
+            event (ProducerEvent): The event to publish.
+        """
+
+        if type(event) not in self._coalesced_events:
+            self._publisher.publish(event)
+            return
+
+        key = (event.get_event_name(), event.get_aggregate_id())
+
+        with self._pending_lock:
+            pending = self._pending.get(key)
+            superseded = pending is not None
+
+            if not superseded or not self._is_older(event, pending):
+                self._pending[key] = event
+
+        self.coalescing_metrics.record_received(superseded)
+
+        if not self._flusher_thread or self._closed.is_set():
+            self._flush_pending()
+
+    @staticmethod
+    def _is_older(event: ProducerEvent, pending: ProducerEvent) -> bool:
+        """
+        Checks whether an event carries an older state of its entity than the pending one.
+
+        Args:
+            event (ProducerEvent): The published event.
+            pending (ProducerEvent): The pending event of the same entity.
+
+        Returns:
+            bool: True if both events are versioned and the published one is older.
+        """
+
+        version, pending_version = event.get_version(), pending.get_version()
+
+        return version is not None and pending_version is not None and version < pending_version
+
+    def _flush_periodically(self):
+        """
+        Flushes pending events once per window until the publisher is closed.
+        """
+
+        while not self._closed.wait(self._window_seconds):
+            try:
+                self._flush_pending()
+            except Exception as e:
+                logger.error(f"Failed to flush coalesced events: {e}")
+
+    def _flush_pending(self):
+        """
+        Hands pending events over to the wrapped publisher.
+
+        Events, which the wrapped publisher doesn't accept, are pending again, unless newer events of their entities
+        have been published meanwhile.
+        """
+
+        with self._flush_lock:
+            with self._pending_lock:
+                events: List[ProducerEvent] = list(self._pending.values())
+                self._pending = dict()
+
+            if not events:
+                return
+
+            for index, event in enumerate(events):
+                try:
+                    self._publisher.publish(event)
+                except Exception:
+                    with self._pending_lock:
+                        for unpublished in events[index:]:
+                            self._pending.setdefault((unpublished.get_event_name(), unpublished.get_aggregate_id()),
+                                                     unpublished)
+                    raise
+
+            self.coalescing_metrics.record_flush(len(events))
+
+    def deliver_records(self, records: Iterable[Tuple[str, Optional[str], dict, List[Tuple[str, bytes]]]],
+                        timeout: Optional[float] = None):
+        self._publisher.deliver_records(records, timeout)
+
+    def flush(self, timeout: Optional[float] = None):
+        """
+        Publishes pending events and waits until all published events are delivered.
+
+        Args:
+            timeout (Optional[float]): The maximum time to wait in seconds.
+        """
+
+        self._flush_pending()
+        self._publisher.flush(timeout)
+
+    def close(self, timeout: Optional[float] = None):
+        """
+        Stops the flusher thread, publishes pending events and closes the wrapped publisher.
+
+        Args:
+            timeout (Optional[float]): The maximum time to wait in seconds.
+        """
+
+        self._closed.set()
+
+        if self._flusher_thread:
+            self._flusher_thread.join()
+
+        self._flush_pending()
+        self._publisher.close(timeout)
@@ -1,9 +1,11 @@
-import json
+import copy
 from abc import ABC, abstractmethod
-from typing import Union, List
+from typing import Dict, Union, List, Optional
 
 from kafka import KafkaProducer
 
+from kafka_files.codecs import TopicCodecSerializer
+
 __all__ = [
     'KafkaProducerBaseCreator',
     'KafkaProducerSASLPlaintextCreator',
@@ -16,19 +18,46 @@ class KafkaProducerBaseCreator(ABC):
     Base class for creating KafkaProducer.
     """
 
-    def __init__(self, bootstrap_servers: Union[str, List[str]], security_protocol: str):
+    def __init__(self, bootstrap_servers: Union[str, List[str]], security_protocol: str,
+                 linger_ms: int = 0, batch_size: int = 16384, compression_type: Optional[str] = None,
+                 topics_codecs: Optional[Dict[str, str]] = None):
         """
         Constructor for the inherited classes from KafkaProducerBaseCreator class.
 
         Args:
             bootstrap_servers (Union[str, List[str]]): The bootstrap servers.
             security_protocol (str): The security protocol.
+            linger_ms (int): The time in milliseconds to wait for more messages to batch together.
+            batch_size (int): The maximum size of a batch of messages for a partition in bytes.
+            compression_type (Optional[str]): The compression of batches: gzip, snappy, lz4, zstd or None.
+            topics_codecs (Optional[Dict[str, str]]): The codecs of values by topics, JSON for other topics.
         """
 
         self._bootstrap_servers = bootstrap_servers
         self._security_protocol = security_protocol
-        self._key_serializer = lambda k: k.encode('ascii')
-        self._value_serializer = lambda m: json.dumps(m).encode('ascii')
+        self._linger_ms = linger_ms
+        self._batch_size = batch_size
+        self._compression_type = compression_type
+        self._key_serializer = lambda k: k.encode('ascii') if isinstance(k, str) else k
+        self._value_serializer = TopicCodecSerializer(topics_codecs)
+
+    def with_compression_type(self, compression_type: Optional[str]) -> "KafkaProducerBaseCreator":
+        """
+        Returns a copy of the creator, which creates producers with another compression.
+
+        Compression is a setting of a producer, so topics with their own compression need their own producers.
+
+        Args:
+            compression_type (Optional[str]): The compression of batches: gzip, snappy, lz4, zstd or None.
+
+        Returns:
+            KafkaProducerBaseCreator: The copy of the creator.
+        """
+
+        creator = copy.copy(self)
+        creator._compression_type = compression_type
+
+        return creator
 
     @abstractmethod
     def create(self) -> KafkaProducer:
@@ -50,7 +79,8 @@ class KafkaProducerSASLPlaintextCreator(KafkaProducerBaseCreator):
     def __init__(self, bootstrap_server_host: str,
                  bootstrap_server_port: str,
                  sasl_plain_username: str,
-                 sasl_plain_password: str):
+                 sasl_plain_password: str,
+                 **producer_options):
         """
         Initializes a new instance of the KafkaProducerSASLCreator class.
 
@@ -59,12 +89,13 @@ class KafkaProducerSASLPlaintextCreator(KafkaProducerBaseCreator):
             bootstrap_server_port (str): The port of the bootstrap server.
             sasl_plain_username (str): The SASL PLAINTEXT username.
             sasl_plain_password (str): The SASL PLAINTEXT password.
+            producer_options: Batching, compression and codec options of KafkaProducerBaseCreator.
         """
 
         self._sasl_mechanism = 'PLAIN'
         self._sasl_plain_username = sasl_plain_username
         self._sasl_plain_password = sasl_plain_password
-        super().__init__(f"{bootstrap_server_host}:{bootstrap_server_port}", "SASL_PLAINTEXT")
+        super().__init__(f"{bootstrap_server_host}:{bootstrap_server_port}", "SASL_PLAINTEXT", **producer_options)
 
     def create(self) -> KafkaProducer:
         return KafkaProducer(
@@ -75,6 +106,9 @@ class KafkaProducerSASLPlaintextCreator(KafkaProducerBaseCreator):
             sasl_mechanism=self._sasl_mechanism,
             sasl_plain_username=self._sasl_plain_username,
             sasl_plain_password=self._sasl_plain_password,
+            linger_ms=self._linger_ms,
+            batch_size=self._batch_size,
+            compression_type=self._compression_type,
         )
 
 
@@ -89,7 +123,8 @@ class KafkaProducerSCRAM256Creator(KafkaProducerBaseCreator):
                  ssl_certfile: str,
                  ssl_keyfile: str,
                  sasl_plain_username: str,
-                 sasl_plain_password: str):
+                 sasl_plain_password: str,
+                 **producer_options):
         """
         Initializes a new instance of the KafkaProducerSCRAM256Creator class.
 
@@ -98,6 +133,7 @@ class KafkaProducerSCRAM256Creator(KafkaProducerBaseCreator):
             bootstrap_server_port (str): The port of the bootstrap server.
             sasl_plain_username (str): The SASL PLAINTEXT username.
             sasl_plain_password (str): The SASL PLAINTEXT password.
+            producer_options: Batching, compression and codec options of KafkaProducerBaseCreator.
         """
 
         self._sasl_mechanism = 'SCRAM-SHA-256'
@@ -106,7 +142,7 @@ class KafkaProducerSCRAM256Creator(KafkaProducerBaseCreator):
         self._ssl_keyfile = ssl_keyfile
         self._sasl_plain_username = sasl_plain_username
         self._sasl_plain_password = sasl_plain_password
-        super().__init__(f"{bootstrap_server_host}:{bootstrap_server_port}", "SASL_SSL")
+        super().__init__(f"{bootstrap_server_host}:{bootstrap_server_port}", "SASL_SSL", **producer_options)
 
     def create(self) -> KafkaProducer:
         return KafkaProducer(
@@ -121,4 +157,7 @@ class KafkaProducerSCRAM256Creator(KafkaProducerBaseCreator):
             ssl_cafile=self._ssl_cafile,
             ssl_certfile=self._ssl_certfile,
             ssl_keyfile=self._ssl_keyfile,
+            linger_ms=self._linger_ms,
+            batch_size=self._batch_size,
+            compression_type=self._compression_type,
         )
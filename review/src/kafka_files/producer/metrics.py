@@ -0,0 +1,135 @@
+import time
+from threading import Lock
+from typing import Any, Dict
+
+__all__ = [
+    'PublisherMetrics',
+    'CoalescingMetrics',
+]
+
+
+class PublisherMetrics(object):
+    """
+    Delivery metrics of a publisher.
+
+    Counters are updated from the request handlers, the sender thread and the Kafka producer's I/O thread.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._enqueued = 0
+        self._dropped = 0
+        self._sent = 0
+        self._delivered = 0
+        self._failed = 0
+        self._delivery_time_total = 0.0
+        self._delivery_time_max = 0.0
+
+    def record_enqueued(self):
+        with self._lock:
+            self._enqueued += 1
+
+    def record_dropped(self):
+        with self._lock:
+            self._dropped += 1
+
+    def record_sent(self):
+        with self._lock:
+            self._sent += 1
+
+    def record_delivered(self, sent_at: float):
+        """
+        Records a message acknowledged by Kafka.
+
+        Args:
+            sent_at (float): The `time.monotonic()` value when the message was handed to the producer.
+        """
+
+        delivery_time = time.monotonic() - sent_at
+
+        with self._lock:
+            self._delivered += 1
+            self._delivery_time_total += delivery_time
+            self._delivery_time_max = max(self._delivery_time_max, delivery_time)
+
+    def record_failed(self):
+        with self._lock:
+            self._failed += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns current values of the metrics.
+
+        Returns:
+            Dict[str, Any]: The metrics by their names.
+        """
+
+        with self._lock:
+            return {
+                "enqueued": self._enqueued,
+                "dropped": self._dropped,
+                "sent": self._sent,
+                "delivered": self._delivered,
+                "failed": self._failed,
+                "delivery_time_avg_seconds": self._delivery_time_total / self._delivered if self._delivered else 0.0,
+                "delivery_time_max_seconds": self._delivery_time_max,
+            }
+
+
+class CoalescingMetrics(object):
+    """
+    Metrics of coalescing of events.
+
+    Counters are updated from the request handlers and the flusher thread.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._received = 0
+        self._superseded = 0
+        self._emitted = 0
+        self._flushes = 0
+
+    def record_received(self, superseded: bool):
+        """
+        Records an event accepted for coalescing.
+
+        Args:
+            superseded (bool): Whether the event has replaced a pending event of the same entity.
+        """
+
+        with self._lock:
+            self._received += 1
+            self._superseded += superseded
+
+    def record_flush(self, emitted: int):
+        """
+        Records a flush of pending events.
+
+        Args:
+            emitted (int): The number of events handed over to the publisher.
+        """
+
+        with self._lock:
+            self._flushes += 1
+            self._emitted += emitted
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns current values of the metrics.
+
+        The coalescing ratio is the number of received events per emitted one.
+
+        Returns:
+            Dict[str, Any]: The metrics by their names.
+        """
+
+        with self._lock:
+            return {
+                "received": self._received,
+                "superseded": self._superseded,
+                "emitted": self._emitted,
+                "pending": self._received - self._superseded - self._emitted,
+                "flushes": self._flushes,
+                "coalescing_ratio": self._received / self._emitted if self._emitted else 0.0,
+            }
@@ -1,22 +1,38 @@
+import time
 from abc import ABC, abstractmethod
+from queue import Queue, Full
+from threading import Thread
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from kafka import KafkaProducer
+from kafka.errors import KafkaTimeoutError
 from loguru import logger
 
-from .events import ProducerEvent
+from .events import ProducerEvent, get_event_schema_id
+from .metrics import PublisherMetrics
 
 __all__ = [
+    'EVENT_NAME_HEADER',
+    'SCHEMA_ID_HEADER',
     'AbstractPublisher',
     'KafkaPublisher',
     'DummyPublisher',
 ]
 
+# Header with the name of the event, the key of a message is the ID of the entity the event is about
+EVENT_NAME_HEADER = 'event_name'
+# Optional header with the ID of the schema the value was produced with
+SCHEMA_ID_HEADER = 'schema_id'
+
 
 class AbstractPublisher(ABC):
     """
     Abstract class for publishing events to Kafka.
     """
 
+    def __init__(self):
+        self.metrics = PublisherMetrics()
+
     @abstractmethod
     def publish(self, event: ProducerEvent):
         """
@@ -28,37 +44,231 @@ class AbstractPublisher(ABC):
 
         raise NotImplementedError
 
+    @abstractmethod
+    def deliver_records(self, records: Iterable[Tuple[str, Optional[str], dict, List[Tuple[str, bytes]]]],
+                        timeout: Optional[float] = None):
+        """
+        Sends messages with their own headers to Kafka and waits until all of them are acknowledged.
+
+        It is used to republish consumed messages, whose headers must be kept.
+
+        Args:
+            records (Iterable[Tuple[str, Optional[str], dict, List[Tuple[str, bytes]]]]): The topic, key, value
+                and headers of every message. Keys and values of fetched messages may be raw bytes,
+                which are sent as they are.
+            timeout (Optional[float]): The maximum time to wait in seconds.
+
+        Raises:
+            KafkaError: If any message is not delivered.
+        """
+
+        raise NotImplementedError
+
+    def flush(self, timeout: Optional[float] = None):
+        """
+        Waits until all published events are delivered.
+
+        Args:
+            timeout (Optional[float]): The maximum time to wait in seconds.
+        """
+
+        pass
+
+    def close(self, timeout: Optional[float] = None):
+        """
+        Delivers all published events and stops the publisher.
+
+        Args:
+            timeout (Optional[float]): The maximum time to wait in seconds.
+        """
+
+        pass
+
 
 class KafkaPublisher(AbstractPublisher):
     """
     Class for publishing events to Kafka.
+
+    Events are put into a bounded queue and sent by a background thread, so publishing doesn't block
+    the caller's event loop. Batching, compression and encoding are done by the Kafka producer according to its
+    linger, batch size, compression and codec settings. Topics with their own compression are sent by their own
+    producers. If the queue stays full, publishing blocks the caller for a while and then fails, so the caller
+    is slowed down by Kafka instead of losing events.
     """
 
-    def __init__(self, producer: KafkaProducer):
+    def __init__(self, producer: KafkaProducer, queue_maxsize: int = 10000,
+                 topics_producers: Optional[Dict[str, KafkaProducer]] = None, schema_id_header: bool = False,
+                 queue_put_timeout: float = 5):
         """
         Initializes a new instance of the KafkaPublisher class.
 
         Args:
             producer (KafkaProducer): The Kafka producer.
+            queue_maxsize (int): The maximum number of events waiting to be sent.
+            topics_producers (Optional[Dict[str, KafkaProducer]]): The Kafka producers of topics, which
+                are sent with another compression than the default producer.
+            schema_id_header (bool): Whether to send the ID of the schema of the value in a header.
+            queue_put_timeout (float): The maximum time to wait in seconds for a place in a full queue.
         """
 
+        super().__init__()
         self._producer = producer
+        self._topics_producers = topics_producers or dict()
+        self._producers = [producer, *{p for p in self._topics_producers.values() if p is not producer}]
+        self._schema_id_header = schema_id_header
+        self._queue_put_timeout = queue_put_timeout
+        self._queue: Queue[Optional[ProducerEvent]] = Queue(maxsize=queue_maxsize)
+        self._sender_thread = Thread(target=self._send_events)
+        self._sender_thread.daemon = True
+        self._sender_thread.start()
 
     def publish(self, event: ProducerEvent):
         """
-        Publishes event to Kafka.
+        Enqueues event for publishing to Kafka, waiting for a place if the queue is full.
 
         Args:
             event (ProducerEvent): The event to publish.
+
+        Raises:
+            KafkaTimeoutError: If the queue stays full for the put timeout.
+        """
+
+        try:
+            self._queue.put(event, timeout=self._queue_put_timeout)
+        except Full:
+            self.metrics.record_dropped()
+            logger.error(f"Publisher queue is full, rejected event {event.get_event_name()}")
+            raise KafkaTimeoutError(f"Publisher queue is full for {self._queue_put_timeout} seconds")
+
+        self.metrics.record_enqueued()
+
+    def _send_events(self):
+        """
+        Sends enqueued events until the publisher is closed.
+        """
+
+        while True:
+            event = self._queue.get()
+
+            try:
+                if event is None:
+                    return
+
+                self._send(event)
+            except Exception as e:
+                self.metrics.record_failed()
+                logger.error(f"Failed to send event {event.get_event_name()}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _send(self, event: ProducerEvent):
+        """
+        Hands event's messages over to the Kafka producer.
+
+        Args:
+            event (ProducerEvent): The event to send.
         """
 
+        event_name = event.get_event_name()
+
+        # Events of an entity go to the same partition and are consumed in order
+        key = event.get_aggregate_id()
+
         for topic in event.get_topics():
-            key = event.get_event_name()
             data = event.get_data(topic)
-            self._producer.send(topic, key=key, value=data)
+            headers = [(EVENT_NAME_HEADER, event_name.encode('ascii'))]
+
+            if self._schema_id_header and (schema_id := get_event_schema_id(event_name, topic)) is not None:
+                headers.append((SCHEMA_ID_HEADER, schema_id.encode('ascii')))
+
+            sent_at = time.monotonic()
+
+            future = self._topics_producers.get(topic, self._producer).send(topic, key=key, value=data,
+                                                                            headers=headers)
+            future.add_callback(self._on_delivered, event_name, topic, sent_at)
+            future.add_errback(self._on_failed, event_name, topic)
+
+            self.metrics.record_sent()
+
+    def deliver_records(self, records: Iterable[Tuple[str, Optional[str], dict, List[Tuple[str, bytes]]]],
+                        timeout: Optional[float] = None):
+        futures = list()
+
+        for topic, key, value, headers in records:
+            event_name = next((header_value.decode('ascii', 'replace') for header, header_value in headers
+                               if header == EVENT_NAME_HEADER), None)
+            sent_at = time.monotonic()
+
+            future = self._topics_producers.get(topic, self._producer).send(topic, key=key, value=value,
+                                                                            headers=headers)
+            future.add_callback(self._on_delivered, event_name, topic, sent_at)
+            future.add_errback(self._on_failed, event_name, topic)
+            futures.append(future)
+
+            self.metrics.record_sent()
+
+        self._flush_producers(timeout)
+
+        for future in futures:
+            if not future.is_done:
+                raise KafkaTimeoutError(f"Message is not delivered in {timeout} seconds")
+
+            if future.failed():
+                raise future.exception
+
+    def _flush_producers(self, timeout: Optional[float]):
+        """
+        Flushes all Kafka producers within the timeout.
+
+        Args:
+            timeout (Optional[float]): The maximum time to wait in seconds.
+        """
+
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        for producer in self._producers:
+            producer.flush(max(deadline - time.monotonic(), 0) if deadline is not None else None)
 
-            data_string = ", ".join(f"{key}={value}" for key, value in data.items())
-            logger.info(f"Published event {key} to topic: {topic} with data: {data_string}")
+    def _on_delivered(self, event_name: str, topic: str, sent_at: float, _record_metadata):
+        self.metrics.record_delivered(sent_at)
+        logger.debug("Published event {} to topic: {}", event_name, topic)
+
+    def _on_failed(self, event_name: str, topic: str, exception: Exception):
+        self.metrics.record_failed()
+        logger.error(f"Failed to publish event {event_name} to topic: {topic}. Error: {exception}")
+
+    def flush(self, timeout: Optional[float] = None):
+        """
+        Waits until all enqueued events are sent and delivered.
+
+        Args:
+            timeout (Optional[float]): The maximum time to wait in seconds.
+        """
+
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        with self._queue.all_tasks_done:
+            self._queue.all_tasks_done.wait_for(lambda: not self._queue.unfinished_tasks, timeout)
+
+        self._flush_producers(max(deadline - time.monotonic(), 0) if deadline is not None else None)
+
+    def close(self, timeout: Optional[float] = None):
+        """
+        Delivers all enqueued events, stops the sender thread and closes the Kafka producers.
+
+        Args:
+            timeout (Optional[float]): The maximum time to wait in seconds.
+        """
+
+        self.flush(timeout)
+
+        try:
+            self._queue.put_nowait(None)
+        except Full:
+            logger.error("Publisher queue is still full, stopping with undelivered events")
+
+        for producer in self._producers:
+            producer.close(timeout)
 
 
 class DummyPublisher(AbstractPublisher):
@@ -75,7 +285,9 @@ class DummyPublisher(AbstractPublisher):
         """
 
         for topic in event.get_topics():
-            key = event.get_event_name()
-            data = event.get_data(topic)
-            data_string = ", ".join(f"{key}={value}" for key, value in data.items())
-            logger.info(f"Published dummy event {key} to topic: {topic} with data: {data_string}")
+            logger.debug("Published dummy event {} to topic: {}", event.get_event_name(), topic)
+
+    def deliver_records(self, records: Iterable[Tuple[str, Optional[str], dict, List[Tuple[str, bytes]]]],
+                        timeout: Optional[float] = None):
+        for topic, key, _, _ in records:
+            logger.debug("Published dummy message {} to topic: {}", key, topic)
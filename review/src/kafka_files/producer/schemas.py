@@ -15,6 +15,8 @@ class RestaurantRatingUpdatedSchema(BaseModel):
     id: int = Field(ge=0)
     rating: float
     reviews_count: int
+    # Version of the rating aggregates, consumers drop ratings older than the stored one
+    version: int = Field(ge=0)
 
 
 class MenuItemRatingUpdatedSchema(BaseModel):
@@ -25,3 +27,5 @@ class MenuItemRatingUpdatedSchema(BaseModel):
     id: int = Field(ge=0)
     rating: float
     reviews_count: int
+    # Version of the rating aggregates, consumers drop ratings older than the stored one
+    version: int = Field(ge=0)
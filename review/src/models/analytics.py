@@ -0,0 +1,27 @@
+from datetime import date
+from typing import List
+
+from pydantic.dataclasses import dataclass
+
+
+@dataclass
+class ReviewAnalyticsModel:
+    """
+    Model for the daily rollup of reviews of a restaurant.
+    """
+
+    restaurant_id: int
+    date: date
+    reviews_count: int
+    ratings_sum: int
+    comments_count: int
+    # Number of ratings with 1 to 5 stars
+    histogram: List[int]
+
+    @property
+    def average_rating(self) -> float:
+        """
+        The average rating, 0 if there are no reviews.
+        """
+
+        return self.ratings_sum / self.reviews_count if self.reviews_count else 0
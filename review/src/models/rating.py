@@ -1,3 +1,6 @@
+from enum import Enum
+from typing import List
+
 from pydantic.dataclasses import dataclass
 
 
@@ -6,3 +9,46 @@ class RatingModel:
     id: int
     rating: float
     reviews_count: int
+    # Version of the aggregates the rating is computed from, 0 if unknown
+    version: int = 0
+
+
+class RatingEntityType(str, Enum):
+    """
+    Types of rated entities.
+    """
+
+    restaurant = 'restaurant'
+    menu_item = 'menu_item'
+    courier = 'courier'
+
+
+@dataclass
+class RatingAggregateModel:
+    """
+    Model for running aggregates of ratings of an entity.
+    """
+
+    entity_type: RatingEntityType
+    entity_id: int
+    reviews_count: int
+    ratings_sum: int
+    # Number of ratings with 1 to 5 stars
+    histogram: List[int]
+    # Number of changes of the aggregates
+    version: int = 0
+
+    def to_rating_model(self) -> RatingModel:
+        """
+        Convert the aggregates to the average rating.
+
+        Returns:
+            RatingModel: The rating, 0 if there are no reviews.
+        """
+
+        return RatingModel(
+            id=self.entity_id,
+            rating=self.ratings_sum / self.reviews_count if self.reviews_count else 0,
+            reviews_count=self.reviews_count,
+            version=self.version,
+        )
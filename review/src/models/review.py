@@ -1,14 +1,16 @@
 from abc import ABC
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from enum import Enum
+from typing import List, Optional
 
 from sqlalchemy import Column, Integer, String, ForeignKey, Float, Boolean, DateTime, Text, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import declarative_base, relationship
 from sqlalchemy.sql import func
 from datetime import datetime, timedelta
 
-from .base import Base
+# Draft tables of reviews aren't created by migrations, so they have their own metadata
+Base = declarative_base()
 
 
 @dataclass
@@ -58,6 +60,44 @@ class ReviewUpdateModel(ReviewBaseModel):
     pass
 
 
+class ReviewSortOrder(str, Enum):
+    """
+    Orders of review listings.
+
+    Reviews with equal ratings are ordered by creation time in the same direction as ratings,
+    so every order is served by a single index.
+    """
+
+    newest = 'newest'
+    highest = 'highest'
+    lowest = 'lowest'
+
+
+@dataclass
+class ReviewListItemModel(ReviewBaseModel):
+    """
+    Model for a review in a listing of reviews of an entity.
+    """
+
+    id: int
+    customer_id: int
+    customer_full_name: str
+    customer_image_url: str
+    order_id: Optional[int]
+    created_at: datetime
+
+
+@dataclass
+class ReviewPageModel:
+    """
+    Model for a page of a listing of reviews.
+    """
+
+    items: List[ReviewListItemModel]
+    # Cursor of the next page, None if it is the last page
+    next_cursor: Optional[str] = None
+
+
 class RestaurantReview(Base):
     """
     Restaurant reviews for MealPeDeal - optimized for Indian market.
@@ -0,0 +1,96 @@
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import List, Optional
+
+from models.analytics import ReviewAnalyticsModel
+
+
+class IReviewAnalyticsRepository(ABC):
+    """
+    Interface for repository of daily rollups of reviews of restaurants.
+
+    Rollups are changed by deltas of every created, updated and deleted review of a restaurant in the transaction
+    of the review, so dashboards are served without scanning reviews. Rollups of past days are recomputed
+    from reviews by backfills.
+    """
+
+    @abstractmethod
+    async def apply(self, restaurant_id: int, day: date,
+                    added_rating: Optional[int] = None, removed_rating: Optional[int] = None,
+                    added_comment: bool = False, removed_comment: bool = False) -> None:
+        """
+        Atomically add a review to the rollup of a day and/or remove a review from it.
+
+        Waits for recomputations of the day, which must not see the review without its delta.
+
+        Args:
+            restaurant_id (int): The ID of the restaurant.
+            day (date): The day the review was created.
+            added_rating (Optional[int]): The rating of a created review or the new rating of an updated one.
+            removed_rating (Optional[int]): The rating of a deleted review or the old rating of an updated one.
+            added_comment (bool): Whether a created review or an updated one has a comment.
+            removed_comment (bool): Whether a deleted review or an updated one had a comment.
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def list_daily(self, restaurant_id: int, date_from: date, date_to: date) -> List[ReviewAnalyticsModel]:
+        """
+        Retrieve rollups of a restaurant in ascending order of days, days without reviews are omitted.
+
+        Args:
+            restaurant_id (int): The ID of the restaurant.
+            date_from (date): The first day.
+            date_to (date): The last day.
+
+        Returns:
+            List[ReviewAnalyticsModel]: The rollups.
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def retrieve_first_review_date(self) -> Optional[date]:
+        """
+        Retrieve the day the first review of a restaurant was created.
+
+        Returns:
+            Optional[date]: The day or None if there are no reviews of restaurants.
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def compute_range(self, date_from: date, date_to: date) -> List[ReviewAnalyticsModel]:
+        """
+        Compute rollups of all restaurants from their reviews created in a range of days.
+
+        Args:
+            date_from (date): The first day.
+            date_to (date): The last day.
+
+        Returns:
+            List[ReviewAnalyticsModel]: The rollups of days with reviews.
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def recompute_range(self, date_from: date, date_to: date) -> int:
+        """
+        Replace rollups of all restaurants in a range of days with rollups computed from reviews.
+
+        Rollups of the days are locked before they are deleted and reviews are read, so reviews of the days
+        wait for the end of the transaction and every review is counted once: either it is committed before
+        reviews are read or its delta is applied after the recomputed rollups are committed.
+
+        Args:
+            date_from (date): The first day.
+            date_to (date): The last day.
+
+        Returns:
+            int: The number of written rollups.
+        """
+
+        raise NotImplementedError
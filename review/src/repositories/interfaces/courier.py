@@ -3,11 +3,12 @@ from typing import Optional
 
 from models.courier import CourierModel, CourierCreateModel
 from models.rating import RatingModel
-from repositories.interfaces.mixins import IRetrieveMixin, ICreateMixin, IDeleteMixin
+from repositories.interfaces.mixins import IRetrieveMixin, ICreateMixin, IUpsertMixin, IDeleteMixin
 
 
 class ICourierRepository(IRetrieveMixin[CourierModel],
                          ICreateMixin[CourierModel, CourierCreateModel],
+                         IUpsertMixin[CourierCreateModel],
                          IDeleteMixin,
                          ABC):
     """
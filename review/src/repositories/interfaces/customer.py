@@ -1,11 +1,12 @@
 from abc import ABC
 
 from models.customer import CustomerModel, CustomerCreateModel, CustomerUpdateModel
-from repositories.interfaces.mixins import IUpdateMixin, ICreateMixin, IRetrieveMixin, IDeleteMixin
+from repositories.interfaces.mixins import IUpdateMixin, ICreateMixin, IUpsertMixin, IRetrieveMixin, IDeleteMixin
 
 
 class ICustomerRepository(IRetrieveMixin[CustomerModel],
                           ICreateMixin[CustomerModel, CustomerCreateModel],
+                          IUpsertMixin[CustomerCreateModel],
                           IUpdateMixin[CustomerModel, CustomerUpdateModel],
                           IDeleteMixin,
                           ABC):
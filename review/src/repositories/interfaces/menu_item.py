@@ -3,11 +3,12 @@ from typing import Optional
 
 from models.menu_item import MenuItemModel, MenuItemCreateModel
 from models.rating import RatingModel
-from repositories.interfaces.mixins import IDeleteMixin, ICreateMixin, IRetrieveMixin
+from repositories.interfaces.mixins import IDeleteMixin, ICreateMixin, IUpsertMixin, IRetrieveMixin
 
 
 class IMenuItemRepository(IRetrieveMixin[MenuItemModel],
                           ICreateMixin[MenuItemModel, MenuItemCreateModel],
+                          IUpsertMixin[MenuItemCreateModel],
                           IDeleteMixin,
                           ABC):
     """
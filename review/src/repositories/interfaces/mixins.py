@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional, TypeVar, Generic
+from typing import List, Optional, Tuple, TypeVar, Generic
 
 Model = TypeVar("Model")
 CreateModel = TypeVar("CreateModel")
@@ -46,6 +46,40 @@ class ICreateMixin(Generic[Model, CreateModel], ABC):
         raise NotImplementedError
 
 
+class IUpsertMixin(Generic[CreateModel], ABC):
+    """
+    Interface for upsert mixin of records replicated from other services.
+
+    A record is only written if it doesn't exist or has an older version, so stale events are dropped.
+    """
+
+    @abstractmethod
+    async def upsert(self, data: CreateModel, version: int) -> bool:
+        """
+        Create a record or update it if the stored version is older.
+
+        Args:
+            data (CreateModel): The data of the record.
+            version (int): The version of the record.
+
+        Returns:
+            bool: True if the record has been written, False if the stored version is the same or newer.
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def upsert_many(self, data: List[Tuple[CreateModel, int]]) -> None:
+        """
+        Create records or update those whose stored versions are older in a single statement.
+
+        Args:
+            data (List[Tuple[CreateModel, int]]): The data and the version of every record.
+        """
+
+        raise NotImplementedError
+
+
 class IUpdateMixin(Generic[Model, UpdateModel], ABC):
     """
     Interface for update mixin.
@@ -1,11 +1,12 @@
 from abc import ABC
 
 from models.order import OrderModel, OrderCreateModel
-from repositories.interfaces.mixins import IDeleteMixin, ICreateMixin, IRetrieveMixin
+from repositories.interfaces.mixins import IDeleteMixin, ICreateMixin, IUpsertMixin, IRetrieveMixin
 
 
 class IOrderRepository(IRetrieveMixin[OrderModel],
                        ICreateMixin[OrderModel, OrderCreateModel],
+                       IUpsertMixin[OrderCreateModel],
                        IDeleteMixin,
                        ABC):
     """
@@ -0,0 +1,112 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from models.rating import RatingAggregateModel, RatingEntityType
+
+
+class IRatingAggregateRepository(ABC):
+    """
+    Interface for repository of running aggregates of ratings.
+
+    Aggregates are changed by deltas of every created, updated and deleted review in the transaction of the review,
+    so the rating of an entity is read without scanning its reviews.
+    """
+
+    @abstractmethod
+    async def retrieve(self, entity_type: RatingEntityType, entity_id: int) -> Optional[RatingAggregateModel]:
+        """
+        Retrieve aggregates of ratings of an entity.
+
+        Args:
+            entity_type (RatingEntityType): The type of the entity.
+            entity_id (int): The ID of the entity.
+
+        Returns:
+            Optional[RatingAggregateModel]: The aggregates or None if the entity has never been rated.
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def apply(self, entity_type: RatingEntityType, entity_id: int,
+                    added_rating: Optional[int] = None,
+                    removed_rating: Optional[int] = None) -> RatingAggregateModel:
+        """
+        Atomically add a rating to aggregates of an entity and/or remove a rating from them.
+
+        The version of the aggregates is incremented, so the changes of an entity are ordered.
+
+        Args:
+            entity_type (RatingEntityType): The type of the entity.
+            entity_id (int): The ID of the entity.
+            added_rating (Optional[int]): The rating of a created review or the new rating of an updated one.
+            removed_rating (Optional[int]): The rating of a deleted review or the old rating of an updated one.
+
+        Returns:
+            RatingAggregateModel: The changed aggregates.
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def list_entity_ids(self, entity_type: RatingEntityType, after_id: Optional[int] = None,
+                              limit: int = 1000) -> List[int]:
+        """
+        Retrieve IDs of entities of a type in ascending order, which may be rated.
+
+        Args:
+            entity_type (RatingEntityType): The type of the entities.
+            after_id (Optional[int]): The ID after which entities are retrieved, None to start from the first one.
+            limit (int): The maximum number of IDs.
+
+        Returns:
+            List[int]: The IDs.
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def list_for_update(self, entity_type: RatingEntityType,
+                              entity_ids: List[int]) -> List[RatingAggregateModel]:
+        """
+        Retrieve stored aggregates of entities and lock them until the end of the transaction.
+
+        Args:
+            entity_type (RatingEntityType): The type of the entities.
+            entity_ids (List[int]): The IDs of the entities.
+
+        Returns:
+            List[RatingAggregateModel]: The aggregates of entities which have been rated.
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def compute_many(self, entity_type: RatingEntityType,
+                           entity_ids: List[int]) -> List[RatingAggregateModel]:
+        """
+        Compute aggregates of entities from all their reviews.
+
+        Args:
+            entity_type (RatingEntityType): The type of the entities.
+            entity_ids (List[int]): The IDs of the entities.
+
+        Returns:
+            List[RatingAggregateModel]: The aggregates of entities which have reviews.
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def replace_many(self, aggregates: List[RatingAggregateModel]) -> List[RatingAggregateModel]:
+        """
+        Overwrite aggregates of entities in a single statement and increment their versions.
+
+        Args:
+            aggregates (List[RatingAggregateModel]): The aggregates, whose versions are ignored.
+
+        Returns:
+            List[RatingAggregateModel]: The overwritten aggregates with their new versions.
+        """
+
+        raise NotImplementedError
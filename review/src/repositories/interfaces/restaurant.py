@@ -3,11 +3,12 @@ from typing import Optional
 
 from models.rating import RatingModel
 from models.restaurant import RestaurantModel, RestaurantCreateModel, RestaurantUpdateModel
-from repositories.interfaces.mixins import IRetrieveMixin, ICreateMixin, IDeleteMixin, IUpdateMixin
+from repositories.interfaces.mixins import IRetrieveMixin, ICreateMixin, IUpsertMixin, IDeleteMixin, IUpdateMixin
 
 
 class IRestaurantRepository(IRetrieveMixin[RestaurantModel],
                             ICreateMixin[RestaurantModel, RestaurantCreateModel],
+                            IUpsertMixin[RestaurantCreateModel],
                             IUpdateMixin[RestaurantModel, RestaurantUpdateModel],
                             IDeleteMixin,
                             ABC):
@@ -1,12 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Optional
 
-from models.review import ReviewModel, ReviewCreateModel, ReviewUpdateModel
-from repositories.interfaces.mixins import IDeleteMixin, IUpdateMixin, ICreateMixin, IRetrieveMixin
+from models.review import ReviewModel, ReviewCreateModel, ReviewUpdateModel, ReviewPageModel, ReviewSortOrder
+from repositories.interfaces.mixins import IDeleteMixin, IUpdateMixin, IRetrieveMixin
 
 
 class IReviewRepository(IRetrieveMixin[ReviewModel],
-                        ICreateMixin[ReviewModel, ReviewCreateModel],
                         IUpdateMixin[ReviewModel, ReviewUpdateModel],
                         IDeleteMixin,
                         ABC):
@@ -14,6 +13,22 @@ class IReviewRepository(IRetrieveMixin[ReviewModel],
     Interface for review repository.
     """
 
+    @abstractmethod
+    async def create(self, data: ReviewCreateModel) -> Optional[ReviewModel]:
+        """
+        Create a review unless the customer has already reviewed the order, the restaurant or the menu item.
+
+        The uniqueness is checked by the database in the same statement, so concurrent duplicates are rejected.
+
+        Args:
+            data (ReviewCreateModel): The data to create a review.
+
+        Returns:
+            Optional[ReviewModel]: The created review or None if the review already exists.
+        """
+
+        raise NotImplementedError
+
     @abstractmethod
     async def retrieve_by_order(self, order_id: int) -> Optional[ReviewModel]:
         """
@@ -59,43 +74,64 @@ class IReviewRepository(IRetrieveMixin[ReviewModel],
         raise NotImplementedError
 
     @abstractmethod
-    async def list_courier_reviews(self, courier_id: int) -> List[ReviewModel]:
+    async def list_courier_reviews(self, courier_id: int, sort_order: ReviewSortOrder = ReviewSortOrder.newest,
+                                   limit: int = 20, cursor: Optional[str] = None) -> ReviewPageModel:
         """
-        List all reviews for a courier.
+        List a page of reviews for a courier.
 
         Args:
             courier_id (int): The ID of the courier.
+            sort_order (ReviewSortOrder): The order of reviews.
+            limit (int): The maximum number of reviews in the page.
+            cursor (Optional[str]): The cursor returned with the previous page or None for the first page.
 
         Returns:
-            List[ReviewModel]: The list of reviews.
+            ReviewPageModel: The page of reviews.
+
+        Raises:
+            InvalidCursorError: If the cursor can't be decoded or was made for another order.
         """
 
         raise NotImplementedError
 
     @abstractmethod
-    async def list_restaurant_reviews(self, restaurant_id: int) -> List[ReviewModel]:
+    async def list_restaurant_reviews(self, restaurant_id: int, sort_order: ReviewSortOrder = ReviewSortOrder.newest,
+                                      limit: int = 20, cursor: Optional[str] = None) -> ReviewPageModel:
         """
-        List all reviews for a restaurant.
+        List a page of reviews for a restaurant.
 
         Args:
             restaurant_id (int): The ID of the restaurant.
+            sort_order (ReviewSortOrder): The order of reviews.
+            limit (int): The maximum number of reviews in the page.
+            cursor (Optional[str]): The cursor returned with the previous page or None for the first page.
 
         Returns:
-            List[ReviewModel]: The list of reviews.
+            ReviewPageModel: The page of reviews.
+
+        Raises:
+            InvalidCursorError: If the cursor can't be decoded or was made for another order.
         """
 
         raise NotImplementedError
 
     @abstractmethod
-    async def list_menu_item_reviews(self, menu_item_id: int) -> List[ReviewModel]:
+    async def list_menu_item_reviews(self, menu_item_id: int, sort_order: ReviewSortOrder = ReviewSortOrder.newest,
+                                     limit: int = 20, cursor: Optional[str] = None) -> ReviewPageModel:
         """
-        List all reviews for a menu item.
+        List a page of reviews for a menu item.
 
         Args:
             menu_item_id (int): The ID of the menu item.
+            sort_order (ReviewSortOrder): The order of reviews.
+            limit (int): The maximum number of reviews in the page.
+            cursor (Optional[str]): The cursor returned with the previous page or None for the first page.
 
         Returns:
-            List[ReviewModel]: The list of reviews.
+            ReviewPageModel: The page of reviews.
+
+        Raises:
+            InvalidCursorError: If the cursor can't be decoded or was made for another order.
         """
 
         raise NotImplementedError
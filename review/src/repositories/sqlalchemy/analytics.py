@@ -0,0 +1,219 @@
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional
+
+from loguru import logger
+from sqlalchemy import Date, Delete, Insert, Select, delete, func, select
+
+from db.sqlalchemy.models import ReviewAnalytics, Review
+from models.analytics import ReviewAnalyticsModel
+from repositories.interfaces.analytics import IReviewAnalyticsRepository
+from repositories.sqlalchemy.base import SqlAlchemyRepository
+from repositories.sqlalchemy.mappers import to_review_analytics_model
+from repositories.sqlalchemy.rating import STARS_COLUMNS
+
+# Additive columns of rollups
+COUNT_COLUMNS = ['reviews_count', 'ratings_sum', 'comments_count', *STARS_COLUMNS]
+
+# First key of advisory locks of days of rollups, the second key is the ordinal of the day
+ANALYTICS_LOCK_KEY = 7297
+
+
+def _get_day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min)
+
+
+class ReviewAnalyticsRepository(IReviewAnalyticsRepository, SqlAlchemyRepository):
+    """
+    SQLAlchemy implementation of the repository of daily rollups of reviews of restaurants.
+    """
+
+    def _get_apply_stmt(self) -> Insert:
+        """
+        Create an INSERT ... ON CONFLICT DO UPDATE statement, which adds deltas to the rollup of a day.
+
+        The rollup is changed by a single statement, so concurrent reviews of a restaurant never lose updates.
+
+        Returns:
+            Insert: The INSERT statement, executed with the restaurant, the day and the deltas of all columns.
+        """
+
+        table = ReviewAnalytics.__table__
+        stmt = self._get_dialect_insert_stmt(table)
+
+        return stmt.on_conflict_do_update(
+            index_elements=[table.c.restaurant_id, table.c.date],
+            set_={column: table.c[column] + stmt.excluded[column] for column in COUNT_COLUMNS},
+        )
+
+    def _get_lock_day_stmt(self, day: date, shared: bool) -> Select:
+        """
+        Create a SELECT statement, which locks rollups of a day until the end of the transaction.
+
+        Reviews take shared locks of their days, so they are applied concurrently, while recomputations
+        take exclusive ones.
+
+        Args:
+            day (date): The day.
+            shared (bool): Whether the lock is shared.
+
+        Returns:
+            Select: The SELECT statement to acquire the advisory lock.
+        """
+
+        lock = func.pg_advisory_xact_lock_shared if shared else func.pg_advisory_xact_lock
+
+        return select(lock(ANALYTICS_LOCK_KEY, day.toordinal()))
+
+    async def _lock_days(self, date_from: date, date_to: date, shared: bool = False):
+        """
+        Lock rollups of a range of days in ascending order until the end of the transaction.
+
+        SQLite has no advisory locks, but it doesn't need them: writing transactions run one at a time.
+
+        Args:
+            date_from (date): The first day.
+            date_to (date): The last day.
+            shared (bool): Whether the locks are shared.
+        """
+
+        if self._session.get_bind().dialect.name != 'postgresql':
+            return
+
+        for ordinal in range(date_from.toordinal(), date_to.toordinal() + 1):
+            await self._session.execute(self._get_lock_day_stmt(date.fromordinal(ordinal), shared))
+
+    def _get_list_daily_stmt(self, restaurant_id: int, date_from: date, date_to: date) -> Select:
+        """
+        Create a SELECT statement to retrieve rollups of a restaurant in a range of days.
+
+        Args:
+            restaurant_id (int): The ID of the restaurant.
+            date_from (date): The first day.
+            date_to (date): The last day.
+
+        Returns:
+            Select: The SELECT statement to retrieve the rollups.
+        """
+
+        return select(ReviewAnalytics) \
+            .where(ReviewAnalytics.restaurant_id == restaurant_id,
+                   ReviewAnalytics.date >= date_from, ReviewAnalytics.date <= date_to) \
+            .order_by(ReviewAnalytics.date)
+
+    def _get_compute_range_stmt(self, date_from: date, date_to: date) -> Select:
+        """
+        Create a SELECT statement to compute rollups of all restaurants from reviews created in a range of days.
+
+        Args:
+            date_from (date): The first day.
+            date_to (date): The last day.
+
+        Returns:
+            Select: The SELECT statement of the restaurant, the day and the rollup columns.
+        """
+
+        day = func.date(Review.created_at, type_=Date).label('date')
+
+        return select(
+            Review.restaurant_id,
+            day,
+            func.count(Review.id).label('reviews_count'),
+            func.sum(Review.rating).label('ratings_sum'),
+            func.count(Review.id).filter(Review.comment != '').label('comments_count'),
+            *[func.count(Review.id).filter(Review.rating == stars).label(column)
+              for stars, column in enumerate(STARS_COLUMNS, start=1)]
+        ).where(
+            Review.created_at >= _get_day_start(date_from),
+            Review.created_at < _get_day_start(date_to + timedelta(days=1)),
+            Review.restaurant_id.is_not(None),
+        ).group_by(Review.restaurant_id, day)
+
+    def _get_first_review_date_stmt(self) -> Select:
+        """
+        Create a SELECT statement to retrieve the creation time of the first review of a restaurant.
+
+        Returns:
+            Select: The SELECT statement to retrieve the creation time.
+        """
+
+        return select(func.min(Review.created_at)).where(Review.restaurant_id.is_not(None))
+
+    def _get_delete_range_stmt(self, date_from: date, date_to: date) -> Delete:
+        """
+        Create a DELETE statement to remove rollups of all restaurants in a range of days.
+
+        Args:
+            date_from (date): The first day.
+            date_to (date): The last day.
+
+        Returns:
+            Delete: The DELETE statement to remove the rollups.
+        """
+
+        return delete(ReviewAnalytics).where(ReviewAnalytics.date >= date_from, ReviewAnalytics.date <= date_to)
+
+    async def apply(self, restaurant_id: int, day: date,
+                    added_rating: Optional[int] = None, removed_rating: Optional[int] = None,
+                    added_comment: bool = False, removed_comment: bool = False) -> None:
+        deltas: Dict[str, int] = {column: 0 for column in COUNT_COLUMNS}
+
+        for rating, sign in ((added_rating, 1), (removed_rating, -1)):
+            if rating is not None:
+                deltas['reviews_count'] += sign
+                deltas['ratings_sum'] += sign * rating
+                deltas[STARS_COLUMNS[rating - 1]] += sign
+
+        deltas['comments_count'] = int(added_comment) - int(removed_comment)
+
+        await self._lock_days(day, day, shared=True)
+
+        stmt = self._get_apply_stmt()
+        await self._session.execute(stmt, {'restaurant_id': restaurant_id, 'date': day, **deltas})
+
+        logger.debug(f"Applied review deltas to analytics of restaurant with id={restaurant_id} on {day}")
+
+    async def list_daily(self, restaurant_id: int, date_from: date, date_to: date) -> List[ReviewAnalyticsModel]:
+        stmt = self._get_list_daily_stmt(restaurant_id, date_from, date_to)
+        result = await self._session.scalars(stmt)
+
+        logger.debug(f"Retrieved review analytics of restaurant with id={restaurant_id} "
+                     f"from {date_from} to {date_to}")
+
+        return [to_review_analytics_model(review_analytics) for review_analytics in result]
+
+    async def retrieve_first_review_date(self) -> Optional[date]:
+        stmt = self._get_first_review_date_stmt()
+        created_at = await self._session.scalar(stmt)
+
+        return created_at.date() if created_at else None
+
+    async def compute_range(self, date_from: date, date_to: date) -> List[ReviewAnalyticsModel]:
+        stmt = self._get_compute_range_stmt(date_from, date_to)
+        result = await self._session.execute(stmt)
+
+        logger.debug(f"Computed review analytics from {date_from} to {date_to}")
+
+        return [ReviewAnalyticsModel(restaurant_id=row.restaurant_id, date=row.date,
+                                     reviews_count=row.reviews_count, ratings_sum=row.ratings_sum,
+                                     comments_count=row.comments_count,
+                                     histogram=[getattr(row, column) for column in STARS_COLUMNS])
+                for row in result]
+
+    async def recompute_range(self, date_from: date, date_to: date) -> int:
+        await self._lock_days(date_from, date_to)
+        await self._session.execute(self._get_delete_range_stmt(date_from, date_to))
+        rollups = await self.compute_range(date_from, date_to)
+
+        if rollups:
+            stmt = self._get_apply_stmt()
+            await self._session.execute(stmt, [{'restaurant_id': rollup.restaurant_id,
+                                                'date': rollup.date,
+                                                'reviews_count': rollup.reviews_count,
+                                                'ratings_sum': rollup.ratings_sum,
+                                                'comments_count': rollup.comments_count,
+                                                **dict(zip(STARS_COLUMNS, rollup.histogram))}
+                                               for rollup in rollups])
+
+        logger.debug(f"Recomputed {len(rollups)} review analytics from {date_from} to {date_to}")
+
+        return len(rollups)
@@ -1,7 +1,12 @@
 from abc import ABC
+from typing import Type, Union
 
+from sqlalchemy import Insert, Table, or_
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from db.sqlalchemy.models import Base
+
 
 class SqlAlchemyRepository(ABC):
     """
@@ -17,3 +22,45 @@ class SqlAlchemyRepository(ABC):
         """
 
         self._session = session
+
+    def _get_dialect_insert_stmt(self, table: Union[Table, Type[Base]]) -> Insert:
+        """
+        Create an INSERT statement of the session's dialect, which supports ON CONFLICT clauses.
+
+        Args:
+            table (Union[Table, Type[Base]]): The table or the model, whose instances are returned by RETURNING.
+
+        Returns:
+            Insert: The INSERT statement.
+        """
+
+        dialect_insert = sqlite.insert if self._session.get_bind().dialect.name == 'sqlite' else postgresql.insert
+
+        return dialect_insert(table)
+
+    def _get_upsert_stmt(self, model: Type[Base]) -> Insert:
+        """
+        Create an INSERT ... ON CONFLICT DO UPDATE statement for a model replicated from another service,
+        which only overwrites an older or a legacy version of a record.
+
+        Replicated models have a `version` column with the offset of the Kafka message which has last written
+        the record. Events of an aggregate are sent to the same partition, so a newer event has a greater offset.
+        Records with version -1 were written by messages published before events were keyed by their entities,
+        whose offsets are not comparable, or before versions were added, so they are overwritten by any message.
+
+        Args:
+            model (Type[Base]): The replicated model.
+
+        Returns:
+            Insert: The INSERT statement, executed with the data and the version of every record.
+        """
+
+        table = model.__table__
+        stmt = self._get_dialect_insert_stmt(table)
+        columns = [column.name for column in table.columns if not column.primary_key]
+
+        return stmt.on_conflict_do_update(
+            index_elements=[table.c.id],
+            set_={column: stmt.excluded[column] for column in columns},
+            where=or_(table.c.version < stmt.excluded.version, table.c.version < 0),
+        )
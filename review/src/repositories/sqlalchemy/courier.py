@@ -1,12 +1,12 @@
 from dataclasses import asdict
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from loguru import logger
-from sqlalchemy import Select, select, Insert, insert, Delete, delete, Update, func
+from sqlalchemy import Select, select, Insert, insert, Delete, delete, Update
 
-from db.sqlalchemy.models import Courier, Order, Review
+from db.sqlalchemy.models import Courier, RatingAggregate
 from models.courier import CourierCreateModel, CourierModel
-from models.rating import RatingModel
+from models.rating import RatingModel, RatingEntityType
 from repositories.interfaces.courier import ICourierRepository
 from repositories.sqlalchemy.base import SqlAlchemyRepository
 from repositories.sqlalchemy.mappers import to_courier_model
@@ -32,19 +32,18 @@ class CourierRepository(ICourierRepository, SqlAlchemyRepository):
 
     def _get_retrieve_courier_rating_stmt(self, courier_id: int) -> Select:
         """
-        Create a SELECT statement to retrieve a courier rating by its ID.
+        Create a SELECT statement to retrieve running aggregates of ratings of a courier.
 
         Args:
-            courier_id (int): The ID of the courier to retrieve.
+            courier_id (int): The ID of the courier.
 
         Returns:
-            Select: The SELECT statement to retrieve the courier rating.
+            Select: The SELECT statement to retrieve the reviews count and the sum of ratings.
         """
 
-        return select(
-            func.count(Review.id).label('reviews_count'),
-            func.avg(Review.rating).label('average_rating')
-        ).join(Order).where(Order.courier_id == courier_id)
+        return select(RatingAggregate.reviews_count, RatingAggregate.ratings_sum) \
+            .where(RatingAggregate.entity_type == RatingEntityType.courier.value,
+                   RatingAggregate.entity_id == courier_id)
 
     def _get_create_stmt(self, courier: CourierCreateModel) -> Insert:
         """
@@ -85,14 +84,17 @@ class CourierRepository(ICourierRepository, SqlAlchemyRepository):
         stmt = self._get_retrieve_courier_rating_stmt(courier_id)
         result = await self._session.execute(stmt)
 
-        result = result.one()
+        result = result.one_or_none()
 
         logger.debug(f"Retrieved courier rating for courier with id={courier_id}")
 
+        if not result or not result.reviews_count:
+            return RatingModel(id=courier_id, rating=0, reviews_count=0)
+
         return RatingModel(
             id=courier_id,
-            rating=result[1] if result[1] else 0,
-            reviews_count=result[0],
+            rating=result.ratings_sum / result.reviews_count,
+            reviews_count=result.reviews_count,
         )
 
     async def create(self, courier: CourierCreateModel) -> CourierModel:
@@ -104,6 +106,26 @@ class CourierRepository(ICourierRepository, SqlAlchemyRepository):
 
         return to_courier_model(courier)
 
+    async def upsert(self, courier: CourierCreateModel, version: int) -> bool:
+        stmt = self._get_upsert_stmt(Courier)
+        result = await self._session.execute(stmt, {**asdict(courier), 'version': version})
+
+        logger.debug(f"Upserted courier with id={courier.id} and version={version}")
+
+        return bool(result.rowcount)
+
+    async def upsert_many(self, couriers: List[Tuple[CourierCreateModel, int]]) -> None:
+        if not couriers:
+            return
+
+        # Only the last version of a courier is written
+        data = {courier.id: {**asdict(courier), 'version': version} for courier, version in couriers}
+
+        stmt = self._get_upsert_stmt(Courier)
+        await self._session.execute(stmt, list(data.values()))
+
+        logger.debug(f"Upserted {len(data)} couriers")
+
     async def delete(self, id: int) -> None:
         stmt = self._get_delete_stmt(id)
         await self._session.execute(stmt)
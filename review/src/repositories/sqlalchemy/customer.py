@@ -1,5 +1,5 @@
 from dataclasses import asdict
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from loguru import logger
 from sqlalchemy import Delete, Select, Insert, select, insert, delete, Update, update
@@ -96,6 +96,26 @@ class CustomerRepository(ICustomerRepository, SqlAlchemyRepository):
             logger.debug(f"Updated customer with id={customer.id}")
             return to_customer_model(customer)
 
+    async def upsert(self, customer: CustomerCreateModel, version: int) -> bool:
+        stmt = self._get_upsert_stmt(Customer)
+        result = await self._session.execute(stmt, {**asdict(customer), 'version': version})
+
+        logger.debug(f"Upserted customer with id={customer.id} and version={version}")
+
+        return bool(result.rowcount)
+
+    async def upsert_many(self, customers: List[Tuple[CustomerCreateModel, int]]) -> None:
+        if not customers:
+            return
+
+        # Only the last version of a customer is written
+        data = {customer.id: {**asdict(customer), 'version': version} for customer, version in customers}
+
+        stmt = self._get_upsert_stmt(Customer)
+        await self._session.execute(stmt, list(data.values()))
+
+        logger.debug(f"Upserted {len(data)} customers")
+
     async def delete(self, id: int) -> None:
         stmt = self._get_delete_stmt(id)
         await self._session.execute(stmt)
@@ -1,14 +1,18 @@
 from typing import Optional
 
 from loguru import logger
+from sqlalchemy import Row
 
-from db.sqlalchemy.models import Review, Restaurant, MenuItem, Customer, Courier, Order
+from db.sqlalchemy.models import Review, Restaurant, MenuItem, Customer, Courier, Order, RatingAggregate, \
+    ReviewAnalytics
+from models.analytics import ReviewAnalyticsModel
 from models.courier import CourierModel
 from models.customer import CustomerModel
 from models.menu_item import MenuItemModel
 from models.order import OrderModel
+from models.rating import RatingAggregateModel, RatingEntityType
 from models.restaurant import RestaurantModel
-from models.review import ReviewModel
+from models.review import ReviewModel, ReviewListItemModel
 
 
 def to_courier_model(courier: Courier) -> CourierModel:
@@ -123,6 +127,29 @@ def to_review_model(review: Review) -> ReviewModel:
     return review_model
 
 
+def to_review_list_item_model(row: Row) -> ReviewListItemModel:
+    """
+    Convert a row of a listing of reviews to review list item model.
+
+    Args:
+        row (Row): The row with the listed columns of a review and its customer.
+
+    Returns:
+        ReviewListItemModel: Review list item model.
+    """
+
+    return ReviewListItemModel(
+        id=row.id,
+        rating=row.rating,
+        comment=row.comment,
+        customer_id=row.customer_id,
+        customer_full_name=row.customer_full_name,
+        customer_image_url=row.customer_image_url,
+        order_id=row.order_id,
+        created_at=row.created_at
+    )
+
+
 def to_order_model(order: Order) -> OrderModel:
     """
     Convert database model to order model.
@@ -143,3 +170,52 @@ def to_order_model(order: Order) -> OrderModel:
     logger.debug(f"Converted database order model with id={order.id} to order model.")
 
     return order_model
+
+
+def to_rating_aggregate_model(rating_aggregate: RatingAggregate) -> RatingAggregateModel:
+    """
+    Convert database model or row to rating aggregate model.
+
+    Args:
+        rating_aggregate (RatingAggregate): Database model or row of the table.
+
+    Returns:
+        RatingAggregateModel: Rating aggregate model.
+    """
+
+    rating_aggregate_model = RatingAggregateModel(
+        entity_type=RatingEntityType(rating_aggregate.entity_type),
+        entity_id=rating_aggregate.entity_id,
+        reviews_count=rating_aggregate.reviews_count,
+        ratings_sum=rating_aggregate.ratings_sum,
+        histogram=[rating_aggregate.stars_1_count, rating_aggregate.stars_2_count, rating_aggregate.stars_3_count,
+                   rating_aggregate.stars_4_count, rating_aggregate.stars_5_count],
+        version=rating_aggregate.version,
+    )
+
+    logger.debug(f"Converted database rating aggregate model of {rating_aggregate.entity_type} "
+                 f"with id={rating_aggregate.entity_id} to rating aggregate model.")
+
+    return rating_aggregate_model
+
+
+def to_review_analytics_model(review_analytics: ReviewAnalytics) -> ReviewAnalyticsModel:
+    """
+    Convert database model to review analytics model.
+
+    Args:
+        review_analytics (ReviewAnalytics): Database model.
+
+    Returns:
+        ReviewAnalyticsModel: Review analytics model.
+    """
+
+    return ReviewAnalyticsModel(
+        restaurant_id=review_analytics.restaurant_id,
+        date=review_analytics.date,
+        reviews_count=review_analytics.reviews_count,
+        ratings_sum=review_analytics.ratings_sum,
+        comments_count=review_analytics.comments_count,
+        histogram=[review_analytics.stars_1_count, review_analytics.stars_2_count, review_analytics.stars_3_count,
+                   review_analytics.stars_4_count, review_analytics.stars_5_count],
+    )
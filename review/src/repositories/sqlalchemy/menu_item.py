@@ -1,12 +1,12 @@
 from dataclasses import asdict
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from loguru import logger
-from sqlalchemy import delete, insert, select, Select, Insert, Delete, func
+from sqlalchemy import delete, insert, select, Select, Insert, Delete
 
-from db.sqlalchemy.models import MenuItem, Review
+from db.sqlalchemy.models import MenuItem, RatingAggregate
 from models.menu_item import MenuItemCreateModel, MenuItemModel
-from models.rating import RatingModel
+from models.rating import RatingModel, RatingEntityType
 from repositories.interfaces.menu_item import IMenuItemRepository
 from repositories.sqlalchemy.base import SqlAlchemyRepository
 from repositories.sqlalchemy.mappers import to_menu_item_model
@@ -32,19 +32,18 @@ class MenuItemRepository(IMenuItemRepository, SqlAlchemyRepository):
 
     def _get_retrieve_menu_item_rating_stmt(self, menu_item_id: int) -> Select:
         """
-        Create a SELECT statement to retrieve a menu item rating by its ID.
+        Create a SELECT statement to retrieve running aggregates of ratings of a menu item.
 
         Args:
-            menu_item_id (int): The ID of the menu item to retrieve.
+            menu_item_id (int): The ID of the menu item.
 
         Returns:
-            Select: The SELECT statement to retrieve the menu item rating.
+            Select: The SELECT statement to retrieve the reviews count and the sum of ratings.
         """
 
-        return select(
-            func.count(Review.id).label('reviews_count'),
-            func.avg(Review.rating).label('average_rating')
-        ).where(Review.menu_item_id == menu_item_id)
+        return select(RatingAggregate.reviews_count, RatingAggregate.ratings_sum) \
+            .where(RatingAggregate.entity_type == RatingEntityType.menu_item.value,
+                   RatingAggregate.entity_id == menu_item_id)
 
     def _get_create_stmt(self, menu_item: MenuItemCreateModel) -> Insert:
         """
@@ -85,14 +84,17 @@ class MenuItemRepository(IMenuItemRepository, SqlAlchemyRepository):
         stmt = self._get_retrieve_menu_item_rating_stmt(menu_item_id)
         result = await self._session.execute(stmt)
 
-        result = result.one()
+        result = result.one_or_none()
 
         logger.debug(f"Retrieved menu item rating for menu item with id={menu_item_id}")
 
+        if not result or not result.reviews_count:
+            return RatingModel(id=menu_item_id, rating=0, reviews_count=0)
+
         return RatingModel(
             id=menu_item_id,
-            rating=result[1] if result[1] else 0,
-            reviews_count=result[0],
+            rating=result.ratings_sum / result.reviews_count,
+            reviews_count=result.reviews_count,
         )
 
     async def create(self, menu_item: MenuItemCreateModel) -> MenuItemModel:
@@ -104,6 +106,26 @@ class MenuItemRepository(IMenuItemRepository, SqlAlchemyRepository):
 
         return to_menu_item_model(menu_item)
 
+    async def upsert(self, menu_item: MenuItemCreateModel, version: int) -> bool:
+        stmt = self._get_upsert_stmt(MenuItem)
+        result = await self._session.execute(stmt, {**asdict(menu_item), 'version': version})
+
+        logger.debug(f"Upserted menu item with id={menu_item.id} and version={version}")
+
+        return bool(result.rowcount)
+
+    async def upsert_many(self, menu_items: List[Tuple[MenuItemCreateModel, int]]) -> None:
+        if not menu_items:
+            return
+
+        # Only the last version of a menu item is written
+        data = {menu_item.id: {**asdict(menu_item), 'version': version} for menu_item, version in menu_items}
+
+        stmt = self._get_upsert_stmt(MenuItem)
+        await self._session.execute(stmt, list(data.values()))
+
+        logger.debug(f"Upserted {len(data)} menu items")
+
     async def delete(self, id: int) -> None:
         stmt = self._get_delete_stmt(id)
         await self._session.execute(stmt)
@@ -1,5 +1,5 @@
 from dataclasses import asdict
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from loguru import logger
 from sqlalchemy import Select, select, Insert, insert, Delete, delete
@@ -73,6 +73,26 @@ class OrderRepository(IOrderRepository, SqlAlchemyRepository):
 
         return to_order_model(order)
 
+    async def upsert(self, order: OrderCreateModel, version: int) -> bool:
+        stmt = self._get_upsert_stmt(Order)
+        result = await self._session.execute(stmt, {**asdict(order), 'version': version})
+
+        logger.debug(f"Upserted order with id={order.id} and version={version}")
+
+        return bool(result.rowcount)
+
+    async def upsert_many(self, orders: List[Tuple[OrderCreateModel, int]]) -> None:
+        if not orders:
+            return
+
+        # Only the last version of a order is written
+        data = {order.id: {**asdict(order), 'version': version} for order, version in orders}
+
+        stmt = self._get_upsert_stmt(Order)
+        await self._session.execute(stmt, list(data.values()))
+
+        logger.debug(f"Upserted {len(data)} orders")
+
     async def delete(self, id: int) -> None:
         stmt = self._get_delete_stmt(id)
         await self._session.execute(stmt)
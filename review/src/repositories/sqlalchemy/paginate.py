@@ -0,0 +1,127 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence
+
+from sqlalchemy import Select, tuple_
+from sqlalchemy.sql import ColumnElement
+
+from exceptions.pagination import InvalidCursorError
+
+
+def encode_cursor(values: Sequence[Any], sort_order: str) -> str:
+    """
+    Encodes values of sort keys of the last row of a page into an opaque cursor.
+
+    Args:
+        values (Sequence[Any]): The values of the sort keys, the last of which is the unique ID.
+        sort_order (str): The name of the order of the listing, so the cursor isn't used with another order.
+
+    Returns:
+        str: The cursor.
+    """
+
+    values = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    payload = {'sort_order': sort_order, 'values': values}
+
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode('utf-8')) \
+        .decode('ascii').rstrip('=')
+
+
+def _decode_value(key: ColumnElement, value: Any, cursor: str) -> Any:
+    """
+    Converts a decoded value of a sort key to the python type of the key.
+
+    Args:
+        key (ColumnElement): The sort key.
+        value (Any): The decoded value.
+        cursor (str): The cursor.
+
+    Returns:
+        Any: The value of the sort key.
+
+    Raises:
+        InvalidCursorError: If the value doesn't match the type of the key.
+    """
+
+    python_type = key.type.python_type
+
+    if python_type is datetime:
+        try:
+            return datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            raise InvalidCursorError(cursor)
+
+    if type(value) is not python_type:
+        raise InvalidCursorError(cursor)
+
+    return value
+
+
+def decode_cursor(cursor: str, sort_keys: Sequence[ColumnElement], sort_order: str) -> List[Any]:
+    """
+    Decodes values of sort keys from a cursor.
+
+    Orders may share sort keys and differ only in direction, so the cursor must have been made
+    for the same order, otherwise its page would skip or repeat rows.
+
+    Args:
+        cursor (str): The cursor.
+        sort_keys (Sequence[ColumnElement]): The sort keys.
+        sort_order (str): The name of the order of the listing.
+
+    Returns:
+        List[Any]: The values of the sort keys.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or was made for another order.
+    """
+
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except ValueError:
+        raise InvalidCursorError(cursor)
+
+    if not isinstance(payload, dict) or payload.get('sort_order') != sort_order:
+        raise InvalidCursorError(cursor)
+
+    values = payload.get('values')
+
+    if not isinstance(values, list) or len(values) != len(sort_keys):
+        raise InvalidCursorError(cursor)
+
+    return [_decode_value(key, value, cursor) for key, value in zip(sort_keys, values)]
+
+
+def get_keyset_page_stmt(query: Select, sort_keys: Sequence[ColumnElement], sort_order: str,
+                         descending: bool = False, cursor: Optional[str] = None) -> Select:
+    """
+    Create a SELECT statement of rows following the row the cursor was made from.
+
+    Rows are ordered by the sort keys and the page is found by comparing them with the cursor's values,
+    so every page costs the same as the first one if the sort keys are indexed. The values of the sort keys
+    are selected after the columns of the query, so the cursor of the next page can be made.
+
+    Args:
+        query (Select): The query.
+        sort_keys (Sequence[ColumnElement]): The sort keys, the last of which must be unique.
+        sort_order (str): The name of the order of the listing, which the cursor must have been made for.
+        descending (bool): Whether all sort keys are in descending order.
+        cursor (Optional[str]): The cursor of the previous page or None for the first page.
+
+    Returns:
+        Select: The SELECT statement without limit.
+
+    Raises:
+        InvalidCursorError: If the cursor can't be decoded or was made for another order.
+    """
+
+    page_query = query.order_by(None) \
+        .order_by(*[key.desc() if descending else key.asc() for key in sort_keys]) \
+        .add_columns(*sort_keys)
+
+    if cursor:
+        keys, values = tuple_(*sort_keys), tuple_(*decode_cursor(cursor, sort_keys, sort_order))
+        page_query = page_query.where(keys < values if descending else keys > values)
+
+    return page_query
@@ -0,0 +1,223 @@
+from typing import Dict, List, Optional
+
+from loguru import logger
+from sqlalchemy import Select, Insert, select, func
+
+from db.sqlalchemy.models import RatingAggregate, Review, Order, Restaurant, MenuItem, Courier
+from models.rating import RatingAggregateModel, RatingEntityType
+from repositories.interfaces.rating import IRatingAggregateRepository
+from repositories.sqlalchemy.base import SqlAlchemyRepository
+from repositories.sqlalchemy.mappers import to_rating_aggregate_model
+
+# Columns of the histogram of ratings from 1 to 5 stars
+STARS_COLUMNS = ['stars_1_count', 'stars_2_count', 'stars_3_count', 'stars_4_count', 'stars_5_count']
+
+# Replica tables of rated entities
+ENTITIES_MODELS = {
+    RatingEntityType.restaurant: Restaurant,
+    RatingEntityType.menu_item: MenuItem,
+    RatingEntityType.courier: Courier,
+}
+
+
+class RatingAggregateRepository(IRatingAggregateRepository, SqlAlchemyRepository):
+    """
+    SQLAlchemy implementation of the repository of running aggregates of ratings.
+    """
+
+    def _get_retrieve_stmt(self, entity_type: RatingEntityType, entity_id: int) -> Select:
+        """
+        Create a SELECT statement to retrieve aggregates of ratings of an entity.
+
+        Args:
+            entity_type (RatingEntityType): The type of the entity.
+            entity_id (int): The ID of the entity.
+
+        Returns:
+            Select: The SELECT statement to retrieve the aggregates.
+        """
+
+        return select(RatingAggregate).where(RatingAggregate.entity_type == entity_type.value,
+                                             RatingAggregate.entity_id == entity_id)
+
+    def _get_apply_stmt(self) -> Insert:
+        """
+        Create an INSERT ... ON CONFLICT DO UPDATE statement, which adds deltas to aggregates of an entity.
+
+        The aggregates are changed by a single statement, so concurrent reviews of an entity never lose updates,
+        and their version is incremented under the row lock, so versions follow the order of changes.
+
+        Returns:
+            Insert: The INSERT statement, executed with the entity and the deltas of all columns.
+        """
+
+        table = RatingAggregate.__table__
+        stmt = self._get_dialect_insert_stmt(table).values(version=1)
+        columns = ['reviews_count', 'ratings_sum', *STARS_COLUMNS]
+
+        return stmt.on_conflict_do_update(
+            index_elements=[table.c.entity_type, table.c.entity_id],
+            set_={**{column: table.c[column] + stmt.excluded[column] for column in columns},
+                  'version': table.c.version + 1},
+        ).returning(*table.columns)
+
+    def _get_replace_stmt(self) -> Insert:
+        """
+        Create an INSERT ... ON CONFLICT DO UPDATE statement, which overwrites aggregates of entities
+        and increments their versions.
+
+        Returns:
+            Insert: The INSERT statement, executed with the aggregates of every entity.
+        """
+
+        table = RatingAggregate.__table__
+        stmt = self._get_dialect_insert_stmt(table).values(version=1)
+        columns = [column.name for column in table.columns if not column.primary_key and column.name != 'version']
+
+        return stmt.on_conflict_do_update(
+            index_elements=[table.c.entity_type, table.c.entity_id],
+            set_={**{column: stmt.excluded[column] for column in columns}, 'version': table.c.version + 1},
+        ).returning(*table.columns)
+
+    def _get_list_entity_ids_stmt(self, entity_type: RatingEntityType, after_id: Optional[int] = None,
+                                  limit: int = 1000) -> Select:
+        """
+        Create a SELECT statement to retrieve a batch of IDs of entities in ascending order.
+
+        Args:
+            entity_type (RatingEntityType): The type of the entities.
+            after_id (Optional[int]): The ID after which entities are retrieved.
+            limit (int): The maximum number of IDs.
+
+        Returns:
+            Select: The SELECT statement to retrieve the IDs.
+        """
+
+        model = ENTITIES_MODELS[entity_type]
+        stmt = select(model.id).order_by(model.id).limit(limit)
+
+        if after_id is not None:
+            stmt = stmt.where(model.id > after_id)
+
+        return stmt
+
+    def _get_list_for_update_stmt(self, entity_type: RatingEntityType, entity_ids: List[int]) -> Select:
+        """
+        Create a SELECT ... FOR UPDATE statement to retrieve and lock aggregates of entities.
+
+        Aggregates are locked in ascending order of entities, so concurrent reconciliations don't deadlock.
+
+        Args:
+            entity_type (RatingEntityType): The type of the entities.
+            entity_ids (List[int]): The IDs of the entities.
+
+        Returns:
+            Select: The SELECT statement to retrieve and lock the aggregates.
+        """
+
+        return select(RatingAggregate) \
+            .where(RatingAggregate.entity_type == entity_type.value, RatingAggregate.entity_id.in_(entity_ids)) \
+            .order_by(RatingAggregate.entity_id) \
+            .with_for_update()
+
+    def _get_compute_many_stmt(self, entity_type: RatingEntityType, entity_ids: List[int]) -> Select:
+        """
+        Create a SELECT statement to compute aggregates of entities from all their reviews.
+
+        Ratings of couriers are ratings of reviews of orders they have delivered.
+
+        Args:
+            entity_type (RatingEntityType): The type of the entities.
+            entity_ids (List[int]): The IDs of the entities.
+
+        Returns:
+            Select: The SELECT statement of the ID of every entity and its aggregates.
+        """
+
+        if entity_type == RatingEntityType.courier:
+            entity_id = Order.courier_id
+            stmt = select(entity_id).select_from(Review).join(Order)
+        else:
+            entity_id = Review.restaurant_id if entity_type == RatingEntityType.restaurant else Review.menu_item_id
+            stmt = select(entity_id)
+
+        return stmt.add_columns(
+            func.count(Review.id).label('reviews_count'),
+            func.sum(Review.rating).label('ratings_sum'),
+            *[func.count(Review.id).filter(Review.rating == stars).label(column)
+              for stars, column in enumerate(STARS_COLUMNS, start=1)]
+        ).where(entity_id.in_(entity_ids)).group_by(entity_id)
+
+    async def retrieve(self, entity_type: RatingEntityType, entity_id: int) -> Optional[RatingAggregateModel]:
+        stmt = self._get_retrieve_stmt(entity_type, entity_id)
+        result = await self._session.execute(stmt)
+        rating_aggregate = result.scalar_one_or_none()
+
+        if rating_aggregate:
+            logger.debug(f"Retrieved rating aggregates of {entity_type.value} with id={entity_id}")
+            return to_rating_aggregate_model(rating_aggregate)
+
+    async def apply(self, entity_type: RatingEntityType, entity_id: int,
+                    added_rating: Optional[int] = None,
+                    removed_rating: Optional[int] = None) -> RatingAggregateModel:
+        deltas: Dict[str, int] = {'reviews_count': 0, 'ratings_sum': 0, **{column: 0 for column in STARS_COLUMNS}}
+
+        for rating, sign in ((added_rating, 1), (removed_rating, -1)):
+            if rating is not None:
+                deltas['reviews_count'] += sign
+                deltas['ratings_sum'] += sign * rating
+                deltas[STARS_COLUMNS[rating - 1]] += sign
+
+        stmt = self._get_apply_stmt()
+        result = await self._session.execute(stmt, {'entity_type': entity_type.value, 'entity_id': entity_id,
+                                                    **deltas})
+        rating_aggregate = result.one()
+
+        logger.debug(f"Applied rating deltas to {entity_type.value} with id={entity_id}")
+
+        return to_rating_aggregate_model(rating_aggregate)
+
+    async def list_entity_ids(self, entity_type: RatingEntityType, after_id: Optional[int] = None,
+                              limit: int = 1000) -> List[int]:
+        stmt = self._get_list_entity_ids_stmt(entity_type, after_id, limit)
+        result = await self._session.scalars(stmt)
+
+        return list(result)
+
+    async def list_for_update(self, entity_type: RatingEntityType,
+                              entity_ids: List[int]) -> List[RatingAggregateModel]:
+        stmt = self._get_list_for_update_stmt(entity_type, entity_ids)
+        result = await self._session.scalars(stmt)
+
+        return [to_rating_aggregate_model(rating_aggregate) for rating_aggregate in result]
+
+    async def compute_many(self, entity_type: RatingEntityType,
+                           entity_ids: List[int]) -> List[RatingAggregateModel]:
+        if not entity_ids:
+            return []
+
+        stmt = self._get_compute_many_stmt(entity_type, entity_ids)
+        result = await self._session.execute(stmt)
+
+        logger.debug(f"Computed rating aggregates of {len(entity_ids)} {entity_type.value} entities")
+
+        return [RatingAggregateModel(entity_type=entity_type, entity_id=row[0], reviews_count=row.reviews_count,
+                                     ratings_sum=row.ratings_sum,
+                                     histogram=[getattr(row, column) for column in STARS_COLUMNS])
+                for row in result]
+
+    async def replace_many(self, aggregates: List[RatingAggregateModel]) -> List[RatingAggregateModel]:
+        if not aggregates:
+            return []
+
+        stmt = self._get_replace_stmt()
+        result = await self._session.execute(stmt, [{'entity_type': aggregate.entity_type.value,
+                                                     'entity_id': aggregate.entity_id,
+                                                     'reviews_count': aggregate.reviews_count,
+                                                     'ratings_sum': aggregate.ratings_sum,
+                                                     **dict(zip(STARS_COLUMNS, aggregate.histogram))}
+                                                    for aggregate in aggregates])
+
+        logger.debug(f"Replaced {len(aggregates)} rating aggregates")
+
+        return [to_rating_aggregate_model(rating_aggregate) for rating_aggregate in result]
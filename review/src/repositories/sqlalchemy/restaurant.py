@@ -1,11 +1,11 @@
 from dataclasses import asdict
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from loguru import logger
-from sqlalchemy import insert, select, delete, update, Delete, Update, Insert, Select, func
+from sqlalchemy import insert, select, delete, update, Delete, Update, Insert, Select
 
-from db.sqlalchemy.models import Restaurant, Review
-from models.rating import RatingModel
+from db.sqlalchemy.models import Restaurant, RatingAggregate
+from models.rating import RatingModel, RatingEntityType
 from models.restaurant import RestaurantCreateModel, RestaurantModel, RestaurantUpdateModel
 from repositories.interfaces.mixins import UpdateModel, Model
 from repositories.interfaces.restaurant import IRestaurantRepository
@@ -33,19 +33,18 @@ class RestaurantRepository(IRestaurantRepository, SqlAlchemyRepository):
 
     def _get_retrieve_restaurant_rating_stmt(self, restaurant_id: int) -> Select:
         """
-        Create a SELECT statement to retrieve a restaurant rating by its ID.
+        Create a SELECT statement to retrieve running aggregates of ratings of a restaurant.
 
         Args:
-            restaurant_id (int): The ID of the restaurant to retrieve.
+            restaurant_id (int): The ID of the restaurant.
 
         Returns:
-            Select: The SELECT statement to retrieve the restaurant rating.
+            Select: The SELECT statement to retrieve the reviews count and the sum of ratings.
         """
 
-        return select(
-                    func.count(Review.id).label('reviews_count'),
-                    func.avg(Review.rating).label('average_rating')
-                ).where(Review.restaurant_id == restaurant_id)
+        return select(RatingAggregate.reviews_count, RatingAggregate.ratings_sum) \
+            .where(RatingAggregate.entity_type == RatingEntityType.restaurant.value,
+                   RatingAggregate.entity_id == restaurant_id)
 
     def _get_create_stmt(self, restaurant: RestaurantCreateModel) -> Insert:
         """
@@ -100,14 +99,17 @@ class RestaurantRepository(IRestaurantRepository, SqlAlchemyRepository):
         stmt = self._get_retrieve_restaurant_rating_stmt(restaurant_id)
         result = await self._session.execute(stmt)
 
-        result = result.one()
+        result = result.one_or_none()
 
         logger.debug(f"Retrieved restaurant rating for restaurant with id={restaurant_id}")
 
+        if not result or not result.reviews_count:
+            return RatingModel(id=restaurant_id, rating=0, reviews_count=0)
+
         return RatingModel(
             id=restaurant_id,
-            rating=result[1] if result[1] else 0,
-            reviews_count=result[0],
+            rating=result.ratings_sum / result.reviews_count,
+            reviews_count=result.reviews_count,
         )
 
     async def create(self, restaurant: RestaurantCreateModel) -> RestaurantModel:
@@ -128,6 +130,26 @@ class RestaurantRepository(IRestaurantRepository, SqlAlchemyRepository):
             logger.debug(f"Updated restaurant with id={restaurant.id}")
             return to_restaurant_model(restaurant)
 
+    async def upsert(self, restaurant: RestaurantCreateModel, version: int) -> bool:
+        stmt = self._get_upsert_stmt(Restaurant)
+        result = await self._session.execute(stmt, {**asdict(restaurant), 'version': version})
+
+        logger.debug(f"Upserted restaurant with id={restaurant.id} and version={version}")
+
+        return bool(result.rowcount)
+
+    async def upsert_many(self, restaurants: List[Tuple[RestaurantCreateModel, int]]) -> None:
+        if not restaurants:
+            return
+
+        # Only the last version of a restaurant is written
+        data = {restaurant.id: {**asdict(restaurant), 'version': version} for restaurant, version in restaurants}
+
+        stmt = self._get_upsert_stmt(Restaurant)
+        await self._session.execute(stmt, list(data.values()))
+
+        logger.debug(f"Upserted {len(data)} restaurants")
+
     async def delete(self, id: int) -> None:
         stmt = self._get_delete_stmt(id)
         await self._session.execute(stmt)
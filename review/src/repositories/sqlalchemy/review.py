@@ -1,15 +1,29 @@
 from dataclasses import asdict
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 from loguru import logger
-from sqlalchemy import Delete, delete, update, insert, Insert, Update, Select, select
+from sqlalchemy import Delete, delete, update, Insert, Update, Select, select
 from sqlalchemy.orm import selectinload
+from sqlalchemy.sql import ColumnElement
 
 from db.sqlalchemy.models import Review, Order, Customer
-from models.review import ReviewUpdateModel, ReviewModel, ReviewCreateModel
+from models.review import ReviewUpdateModel, ReviewModel, ReviewCreateModel, ReviewPageModel, ReviewSortOrder
 from repositories.interfaces.review import IReviewRepository
 from repositories.sqlalchemy.base import SqlAlchemyRepository
-from repositories.sqlalchemy.mappers import to_review_model
+from repositories.sqlalchemy.mappers import to_review_model, to_review_list_item_model
+from repositories.sqlalchemy.paginate import encode_cursor, get_keyset_page_stmt
+
+# Columns of reviews and their customers in listings of reviews
+LIST_COLUMNS = (
+    Review.id,
+    Review.rating,
+    Review.comment,
+    Review.customer_id,
+    Customer.full_name.label('customer_full_name'),
+    Customer.image_url.label('customer_image_url'),
+    Review.order_id,
+    Review.created_at,
+)
 
 
 class ReviewRepository(IReviewRepository, SqlAlchemyRepository):
@@ -83,9 +97,57 @@ class ReviewRepository(IReviewRepository, SqlAlchemyRepository):
         return (self._get_base_retrieve_stmt().
                 where(Review.customer_id == customer_id, Review.menu_item_id == menu_item_id))
 
+    def _get_base_list_stmt(self) -> Select:
+        """
+        Create a base SELECT statement to list reviews.
+
+        Only the columns of a listed review and its customer are selected.
+
+        Returns:
+            Select: The base SELECT statement to list reviews.
+        """
+
+        return select(*LIST_COLUMNS).join(Customer, Review.customer_id == Customer.id)
+
+    def _get_sort_keys(self, sort_order: ReviewSortOrder) -> Tuple[List[ColumnElement], bool]:
+        """
+        Get the sort keys of a listing of reviews.
+
+        The keys of every parent are covered by the indexes of reviews by the parent ID, creation time and ID
+        and by the parent ID, rating, creation time and ID.
+
+        Args:
+            sort_order (ReviewSortOrder): The order of reviews.
+
+        Returns:
+            Tuple[List[ColumnElement], bool]: The sort keys and whether they are in descending order.
+        """
+
+        if sort_order == ReviewSortOrder.newest:
+            return [Review.created_at, Review.id], True
+
+        return [Review.rating, Review.created_at, Review.id], sort_order == ReviewSortOrder.highest
+
+    def _get_list_page_stmt(self, stmt: Select, sort_order: ReviewSortOrder, cursor: Optional[str] = None) -> Select:
+        """
+        Create a SELECT statement to list a page of reviews.
+
+        Args:
+            stmt (Select): The SELECT statement to list reviews.
+            sort_order (ReviewSortOrder): The order of reviews.
+            cursor (Optional[str]): The cursor returned with the previous page or None for the first page.
+
+        Returns:
+            Select: The SELECT statement to list the page without limit.
+        """
+
+        sort_keys, descending = self._get_sort_keys(sort_order)
+
+        return get_keyset_page_stmt(stmt, sort_keys, sort_order.value, descending=descending, cursor=cursor)
+
     def _get_list_courier_reviews_stmt(self, courier_id: int) -> Select:
         """
-        Create a SELECT statement to list all reviews for a courier.
+        Create a SELECT statement to list reviews for a courier.
 
         Args:
             courier_id (int): The ID of the courier.
@@ -94,11 +156,11 @@ class ReviewRepository(IReviewRepository, SqlAlchemyRepository):
             Select: The SELECT statement to list the reviews.
         """
 
-        return self._get_base_retrieve_stmt().join(Order).where(Order.courier_id == courier_id)
+        return self._get_base_list_stmt().join(Order, Review.order_id == Order.id).where(Order.courier_id == courier_id)
 
     def _get_list_restaurant_reviews_stmt(self, restaurant_id: int) -> Select:
         """
-        Create a SELECT statement to list all reviews for a restaurant.
+        Create a SELECT statement to list reviews for a restaurant.
 
         Args:
             restaurant_id (int): The ID of the restaurant.
@@ -107,11 +169,11 @@ class ReviewRepository(IReviewRepository, SqlAlchemyRepository):
             Select: The SELECT statement to list the reviews.
         """
 
-        return self._get_base_retrieve_stmt().where(Review.restaurant_id == restaurant_id)
+        return self._get_base_list_stmt().where(Review.restaurant_id == restaurant_id)
 
     def _get_list_menu_item_reviews_stmt(self, menu_item_id: int) -> Select:
         """
-        Create a SELECT statement to list all reviews for a menu item.
+        Create a SELECT statement to list reviews for a menu item.
 
         Args:
             menu_item_id (int): The ID of the menu item.
@@ -120,11 +182,14 @@ class ReviewRepository(IReviewRepository, SqlAlchemyRepository):
             Select: The SELECT statement to list the reviews.
         """
 
-        return self._get_base_retrieve_stmt().where(Review.menu_item_id == menu_item_id)
+        return self._get_base_list_stmt().where(Review.menu_item_id == menu_item_id)
 
     def _get_create_stmt(self, review: ReviewCreateModel) -> Insert:
         """
-        Create an INSERT statement to add a new review.
+        Create an INSERT ... ON CONFLICT DO NOTHING statement to add a new review.
+
+        A second review of an order, or of a restaurant or a menu item by the same customer, conflicts with
+        a unique index, so it is not inserted and nothing is returned.
 
         Args:
             review (ReviewCreateModel): The dataclass containing the data to add.
@@ -133,7 +198,8 @@ class ReviewRepository(IReviewRepository, SqlAlchemyRepository):
             Insert: The INSERT statement to add the new review.
         """
 
-        return insert(Review).values(asdict(review)).returning(Review).options(selectinload(Review.customer))
+        return self._get_dialect_insert_stmt(Review).values(asdict(review)).on_conflict_do_nothing() \
+            .returning(Review).options(selectinload(Review.customer))
 
     def _get_update_stmt(self, id: int, review: ReviewUpdateModel) -> Update:
         """
@@ -198,41 +264,68 @@ class ReviewRepository(IReviewRepository, SqlAlchemyRepository):
             logger.debug(f"Retrieved review with id={review.id}")
             return to_review_model(review)
 
-    async def list_courier_reviews(self, courier_id: int) -> List[ReviewModel]:
+    async def _list_page(self, stmt: Select, sort_order: ReviewSortOrder, limit: int,
+                         cursor: Optional[str] = None) -> ReviewPageModel:
+        """
+        List a page of reviews.
+
+        Args:
+            stmt (Select): The SELECT statement to list reviews.
+            sort_order (ReviewSortOrder): The order of reviews.
+            limit (int): The maximum number of reviews in the page.
+            cursor (Optional[str]): The cursor returned with the previous page or None for the first page.
+
+        Returns:
+            ReviewPageModel: The page of reviews.
+        """
+
+        stmt = self._get_list_page_stmt(stmt, sort_order, cursor)
+        result = await self._session.execute(stmt.limit(limit + 1))
+        rows = result.all()
+        # Values of the sort keys follow the listed columns
+        next_cursor = encode_cursor(rows[limit - 1][len(LIST_COLUMNS):], sort_order.value) \
+            if len(rows) > limit else None
+
+        return ReviewPageModel(items=[to_review_list_item_model(row) for row in rows[:limit]],
+                               next_cursor=next_cursor)
+
+    async def list_courier_reviews(self, courier_id: int, sort_order: ReviewSortOrder = ReviewSortOrder.newest,
+                                   limit: int = 20, cursor: Optional[str] = None) -> ReviewPageModel:
         stmt = self._get_list_courier_reviews_stmt(courier_id)
-        result = await self._session.execute(stmt)
-        reviews = result.scalars().all()
+        page = await self._list_page(stmt, sort_order, limit, cursor)
 
-        logger.debug(f"Retrieved list of courier reviews with courier_id={courier_id}")
+        logger.debug(f"Retrieved page of courier reviews with courier_id={courier_id}")
 
-        return [to_review_model(review) for review in reviews]
+        return page
 
-    async def list_restaurant_reviews(self, restaurant_id: int) -> List[ReviewModel]:
+    async def list_restaurant_reviews(self, restaurant_id: int, sort_order: ReviewSortOrder = ReviewSortOrder.newest,
+                                      limit: int = 20, cursor: Optional[str] = None) -> ReviewPageModel:
         stmt = self._get_list_restaurant_reviews_stmt(restaurant_id)
-        result = await self._session.execute(stmt)
-        reviews = result.scalars().all()
+        page = await self._list_page(stmt, sort_order, limit, cursor)
 
-        logger.debug(f"Retrieved list of restaurant reviews with restaurant_id={restaurant_id}")
+        logger.debug(f"Retrieved page of restaurant reviews with restaurant_id={restaurant_id}")
 
-        return [to_review_model(review) for review in reviews]
+        return page
 
-    async def list_menu_item_reviews(self, menu_item_id: int) -> List[ReviewModel]:
+    async def list_menu_item_reviews(self, menu_item_id: int, sort_order: ReviewSortOrder = ReviewSortOrder.newest,
+                                     limit: int = 20, cursor: Optional[str] = None) -> ReviewPageModel:
         stmt = self._get_list_menu_item_reviews_stmt(menu_item_id)
-        result = await self._session.execute(stmt)
-        reviews = result.scalars().all()
+        page = await self._list_page(stmt, sort_order, limit, cursor)
 
-        logger.debug(f"Retrieved list of menu item reviews with menu_item_id={menu_item_id}")
+        logger.debug(f"Retrieved page of menu item reviews with menu_item_id={menu_item_id}")
 
-        return [to_review_model(review) for review in reviews]
+        return page
 
-    async def create(self, review: ReviewCreateModel) -> ReviewModel:
+    async def create(self, review: ReviewCreateModel) -> Optional[ReviewModel]:
         stmt = self._get_create_stmt(review)
         result = await self._session.execute(stmt)
-        review = result.scalar_one()
+        created_review = result.scalar_one_or_none()
 
-        logger.debug(f"Created review with id={review.id}")
+        if created_review:
+            logger.debug(f"Created review with id={created_review.id}")
+            return to_review_model(created_review)
 
-        return to_review_model(review)
+        logger.debug(f"Review of customer with id={review.customer_id} already exists")
 
     async def update(self, id: int, review: ReviewUpdateModel) -> Optional[ReviewModel]:
         stmt = self._get_update_stmt(id, review)
@@ -241,11 +334,6 @@ class ReviewRepository(IReviewRepository, SqlAlchemyRepository):
 
         if review:
             logger.debug(f"Updated review with id={id}")
-
-            stmt = self._get_retrieve_stmt(review.id)
-            result = await self._session.execute(stmt)
-            review = result.scalar_one()
-
             return to_review_model(review)
 
     async def delete(self, id: int) -> None:
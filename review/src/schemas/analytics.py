@@ -0,0 +1,38 @@
+from datetime import date
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class ReviewAnalyticsBaseSchema(BaseModel):
+    """
+    Base schema class for aggregated reviews of a restaurant.
+    """
+
+    reviews_count: int = Field(ge=0, examples=[120])
+    average_rating: float = Field(ge=0, le=5, examples=[4.2])
+    comments_count: int = Field(ge=0, examples=[45])
+    histogram: List[int] = Field(description="Number of ratings with 1 to 5 stars", examples=[[5, 5, 10, 40, 60]])
+
+
+class ReviewAnalyticsDayOutSchema(ReviewAnalyticsBaseSchema):
+    """
+    Schema class for output representation of reviews of a restaurant created in a day.
+    """
+
+    date: date
+
+    model_config = {
+        "from_attributes": True
+    }
+
+
+class ReviewAnalyticsOutSchema(ReviewAnalyticsBaseSchema):
+    """
+    Schema class for output representation of analytics of reviews of a restaurant in a range of days.
+    """
+
+    restaurant_id: int = Field(ge=0, examples=[1, 2, 3, 4, 5])
+    date_from: date
+    date_to: date
+    days: List[ReviewAnalyticsDayOutSchema] = Field(description="Days with reviews in ascending order")
@@ -0,0 +1,45 @@
+from pydantic import BaseModel
+
+
+class DatabasePoolMetricsOutSchema(BaseModel):
+    """
+    Schema for output representation of database connection pool metrics
+    """
+
+    pools: int
+    size: int
+    checked_out: int
+    idle: int
+    overflow: int
+    waiters: int
+    checkouts: int
+    timeouts: int
+    wait_time_avg_seconds: float
+    wait_time_max_seconds: float
+
+
+class KafkaPublisherMetricsOutSchema(BaseModel):
+    """
+    Schema for output representation of Kafka publisher metrics
+    """
+
+    enqueued: int
+    dropped: int
+    sent: int
+    delivered: int
+    failed: int
+    delivery_time_avg_seconds: float
+    delivery_time_max_seconds: float
+
+
+class KafkaPublisherCoalescingMetricsOutSchema(BaseModel):
+    """
+    Schema for output representation of metrics of coalescing of Kafka publisher events
+    """
+
+    received: int
+    superseded: int
+    emitted: int
+    pending: int
+    flushes: int
+    coalescing_ratio: float
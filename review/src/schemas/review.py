@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -32,6 +32,41 @@ class ReviewRetrieveOutSchema(ReviewBaseSchema):
     }
 
 
+class ReviewListItemOutSchema(ReviewBaseSchema):
+    """
+    Schema class for output representation of a review in a listing of reviews of an entity.
+    """
+
+    id: int = Field(ge=0, examples=[1, 2, 3, 4, 5])
+    customer_id: int = Field(ge=0, examples=[1, 2, 3, 4, 5])
+    customer_full_name: str = Field(max_length=255, examples=["John Doe", "Bill Clinton"])
+    customer_image_url: Optional[str] = Field(max_length=255, examples=["https://example.com/image.jpg"])
+    order_id: Optional[int] = Field(ge=0, examples=[1, 2, 3, 4, 5])
+    created_at: datetime = Field(examples=[datetime.now()])
+
+    model_config = {
+        "from_attributes": True
+    }
+
+
+class ReviewPageOutSchema(BaseModel):
+    """
+    Schema class for output representation of a page of reviews.
+
+    Listings of reviews of couriers, restaurants and menu items return a page
+    `{"items": [...], "next_cursor": "..."}` instead of a list of reviews. The next page is requested
+    with `cursor=<next_cursor>` and the same `sort_order`, a cursor of another order is rejected with 400.
+    """
+
+    items: List[ReviewListItemOutSchema] = Field(description="Reviews of the page")
+    next_cursor: Optional[str] = Field(default=None, description="Cursor of the next page, "
+                                                                 "null if it is the last page")
+
+    model_config = {
+        "from_attributes": True
+    }
+
+
 class ReviewCreateInSchema(ReviewBaseSchema):
     """
     Schema class for input data when creating a review.
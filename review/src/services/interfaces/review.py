@@ -1,25 +1,33 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import date
+from typing import Optional
 
+from models.review import ReviewSortOrder
+from schemas.analytics import ReviewAnalyticsOutSchema
 from schemas.rating import RatingRetrieveOutSchema
 from schemas.review import ReviewCreateInSchema, ReviewUpdateInSchema, ReviewCreateOutSchema, ReviewUpdateOutSchema, \
-    ReviewRetrieveOutSchema
+    ReviewRetrieveOutSchema, ReviewPageOutSchema
 from uow.generic import GenericUnitOfWork
 
 
 class IReviewService(ABC):
 
     @abstractmethod
-    async def get_courier_reviews(self, courier_id: int, uow: GenericUnitOfWork) -> List[ReviewRetrieveOutSchema]:
+    async def get_courier_reviews(self, courier_id: int, uow: GenericUnitOfWork,
+                                  sort_order: ReviewSortOrder = ReviewSortOrder.newest, limit: int = 20,
+                                  cursor: Optional[str] = None) -> ReviewPageOutSchema:
         """
-        Get all reviews for a courier.
+        Get a page of reviews for a courier.
 
         Args:
             courier_id (int): The ID of the courier.
             uow (GenericUnitOfWork): The unit of work instance.
+            sort_order (ReviewSortOrder): The order of reviews.
+            limit (int): The maximum number of reviews in the page.
+            cursor (Optional[str]): The cursor returned with the previous page or None for the first page.
 
         Returns:
-            List[ReviewRetrieveOutSchema]: The list of reviews.
+            ReviewPageOutSchema: The page of reviews.
         """
 
         raise NotImplementedError
@@ -56,16 +64,40 @@ class IReviewService(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    async def get_restaurant_reviews(self, restaurant_id: int, uow: GenericUnitOfWork) -> List[ReviewRetrieveOutSchema]:
+    async def get_restaurant_reviews(self, restaurant_id: int, uow: GenericUnitOfWork,
+                                     sort_order: ReviewSortOrder = ReviewSortOrder.newest, limit: int = 20,
+                                     cursor: Optional[str] = None) -> ReviewPageOutSchema:
         """
-        Get all reviews for a restaurant.
+        Get a page of reviews for a restaurant.
 
         Args:
             restaurant_id (int): The ID of the restaurant.
             uow (GenericUnitOfWork): The unit of work instance.
+            sort_order (ReviewSortOrder): The order of reviews.
+            limit (int): The maximum number of reviews in the page.
+            cursor (Optional[str]): The cursor returned with the previous page or None for the first page.
 
         Returns:
-            List[ReviewRetrieveOutSchema]: The list of reviews.
+            ReviewPageOutSchema: The page of reviews.
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_restaurant_review_analytics(self, restaurant_id: int, uow: GenericUnitOfWork,
+                                              date_from: Optional[date] = None,
+                                              date_to: Optional[date] = None) -> ReviewAnalyticsOutSchema:
+        """
+        Get analytics of reviews of a restaurant by days the reviews were created.
+
+        Args:
+            restaurant_id (int): The ID of the restaurant.
+            uow (GenericUnitOfWork): The unit of work instance.
+            date_from (Optional[date]): The first day, the range has 30 days by default.
+            date_to (Optional[date]): The last day, the current UTC day by default.
+
+        Returns:
+            ReviewAnalyticsOutSchema: The analytics of the range of days and of every day with reviews.
         """
 
         raise NotImplementedError
@@ -87,16 +119,21 @@ class IReviewService(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    async def get_menu_item_reviews(self, menu_item_id: int, uow: GenericUnitOfWork) -> List[ReviewRetrieveOutSchema]:
+    async def get_menu_item_reviews(self, menu_item_id: int, uow: GenericUnitOfWork,
+                                    sort_order: ReviewSortOrder = ReviewSortOrder.newest, limit: int = 20,
+                                    cursor: Optional[str] = None) -> ReviewPageOutSchema:
         """
-        Get all reviews for a menu item.
+        Get a page of reviews for a menu item.
 
         Args:
             menu_item_id (int): The ID of the menu item.
             uow (GenericUnitOfWork): The unit of work instance.
+            sort_order (ReviewSortOrder): The order of reviews.
+            limit (int): The maximum number of reviews in the page.
+            cursor (Optional[str]): The cursor returned with the previous page or None for the first page.
 
         Returns:
-            List[ReviewRetrieveOutSchema]: The list of reviews.
+            ReviewPageOutSchema: The page of reviews.
         """
 
         raise NotImplementedError
@@ -1,8 +1,10 @@
 from dataclasses import asdict
-from typing import List, Optional
+from datetime import date, datetime, timedelta
+from typing import Optional
 
 from loguru import logger
 
+from exceptions.analytics import InvalidDateRangeError
 from exceptions.base import PermissionDeniedError
 from exceptions.courier import CourierOwnershipError, CourierNotFoundError
 from exceptions.customer import CustomerOwnershipError
@@ -13,15 +15,21 @@ from exceptions.review import ReviewAlreadyExistsError, ReviewNotFoundError
 from kafka_files.producer.events import MenuItemRatingUpdatedEvent, RestaurantRatingUpdatedEvent
 from models.courier import CourierModel
 from models.customer import CustomerModel
-from models.review import ReviewCreateModel, ReviewUpdateModel
+from models.rating import RatingEntityType
+from models.review import ReviewCreateModel, ReviewUpdateModel, ReviewModel, ReviewSortOrder
 from roles import CourierRole, CustomerRole
+from schemas.analytics import ReviewAnalyticsOutSchema, ReviewAnalyticsDayOutSchema
 from schemas.rating import RatingRetrieveOutSchema
 from schemas.review import ReviewUpdateInSchema, ReviewUpdateOutSchema, ReviewCreateInSchema, ReviewCreateOutSchema, \
-    ReviewRetrieveOutSchema
+    ReviewRetrieveOutSchema, ReviewPageOutSchema
 from services.interfaces.review import IReviewService
 from setup.kafka.producer.publisher import publisher
 from uow.generic import GenericUnitOfWork
 
+# Number of days of review analytics by default and at most
+ANALYTICS_DEFAULT_DAYS = 30
+ANALYTICS_MAX_DAYS = 366
+
 
 class ReviewService(IReviewService):
 
@@ -31,7 +39,9 @@ class ReviewService(IReviewService):
         self._customer = customer
         self._courier = courier
 
-    async def get_courier_reviews(self, courier_id: int, uow: GenericUnitOfWork) -> List[ReviewRetrieveOutSchema]:
+    async def get_courier_reviews(self, courier_id: int, uow: GenericUnitOfWork,
+                                  sort_order: ReviewSortOrder = ReviewSortOrder.newest, limit: int = 20,
+                                  cursor: Optional[str] = None) -> ReviewPageOutSchema:
         # Permission checks
         if not self._courier:
             logger.warning(f"User is not a courier.")
@@ -41,11 +51,11 @@ class ReviewService(IReviewService):
             logger.warning(f"User is not the courier with id={courier_id} and cannot get reviews.")
             raise CourierOwnershipError()
 
-        courier_review_models = await uow.reviews.list_courier_reviews(courier_id)
+        courier_review_page = await uow.reviews.list_courier_reviews(courier_id, sort_order, limit, cursor)
 
-        logger.info(f"Retrieved list of courier reviews with courier_id={courier_id}.")
+        logger.info(f"Retrieved page of courier reviews with courier_id={courier_id}.")
 
-        return [ReviewRetrieveOutSchema.model_validate(review) for review in courier_review_models]
+        return ReviewPageOutSchema.model_validate(courier_review_page)
 
     async def get_order_review(self, order_id: int, uow: GenericUnitOfWork) -> Optional[ReviewRetrieveOutSchema]:
 
@@ -101,7 +111,9 @@ class ReviewService(IReviewService):
 
         return ReviewRetrieveOutSchema.model_validate(customer_review)
 
-    async def get_restaurant_reviews(self, restaurant_id: int, uow: GenericUnitOfWork) -> List[ReviewRetrieveOutSchema]:
+    async def get_restaurant_reviews(self, restaurant_id: int, uow: GenericUnitOfWork,
+                                     sort_order: ReviewSortOrder = ReviewSortOrder.newest, limit: int = 20,
+                                     cursor: Optional[str] = None) -> ReviewPageOutSchema:
 
         restaurant = await uow.restaurants.retrieve(restaurant_id)
 
@@ -114,11 +126,49 @@ class ReviewService(IReviewService):
             logger.warning(f"Restaurant with id={restaurant_id} is not active.")
             raise RestaurantNotActiveError(restaurant_id)
 
-        restaurant_review_models = await uow.reviews.list_restaurant_reviews(restaurant_id)
+        restaurant_review_page = await uow.reviews.list_restaurant_reviews(restaurant_id, sort_order, limit, cursor)
+
+        logger.info(f"Retrieved page of restaurant reviews with restaurant_id={restaurant_id}.")
+
+        return ReviewPageOutSchema.model_validate(restaurant_review_page)
+
+    async def get_restaurant_review_analytics(self, restaurant_id: int, uow: GenericUnitOfWork,
+                                              date_from: Optional[date] = None,
+                                              date_to: Optional[date] = None) -> ReviewAnalyticsOutSchema:
+
+        restaurant = await uow.restaurants.retrieve(restaurant_id)
+
+        if not restaurant:
+            logger.warning(f"Restaurant with id={restaurant_id} does not exist.")
+            raise RestaurantNotFoundError(restaurant_id)
+
+        date_to = date_to or datetime.utcnow().date()
+        date_from = date_from or date_to - timedelta(days=ANALYTICS_DEFAULT_DAYS - 1)
 
-        logger.info(f"Retrieved list of restaurant reviews with restaurant_id={restaurant_id}.")
+        if date_from > date_to or (date_to - date_from).days >= ANALYTICS_MAX_DAYS:
+            logger.warning(f"Range of days from {date_from} to {date_to} is invalid.")
+            raise InvalidDateRangeError(date_from, date_to, ANALYTICS_MAX_DAYS)
 
-        return [ReviewRetrieveOutSchema.model_validate(review) for review in restaurant_review_models]
+        # Analytics are served from daily rollups only
+        days = await uow.review_analytics.list_daily(restaurant_id, date_from, date_to)
+        reviews_count = sum(day.reviews_count for day in days)
+        ratings_sum = sum(day.ratings_sum for day in days)
+
+        logger.info(f"Retrieved review analytics of restaurant with id={restaurant_id}.")
+
+        return ReviewAnalyticsOutSchema(
+            restaurant_id=restaurant_id,
+            date_from=date_from,
+            date_to=date_to,
+            reviews_count=reviews_count,
+            average_rating=ratings_sum / reviews_count if reviews_count else 0,
+            comments_count=sum(day.comments_count for day in days),
+            histogram=[sum(day.histogram[stars] for day in days) for stars in range(5)],
+            days=[ReviewAnalyticsDayOutSchema(date=day.date, reviews_count=day.reviews_count,
+                                              average_rating=day.average_rating, comments_count=day.comments_count,
+                                              histogram=day.histogram)
+                  for day in days],
+        )
 
     async def get_customer_menu_item_review(self, menu_item_id: int,
                                             uow: GenericUnitOfWork) -> Optional[ReviewRetrieveOutSchema]:
@@ -142,7 +192,9 @@ class ReviewService(IReviewService):
 
         return ReviewRetrieveOutSchema.model_validate(customer_review)
 
-    async def get_menu_item_reviews(self, menu_item_id: int, uow: GenericUnitOfWork) -> List[ReviewRetrieveOutSchema]:
+    async def get_menu_item_reviews(self, menu_item_id: int, uow: GenericUnitOfWork,
+                                    sort_order: ReviewSortOrder = ReviewSortOrder.newest, limit: int = 20,
+                                    cursor: Optional[str] = None) -> ReviewPageOutSchema:
 
         menu_item = await uow.menu_items.retrieve(menu_item_id)
 
@@ -150,11 +202,11 @@ class ReviewService(IReviewService):
             logger.warning(f"Menu item with id={menu_item_id} does not exist.")
             raise MenuItemNotFoundError(menu_item_id)
 
-        menu_item_review_models = await uow.reviews.list_menu_item_reviews(menu_item_id)
+        menu_item_review_page = await uow.reviews.list_menu_item_reviews(menu_item_id, sort_order, limit, cursor)
 
-        logger.info(f"Retrieved list of menu item reviews with menu_item_id={menu_item_id}.")
+        logger.info(f"Retrieved page of menu item reviews with menu_item_id={menu_item_id}.")
 
-        return [ReviewRetrieveOutSchema.model_validate(review) for review in menu_item_review_models]
+        return ReviewPageOutSchema.model_validate(menu_item_review_page)
 
     async def add_order_review(self, order_id: int, review: ReviewCreateInSchema,
                                uow: GenericUnitOfWork) -> ReviewCreateOutSchema:
@@ -163,13 +215,6 @@ class ReviewService(IReviewService):
             logger.warning(f"User is not a customer.")
             raise PermissionDeniedError(CustomerRole)
 
-        retrieved_review = await uow.reviews.retrieve_by_order(order_id)
-
-        # Check if review already exists
-        if retrieved_review:
-            logger.warning(f"Review with id={review.id} already exists.")
-            raise ReviewAlreadyExistsError()
-
         order = await uow.orders.retrieve(order_id)
 
         # Check if order exists
@@ -192,8 +237,14 @@ class ReviewService(IReviewService):
 
         created_review = await uow.reviews.create(review_create_model)
 
+        if not created_review:
+            logger.warning(f"Review of customer with id={self._customer.id} already exists.")
+            raise ReviewAlreadyExistsError()
+
         logger.info(f"Created review with id={created_review.id}.")
 
+        await self._update_rating(created_review, uow, added_rating=created_review.rating)
+
         return ReviewCreateOutSchema.model_validate(created_review)
 
     async def add_restaurant_review(self, restaurant_id: int, review: ReviewCreateInSchema,
@@ -215,13 +266,6 @@ class ReviewService(IReviewService):
             logger.warning(f"Restaurant with id={restaurant_id} is not active.")
             raise RestaurantNotActiveError(restaurant_id)
 
-        # Check if review already exists
-        retrieved_review = await uow.reviews.retrieve_by_customer_and_restaurant(self._customer.id, restaurant_id)
-
-        if retrieved_review:
-            logger.warning(f"Review with id={review.id} already exists.")
-            raise ReviewAlreadyExistsError()
-
         # Create review
         review_create_model = ReviewCreateModel(
             restaurant_id=restaurant_id,
@@ -231,17 +275,14 @@ class ReviewService(IReviewService):
 
         created_review = await uow.reviews.create(review_create_model)
 
+        if not created_review:
+            logger.warning(f"Review of customer with id={self._customer.id} already exists.")
+            raise ReviewAlreadyExistsError()
+
         logger.info(f"Created review with id={created_review.id}.")
 
-        restaurant_rating = await uow.restaurants.retrieve_restaurant_rating(restaurant_id)
-
-        publisher.publish(
-            RestaurantRatingUpdatedEvent(
-                id=restaurant_id,
-                rating=restaurant_rating.rating,
-                reviews_count=restaurant_rating.reviews_count
-            )
-        )
+        await self._update_rating(created_review, uow, added_rating=created_review.rating)
+        await self._update_analytics(uow, added_review=created_review)
 
         return ReviewCreateOutSchema.model_validate(created_review)
 
@@ -259,13 +300,6 @@ class ReviewService(IReviewService):
             logger.warning(f"Menu item with id={menu_item_id} does not exist.")
             raise MenuItemNotFoundError(menu_item_id)
 
-        # Check if review already exists
-        retrieved_review = await uow.reviews.retrieve_by_customer_and_menu_item(self._customer.id, menu_item_id)
-
-        if retrieved_review:
-            logger.warning(f"Review with id={review.id} already exists.")
-            raise ReviewAlreadyExistsError()
-
         # Create review
 
         review_create_model = ReviewCreateModel(
@@ -276,17 +310,13 @@ class ReviewService(IReviewService):
 
         created_review = await uow.reviews.create(review_create_model)
 
-        logger.info(f"Created review with id={created_review.id}.")
+        if not created_review:
+            logger.warning(f"Review of customer with id={self._customer.id} already exists.")
+            raise ReviewAlreadyExistsError()
 
-        menu_item_rating = await uow.menu_items.retrieve_menu_item_rating(menu_item_id)
+        logger.info(f"Created review with id={created_review.id}.")
 
-        publisher.publish(
-            MenuItemRatingUpdatedEvent(
-                id=menu_item_id,
-                rating=menu_item_rating.rating,
-                reviews_count=menu_item_rating.reviews_count
-            )
-        )
+        await self._update_rating(created_review, uow, added_rating=created_review.rating)
 
         return ReviewCreateOutSchema.model_validate(created_review)
 
@@ -319,26 +349,9 @@ class ReviewService(IReviewService):
 
         logger.info(f"Updated review with id={updated_review.id}.")
 
-        if updated_review.menu_item_id:
-            menu_item_rating = await uow.menu_items.retrieve_menu_item_rating(updated_review.menu_item_id)
-
-            publisher.publish(
-                MenuItemRatingUpdatedEvent(
-                    id=updated_review.menu_item_id,
-                    rating=menu_item_rating.rating,
-                    reviews_count=menu_item_rating.reviews_count
-                )
-            )
-        elif updated_review.restaurant_id:
-            restaurant_rating = await uow.restaurants.retrieve_restaurant_rating(updated_review.restaurant_id)
-
-            publisher.publish(
-                RestaurantRatingUpdatedEvent(
-                    id=updated_review.restaurant_id,
-                    rating=restaurant_rating.rating,
-                    reviews_count=restaurant_rating.reviews_count
-                )
-            )
+        await self._update_rating(updated_review, uow, added_rating=updated_review.rating,
+                                  removed_rating=retrieved_review.rating)
+        await self._update_analytics(uow, added_review=updated_review, removed_review=retrieved_review)
 
         return ReviewUpdateOutSchema.model_validate(updated_review)
 
@@ -365,23 +378,77 @@ class ReviewService(IReviewService):
 
         logger.info(f"Deleted review with id={review_id}.")
 
-        if retrieved_review.menu_item_id:
-            menu_item_rating = await uow.menu_items.retrieve_menu_item_rating(retrieved_review.menu_item_id)
+        await self._update_rating(retrieved_review, uow, removed_rating=retrieved_review.rating)
+        await self._update_analytics(uow, removed_review=retrieved_review)
+
+    async def _update_rating(self, review: ReviewModel, uow: GenericUnitOfWork,
+                             added_rating: Optional[int] = None, removed_rating: Optional[int] = None) -> None:
+        """
+        Applies a created, updated or deleted review to running aggregates of ratings of the reviewed entity
+        in the transaction of the review and publishes the new rating of a restaurant or a menu item.
+
+        Args:
+            review (ReviewModel): The review.
+            uow (GenericUnitOfWork): The unit of work instance.
+            added_rating (Optional[int]): The rating of a created review or the new rating of an updated one.
+            removed_rating (Optional[int]): The rating of a deleted review or the old rating of an updated one.
+        """
+
+        if review.menu_item_id:
+            menu_item_rating = (await uow.rating_aggregates.apply(RatingEntityType.menu_item, review.menu_item_id,
+                                                                  added_rating=added_rating,
+                                                                  removed_rating=removed_rating)).to_rating_model()
 
             publisher.publish(
                 MenuItemRatingUpdatedEvent(
-                    id=retrieved_review.menu_item_id,
+                    id=review.menu_item_id,
                     rating=menu_item_rating.rating,
-                    reviews_count=menu_item_rating.reviews_count
+                    reviews_count=menu_item_rating.reviews_count,
+                    version=menu_item_rating.version
                 )
             )
-        elif retrieved_review.restaurant_id:
-            restaurant_rating = await uow.restaurants.retrieve_restaurant_rating(retrieved_review.restaurant_id)
+        elif review.restaurant_id:
+            restaurant_rating = (await uow.rating_aggregates.apply(RatingEntityType.restaurant, review.restaurant_id,
+                                                                   added_rating=added_rating,
+                                                                   removed_rating=removed_rating)).to_rating_model()
 
             publisher.publish(
                 RestaurantRatingUpdatedEvent(
-                    id=retrieved_review.restaurant_id,
+                    id=review.restaurant_id,
                     rating=restaurant_rating.rating,
-                    reviews_count=restaurant_rating.reviews_count
+                    reviews_count=restaurant_rating.reviews_count,
+                    version=restaurant_rating.version
                 )
             )
+        elif review.order_id:
+            order = await uow.orders.retrieve(review.order_id)
+
+            if order:
+                await uow.rating_aggregates.apply(RatingEntityType.courier, order.courier_id,
+                                                  added_rating=added_rating, removed_rating=removed_rating)
+
+    async def _update_analytics(self, uow: GenericUnitOfWork, added_review: Optional[ReviewModel] = None,
+                                removed_review: Optional[ReviewModel] = None) -> None:
+        """
+        Applies a created, updated or deleted review of a restaurant to the rollup of the day the review was created
+        in the transaction of the review.
+
+        Args:
+            uow (GenericUnitOfWork): The unit of work instance.
+            added_review (Optional[ReviewModel]): The created review or the updated one after the update.
+            removed_review (Optional[ReviewModel]): The deleted review or the updated one before the update.
+        """
+
+        review = added_review or removed_review
+
+        if not review.restaurant_id:
+            return
+
+        await uow.review_analytics.apply(
+            review.restaurant_id,
+            review.created_at.date(),
+            added_rating=added_review.rating if added_review else None,
+            removed_rating=removed_review.rating if removed_review else None,
+            added_comment=bool(added_review and added_review.comment),
+            removed_comment=bool(removed_review and removed_review.comment),
+        )
@@ -1,11 +1,20 @@
+import asyncio
+from typing import List
+
 from fastapi import FastAPI
 from loguru import logger
 from starlette.middleware.cors import CORSMiddleware
 
 from api import api_router
-from setup.kafka.consumer.receiver import init_kafka_receivers
+from kafka_files.consumer.broadcast import KafkaBroadcastReceiver
+from kafka_files.consumer.receiver import KafkaReceiver
+from setup.kafka.consumer.receiver import init_kafka_receivers, init_kafka_broadcast_receivers
 from setup.kafka.consumer.creator import consumer_creator
 from setup.kafka.producer.events import init_producer_events
+from setup.kafka.producer.publisher import publisher
+from setup.settings.server import get_server_settings
+from setup.grpc import grpc_roles_client
+from setup.sqlalchemy.engine import async_engine
 
 # App initialization #
 
@@ -30,21 +39,60 @@ app.add_middleware(
 
 app.include_router(api_router)
 
+kafka_receivers: List[KafkaReceiver] = list()
+kafka_broadcast_receivers: List[KafkaBroadcastReceiver] = list()
+
 
 # Start kafka receivers #
 @app.on_event("startup")
 def startup_event():
+    # Kafka events are consumed by a separate process (python -m consumer) unless enabled here
+    if get_server_settings().web_app_kafka_receivers_enabled:
+        try:
+            kafka_receivers.extend(init_kafka_receivers(consumer_creator))
+            logger.info("Started kafka receivers.")
+
+            for kafka_receiver in kafka_receivers:
+                kafka_receiver.start_receiving()
+        except Exception as e:
+            logger.error(f"Failed to start kafka receivers. Error: {str(e)}")
+
+    # Every process invalidates its caches, whichever process consumes the events
     try:
-        kafka_receivers = init_kafka_receivers(consumer_creator)
-        logger.info("Started kafka receivers.")
+        kafka_broadcast_receivers.extend(init_kafka_broadcast_receivers(consumer_creator))
+        logger.info("Started kafka broadcast receivers.")
 
-        for kafka_receiver in kafka_receivers:
-            kafka_receiver.start_receiving()
+        for kafka_broadcast_receiver in kafka_broadcast_receivers:
+            kafka_broadcast_receiver.start_receiving()
     except Exception as e:
-        logger.error(f"Failed to start kafka receivers. Error: {str(e)}")
+        logger.error(f"Failed to start kafka broadcast receivers. Error: {str(e)}")
 
     try:
         init_producer_events()
         logger.info("Kafka producer events initialized")
     except Exception as e:
         logger.error(f"Error initializing kafka producer events: {e}")
+
+
+# Stop kafka receivers, flush Kafka publisher, close gRPC channel and database connections #
+@app.on_event("shutdown")
+async def shutdown_event():
+    settings = get_server_settings()
+
+    await asyncio.gather(*(asyncio.to_thread(kafka_receiver.stop, settings.kafka_consumer_shutdown_timeout_seconds)
+                           for kafka_receiver in kafka_receivers))
+    logger.info("Stopped kafka receivers.")
+
+    await asyncio.gather(*(asyncio.to_thread(kafka_broadcast_receiver.stop,
+                                             settings.kafka_consumer_shutdown_timeout_seconds)
+                           for kafka_broadcast_receiver in kafka_broadcast_receivers))
+    logger.info("Stopped kafka broadcast receivers.")
+
+    await asyncio.to_thread(publisher.close, settings.kafka_publisher_flush_timeout_seconds)
+    logger.info("Flushed and closed Kafka publisher.")
+
+    await grpc_roles_client.close()
+    logger.info("Closed gRPC roles client.")
+
+    await async_engine.dispose()
+    logger.info("Closed database connection pool.")
@@ -1,7 +1,21 @@
+from grpc_files.roles_cache import CachedRolesClient
 from grpc_files.roles_client import RolesClient
+from grpc_files.roles_verifier import LocalRolesClient
 from setup.settings.server import get_server_settings
 
 settings = get_server_settings()
 
-grpc_roles_client = RolesClient(host=settings.roles_grpc_server_host,
-                                port=settings.roles_grpc_server_port)
+grpc_roles_client = CachedRolesClient(RolesClient(host=settings.roles_grpc_server_host,
+                                                  port=settings.roles_grpc_server_port,
+                                                  timeout=settings.roles_grpc_timeout_seconds),
+                                      maxsize=settings.roles_cache_maxsize,
+                                      ttl=settings.roles_cache_ttl_seconds,
+                                      negative_ttl=settings.roles_cache_negative_ttl_seconds)
+
+if settings.jwt_local_verification:
+    grpc_roles_client = LocalRolesClient(grpc_roles_client,
+                                         algorithm=settings.jwt_algorithm,
+                                         verifying_key=settings.jwt_verifying_key,
+                                         jwks_file=settings.jwt_jwks_file,
+                                         leeway=settings.jwt_leeway_seconds,
+                                         max_token_lifetime=settings.jwt_access_token_lifetime_seconds)
@@ -1,14 +1,31 @@
 from typing import List
 
 from config.settings.app import AppSettings
+from kafka_files.consumer.broadcast import KafkaBroadcastReceiver
 from kafka_files.consumer.creator import KafkaConsumerBaseCreator
 from kafka_files.consumer.receiver import KafkaReceiver
+from kafka_files.consumer.retry import RetryPolicy
+from setup.kafka.producer.publisher import publisher
 from setup.settings.app import get_app_settings
+from setup.settings.server import get_server_settings
 
 
 def init_kafka_receivers(consumer_creator: KafkaConsumerBaseCreator) -> List[KafkaReceiver]:
     kafka_receivers = list()
     settings = get_app_settings()
+    server_settings = get_server_settings()
+
+    receiver_options = {
+        'workers_count': server_settings.kafka_consumer_workers_count,
+        'partition_queue_maxsize': server_settings.kafka_consumer_partition_queue_maxsize,
+        'max_poll_records': server_settings.kafka_consumer_max_poll_records,
+        'poll_timeout_ms': server_settings.kafka_consumer_poll_timeout_ms,
+        'batch_max_size': server_settings.kafka_consumer_batch_max_size,
+        'batch_max_wait_ms': server_settings.kafka_consumer_batch_max_wait_ms,
+        'retry_policy': RetryPolicy(publisher, max_attempts=server_settings.kafka_consumer_retry_max_attempts,
+                                    backoff_ms=server_settings.kafka_consumer_retry_backoff_ms,
+                                    delivery_timeout=server_settings.kafka_consumer_retry_delivery_timeout_seconds),
+    }
 
     for topic, consumer_events in settings.kafka_consumer_topic_events.items():
         group_id = f"{topic}_group"
@@ -17,7 +34,29 @@ def init_kafka_receivers(consumer_creator: KafkaConsumerBaseCreator) -> List[Kaf
         consumers = [consumer_creator.create(topic, str(group_id)) for _ in range(settings.kafka_group_consumers_count)]
 
         # Add group of consumers to kafka receivers
-        kafka_receivers.extend((KafkaReceiver(consumer, consumer_events, settings.get_app_uow)
+        kafka_receivers.extend((KafkaReceiver(consumer, consumer_events, settings.get_app_uow,
+                                              settings.init_app_thread, settings.dispose_app_thread,
+                                              **receiver_options)
                                 for consumer in consumers))
 
     return kafka_receivers
+
+
+def init_kafka_broadcast_receivers(consumer_creator: KafkaConsumerBaseCreator) -> List[KafkaBroadcastReceiver]:
+    kafka_broadcast_receivers = list()
+    settings = get_app_settings()
+    server_settings = get_server_settings()
+
+    for topic, consumer_events in settings.kafka_broadcast_topic_events.items():
+        # Every process consumes all partitions without a group and committed offsets
+        consumer = consumer_creator.create(topic, None)
+
+        kafka_broadcast_receivers.append(
+            KafkaBroadcastReceiver(consumer, consumer_events, settings.get_app_uow,
+                                   settings.init_app_thread, settings.dispose_app_thread,
+                                   repeat_delay=server_settings.kafka_broadcast_repeat_delay_seconds,
+                                   max_poll_records=server_settings.kafka_consumer_max_poll_records,
+                                   poll_timeout_ms=server_settings.kafka_consumer_poll_timeout_ms)
+        )
+
+    return kafka_broadcast_receivers
@@ -0,0 +1,102 @@
+"""
+Bootstrap of replicas from a snapshot of a topic.
+
+`load` applies the last message of every aggregate by bulk upserts and commits the offsets following
+the snapshot for the topic's consumer group, so receivers continue live consumption from them.
+The snapshot is read from the compacted topic itself or from a JSONL file exported by `export`.
+Receivers of the group must not run during loading.
+
+Usage (from `src` directory):
+    python -m setup.kafka.consumer.snapshot export restaurant_review --file restaurant_review.jsonl
+    python -m setup.kafka.consumer.snapshot load restaurant_review [--file restaurant_review.jsonl] [--batch-size 1000]
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict, Iterable
+
+from kafka.consumer.fetcher import ConsumerRecord
+from kafka.structs import TopicPartition
+from loguru import logger
+
+from kafka_files.consumer.retry import RetryPolicy
+from kafka_files.consumer.snapshot import SnapshotLoader, read_topic_snapshot, read_jsonl_snapshot, \
+    write_jsonl_snapshot, commit_snapshot_offsets
+from setup.kafka.consumer.creator import consumer_creator
+from setup.kafka.producer.publisher import publisher
+from setup.settings.app import get_app_settings
+from setup.settings.server import get_server_settings
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Replicas bootstrap from a snapshot")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    load_parser = subparsers.add_parser("load", help="Load replicas and commit offsets of the consumer group")
+    load_parser.add_argument("topic", help="Topic of the snapshot")
+    load_parser.add_argument("--file", help="JSONL export of the topic instead of the topic itself")
+    load_parser.add_argument("--batch-size", type=int, default=1000, help="Number of messages in a transaction")
+
+    export_parser = subparsers.add_parser("export", help="Export the topic as JSON lines")
+    export_parser.add_argument("topic", help="Topic of the snapshot")
+    export_parser.add_argument("--file", required=True, help="Output JSONL file")
+
+    return parser.parse_args()
+
+
+async def load_snapshot(loader: SnapshotLoader, messages: Iterable[ConsumerRecord]) -> Dict[TopicPartition, int]:
+    settings = get_app_settings()
+    settings.init_app_thread()
+
+    try:
+        return await loader.load(messages)
+    finally:
+        await settings.dispose_app_thread()
+
+
+def load(args: argparse.Namespace):
+    settings = get_app_settings()
+    server_settings = get_server_settings()
+    consumer = consumer_creator.create(args.topic, f"{args.topic}_group")
+    retry_policy = RetryPolicy(publisher,
+                               delivery_timeout=server_settings.kafka_consumer_retry_delivery_timeout_seconds)
+    loader = SnapshotLoader(settings.kafka_consumer_topic_events[args.topic], settings.get_app_uow,
+                            batch_size=args.batch_size, retry_policy=retry_policy)
+
+    start = time.perf_counter()
+
+    try:
+        if args.file:
+            with open(args.file) as file:
+                offsets = asyncio.run(load_snapshot(loader, read_jsonl_snapshot(file)))
+        else:
+            offsets = asyncio.run(load_snapshot(loader, read_topic_snapshot(consumer, args.topic)))
+
+        commit_snapshot_offsets(consumer, offsets)
+    finally:
+        consumer.close(autocommit=False)
+        publisher.close(server_settings.kafka_publisher_flush_timeout_seconds)
+
+    logger.info(f"Loaded snapshot of {args.topic} in {time.perf_counter() - start:.1f}s")
+
+
+def export(args: argparse.Namespace):
+    consumer = consumer_creator.create(args.topic, f"{args.topic}_group")
+
+    try:
+        with open(args.file, "w") as file:
+            count = write_jsonl_snapshot(read_topic_snapshot(consumer, args.topic), file)
+    finally:
+        consumer.close(autocommit=False)
+
+    logger.info(f"Exported {count} messages of {args.topic} to {args.file}")
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+
+    if arguments.command == "load":
+        load(arguments)
+    else:
+        export(arguments)
@@ -0,0 +1,140 @@
+"""
+Backfill of daily rollups of reviews of restaurants.
+
+Splits a range of days into chunks and recomputes rollups of every chunk from reviews in its own transaction,
+several chunks at once. Rollups of a chunk are locked while it is recomputed, so reviews of its days wait
+for the chunk and the backfill can run alongside the service and be rerun for any range.
+
+Usage (from `src` directory):
+    python -m setup.sqlalchemy.backfill_analytics [--date-from 2024-01-01] [--date-to 2024-12-31] \\
+        [--chunk-days 7] [--workers 4]
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, List, Optional, Tuple
+
+from loguru import logger
+
+from setup.settings.app import get_app_settings
+from uow.generic import GenericUnitOfWork
+from uow.utils import uow_transaction, uow_transaction_with_commit
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Backfill of daily rollups of reviews of restaurants")
+    parser.add_argument("--date-from", type=date.fromisoformat, default=None,
+                        help="First day, the day of the first review by default")
+    parser.add_argument("--date-to", type=date.fromisoformat, default=None,
+                        help="Last day, the current UTC day by default")
+    parser.add_argument("--chunk-days", type=int, default=7, help="Number of days in a transaction")
+    parser.add_argument("--workers", type=int, default=4, help="Number of chunks backfilled at once")
+    return parser.parse_args()
+
+
+def split_range(date_from: date, date_to: date, chunk_days: int) -> List[Tuple[date, date]]:
+    """
+    Splits a range of days into chunks.
+
+    Args:
+        date_from (date): The first day.
+        date_to (date): The last day.
+        chunk_days (int): The maximum number of days in a chunk.
+
+    Returns:
+        List[Tuple[date, date]]: The first and the last day of every chunk.
+    """
+
+    chunks = []
+
+    while date_from <= date_to:
+        chunk_to = min(date_from + timedelta(days=chunk_days - 1), date_to)
+        chunks.append((date_from, chunk_to))
+        date_from = chunk_to + timedelta(days=1)
+
+    return chunks
+
+
+async def backfill_chunk(date_from: date, date_to: date, get_uow: Callable[[], GenericUnitOfWork]) -> int:
+    """
+    Recomputes rollups of a chunk of days in a transaction.
+
+    Args:
+        date_from (date): The first day.
+        date_to (date): The last day.
+        get_uow (Callable[[], GenericUnitOfWork]): The function to get the UOW.
+
+    Returns:
+        int: The number of written rollups.
+    """
+
+    async with uow_transaction_with_commit(get_uow()) as uow:
+        return await uow.review_analytics.recompute_range(date_from, date_to)
+
+
+async def backfill(get_uow: Callable[[], GenericUnitOfWork], date_from: Optional[date] = None,
+                   date_to: Optional[date] = None, chunk_days: int = 7, workers: int = 4) -> int:
+    """
+    Recomputes rollups of a range of days in chunks, several chunks at once.
+
+    Args:
+        get_uow (Callable[[], GenericUnitOfWork]): The function to get the UOW.
+        date_from (Optional[date]): The first day or None for the day of the first review.
+        date_to (Optional[date]): The last day or None for the current UTC day.
+        chunk_days (int): The number of days in a transaction.
+        workers (int): The number of chunks backfilled at once.
+
+    Returns:
+        int: The number of written rollups.
+    """
+
+    if date_from is None:
+        async with uow_transaction(get_uow()) as uow:
+            date_from = await uow.review_analytics.retrieve_first_review_date()
+
+        if date_from is None:
+            logger.info("There are no reviews of restaurants to backfill")
+            return 0
+
+    date_to = date_to or datetime.utcnow().date()
+    chunks = split_range(date_from, date_to, chunk_days)
+    semaphore = asyncio.Semaphore(workers)
+
+    async def run_chunk(chunk_from: date, chunk_to: date) -> int:
+        async with semaphore:
+            rollups_count = await backfill_chunk(chunk_from, chunk_to, get_uow)
+
+        logger.info(f"Backfilled {rollups_count} review analytics from {chunk_from} to {chunk_to}")
+
+        return rollups_count
+
+    rollups_count = sum(await asyncio.gather(*[run_chunk(*chunk) for chunk in chunks]))
+
+    logger.info(f"Backfilled {rollups_count} review analytics from {date_from} to {date_to} "
+                f"in {len(chunks)} chunks")
+
+    return rollups_count
+
+
+async def backfill_app(args: argparse.Namespace) -> int:
+    settings = get_app_settings()
+    settings.init_app_thread()
+
+    try:
+        return await backfill(settings.get_app_uow, args.date_from, args.date_to, chunk_days=args.chunk_days,
+                              workers=args.workers)
+    finally:
+        await settings.dispose_app_thread()
+
+
+def run(args: argparse.Namespace):
+    start = time.perf_counter()
+    rollups_count = asyncio.run(backfill_app(args))
+
+    logger.info(f"Backfilled {rollups_count} review analytics in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    run(parse_args())
@@ -0,0 +1,158 @@
+"""
+Reconciliation of running aggregates of ratings.
+
+Compares stored aggregates of entities with aggregates of all their reviews in batches of entities
+and logs mismatches. With `--fix`, mismatched aggregates are overwritten and new ratings of restaurants
+and menu items are published. Stored aggregates of a batch are locked while it is reconciled, so reviews
+written concurrently are applied after the fix.
+
+Usage (from `src` directory):
+    python -m setup.sqlalchemy.reconcile [--entity-type restaurant] [--batch-size 1000] [--fix]
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Callable, List, Optional
+
+from loguru import logger
+
+from kafka_files.producer.events import MenuItemRatingUpdatedEvent, RestaurantRatingUpdatedEvent
+from models.rating import RatingAggregateModel, RatingEntityType
+from setup.kafka.producer.publisher import publisher
+from setup.settings.app import get_app_settings
+from setup.settings.server import get_server_settings
+from uow.generic import GenericUnitOfWork
+from uow.utils import uow_transaction_with_commit
+
+# Events with new ratings of entities, which are replicated by other services
+RATING_UPDATED_EVENTS = {
+    RatingEntityType.restaurant: RestaurantRatingUpdatedEvent,
+    RatingEntityType.menu_item: MenuItemRatingUpdatedEvent,
+}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Reconciliation of running aggregates of ratings")
+    parser.add_argument("--entity-type", choices=[entity_type.value for entity_type in RatingEntityType],
+                        default=None, help="Type of reconciled entities, all types by default")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Number of entities in a transaction")
+    parser.add_argument("--fix", action="store_true", help="Overwrite mismatched aggregates")
+    return parser.parse_args()
+
+
+def _get_empty_aggregate(entity_type: RatingEntityType, entity_id: int) -> RatingAggregateModel:
+    return RatingAggregateModel(entity_type=entity_type, entity_id=entity_id, reviews_count=0, ratings_sum=0,
+                                histogram=[0] * 5)
+
+
+def _is_same(stored: RatingAggregateModel, expected: RatingAggregateModel) -> bool:
+    return (stored.reviews_count, stored.ratings_sum, list(stored.histogram)) == \
+        (expected.reviews_count, expected.ratings_sum, list(expected.histogram))
+
+
+async def reconcile_batch(entity_type: RatingEntityType, entity_ids: List[int], uow: GenericUnitOfWork,
+                          fix: bool = False) -> List[RatingAggregateModel]:
+    """
+    Reconciles aggregates of a batch of entities in a transaction.
+
+    Args:
+        entity_type (RatingEntityType): The type of the entities.
+        entity_ids (List[int]): The IDs of the entities.
+        uow (GenericUnitOfWork): The unit of work instance.
+        fix (bool): Whether to overwrite mismatched aggregates.
+
+    Returns:
+        List[RatingAggregateModel]: The aggregates computed from reviews, which differ from stored ones.
+    """
+
+    stored = {aggregate.entity_id: aggregate
+              for aggregate in await uow.rating_aggregates.list_for_update(entity_type, entity_ids)}
+    expected = {aggregate.entity_id: aggregate
+                for aggregate in await uow.rating_aggregates.compute_many(entity_type, entity_ids)}
+
+    mismatched = list()
+
+    for entity_id in entity_ids:
+        stored_aggregate = stored.get(entity_id, _get_empty_aggregate(entity_type, entity_id))
+        expected_aggregate = expected.get(entity_id, _get_empty_aggregate(entity_type, entity_id))
+
+        if not _is_same(stored_aggregate, expected_aggregate):
+            logger.warning(f"Rating aggregates of {entity_type.value} with id={entity_id} mismatch: "
+                           f"stored {stored_aggregate}, expected {expected_aggregate}")
+            mismatched.append(expected_aggregate)
+
+    if fix and mismatched:
+        replaced = await uow.rating_aggregates.replace_many(mismatched)
+
+        if event_class := RATING_UPDATED_EVENTS.get(entity_type):
+            for aggregate in replaced:
+                rating = aggregate.to_rating_model()
+                publisher.publish(event_class(id=rating.id, rating=rating.rating,
+                                              reviews_count=rating.reviews_count, version=rating.version))
+
+    return mismatched
+
+
+async def reconcile(entity_type: RatingEntityType, get_uow: Callable[[], GenericUnitOfWork],
+                    batch_size: int = 1000, fix: bool = False) -> int:
+    """
+    Reconciles aggregates of all entities of a type, every batch in its own transaction.
+
+    Args:
+        entity_type (RatingEntityType): The type of the entities.
+        get_uow (Callable[[], GenericUnitOfWork]): The function to get the UOW.
+        batch_size (int): The number of entities in a transaction.
+        fix (bool): Whether to overwrite mismatched aggregates.
+
+    Returns:
+        int: The number of mismatched aggregates.
+    """
+
+    after_id: Optional[int] = None
+    entities_count = mismatched_count = 0
+
+    while True:
+        async with uow_transaction_with_commit(get_uow()) as uow:
+            entity_ids = await uow.rating_aggregates.list_entity_ids(entity_type, after_id, batch_size)
+
+            if not entity_ids:
+                break
+
+            mismatched_count += len(await reconcile_batch(entity_type, entity_ids, uow, fix=fix))
+
+        entities_count += len(entity_ids)
+        after_id = entity_ids[-1]
+
+    logger.info(f"Reconciled rating aggregates of {entities_count} {entity_type.value} entities, "
+                f"{mismatched_count} mismatched{', fixed' if fix and mismatched_count else ''}")
+
+    return mismatched_count
+
+
+async def reconcile_all(entity_types: List[RatingEntityType], batch_size: int, fix: bool) -> int:
+    settings = get_app_settings()
+    settings.init_app_thread()
+
+    try:
+        return sum([await reconcile(entity_type, settings.get_app_uow, batch_size=batch_size, fix=fix)
+                    for entity_type in entity_types])
+    finally:
+        await settings.dispose_app_thread()
+
+
+def run(args: argparse.Namespace):
+    entity_types = [RatingEntityType(args.entity_type)] if args.entity_type else list(RatingEntityType)
+    start = time.perf_counter()
+
+    try:
+        mismatched_count = asyncio.run(reconcile_all(entity_types, args.batch_size, args.fix))
+    finally:
+        publisher.close(get_server_settings().kafka_publisher_flush_timeout_seconds)
+
+    logger.info(f"Reconciled rating aggregates in {time.perf_counter() - start:.1f}s, "
+                f"{mismatched_count} mismatched")
+
+
+if __name__ == "__main__":
+    run(parse_args())
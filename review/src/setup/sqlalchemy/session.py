@@ -1,13 +1,25 @@
-from typing import AsyncGenerator
+from functools import partial
+from typing import AsyncGenerator, Callable
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
-from .engine import async_engine
+from .engine import async_engine, get_async_engine
 
 # Async Session #
 
 async_session_maker = async_sessionmaker(bind=async_engine, expire_on_commit=False)
 
 
+def get_async_session_maker() -> Callable[[], AsyncSession]:
+    """
+    Returns the session maker bound to the engine of the current thread.
+
+    Returns:
+        Callable[[], AsyncSession]: The session maker.
+    """
+
+    return partial(async_session_maker, bind=get_async_engine())
+
+
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_maker() as session:
         yield session
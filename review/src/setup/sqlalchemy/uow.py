@@ -1,4 +1,4 @@
-from setup.sqlalchemy.session import async_session_maker
+from setup.sqlalchemy.session import get_async_session_maker
 from uow.sqlalchemy import SqlAlchemyUnitOfWork
 
 __all__ = [
@@ -14,4 +14,4 @@ def get_sqlalchemy_uow() -> SqlAlchemyUnitOfWork:
         SqlAlchemyOfWork: The instance.
     """
 
-    return SqlAlchemyUnitOfWork(async_session_maker)
+    return SqlAlchemyUnitOfWork(get_async_session_maker())
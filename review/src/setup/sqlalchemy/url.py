@@ -1,8 +1,12 @@
+from config.settings.db import SqliteSettings
 from setup.settings.server import get_server_settings
 
 settings = get_server_settings()
 
 # Database URL #
 
-DATABASE_URL = f"postgresql+asyncpg://{settings.pg_user}:{settings.pg_password}@" \
-               f"{settings.pg_host}:{settings.pg_port}/{settings.pg_database}"
+if isinstance(settings, SqliteSettings):
+    DATABASE_URL = f"sqlite+aiosqlite:///{settings.sqlite_db_file}"
+else:
+    DATABASE_URL = f"postgresql+asyncpg://{settings.pg_user}:{settings.pg_password}@" \
+                   f"{settings.pg_host}:{settings.pg_port}/{settings.pg_database}"
@@ -6,3 +6,47 @@ def start_app():
     import uvicorn
     settings = get_server_settings()
     uvicorn.run("setup.app:app", host=settings.web_app_host, port=settings.web_app_port, reload=settings.reload)
+
+
+def start_consumer():
+    """
+    Runs Kafka receivers without the web app until the process is interrupted or terminated.
+    """
+
+    import signal
+    from concurrent.futures import ThreadPoolExecutor
+    from threading import Event
+
+    from loguru import logger
+
+    from setup.kafka.consumer.creator import consumer_creator
+    from setup.kafka.consumer.receiver import init_kafka_receivers
+    from setup.kafka.producer.events import init_producer_events
+    from setup.kafka.producer.publisher import publisher
+
+    settings = get_server_settings()
+    stop_requested = Event()
+
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signal_number, lambda *_: stop_requested.set())
+
+    init_producer_events()
+    logger.info("Kafka producer events initialized")
+
+    kafka_receivers = init_kafka_receivers(consumer_creator)
+
+    for kafka_receiver in kafka_receivers:
+        kafka_receiver.start_receiving()
+
+    logger.info(f"Started {len(kafka_receivers)} kafka receivers.")
+
+    stop_requested.wait()
+
+    with ThreadPoolExecutor(max_workers=max(len(kafka_receivers), 1)) as executor:
+        executor.map(lambda kafka_receiver: kafka_receiver.stop(settings.kafka_consumer_shutdown_timeout_seconds),
+                     kafka_receivers)
+
+    logger.info("Stopped kafka receivers.")
+
+    publisher.close(settings.kafka_publisher_flush_timeout_seconds)
+    logger.info("Flushed and closed Kafka publisher.")
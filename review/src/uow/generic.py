@@ -1,9 +1,11 @@
 from abc import ABC, abstractmethod
 
+from repositories.interfaces.analytics import IReviewAnalyticsRepository
 from repositories.interfaces.courier import ICourierRepository
 from repositories.interfaces.customer import ICustomerRepository
 from repositories.interfaces.menu_item import IMenuItemRepository
 from repositories.interfaces.order import IOrderRepository
+from repositories.interfaces.rating import IRatingAggregateRepository
 from repositories.interfaces.restaurant import IRestaurantRepository
 from repositories.interfaces.review import IReviewRepository
 
@@ -20,8 +22,10 @@ class GenericUnitOfWork(ABC):
     couriers: ICourierRepository
     menu_items: IMenuItemRepository
     orders: IOrderRepository
+    rating_aggregates: IRatingAggregateRepository
     restaurants: IRestaurantRepository
     reviews: IReviewRepository
+    review_analytics: IReviewAnalyticsRepository
 
     async def __aenter__(self):
         return self
@@ -1,10 +1,12 @@
 from typing import Callable
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from repositories.sqlalchemy.analytics import ReviewAnalyticsRepository
 from repositories.sqlalchemy.courier import CourierRepository
 from repositories.sqlalchemy.customer import CustomerRepository
 from repositories.sqlalchemy.menu_item import MenuItemRepository
 from repositories.sqlalchemy.order import OrderRepository
+from repositories.sqlalchemy.rating import RatingAggregateRepository
 from repositories.sqlalchemy.restaurant import RestaurantRepository
 from repositories.sqlalchemy.review import ReviewRepository
 from uow.generic import GenericUnitOfWork
@@ -23,16 +25,20 @@ class SqlAlchemyUnitOfWork(GenericUnitOfWork):
         couriers (CourierRepository): Courier repository.
         menu_items (MenuItemRepository): Menu item repository.
         orders (OrderRepository): Order repository.
+        rating_aggregates (RatingAggregateRepository): Rating aggregate repository.
         restaurants (RestaurantRepository): Restaurant repository.
         reviews (ReviewRepository): Review repository.
+        review_analytics (ReviewAnalyticsRepository): Review analytics repository.
     """
 
     customers: CustomerRepository
     couriers: CourierRepository
     menu_items: MenuItemRepository
     orders: OrderRepository
+    rating_aggregates: RatingAggregateRepository
     restaurants: RestaurantRepository
     reviews: ReviewRepository
+    review_analytics: ReviewAnalyticsRepository
 
     def __init__(self, session_factory: Callable[[], AsyncSession]):
         self._session_factory = session_factory
@@ -43,8 +49,10 @@ class SqlAlchemyUnitOfWork(GenericUnitOfWork):
         self.couriers = CourierRepository(session)
         self.menu_items = MenuItemRepository(session)
         self.orders = OrderRepository(session)
+        self.rating_aggregates = RatingAggregateRepository(session)
         self.restaurants = RestaurantRepository(session)
         self.reviews = ReviewRepository(session)
+        self.review_analytics = ReviewAnalyticsRepository(session)
 
     async def __aenter__(self):
         self._session = self._session_factory()
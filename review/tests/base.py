@@ -0,0 +1,7 @@
+from models.customer import CustomerModel
+from services.review import ReviewService
+
+
+def get_review_service(customer_id: int) -> ReviewService:
+    return ReviewService(customer=CustomerModel(id=customer_id, full_name=f'Customer {customer_id}',
+                                                image_url=f'https://example.com/{customer_id}.jpg'))
@@ -0,0 +1,98 @@
+import os
+import pytest
+import asyncio
+
+from typing import Callable
+
+from sqlalchemy import BigInteger, NullPool, insert, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.ext.compiler import compiles
+
+# Change settings to Test #
+
+os.environ.setdefault("CONFIGURATION", "Test")
+
+from db.sqlalchemy.models import Base, Courier, Customer, MenuItem, Order, Restaurant
+from setup.settings.server import get_server_settings
+from uow.sqlalchemy import SqlAlchemyUnitOfWork
+from uow.utils import uow_transaction
+
+settings = get_server_settings()
+
+
+# SQLite generates IDs only for INTEGER primary keys, BIGINT ones would have to be set by every insert
+@compiles(BigInteger, 'sqlite')
+def compile_big_integer(type_, compiler, **kw):
+    return 'INTEGER'
+
+
+# Test database url #
+
+DATABASE_URL_TEST = f"sqlite+aiosqlite:///{settings.sqlite_db_file}"
+
+# Test engine and session maker #
+
+engine_test = create_async_engine(DATABASE_URL_TEST, poolclass=NullPool)
+async_session_maker = async_sessionmaker(bind=engine_test, expire_on_commit=False, autoflush=False)
+
+
+@pytest.fixture(scope='session')
+def event_loop(request):
+    """Create an instance of the default event loop for each test case."""
+    loop = asyncio.get_event_loop_policy().new_event_loop()
+    yield loop
+    loop.close()
+
+
+# Database fixtures
+
+@pytest.fixture(scope='session', autouse=True)
+async def engine():
+    async with engine_test.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield engine_test
+
+    async with engine_test.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+    os.remove(settings.sqlite_db_file)
+
+
+@pytest.fixture(scope='session')
+def get_uow() -> Callable[[], SqlAlchemyUnitOfWork]:
+    return lambda: SqlAlchemyUnitOfWork(async_session_maker)
+
+
+@pytest.fixture(scope='function')
+async def uow(get_uow: Callable[[], SqlAlchemyUnitOfWork]) -> SqlAlchemyUnitOfWork:
+    async with uow_transaction(get_uow()) as uow:
+        yield uow
+        await uow.rollback()
+
+
+@pytest.fixture(scope='function', autouse=True)
+async def clear_database():
+    async with async_session_maker() as session:
+        for table in reversed(Base.metadata.sorted_tables):
+            await session.execute(text(f'DELETE FROM {table.name};'))
+            await session.commit()
+
+
+# Data fixtures
+
+@pytest.fixture(scope='function')
+async def entities():
+    """
+    Creates replicas of a restaurant, a menu item, a courier, customers and an order of the first customer.
+    """
+
+    async with engine_test.begin() as conn:
+        await conn.execute(insert(Restaurant), [{'id': 1, 'is_active': True}])
+        await conn.execute(insert(MenuItem), [{'id': 1}])
+        await conn.execute(insert(Courier), [{'id': 1}])
+        await conn.execute(insert(Customer), [{'id': customer_id, 'full_name': f'Customer {customer_id}',
+                                               'image_url': f'https://example.com/{customer_id}.jpg'}
+                                              for customer_id in range(1, 4)])
+        await conn.execute(insert(Order), [{'id': 1, 'customer_id': 1, 'courier_id': 1}])
+
@@ -0,0 +1,83 @@
+from datetime import date, datetime, timedelta
+from typing import Callable, List
+
+import pytest
+from sqlalchemy import Row, insert, select
+
+from db.sqlalchemy.models import Customer, Review, ReviewAnalytics
+from setup.sqlalchemy.backfill_analytics import backfill, split_range
+from uow.sqlalchemy import SqlAlchemyUnitOfWork
+from uow.utils import uow_transaction, uow_transaction_with_commit
+
+FIRST_DAY = date(2024, 1, 1)
+DAYS_COUNT = 10
+
+
+async def list_rollups(get_uow: Callable[[], SqlAlchemyUnitOfWork]) -> List[Row]:
+    async with uow_transaction(get_uow()) as uow:
+        result = await uow._session.execute(select(ReviewAnalytics.__table__)
+                                            .order_by(ReviewAnalytics.restaurant_id, ReviewAnalytics.date))
+
+        return result.all()
+
+
+@pytest.fixture(scope='function')
+async def reviews(entities, get_uow: Callable[[], SqlAlchemyUnitOfWork]):
+    """
+    Creates reviews of the restaurant bypassing rollups, several of them a day, and a stale rollup of a day
+    without reviews.
+    """
+
+    reviews_count = DAYS_COUNT * 3
+
+    async with uow_transaction_with_commit(get_uow()) as uow:
+        await uow._session.execute(insert(Customer), [{'id': id, 'full_name': f'Customer {id}',
+                                                       'image_url': f'https://example.com/{id}.jpg'}
+                                                      for id in range(4, reviews_count + 1)])
+        await uow._session.execute(insert(Review), [
+            {'rating': 1 + id % 5, 'comment': 'Tasty' if id % 2 else None, 'customer_id': id, 'restaurant_id': 1,
+             'created_at': datetime.combine(FIRST_DAY, datetime.min.time()) + timedelta(hours=id * 7)}
+            for id in range(1, reviews_count + 1)
+        ])
+        await uow._session.execute(insert(ReviewAnalytics), [
+            {'restaurant_id': 1, 'date': FIRST_DAY + timedelta(days=DAYS_COUNT + 1), 'reviews_count': 1,
+             'ratings_sum': 5, 'stars_5_count': 1},
+        ])
+
+
+def test_split_range():
+    assert split_range(date(2024, 1, 1), date(2024, 1, 10), 4) == [
+        (date(2024, 1, 1), date(2024, 1, 4)),
+        (date(2024, 1, 5), date(2024, 1, 8)),
+        (date(2024, 1, 9), date(2024, 1, 10)),
+    ]
+    assert split_range(date(2024, 1, 1), date(2024, 1, 1), 7) == [(date(2024, 1, 1), date(2024, 1, 1))]
+
+
+@pytest.mark.usefixtures('reviews')
+class TestBackfill:
+
+    async def test_backfill(self, get_uow: Callable[[], SqlAlchemyUnitOfWork]):
+        date_to = FIRST_DAY + timedelta(days=DAYS_COUNT + 1)
+        rollups_count = await backfill(get_uow, date_to=date_to, chunk_days=3, workers=2)
+        rollups = await list_rollups(get_uow)
+
+        # Every review is rolled up into its day, the stale rollup is removed
+        assert rollups_count == len(rollups)
+        assert sum(rollup.reviews_count for rollup in rollups) == DAYS_COUNT * 3
+        assert all(rollup.date < date_to for rollup in rollups)
+        assert all(rollup.reviews_count == sum(rollup[-5:]) for rollup in rollups)
+
+    async def test_backfill_rerun(self, get_uow: Callable[[], SqlAlchemyUnitOfWork]):
+        date_to = FIRST_DAY + timedelta(days=DAYS_COUNT + 1)
+
+        await backfill(get_uow, date_to=date_to, chunk_days=3, workers=2)
+        rollups = await list_rollups(get_uow)
+
+        # Reruns of any range, with other chunks, give the same rollups
+        await backfill(get_uow, date_to=date_to, chunk_days=3, workers=2)
+        assert await list_rollups(get_uow) == rollups
+
+        await backfill(get_uow, FIRST_DAY + timedelta(days=2), FIRST_DAY + timedelta(days=5), chunk_days=1,
+                       workers=4)
+        assert await list_rollups(get_uow) == rollups
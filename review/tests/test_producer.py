@@ -0,0 +1,135 @@
+from typing import Iterable, List, Optional, Tuple
+
+import pytest
+from kafka.errors import KafkaTimeoutError
+
+from kafka_files.producer.coalescing import CoalescingPublisher
+from kafka_files.producer.events import MenuItemRatingUpdatedEvent, ProducerEvent, RestaurantRatingUpdatedEvent
+from kafka_files.producer.publisher import AbstractPublisher
+
+
+class RecordingPublisher(AbstractPublisher):
+    """
+    Publisher, which records published events instead of sending them.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.events: List[ProducerEvent] = list()
+        self.closed = False
+        self.error: Optional[Exception] = None
+
+    def publish(self, event: ProducerEvent):
+        if self.error:
+            raise self.error
+
+        self.events.append(event)
+
+    def deliver_records(self, records: Iterable[Tuple[str, Optional[str], dict, List[Tuple[str, bytes]]]],
+                        timeout: Optional[float] = None):
+        pass
+
+    def close(self, timeout: Optional[float] = None):
+        self.closed = True
+
+
+def get_published(publisher: RecordingPublisher) -> List[Tuple[str, Optional[str], dict]]:
+    return [(event.get_event_name(), event.get_aggregate_id(), event._data) for event in publisher.events]
+
+
+class TestCoalescingPublisher:
+
+    def get_publisher(self, window_seconds: float = 60) -> Tuple[CoalescingPublisher, RecordingPublisher]:
+        recording_publisher = RecordingPublisher()
+        publisher = CoalescingPublisher(recording_publisher, [MenuItemRatingUpdatedEvent],
+                                        window_seconds=window_seconds)
+
+        return publisher, recording_publisher
+
+    def test_publish_final_value(self):
+        publisher, recording_publisher = self.get_publisher()
+
+        for reviews_count in range(1, 6):
+            publisher.publish(MenuItemRatingUpdatedEvent(id=1, rating=reviews_count, reviews_count=reviews_count,
+                                                         version=reviews_count))
+
+        publisher.publish(MenuItemRatingUpdatedEvent(id=2, rating=3, reviews_count=1, version=1))
+
+        # Events are pending until the window ends
+        assert recording_publisher.events == []
+
+        publisher.flush()
+
+        assert sorted(get_published(recording_publisher)) == [
+            ('MenuItemRatingUpdatedEvent', '1', {'id': 1, 'rating': 5, 'reviews_count': 5, 'version': 5}),
+            ('MenuItemRatingUpdatedEvent', '2', {'id': 2, 'rating': 3, 'reviews_count': 1, 'version': 1}),
+        ]
+
+        publisher.close()
+
+    def test_publish_older_version(self):
+        publisher, recording_publisher = self.get_publisher()
+
+        publisher.publish(MenuItemRatingUpdatedEvent(id=1, rating=4, reviews_count=2, version=3))
+        # Published later by a concurrent request, which read older aggregates
+        publisher.publish(MenuItemRatingUpdatedEvent(id=1, rating=5, reviews_count=1, version=2))
+        publisher.close()
+
+        assert get_published(recording_publisher) == [
+            ('MenuItemRatingUpdatedEvent', '1', {'id': 1, 'rating': 4, 'reviews_count': 2, 'version': 3}),
+        ]
+
+    def test_publish_not_coalesced(self):
+        publisher, recording_publisher = self.get_publisher()
+
+        publisher.publish(RestaurantRatingUpdatedEvent(id=1, rating=4, reviews_count=1, version=1))
+        publisher.publish(RestaurantRatingUpdatedEvent(id=1, rating=5, reviews_count=2, version=2))
+
+        assert len(recording_publisher.events) == 2
+
+        publisher.close()
+
+    def test_close_flushes_pending(self):
+        publisher, recording_publisher = self.get_publisher()
+
+        publisher.publish(MenuItemRatingUpdatedEvent(id=1, rating=4, reviews_count=1, version=1))
+        publisher.close()
+
+        assert get_published(recording_publisher) == [
+            ('MenuItemRatingUpdatedEvent', '1', {'id': 1, 'rating': 4, 'reviews_count': 1, 'version': 1}),
+        ]
+        assert recording_publisher.closed
+
+        # Events published after close aren't lost
+        publisher.publish(MenuItemRatingUpdatedEvent(id=1, rating=5, reviews_count=2, version=2))
+
+        assert len(recording_publisher.events) == 2
+
+    def test_publish_without_window(self):
+        publisher, recording_publisher = self.get_publisher(window_seconds=0)
+
+        publisher.publish(MenuItemRatingUpdatedEvent(id=1, rating=4, reviews_count=1, version=1))
+
+        assert len(recording_publisher.events) == 1
+
+        publisher.close()
+
+    def test_flush_rejected(self):
+        publisher, recording_publisher = self.get_publisher()
+        recording_publisher.error = KafkaTimeoutError()
+
+        publisher.publish(MenuItemRatingUpdatedEvent(id=1, rating=4, reviews_count=1, version=1))
+
+        with pytest.raises(KafkaTimeoutError):
+            publisher.flush()
+
+        # Rejected events are pending again and a newer event still replaces them
+        publisher.publish(MenuItemRatingUpdatedEvent(id=2, rating=3, reviews_count=1, version=1))
+        publisher.publish(MenuItemRatingUpdatedEvent(id=2, rating=5, reviews_count=2, version=2))
+        recording_publisher.error = None
+        publisher.close()
+
+        assert sorted(get_published(recording_publisher)) == [
+            ('MenuItemRatingUpdatedEvent', '1', {'id': 1, 'rating': 4, 'reviews_count': 1, 'version': 1}),
+            ('MenuItemRatingUpdatedEvent', '2', {'id': 2, 'rating': 5, 'reviews_count': 2, 'version': 2}),
+        ]
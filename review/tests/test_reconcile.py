@@ -0,0 +1,69 @@
+from typing import Callable
+
+import pytest
+from sqlalchemy import insert
+
+from db.sqlalchemy.models import MenuItem, RatingAggregate, Restaurant, Review
+from models.rating import RatingEntityType
+from setup.sqlalchemy.reconcile import reconcile
+from uow.sqlalchemy import SqlAlchemyUnitOfWork
+from uow.utils import uow_transaction, uow_transaction_with_commit
+
+
+@pytest.fixture(scope='function')
+async def drifted(entities, get_uow: Callable[[], SqlAlchemyUnitOfWork]):
+    """
+    Creates reviews bypassing aggregates: restaurant 1 has stale aggregates, restaurant 2 has none,
+    restaurant 3 has aggregates of deleted reviews and restaurant 4 is in sync.
+    """
+
+    async with uow_transaction_with_commit(get_uow()) as uow:
+        await uow._session.execute(insert(Restaurant), [{'id': id, 'is_active': True} for id in range(2, 5)])
+        await uow._session.execute(insert(MenuItem), [{'id': 2}])
+        await uow._session.execute(insert(Review), [
+            {'rating': 5, 'customer_id': 1, 'restaurant_id': 1},
+            {'rating': 3, 'customer_id': 2, 'restaurant_id': 1},
+            {'rating': 4, 'customer_id': 1, 'restaurant_id': 2},
+            {'rating': 2, 'customer_id': 1, 'restaurant_id': 4},
+            {'rating': 1, 'customer_id': 1, 'menu_item_id': 2},
+        ])
+        await uow._session.execute(insert(RatingAggregate), [
+            {'entity_type': 'restaurant', 'entity_id': 1, 'reviews_count': 1, 'ratings_sum': 5, 'stars_5_count': 1},
+            {'entity_type': 'restaurant', 'entity_id': 3, 'reviews_count': 1, 'ratings_sum': 1, 'stars_1_count': 1},
+            {'entity_type': 'restaurant', 'entity_id': 4, 'reviews_count': 1, 'ratings_sum': 2, 'stars_2_count': 1},
+        ])
+
+
+@pytest.mark.usefixtures('drifted')
+class TestReconcile:
+
+    async def test_reconcile(self, get_uow: Callable[[], SqlAlchemyUnitOfWork]):
+        assert await reconcile(RatingEntityType.restaurant, get_uow, batch_size=2) == 3
+
+        # Aggregates aren't changed without fix
+        async with uow_transaction(get_uow()) as uow:
+            aggregate = await uow.rating_aggregates.retrieve(RatingEntityType.restaurant, 1)
+
+        assert (aggregate.reviews_count, aggregate.ratings_sum) == (1, 5)
+
+    async def test_reconcile_fix(self, get_uow: Callable[[], SqlAlchemyUnitOfWork]):
+        assert await reconcile(RatingEntityType.restaurant, get_uow, batch_size=2, fix=True) == 3
+
+        async with uow_transaction(get_uow()) as uow:
+            aggregates = {entity_id: await uow.rating_aggregates.retrieve(RatingEntityType.restaurant, entity_id)
+                          for entity_id in range(1, 5)}
+
+        assert {entity_id: (aggregate.reviews_count, aggregate.ratings_sum, aggregate.histogram)
+                for entity_id, aggregate in aggregates.items()} == {
+            1: (2, 8, [0, 0, 1, 0, 1]),
+            2: (1, 4, [0, 0, 0, 1, 0]),
+            3: (0, 0, [0, 0, 0, 0, 0]),
+            4: (1, 2, [0, 1, 0, 0, 0]),
+        }
+        # Fixed aggregates get new versions, so consumers replace their ratings
+        assert aggregates[1].version > 0 and aggregates[2].version > 0 and aggregates[3].version > 0
+        assert aggregates[4].version == 0
+
+        # Fixed aggregates are in sync, other entity types are reconciled on their own
+        assert await reconcile(RatingEntityType.restaurant, get_uow, batch_size=2) == 0
+        assert await reconcile(RatingEntityType.menu_item, get_uow, batch_size=2) == 1
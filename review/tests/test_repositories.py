@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+import pytest
+from sqlalchemy import insert
+
+from db.sqlalchemy.models import Customer, Review
+from exceptions.pagination import InvalidCursorError
+from models.review import ReviewCreateModel, ReviewSortOrder
+from repositories.sqlalchemy.paginate import encode_cursor, decode_cursor
+from uow.sqlalchemy import SqlAlchemyUnitOfWork
+
+# Ratings of reviews of the restaurant by customers, several reviews share a rating and a creation time
+RATINGS = [5, 3, 5, 1, 3, 4, 5, 2, 3, 1]
+CREATED_AT = datetime(2024, 1, 1, 12)
+
+
+@pytest.fixture(scope='function')
+async def reviews(entities, uow: SqlAlchemyUnitOfWork) -> List[dict]:
+    # Every review is written by its own customer
+    customers = [{'id': id, 'full_name': f'Customer {id}', 'image_url': f'https://example.com/{id}.jpg'}
+                 for id in range(4, len(RATINGS) + 1)]
+    rows = [{'id': id, 'rating': rating, 'customer_id': id, 'restaurant_id': 1,
+             'created_at': CREATED_AT + timedelta(hours=id // 3)}
+            for id, rating in enumerate(RATINGS, start=1)]
+
+    await uow._session.execute(insert(Customer), customers)
+    await uow._session.execute(insert(Review), rows)
+
+    return rows
+
+
+def get_expected_ids(rows: List[dict], sort_order: ReviewSortOrder) -> List[int]:
+    if sort_order == ReviewSortOrder.newest:
+        key, reverse = (lambda row: (row['created_at'], row['id'])), True
+    else:
+        key, reverse = (lambda row: (row['rating'], row['created_at'], row['id'])), \
+            sort_order == ReviewSortOrder.highest
+
+    return [row['id'] for row in sorted(rows, key=key, reverse=reverse)]
+
+
+class TestPaginate:
+
+    def test_cursor_round_trip(self):
+        keys = [Review.rating, Review.created_at, Review.id]
+        cursor = encode_cursor([5, CREATED_AT, 7], ReviewSortOrder.highest.value)
+
+        assert decode_cursor(cursor, keys, ReviewSortOrder.highest.value) == [5, CREATED_AT, 7]
+
+    @pytest.mark.parametrize('cursor', [
+        # Another order with the same sort keys
+        encode_cursor([5, CREATED_AT, 7], ReviewSortOrder.lowest.value),
+        # Other sort keys
+        encode_cursor([CREATED_AT, 7], ReviewSortOrder.highest.value),
+        # Values of wrong types
+        encode_cursor(['5', CREATED_AT, 7], ReviewSortOrder.highest.value),
+        encode_cursor([5, 'yesterday', 7], ReviewSortOrder.highest.value),
+        # Cursor without an order
+        'WzUsIjIwMjQtMDEtMDFUMTI6MDA6MDAiLDdd',
+        'not a cursor',
+    ])
+    def test_decode_invalid_cursor(self, cursor: str):
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor, [Review.rating, Review.created_at, Review.id], ReviewSortOrder.highest.value)
+
+
+class TestReviewRepository:
+
+    @pytest.mark.parametrize('sort_order', list(ReviewSortOrder))
+    @pytest.mark.parametrize('limit', [1, 3, 10, 20])
+    async def test_list_restaurant_reviews_pages(self, reviews: List[dict], uow: SqlAlchemyUnitOfWork,
+                                                 sort_order: ReviewSortOrder, limit: int):
+        ids, cursor = [], None
+
+        while True:
+            page = await uow.reviews.list_restaurant_reviews(1, sort_order, limit, cursor)
+
+            assert len(page.items) <= limit
+            ids.extend(review.id for review in page.items)
+
+            if not page.next_cursor:
+                break
+
+            cursor = page.next_cursor
+
+        assert ids == get_expected_ids(reviews, sort_order)
+
+    async def test_list_restaurant_reviews_cursor_of_another_order(self, reviews: List[dict],
+                                                                   uow: SqlAlchemyUnitOfWork):
+        page = await uow.reviews.list_restaurant_reviews(1, ReviewSortOrder.highest, 3)
+
+        with pytest.raises(InvalidCursorError):
+            await uow.reviews.list_restaurant_reviews(1, ReviewSortOrder.lowest, 3, page.next_cursor)
+
+    @pytest.mark.parametrize('restaurant_id, menu_item_id', [(1, None), (None, 1)])
+    async def test_create_duplicate(self, entities, uow: SqlAlchemyUnitOfWork,
+                                    restaurant_id: Optional[int], menu_item_id: Optional[int]):
+        review = ReviewCreateModel(rating=5, comment=None, customer_id=1, restaurant_id=restaurant_id,
+                                   menu_item_id=menu_item_id)
+
+        created_review = await uow.reviews.create(review)
+
+        assert created_review.id is not None
+        assert await uow.reviews.create(review) is None
+        # Other customers still review the entity
+        assert await uow.reviews.create(ReviewCreateModel(rating=1, comment=None, customer_id=2,
+                                                          restaurant_id=restaurant_id,
+                                                          menu_item_id=menu_item_id)) is not None
@@ -0,0 +1,113 @@
+from datetime import datetime
+from typing import Callable, List, Optional
+
+import pytest
+
+from exceptions.review import ReviewAlreadyExistsError
+from models.rating import RatingEntityType, RatingAggregateModel
+from schemas.review import ReviewCreateInSchema, ReviewUpdateInSchema
+from uow.sqlalchemy import SqlAlchemyUnitOfWork
+from uow.utils import uow_transaction, uow_transaction_with_commit
+from .base import get_review_service
+
+
+async def retrieve_aggregate(get_uow: Callable[[], SqlAlchemyUnitOfWork], entity_type: RatingEntityType,
+                             entity_id: int = 1) -> Optional[RatingAggregateModel]:
+    async with uow_transaction(get_uow()) as uow:
+        return await uow.rating_aggregates.retrieve(entity_type, entity_id)
+
+
+def get_histogram(*ratings: int) -> List[int]:
+    return [ratings.count(stars) for stars in range(1, 6)]
+
+
+@pytest.mark.usefixtures('entities')
+class TestReviewService:
+    review_adders = {
+        RatingEntityType.restaurant: lambda service, review, uow: service.add_restaurant_review(1, review, uow),
+        RatingEntityType.menu_item: lambda service, review, uow: service.add_menu_item_review(1, review, uow),
+        RatingEntityType.courier: lambda service, review, uow: service.add_order_review(1, review, uow),
+    }
+
+    async def add_review(self, get_uow: Callable[[], SqlAlchemyUnitOfWork], entity_type: RatingEntityType,
+                         customer_id: int, rating: int, comment: Optional[str] = None):
+        async with uow_transaction_with_commit(get_uow()) as uow:
+            return await self.review_adders[entity_type](get_review_service(customer_id),
+                                                         ReviewCreateInSchema(rating=rating, comment=comment), uow)
+
+    @pytest.mark.parametrize('entity_type', list(RatingEntityType))
+    async def test_add_review_applies_rating(self, get_uow: Callable[[], SqlAlchemyUnitOfWork],
+                                             entity_type: RatingEntityType):
+        await self.add_review(get_uow, entity_type, 1, 5)
+        aggregate = await retrieve_aggregate(get_uow, entity_type)
+
+        assert (aggregate.reviews_count, aggregate.ratings_sum, aggregate.histogram) == (1, 5, get_histogram(5))
+
+        # Orders are reviewed by their customers only, other entities by anyone
+        if entity_type != RatingEntityType.courier:
+            await self.add_review(get_uow, entity_type, 2, 2)
+            aggregate = await retrieve_aggregate(get_uow, entity_type)
+
+            assert (aggregate.reviews_count, aggregate.ratings_sum, aggregate.histogram) == \
+                (2, 7, get_histogram(5, 2))
+            assert aggregate.to_rating_model().rating == 3.5
+
+    @pytest.mark.parametrize('entity_type', list(RatingEntityType))
+    async def test_update_review_moves_rating(self, get_uow: Callable[[], SqlAlchemyUnitOfWork],
+                                              entity_type: RatingEntityType):
+        review = await self.add_review(get_uow, entity_type, 1, 5)
+
+        async with uow_transaction_with_commit(get_uow()) as uow:
+            await get_review_service(1).update_review(review.id, ReviewUpdateInSchema(rating=1), uow)
+
+        aggregate = await retrieve_aggregate(get_uow, entity_type)
+
+        assert (aggregate.reviews_count, aggregate.ratings_sum, aggregate.histogram) == (1, 1, get_histogram(1))
+
+    @pytest.mark.parametrize('entity_type', list(RatingEntityType))
+    async def test_delete_review_removes_rating(self, get_uow: Callable[[], SqlAlchemyUnitOfWork],
+                                                entity_type: RatingEntityType):
+        review = await self.add_review(get_uow, entity_type, 1, 4)
+
+        async with uow_transaction_with_commit(get_uow()) as uow:
+            await get_review_service(1).delete_review(review.id, uow)
+
+        aggregate = await retrieve_aggregate(get_uow, entity_type)
+
+        assert (aggregate.reviews_count, aggregate.ratings_sum, aggregate.histogram) == (0, 0, get_histogram())
+        assert aggregate.to_rating_model().rating == 0
+
+    async def test_review_changes_analytics(self, get_uow: Callable[[], SqlAlchemyUnitOfWork]):
+        today = datetime.utcnow().date()
+        review = await self.add_review(get_uow, RatingEntityType.restaurant, 1, 5, comment='Tasty')
+        await self.add_review(get_uow, RatingEntityType.restaurant, 2, 3)
+
+        async with uow_transaction_with_commit(get_uow()) as uow:
+            await get_review_service(1).update_review(review.id, ReviewUpdateInSchema(rating=4), uow)
+
+        async with uow_transaction(get_uow()) as uow:
+            [rollup] = await uow.review_analytics.list_daily(1, today, today)
+
+        assert (rollup.reviews_count, rollup.ratings_sum, rollup.comments_count, rollup.histogram) == \
+            (2, 7, 0, get_histogram(4, 3))
+
+        async with uow_transaction_with_commit(get_uow()) as uow:
+            await get_review_service(1).delete_review(review.id, uow)
+
+        async with uow_transaction(get_uow()) as uow:
+            [rollup] = await uow.review_analytics.list_daily(1, today, today)
+
+        assert (rollup.reviews_count, rollup.ratings_sum, rollup.comments_count, rollup.histogram) == \
+            (1, 3, 0, get_histogram(3))
+
+    @pytest.mark.parametrize('entity_type', list(RatingEntityType))
+    async def test_add_duplicate_review(self, get_uow: Callable[[], SqlAlchemyUnitOfWork],
+                                        entity_type: RatingEntityType):
+        await self.add_review(get_uow, entity_type, 1, 5)
+
+        with pytest.raises(ReviewAlreadyExistsError):
+            await self.add_review(get_uow, entity_type, 1, 1)
+
+        aggregate = await retrieve_aggregate(get_uow, entity_type)
+
+        assert (aggregate.reviews_count, aggregate.ratings_sum) == (1, 5)
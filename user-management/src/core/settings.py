@@ -92,6 +92,16 @@ class Base(Configuration):
         ]
     }
 
+    # Put role, is_active and is_email_verified claims into access tokens,
+    # so other microservices can authorize requests without gRPC calls
+
+    JWT_USER_CLAIMS_ENABLED = env.bool('JWT_USER_CLAIMS_ENABLED', default=False)
+
+    # Cache of user roles in gRPC servicer
+
+    USER_ROLES_CACHE_MAXSIZE = env.int('USER_ROLES_CACHE_MAXSIZE', default=10000)
+    USER_ROLES_CACHE_TTL_SECONDS = env.int('USER_ROLES_CACHE_TTL_SECONDS', default=30)
+
     SIMPLE_JWT = {
         "ACCESS_TOKEN_LIFETIME": timedelta(days=1),
         "REFRESH_TOKEN_LIFETIME": timedelta(days=10),
@@ -99,9 +109,9 @@ class Base(Configuration):
         "BLACKLIST_AFTER_ROTATION": True,
         "UPDATE_LAST_LOGIN": False,
 
-        "ALGORITHM": "HS256",
-        "SIGNING_KEY": SECRET_KEY,
-        "VERIFYING_KEY": "",
+        "ALGORITHM": env('JWT_ALGORITHM', default="HS256"),
+        "SIGNING_KEY": env('JWT_SIGNING_KEY', default=SECRET_KEY),
+        "VERIFYING_KEY": env('JWT_VERIFYING_KEY', default=""),
         "AUDIENCE": None,
         "ISSUER": None,
         "JSON_ENCODER": None,
@@ -207,6 +217,12 @@ class Base(Configuration):
             'user_restaurant': 'producer.serializers.ModeratorCreatedSerializer',
             'user_order': 'producer.serializers.ModeratorCreatedSerializer',
         },
+        # Updates of users have their own topics, so compaction of replica topics keeps created events
+        'producer.events.UserUpdatedEvent': {
+            'user_roles_restaurant': 'producer.serializers.UserUpdatedSerializer',
+            'user_roles_menu': 'producer.serializers.UserUpdatedSerializer',
+            'user_roles_review': 'producer.serializers.UserUpdatedSerializer',
+        },
     }
 
     # Auth user model
@@ -19,6 +19,11 @@ class RolesServiceStub(object):
                 request_serializer=roles_dot_roles__pb2.GetUserRoleRequest.SerializeToString,
                 response_deserializer=roles_dot_roles__pb2.GetUserRoleResponse.FromString,
                 )
+        self.GetUserRoles = channel.unary_unary(
+                '/roles.RolesService/GetUserRoles',
+                request_serializer=roles_dot_roles__pb2.GetUserRolesRequest.SerializeToString,
+                response_deserializer=roles_dot_roles__pb2.GetUserRolesResponse.FromString,
+                )
 
 
 class RolesServiceServicer(object):
@@ -30,6 +35,12 @@ class RolesServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def GetUserRoles(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_RolesServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -38,6 +49,11 @@ def add_RolesServiceServicer_to_server(servicer, server):
                     request_deserializer=roles_dot_roles__pb2.GetUserRoleRequest.FromString,
                     response_serializer=roles_dot_roles__pb2.GetUserRoleResponse.SerializeToString,
             ),
+            'GetUserRoles': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetUserRoles,
+                    request_deserializer=roles_dot_roles__pb2.GetUserRolesRequest.FromString,
+                    response_serializer=roles_dot_roles__pb2.GetUserRolesResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'roles.RolesService', rpc_method_handlers)
@@ -64,3 +80,20 @@ class RolesService(object):
             roles_dot_roles__pb2.GetUserRoleResponse.FromString,
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetUserRoles(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/roles.RolesService/GetUserRoles',
+            roles_dot_roles__pb2.GetUserRolesRequest.SerializeToString,
+            roles_dot_roles__pb2.GetUserRolesResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
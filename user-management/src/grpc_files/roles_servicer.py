@@ -1,66 +1,105 @@
 import logging
-from typing import Optional
+from typing import Optional, Tuple
 
 from grpc import StatusCode
 
 import grpc_files.generated.roles.roles_pb2_grpc as pb2_grpc
 import grpc_files.generated.roles.roles_pb2 as pb2
 
-from users.models import User, UserRole
-from tokens.utils import get_user
+from users.cache import CachedUserRole, user_roles_cache
+from users.models import UserRole
+from tokens.utils import get_user_id
 
 logger = logging.getLogger(__name__)
 
 
 class RolesServicer(pb2_grpc.RolesServiceServicer):
 
-    def _get_user(self, access_token: str, context) -> Optional[User]:
-        if not access_token:
-            logger.warning("Missing access token")
-            context.abort(StatusCode.INVALID_ARGUMENT, "Missing access token")
-            return
-
-        user = get_user(access_token=access_token)
-
+    def _check_user(self, user: Optional[CachedUserRole]) -> Optional[Tuple[StatusCode, str]]:
         if not user:
-            logger.warning(f"Invalid access token: {access_token}")
-            context.abort(StatusCode.INVALID_ARGUMENT, "Invalid access token")
-            return
+            return StatusCode.INVALID_ARGUMENT, "Invalid access token"
 
         if not user.is_active:
             logger.warning(f"User with id={user.id} isn't active")
-            context.abort(StatusCode.UNAUTHENTICATED, "User isn't active")
-            return
+            return StatusCode.UNAUTHENTICATED, "User isn't active"
 
         if not user.is_email_verified:
             logger.warning(f"User with id={user.id} has got unverified email")
-            context.abort(StatusCode.UNAUTHENTICATED, "User has got unverified email")
-            return
+            return StatusCode.UNAUTHENTICATED, "User has got unverified email"
 
         if user.is_staff:
             logger.warning(f"User with id={user.id} is staff")
-            context.abort(StatusCode.UNAUTHENTICATED, "User is staff")
+            return StatusCode.UNAUTHENTICATED, "User is staff"
+
+    def _get_user(self, access_token: str, context) -> Optional[CachedUserRole]:
+        if not access_token:
+            logger.warning("Missing access token")
+            context.abort(StatusCode.INVALID_ARGUMENT, "Missing access token")
+            return
+
+        user_id = get_user_id(access_token=access_token)
+        user = user_roles_cache.get(user_id) if user_id is not None else None
+
+        if not user:
+            logger.warning(f"Invalid access token: {access_token}")
+
+        error = self._check_user(user)
+
+        if error:
+            context.abort(*error)
             return
 
         logger.debug(f"Got user with id={user.id} and role={user.role}")
         return user
 
+    def _get_grpc_role(self, role: str) -> pb2.UserRole:
+        match role:
+            case UserRole.CUSTOMER:
+                return pb2.UserRole.USER_ROLE_CUSTOMER
+            case UserRole.COURIER:
+                return pb2.UserRole.USER_ROLE_COURIER
+            case UserRole.RESTAURANT_MANAGER:
+                return pb2.UserRole.USER_ROLE_RESTAURANT_MANAGER
+            case UserRole.MODERATOR:
+                return pb2.UserRole.USER_ROLE_MODERATOR
+            case _:
+                return pb2.UserRole.USER_ROLE_UNSPECIFIED
+
     def GetUserRole(self, request, context):
         logger.info(f"Got gRPC request to get user role")
 
         access_token = request.access_token
         user = self._get_user(access_token=access_token,
                               context=context)
-        match user.role:
-            case UserRole.CUSTOMER:
-                role = pb2.UserRole.USER_ROLE_CUSTOMER
-            case UserRole.COURIER:
-                role = pb2.UserRole.USER_ROLE_COURIER
-            case UserRole.RESTAURANT_MANAGER:
-                role = pb2.UserRole.USER_ROLE_RESTAURANT_MANAGER
-            case UserRole.MODERATOR:
-                role = pb2.UserRole.USER_ROLE_MODERATOR
-            case _:
-                role = pb2.UserRole.USER_ROLE_UNSPECIFIED
 
-        return pb2.GetUserRoleResponse(user_id=str(user.id), role=role)
+        return pb2.GetUserRoleResponse(user_id=str(user.id), role=self._get_grpc_role(user.role))
+
+    def GetUserRoles(self, request, context):
+        logger.info(f"Got gRPC request to get roles of {len(request.access_tokens)} user(s)")
+
+        user_ids = [get_user_id(access_token=access_token) if access_token else None
+                    for access_token in request.access_tokens]
+
+        # All users of a batch are loaded with a single query
+        users = user_roles_cache.get_many(user_id for user_id in user_ids if user_id is not None)
+
+        results = []
+
+        for access_token, user_id in zip(request.access_tokens, user_ids):
+            if not access_token:
+                results.append(pb2.UserRoleResult(status_code=StatusCode.INVALID_ARGUMENT.value[0],
+                                                  details="Missing access token"))
+                continue
+
+            user = users.get(user_id)
+            error = self._check_user(user)
+
+            if error:
+                status_code, details = error
+                results.append(pb2.UserRoleResult(status_code=status_code.value[0], details=details))
+                continue
+
+            results.append(pb2.UserRoleResult(user_id=str(user.id), role=self._get_grpc_role(user.role),
+                                              status_code=StatusCode.OK.value[0]))
+
+        return pb2.GetUserRolesResponse(results=results)
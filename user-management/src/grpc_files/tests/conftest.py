@@ -3,6 +3,7 @@ import pytest
 from django_grpc_testtools.context import FakeServicerContext
 from rest_framework_simplejwt.tokens import AccessToken
 from grpc_files.roles_servicer import RolesServicer
+from users.cache import user_roles_cache
 from users.models import User
 from users.tests.utils import create_verified_customer, create_verified_courier, create_verified_restaurant_manager, \
     create_verified_moderator, create_unverified_customer
@@ -22,6 +23,11 @@ def roles_servicer():
     return RolesServicer()
 
 
+@pytest.fixture(autouse=True)
+def clear_user_roles_cache():
+    user_roles_cache.clear()
+
+
 # User fixtures #
 
 @pytest.fixture
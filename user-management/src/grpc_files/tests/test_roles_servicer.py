@@ -1,8 +1,9 @@
 import grpc
 import pytest
 
-import grpc_files.generated.roles_pb2 as pb2
-from grpc_files.generated.roles_pb2 import GetUserRoleRequest, GetUserRoleResponse, UserRole
+import grpc_files.generated.roles.roles_pb2 as pb2
+from grpc_files.generated.roles.roles_pb2 import GetUserRoleRequest, GetUserRoleResponse, GetUserRolesRequest, \
+    UserRole
 from users.models import User
 
 
@@ -104,6 +105,51 @@ class TestRolesServicer:
         assert context.abort_status == expected_abort_status
         assert context.abort_message == expected_abort_message
 
+    def test_get_user_roles(self, roles_servicer, context, verified_customer: User, verified_courier: User,
+                            access_token_for_verified_customer: str, access_token_for_verified_courier: str,
+                            access_token_for_unverified_customer: str, invalid_access_token: str,
+                            django_assert_num_queries):
+        roles_request = GetUserRolesRequest(access_tokens=[access_token_for_verified_customer,
+                                                           access_token_for_verified_courier,
+                                                           access_token_for_unverified_customer,
+                                                           invalid_access_token,
+                                                           ""])
+
+        with django_assert_num_queries(1):
+            response = roles_servicer.GetUserRoles(request=roles_request, context=context)
+
+        assert [(result.user_id, result.role) for result in response.results[:2]] == [
+            (str(verified_customer.id), UserRole.USER_ROLE_CUSTOMER),
+            (str(verified_courier.id), UserRole.USER_ROLE_COURIER),
+        ]
+        assert [result.status_code for result in response.results] == [
+            grpc.StatusCode.OK.value[0],
+            grpc.StatusCode.OK.value[0],
+            grpc.StatusCode.UNAUTHENTICATED.value[0],
+            grpc.StatusCode.INVALID_ARGUMENT.value[0],
+            grpc.StatusCode.INVALID_ARGUMENT.value[0],
+        ]
+
+    def test_get_user_role_cached(self, roles_servicer, context, verified_customer: User,
+                                  access_token_for_verified_customer: str, django_assert_num_queries):
+        role_request = GetUserRoleRequest(access_token=access_token_for_verified_customer)
+        roles_servicer.GetUserRole(request=role_request, context=context)
+
+        with django_assert_num_queries(0):
+            roles_servicer.GetUserRole(request=role_request, context=context)
+
+        # Saving a user invalidates cached role
+        verified_customer.is_active = False
+        verified_customer.save()
+
+        try:
+            roles_servicer.GetUserRole(request=role_request, context=context)
+        except Exception:
+            pass
+
+        assert context.abort_status == grpc.StatusCode.UNAUTHENTICATED
+        assert context.abort_message == "User isn't active"
+
     # @pytest.mark.parametrize(
     #     "access_token_name, user_name, has_permission",
     #     [
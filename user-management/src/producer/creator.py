@@ -27,7 +27,7 @@ class KafkaProducerBaseCreator(ABC):
 
         self._bootstrap_servers = bootstrap_servers
         self._security_protocol = security_protocol
-        self._key_serializer = lambda k: k.encode('ascii')
+        self._key_serializer = lambda k: k.encode('ascii') if k is not None else None
         self._value_serializer = lambda m: json.dumps(m).encode('ascii')
 
     @abstractmethod
@@ -1,5 +1,5 @@
 from abc import ABC
-from typing import List, Set, Any, Dict, Type, Iterable
+from typing import List, Set, Any, Dict, Type, Iterable, Optional
 
 from rest_framework.serializers import Serializer
 
@@ -10,6 +10,7 @@ __all__ = [
     'CourierCreatedEvent',
     'CustomerCreatedEvent',
     'CustomerUpdatedEvent',
+    'UserUpdatedEvent',
 ]
 
 
@@ -22,9 +23,11 @@ class ProducerEvent(ABC):
     Attributes:
         _topics_serializers (Dict[str, Type[Serializer]]): Dictionary of topics to which the event's data
         will be published and associated serializers with them.
+        _aggregate_id_field (str): Name of the data field with ID of the entity the event is about.
     """
 
     _topics_serializers: Dict[str, Type[Serializer]]
+    _aggregate_id_field: str = 'id'
 
     def __init__(self, data: dict):
         """
@@ -51,6 +54,20 @@ class ProducerEvent(ABC):
 
         return self._topics_serializers.get(topic)(self._data).data
 
+    def get_aggregate_id(self) -> Optional[str]:
+        """
+        ID of the entity the event is about.
+
+        Events of the same entity are published in the order they were created.
+
+        Returns:
+            Optional[str]: The ID or None if the data has no such field.
+        """
+
+        aggregate_id = self._data.get(self._aggregate_id_field)
+
+        return str(aggregate_id) if aggregate_id is not None else None
+
     @classmethod
     def extend_topics_serializers(cls, topics_serializers: Dict[str, Type[Serializer]]):
         """
@@ -123,3 +140,11 @@ class ModeratorCreatedEvent(ProducerEvent):
     """
 
     _topics_serializers = dict()
+
+
+class UserUpdatedEvent(ProducerEvent):
+    """
+    Event when User's role, activity or email verification may have changed.
+    """
+
+    _topics_serializers = dict()
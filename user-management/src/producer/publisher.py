@@ -13,6 +13,9 @@ __all__ = [
 
 logger = logging.getLogger(__name__)
 
+# Header with the name of the event, the key of a message is the ID of the entity the event is about
+EVENT_NAME_HEADER = 'event_name'
+
 
 class AbstractPublisher(ABC):
     """
@@ -54,13 +57,18 @@ class KafkaPublisher(AbstractPublisher):
             event (ProducerEvent): The event to publish.
         """
 
+        event_name = event.get_event_name()
+        headers = [(EVENT_NAME_HEADER, event_name.encode('ascii'))]
+
+        # Events of a user go to the same partition and are consumed in order
+        key = event.get_aggregate_id()
+
         for topic in event.get_topics():
-            key = event.get_event_name()
             data = event.get_data(topic)
-            self._producer.send(topic, key=key, value=data)
+            self._producer.send(topic, key=key, value=data, headers=headers)
 
-            data_string = ", ".join(f"{key}={value}" for key, value in data.items())
-            logger.info(f"Published event {key} to topic: {topic} with data: {data_string}")
+            data_string = ", ".join(f"{field}={value}" for field, value in data.items())
+            logger.info(f"Published event {event_name} to topic: {topic} with data: {data_string}")
 
 
 class DummyPublisher(AbstractPublisher):
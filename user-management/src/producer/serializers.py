@@ -51,3 +51,14 @@ class ModeratorCreatedSerializer(serializers.Serializer):
     """
 
     id = serializers.IntegerField(min_value=0)
+
+
+class UserUpdatedSerializer(serializers.Serializer):
+    """
+    Serializes User to data that will be published to Kafka.
+    """
+
+    id = serializers.IntegerField(min_value=0)
+    role = serializers.CharField()
+    is_active = serializers.BooleanField()
+    is_email_verified = serializers.BooleanField()
@@ -4,8 +4,11 @@ from rest_framework import serializers
 from rest_framework_simplejwt.exceptions import InvalidToken
 from rest_framework_simplejwt.serializers import TokenRefreshSerializer, TokenObtainPairSerializer
 
+from .tokens import UserClaimsRefreshToken
+
 
 class CookieTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = UserClaimsRefreshToken
     expires_session = serializers.BooleanField(default=False)
 
     def validate(self, attrs):
@@ -16,6 +19,7 @@ class CookieTokenObtainPairSerializer(TokenObtainPairSerializer):
 
 class CookieTokenRefreshSerializer(TokenRefreshSerializer):
     refresh = None
+    token_class = UserClaimsRefreshToken
 
     def validate(self, attrs):
         attrs['refresh'] = self.context['request'].COOKIES.get(settings.SIMPLE_JWT['AUTH_COOKIE_REFRESH'])
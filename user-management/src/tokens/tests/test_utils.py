@@ -7,7 +7,7 @@ from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 from tokens.utils import set_access_cookie, set_refresh_cookie, generate_jwt_token_pair, \
     pop_access_token_from_response_data, pop_refresh_token_from_response_data, move_tokens_from_data, \
     set_jwt_cookies, get_user
-from users.models import User
+from users.models import User, UserRole
 
 
 class TestUtils:
@@ -26,6 +26,27 @@ class TestUtils:
         assert access_token.get('user_id') == superuser.id
         assert refresh_token.get('user_id') == superuser.id
 
+    @pytest.mark.django_db
+    def test_generate_jwt_token_pair_with_user_claims(self, django_user_model, settings):
+        settings.JWT_USER_CLAIMS_ENABLED = True
+        customer = django_user_model.objects.create_user(email="c@gmail.com", password="12345",
+                                                         role=UserRole.CUSTOMER)
+
+        access_token, refresh_token = generate_jwt_token_pair(customer)
+
+        assert access_token.get('role') == UserRole.CUSTOMER
+        assert access_token.get('is_active') is True
+        assert access_token.get('is_email_verified') is False
+        assert refresh_token.get('role') is None
+
+    @pytest.mark.django_db
+    def test_generate_jwt_token_pair_with_user_claims_for_staff(self, superuser: User, settings):
+        settings.JWT_USER_CLAIMS_ENABLED = True
+
+        access_token, _ = generate_jwt_token_pair(superuser)
+
+        assert access_token.get('role') is None
+
     @pytest.mark.parametrize(
         "response_name, pop_token_function, token_name",
         [
@@ -0,0 +1,54 @@
+import logging
+
+from django.conf import settings
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken, Token
+
+from users.models import User
+
+logger = logging.getLogger(__name__)
+
+
+def set_user_claims(token: Token, user: User):
+    """
+    Puts role, is_active and is_email_verified claims of the user into the token.
+
+    Claims are set only if JWT_USER_CLAIMS_ENABLED is on. Staff users never get claims,
+    so other microservices always check them via gRPC and reject them.
+
+    Args:
+        token (Token): The token to put claims into.
+        user (User): The owner of the token.
+    """
+
+    if not settings.JWT_USER_CLAIMS_ENABLED or user.is_staff:
+        return
+
+    token['role'] = user.role
+    token['is_active'] = user.is_active
+    token['is_email_verified'] = user.is_email_verified
+
+
+class UserClaimsRefreshToken(RefreshToken):
+    """
+    Refresh token which issues access tokens with user claims.
+
+    Claims are read from the database whenever an access token is issued and "iat" is moved to that moment,
+    so other microservices can tell whether claims are older than the last update of the user.
+    """
+
+    @property
+    def access_token(self) -> AccessToken:
+        access = super().access_token
+
+        if settings.JWT_USER_CLAIMS_ENABLED:
+            user_id = self.payload.get(api_settings.USER_ID_CLAIM)
+            user = User.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).first()
+
+            if user:
+                access.set_iat(at_time=self.current_time)
+                set_user_claims(access, user)
+            else:
+                logger.warning(f"User with id={user_id} of refresh token not found")
+
+        return access
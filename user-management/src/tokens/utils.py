@@ -6,6 +6,7 @@ from rest_framework.response import Response
 from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 from users.models import User
+from .tokens import UserClaimsRefreshToken
 
 logger = logging.getLogger(__name__)
 
@@ -23,7 +24,7 @@ def generate_jwt_token_pair(user: User) -> tuple[AccessToken, RefreshToken]:
 
     try:
 
-        refresh_token = RefreshToken.for_user(user)
+        refresh_token = UserClaimsRefreshToken.for_user(user)
         access_token = refresh_token.access_token
 
         logger.debug(f"JWT token pair generated for user: {user}")
@@ -185,7 +186,23 @@ def get_user(access_token: str) -> Optional[User]:
     """
 
     try:
-        user_id = AccessToken(access_token).get('user_id')
-        return User.objects.get(id=user_id)
-    except (TokenError, User.DoesNotExist):
+        return User.objects.get(id=get_user_id(access_token))
+    except User.DoesNotExist:
+        pass
+
+
+def get_user_id(access_token: str) -> Optional[int]:
+    """
+    Retrieve ID of a user from the provided access token without querying the database.
+
+    Parameters:
+        access_token (str): The access token representing the authenticated user.
+
+    Returns:
+        Optional[int]: ID of the user or None if the access token is invalid.
+    """
+
+    try:
+        return AccessToken(access_token).get('user_id')
+    except TokenError:
         pass
@@ -12,3 +12,6 @@ class UsersConfig(AppConfig):
         init_producer_events()
         init_firebase()
 
+        # Connect signals
+        from . import signals  # noqa: F401
+
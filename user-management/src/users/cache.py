@@ -0,0 +1,112 @@
+import logging
+from threading import Lock
+from typing import Dict, Iterable, NamedTuple, Optional
+
+from cachetools import TTLCache
+from django.conf import settings
+
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+
+class CachedUserRole(NamedTuple):
+    """
+    Role and flags of a user which are needed to authorize the user in other microservices.
+    """
+
+    id: int
+    role: str
+    is_active: bool
+    is_email_verified: bool
+    is_staff: bool
+
+
+class UserRolesCache:
+    """
+    LRU cache of user roles and flags used by gRPC servicer.
+
+    Entries are removed by User save and delete signals. Signals reach only the process where
+    the user is saved, so entries also expire after a TTL.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._lock = Lock()
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generation = 0
+
+    def get_many(self, user_ids: Iterable[int]) -> Dict[int, CachedUserRole]:
+        """
+        Returns roles and flags of users, loading all missing users with a single query.
+
+        Args:
+            user_ids (Iterable[int]): IDs of users.
+
+        Returns:
+            Dict[int, CachedUserRole]: Roles and flags of existing users by their IDs.
+        """
+
+        user_ids = set(user_ids)
+
+        with self._lock:
+            users = {user_id: self._cache[user_id] for user_id in user_ids if user_id in self._cache}
+            generation = self._generation
+
+        missing_user_ids = user_ids - users.keys()
+
+        if missing_user_ids:
+            loaded_users = {
+                row[0]: CachedUserRole(*row)
+                for row in User.objects.filter(id__in=missing_user_ids).values_list(
+                    'id', 'role', 'is_active', 'is_email_verified', 'is_staff'
+                )
+            }
+
+            with self._lock:
+                # Rows read before an invalidation may be outdated
+                if generation == self._generation:
+                    self._cache.update(loaded_users)
+
+            logger.debug(f"Loaded roles of {len(loaded_users)} user(s) from the database")
+
+            users.update(loaded_users)
+
+        return users
+
+    def get(self, user_id: int) -> Optional[CachedUserRole]:
+        """
+        Returns role and flags of a user.
+
+        Args:
+            user_id (int): ID of the user.
+
+        Returns:
+            Optional[CachedUserRole]: Role and flags of the user or None if the user does not exist.
+        """
+
+        return self.get_many([user_id]).get(user_id)
+
+    def invalidate(self, user_id: int):
+        """
+        Removes role and flags of a user from the cache.
+
+        Args:
+            user_id (int): ID of the user.
+        """
+
+        with self._lock:
+            self._generation += 1
+            self._cache.pop(user_id, None)
+
+    def clear(self):
+        """
+        Removes all users from the cache.
+        """
+
+        with self._lock:
+            self._generation += 1
+            self._cache.clear()
+
+
+user_roles_cache = UserRolesCache(maxsize=settings.USER_ROLES_CACHE_MAXSIZE,
+                                  ttl=settings.USER_ROLES_CACHE_TTL_SECONDS)
@@ -0,0 +1,77 @@
+"""
+Benchmark for the roles gRPC servicer.
+
+Starts the servicer on a local port and compares throughput of single `GetUserRole` calls
+with batched `GetUserRoles` calls. Access tokens are generated for existing active users
+with verified email, nothing is written to the database.
+
+Usage (from `src` directory):
+    python manage.py benchmark_roles --users 1000 --requests 5000 --batch-size 100
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import grpc
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+
+import grpc_files.generated.roles.roles_pb2_grpc as pb2_grpc
+import grpc_files.generated.roles.roles_pb2 as pb2
+from grpc_files.roles_servicer import RolesServicer
+from users.cache import user_roles_cache
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = "Compares throughput of single and batched roles gRPC calls"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000, help="Maximum number of users to generate tokens for")
+        parser.add_argument("--requests", type=int, default=5000, help="Number of resolved tokens per mode")
+        parser.add_argument("--batch-size", type=int, default=100, help="Number of tokens in a batched call")
+        parser.add_argument("--workers", type=int, default=10, help="Number of server threads")
+
+    def _report(self, mode: str, rpcs: int, tokens: int, elapsed: float):
+        self.stdout.write(f"{mode:>8}: {rpcs / elapsed:10.1f} RPCs/sec {tokens / elapsed:10.1f} tokens/sec "
+                          f"({rpcs} RPCs in {elapsed:.2f}s)")
+
+    def handle(self, *args, **options):
+        users = list(User.objects.filter(is_active=True, is_email_verified=True, is_staff=False)[:options["users"]])
+
+        if not users:
+            raise CommandError("There are no active users with verified email to generate tokens for")
+
+        access_tokens = [str(AccessToken.for_user(users[index % len(users)])) for index in range(options["requests"])]
+        batch_size = options["batch_size"]
+
+        server = grpc.server(ThreadPoolExecutor(max_workers=options["workers"]))
+        pb2_grpc.add_RolesServiceServicer_to_server(RolesServicer(), server)
+        port = server.add_insecure_port("127.0.0.1:0")
+        server.start()
+
+        try:
+            with grpc.insecure_channel(f"127.0.0.1:{port}") as channel:
+                stub = pb2_grpc.RolesServiceStub(channel)
+
+                # Single
+                user_roles_cache.clear()
+                start = time.perf_counter()
+
+                for access_token in access_tokens:
+                    stub.GetUserRole(pb2.GetUserRoleRequest(access_token=access_token))
+
+                self._report("single", len(access_tokens), len(access_tokens), time.perf_counter() - start)
+
+                # Batched
+                user_roles_cache.clear()
+                batches = [access_tokens[index:index + batch_size]
+                           for index in range(0, len(access_tokens), batch_size)]
+                start = time.perf_counter()
+
+                for batch in batches:
+                    stub.GetUserRoles(pb2.GetUserRolesRequest(access_tokens=batch))
+
+                self._report("batched", len(batches), len(access_tokens), time.perf_counter() - start)
+        finally:
+            server.stop(grace=None)
@@ -0,0 +1,56 @@
+import logging
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from producer import publisher
+from producer.events import UserUpdatedEvent
+from .cache import user_roles_cache
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+# Fields of a user, which other microservices keep in their replicas of the user
+PUBLISHED_FIELDS = ('role', 'is_active', 'is_email_verified')
+
+
+def publish_user_updated(user: User, is_active: bool):
+    # Lets other microservices drop cached role lookups of the user
+    publisher.publish(UserUpdatedEvent(data={
+        'id': user.id,
+        'role': user.role,
+        'is_active': is_active,
+        'is_email_verified': user.is_email_verified
+    }))
+
+
+@receiver(pre_save, sender=User)
+def user_saving(sender, instance: User, update_fields=None, **kwargs):
+    # The stored values of published fields, so an update is published only if any of them is changed
+    if instance.pk is None or (update_fields is not None and not set(update_fields) & set(PUBLISHED_FIELDS)):
+        instance._published_values = None
+    else:
+        instance._published_values = User.objects.filter(pk=instance.pk).values(*PUBLISHED_FIELDS).first()
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance: User, created: bool, **kwargs):
+    user_roles_cache.invalidate(instance.id)
+
+    published_values = getattr(instance, '_published_values', None)
+
+    if not created and published_values is not None and \
+            published_values != {field: getattr(instance, field) for field in PUBLISHED_FIELDS}:
+        transaction.on_commit(lambda: publish_user_updated(instance, instance.is_active))
+
+    logger.debug(f"Invalidated cached role of user: {instance}")
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance: User, **kwargs):
+    user_roles_cache.invalidate(instance.id)
+
+    transaction.on_commit(lambda: publish_user_updated(instance, False))
+
+    logger.debug(f"Invalidated cached role of deleted user: {instance}")
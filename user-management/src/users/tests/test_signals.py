@@ -0,0 +1,45 @@
+import pytest
+
+from users import signals
+from users.roles import UserRole
+from .utils import create_verified_customer
+
+
+@pytest.mark.django_db
+class TestUserSavedSignal:
+
+    @pytest.fixture
+    def published(self, monkeypatch) -> list:
+        published = list()
+        monkeypatch.setattr(signals, 'publish_user_updated', lambda user, is_active: published.append(user.id))
+        return published
+
+    @pytest.mark.parametrize(
+        "field, value",
+        [
+            ("role", UserRole.COURIER),
+            ("is_active", False),
+            ("is_email_verified", False),
+        ]
+    )
+    def test_published_field_changed(self, field: str, value, published: list, django_capture_on_commit_callbacks):
+        user = create_verified_customer()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            setattr(user, field, value)
+            user.save()
+
+        assert published == [user.id]
+
+    def test_other_field_changed(self, published: list, django_capture_on_commit_callbacks):
+        user = create_verified_customer()
+
+        # Other microservices don't keep notification preferences, so they aren't told about them
+        with django_capture_on_commit_callbacks(execute=True):
+            user.accepts_sms_notifications = False
+            user.save()
+            user.save(update_fields=['accepts_sms_notifications'])
+            user.last_login = None
+            user.save(update_fields=['last_login'])
+
+        assert published == []